@@ -0,0 +1,265 @@
+"""
+鸣潮成就管理器 - 命令行入口
+无需启动界面即可执行爬取、合并、重新编码、导出和资源同步，适合计划任务调用
+
+用法：
+    python -m cli crawl --version 2.7 [--output 文件] [--merge] [--no-cache]
+    python -m cli merge --input 鸣潮v2.7爬取数据.json
+    python -m cli reencode
+    python -m cli export --output 文件 [--version 2.7 ...] [--user 用户名]
+    python -m cli assets [--workers 4] [--api-base URL] [--local-only]
+    python -m cli bench excel [--rows 50000]
+    python -m cli bench startup
+    python -m cli bench snapshot [--rows 50000]
+    python -m cli bench records [--rows 50000]
+    python -m cli bench columnar [--rows 1000/10000/100000]
+    python -m cli bench progress [--rows 50000]
+    python -m cli bench matrix [--rows 50000]
+    python -m cli bench groups [--rows 10000]
+    python -m cli bench shards [--rows 50000]
+    python -m cli bench assets [--rows 24]
+
+标准输出只输出一行JSON汇总，日志输出到标准错误
+退出码：0 成功，1 执行失败，2 参数错误，3 已有任务在运行
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_LOCKED = 3
+
+# 锁文件超过该时间视为残留（秒）
+LOCK_STALE_SECONDS = 3600
+
+
+class CommandError(Exception):
+    """命令执行失败"""
+
+
+class LockedError(Exception):
+    """已有命令行任务在运行"""
+
+
+@contextlib.contextmanager
+def run_lock(resources_dir):
+    """防止计划任务重复启动时并发写入数据文件"""
+    lock_file = resources_dir / ".cli.lock"
+    if lock_file.exists() and time.time() - lock_file.stat().st_mtime > LOCK_STALE_SECONDS:
+        print(f"[WARNING] 清理残留的锁文件: {lock_file}")
+        lock_file.unlink()
+
+    try:
+        fd = os.open(str(lock_file), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        raise LockedError(f"锁文件已存在: {lock_file}")
+    try:
+        os.write(fd, str(os.getpid()).encode())
+        os.close(fd)
+        yield
+    finally:
+        try:
+            lock_file.unlink()
+        except OSError:
+            pass
+
+
+def _load_json_list(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise CommandError(f"文件格式错误，应为成就列表: {path}")
+    return data
+
+
+def _migrate_data_files():
+    """写入用户数据前先把旧格式数据迁移到当前格式，只读的命令不需要"""
+    from core.config import config
+    config.migrate_data_files()
+
+
+def _merge(new_achievements):
+    """合并成就到基础数据并同步重新编码所有用户存档"""
+    from core.config import config
+    from core.achievement_ops import merge_new_achievements
+
+    _migrate_data_files()
+    current_achievements = config.load_base_achievements()
+    all_achievements, to_add, has_new_categories = merge_new_achievements(
+        current_achievements, new_achievements, reencode=False)
+
+    result = {"added": len(to_add), "new_categories": has_new_categories}
+    if to_add:
+        # 先保存合并后的数据，再统一重新编码基础数据和用户存档，保证存档编号映射正确
+        if not config.save_base_achievements(all_achievements):
+            raise CommandError("保存基础成就数据失败")
+        if not config.reencode_all_user_progress():
+            raise CommandError("重新编码用户存档失败")
+    result["total"] = sum(config.get_base_versions().values())
+    return result
+
+
+def cmd_crawl(args):
+    from core.achievement_crawler import AchievementCrawler
+    from core.config import get_resource_path
+
+    if args.no_cache:
+        cache_file = get_resource_path("resources") / "achievement_cache.json"
+        if cache_file.exists():
+            cache_file.unlink()
+            print("[INFO] 已忽略本地缓存")
+
+    crawler = AchievementCrawler(args.version)
+    outcome = {}
+    crawler.progress.connect(lambda message: print(f"[INFO] {message}"))
+    crawler.finished.connect(lambda achievements: outcome.update(achievements=achievements))
+    crawler.error.connect(lambda message: outcome.update(error=message))
+    crawler.crawl()
+
+    if "error" in outcome:
+        raise CommandError(outcome["error"])
+    achievements = outcome.get("achievements", [])
+
+    result = {"version": args.version, "crawled": len(achievements)}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(achievements, f, ensure_ascii=False, indent=2)
+        result["output"] = os.path.abspath(args.output)
+        print(f"[SUCCESS] 爬取数据已保存到: {args.output}")
+    if args.merge:
+        result["merge"] = _merge(achievements)
+    return result
+
+
+def cmd_merge(args):
+    achievements = _load_json_list(args.input)
+    result = {"input": os.path.abspath(args.input), "records": len(achievements)}
+    result.update(_merge(achievements))
+    return result
+
+
+def cmd_reencode(args):
+    from core.config import config
+
+    _migrate_data_files()
+    if not config.reencode_all_user_progress():
+        raise CommandError("重新编码失败")
+    return {"total": sum(config.get_base_versions().values()), "users": len(config.get_users())}
+
+
+def cmd_export(args):
+    """只读导出：指定版本时只读取这些版本的分片，不迁移或改写任何数据文件"""
+    from core.config import config
+
+    if args.user and args.user not in config.get_users():
+        raise CommandError(f"用户不存在: {args.user}")
+    achievements = config.load_base_achievements(args.version)
+    if args.user:
+        progress = config.load_user_progress(args.user, update_matrix=False)
+        for achievement in achievements:
+            achievement["获取状态"] = progress.get(achievement.get("编号", ""), {}).get("获取状态", "")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(achievements, f, ensure_ascii=False, indent=2)
+    print(f"[SUCCESS] 已导出 {len(achievements)} 条成就到: {args.output}")
+    return {"output": os.path.abspath(args.output), "records": len(achievements),
+            "versions": args.version or "全部"}
+
+
+def cmd_assets(args):
+    from core.asset_sync import sync_assets, build_local_thumbnails
+
+    if args.local_only:
+        return {"generated": build_local_thumbnails()}
+    summary = sync_assets(args.api_base, args.workers)
+    if summary["failed"] and not (summary["downloaded"] or summary["skipped"] or summary["unchanged"]):
+        raise CommandError(f"资源同步失败: {summary['errors'][:3]}")
+    return summary
+
+
+def cmd_bench(args):
+    import inspect
+    from core.benchmarks import BENCHMARKS, run_benchmark
+
+    kwargs = {}
+    if args.rows:
+        bench_func = BENCHMARKS.get(args.target)
+        if bench_func and "rows" not in inspect.signature(bench_func).parameters:
+            raise CommandError(f"基准 {args.target} 不支持 --rows 参数")
+        kwargs["rows"] = args.rows
+    return run_benchmark(args.target, **kwargs)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m cli", description="鸣潮成就管理器命令行工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    crawl_parser = subparsers.add_parser("crawl", help="爬取指定版本的成就数据")
+    crawl_parser.add_argument("--version", required=True, help="目标版本号，如 2.7")
+    crawl_parser.add_argument("--output", help="保存爬取结果的JSON文件")
+    crawl_parser.add_argument("--merge", action="store_true", help="爬取后直接合并到基础数据")
+    crawl_parser.add_argument("--no-cache", action="store_true", help="忽略本地缓存重新请求")
+    crawl_parser.set_defaults(handler=cmd_crawl)
+
+    merge_parser = subparsers.add_parser("merge", help="合并爬取结果到基础数据")
+    merge_parser.add_argument("--input", required=True, help="爬取结果JSON文件")
+    merge_parser.set_defaults(handler=cmd_merge)
+
+    reencode_parser = subparsers.add_parser("reencode", help="按分类配置重新编码基础数据和所有用户存档")
+    reencode_parser.set_defaults(handler=cmd_reencode)
+
+    export_parser = subparsers.add_parser("export", help="导出基础成就（可附带用户进度）到JSON文件")
+    export_parser.add_argument("--output", required=True, help="导出的JSON文件")
+    export_parser.add_argument("--version", action="append", help="只导出指定版本，可重复")
+    export_parser.add_argument("--user", help="附带该用户的获取状态")
+    export_parser.set_defaults(handler=cmd_export)
+
+    assets_parser = subparsers.add_parser("assets", help="同步头像与角色肖像资源")
+    assets_parser.add_argument("--workers", type=int, default=4, help="并发下载数")
+    assets_parser.add_argument("--api-base", default="https://api.kurobbs.com", help="wiki接口地址")
+    assets_parser.add_argument("--local-only", action="store_true", help="只为本地已有图片生成缩略图")
+    assets_parser.set_defaults(handler=cmd_assets)
+
+    bench_parser = subparsers.add_parser("bench", help="运行性能基准")
+    bench_parser.add_argument("target", help="基准名称，如 excel")
+    bench_parser.add_argument("--rows", type=int, help="合成数据行数")
+    bench_parser.set_defaults(handler=cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    start_time = time.perf_counter()
+    summary = {"command": args.command, "ok": False}
+    exit_code = EXIT_FAILED
+
+    # 日志输出到标准错误，标准输出只保留JSON汇总
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            from core.config import get_resource_path
+            with run_lock(get_resource_path("resources")):
+                summary["result"] = args.handler(args)
+            summary["ok"] = True
+            exit_code = EXIT_OK
+        except LockedError as e:
+            print(f"[ERROR] 已有命令行任务在运行: {e}")
+            summary["error"] = "已有命令行任务在运行"
+            exit_code = EXIT_LOCKED
+        except Exception as e:
+            print(f"[ERROR] {args.command} 执行失败: {e}")
+            summary["error"] = str(e)
+
+    summary["elapsed"] = round(time.perf_counter() - start_time, 3)
+    print(json.dumps(summary, ensure_ascii=False))
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
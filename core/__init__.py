@@ -1,4 +1,12 @@
-from .config import config
-from .signal_bus import signal_bus
+# 按需导入，避免 import core.xxx 时提前加载配置（便于启动分析覆盖配置加载阶段）
+__all__ = ['config', 'signal_bus']
 
-__all__ = ['config', 'signal_bus']
\ No newline at end of file
+
+def __getattr__(name):
+    if name == 'config':
+        from .config import config
+        return config
+    if name == 'signal_bus':
+        from .signal_bus import signal_bus
+        return signal_bus
+    raise AttributeError(f"module 'core' has no attribute '{name}'")
@@ -0,0 +1,437 @@
+"""
+成就爬虫模块
+从库街区wiki获取成就数据并解析，仅依赖QtCore，可在无界面环境（命令行）中使用；
+requests 与 bs4 在实际爬取/解析时才导入，不拖慢界面启动
+"""
+import re
+import html
+import os
+import codecs
+
+from PySide6.QtCore import QObject, Signal
+
+from core.config import config
+from core.game_version import version_key
+from core.instrumentation import metrics
+from core.json_stream import iter_filter_components
+
+
+class AchievementCrawler(QObject):
+    """成就爬虫类"""
+    progress = Signal(str)
+    finished = Signal(list)
+    error = Signal(str)
+
+    def __init__(self, target_version=None):
+        super().__init__()
+        self.target_version = target_version
+        self.devcode = ""
+        self.token = ""
+        
+        # 从配置文件加载分类配置
+        self.category_config = config.load_category_config()
+        self.first_categories = self.category_config.get("first_categories", {})
+        self.second_categories = self.category_config.get("second_categories", {})
+        
+        # 创建第二分类到第一分类的映射
+        self.first_category_map = {}
+        for first_cat, second_cats in self.second_categories.items():
+            for second_cat in second_cats:
+                self.first_category_map[second_cat] = first_cat
+    
+    def _load_auth_config(self):
+        """从配置中加载认证信息"""
+        self.devcode, self.token = config.get_auth_data()
+
+    @metrics.timed("爬取（下载与解析）")
+    def crawl(self):
+        try:
+            # 加载认证信息
+            self._load_auth_config()
+            self.progress.emit("正在获取成就数据...")
+            # 流式获取成就表格HTML，边下载边解析
+            html_blobs = self.get_achievement_data()
+            achievements = self.parse_achievements_data(html_blobs, self.target_version)
+            self.finished.emit(achievements)
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def get_achievement_data(self):
+        """流式获取成就表格HTML
+
+        逐块解码接口响应（或本地缓存），只提取 filter-component 的HTML内容并逐个产出，
+        同时把原始响应边下载边写入缓存文件，避免整页JSON在内存中同时存在多份
+        """
+        from core.config import get_resource_path
+
+        cache_file = get_resource_path("resources") / "achievement_cache.json"
+
+        if cache_file.exists():
+            yielded = 0
+            try:
+                self.progress.emit("使用本地缓存数据...")
+                print("[INFO] 使用本地缓存数据")
+                for html_content in iter_filter_components(self._iter_cache_chunks(cache_file)):
+                    yielded += 1
+                    yield html_content
+                return
+            except Exception as e:
+                if yielded:
+                    raise Exception(f"读取缓存失败: {str(e)}")
+                print(f"[WARNING] 读取缓存失败: {str(e)}，将重新请求")
+
+        url = "https://api.kurobbs.com/wiki/core/catalogue/item/getEntryDetail"
+        headers = {
+            'Accept': 'application/json, text/plain, */*',
+            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6',
+            'Connection': 'keep-alive',
+            'Content-Type': 'application/x-www-form-urlencoded;charset=UTF-8',
+            'Origin': 'https://wiki.kurobbs.com',
+            'Referer': 'https://wiki.kurobbs.com/',
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'devcode': self.devcode,
+            'token': self.token,
+            'wiki_type': '9'
+        }
+        data = {'id': '1220879855033786368'}
+
+        import requests
+
+        temp_file = cache_file.with_name(cache_file.name + ".tmp")
+        completed = False
+        try:
+            with requests.post(url, headers=headers, data=data, timeout=30, stream=True) as response:
+                with open(temp_file, 'wb') as cache_f:
+                    chunks = self._iter_response_chunks(response, cache_f)
+                    for html_content in iter_filter_components(chunks):
+                        yield html_content
+
+            # 响应完整解析后才替换正式缓存，避免留下半截文件
+            os.replace(temp_file, cache_file)
+            completed = True
+            print(f"[INFO] 已保存缓存到: {cache_file}")
+        except requests.RequestException as e:
+            raise Exception(f"网络请求失败: {str(e)}")
+        except ValueError as e:
+            # JSON 不完整或格式错误（含UTF-8解码错误）
+            raise Exception(f"解析接口数据失败: {str(e)}")
+        except OSError as e:
+            raise Exception(f"写入缓存失败: {str(e)}")
+        finally:
+            # 出错或调用方提前停止迭代（GeneratorExit）时都删除未完成的临时文件
+            if not completed:
+                try:
+                    temp_file.unlink(missing_ok=True)
+                except OSError:
+                    pass
+
+    def _iter_cache_chunks(self, cache_file, chunk_size=65536):
+        """分块读取缓存文件"""
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def _iter_response_chunks(self, response, cache_f, chunk_size=65536):
+        """分块读取响应并同步写入缓存，按UTF-8增量解码"""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        for raw in response.iter_content(chunk_size=chunk_size):
+            if not raw:
+                continue
+            cache_f.write(raw)
+            metrics.add_bytes(len(raw))
+            yield decoder.decode(raw)
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+    def clean_text(self, text):
+        if text is None:
+            return ""
+        text = re.sub(r'\s+', ' ', text).strip()
+        text = html.unescape(text)
+        return text
+
+    def parse_html_table(self, html_content):
+        achievements = []
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html_content, 'html.parser')
+        rows = soup.find_all('tr')
+
+        for row in rows[1:]:
+            cells = row.find_all('td')
+            if len(cells) >= 5:
+                name_text = self.clean_text(cells[0].get_text(strip=True))
+                is_hidden = '隐藏成就' in name_text
+
+                if '「隐藏成就」' in name_text:
+                    name_text = name_text.replace('「隐藏成就」', '').strip()
+
+                # 从data-filter-tag属性中获取分类信息
+                filter_tag = row.get('data-filter-tag', '')
+                categories = []
+                if filter_tag:
+                    # 分割filter_tag获取分类信息
+                    tags = filter_tag.split(',')
+                    for tag in tags:
+                        if tag.startswith('合集-'):
+                            category = tag[3:]  # 去掉'合集-'前缀
+                            categories.append(category)
+                
+                # 使用合集作为第二分类
+                second_category = categories[0] if categories else self.clean_text(cells[2].get_text(strip=True))
+                
+                achievement = {
+                    '名称': name_text,
+                    '版本': self.clean_text(cells[1].get_text(strip=True)),
+                    '第一分类': '',  # 第一分类需要后续推断
+                    '第二分类': second_category,
+                    '描述': self.clean_text(cells[3].get_text(strip=True)),
+                    '奖励': self.clean_text(cells[4].get_text(strip=True)),
+                    '是否隐藏': '隐藏' if is_hidden else ''
+                }
+                achievements.append(achievement)
+        return achievements
+    
+    def parse_html_table_with_categories(self, html_content):
+                """解析包含折叠分类结构的HTML表格"""
+                achievements = []
+                from bs4 import BeautifulSoup
+                soup = BeautifulSoup(html_content, 'html.parser')
+                
+                # 查找所有的details标签
+                details_list = soup.find_all('details', class_='kr-collapse-details')
+                
+                for details in details_list:
+                    # 获取第一分类名称
+                    summary = details.find('summary', class_='kr-collapse-summary')
+                    if summary:
+                        first_category = self.clean_text(summary.get_text(strip=True))
+                    else:
+                        first_category = ''
+                    
+                    # 在details内查找表格
+                    table = details.find('table', class_='kr-table-filter')
+                    if not table:
+                        continue
+                        
+                    # 查找表格中的所有行
+                    rows = table.find_all('tr')
+                    
+                    # 跳过表头行
+                    for row in rows[1:]:
+                        cells = row.find_all('td')
+                        if len(cells) >= 5:
+                            name_text = self.clean_text(cells[0].get_text(strip=True))
+                            is_hidden = '隐藏成就' in name_text
+        
+                            if '「隐藏成就」' in name_text:
+                                name_text = name_text.replace('「隐藏成就」', '').strip()
+        
+                            # 从data-filter-tag属性中获取分类信息
+                            filter_tag = row.get('data-filter-tag', '')
+                            second_category = ''
+                            if filter_tag:
+                                # 分割filter_tag获取分类信息
+                                tags = filter_tag.split(',')
+                                for tag in tags:
+                                    if tag.startswith('合集-'):
+                                        second_category = tag[3:]  # 去掉'合集-'前缀
+                                        break
+                            
+                            # 如果没有从filter-tag获取到，使用第三列
+                            if not second_category and len(cells) > 2:
+                                second_category = self.clean_text(cells[2].get_text(strip=True))
+        
+                            achievement = {
+                                '名称': name_text,
+                                '版本': self.clean_text(cells[1].get_text(strip=True)),
+                                '第一分类': first_category,
+                                '第二分类': second_category,
+                                '描述': self.clean_text(cells[3].get_text(strip=True)),
+                                '奖励': self.clean_text(cells[4].get_text(strip=True)),
+                                '是否隐藏': '隐藏' if is_hidden else ''
+                            }
+                            achievements.append(achievement)
+                
+                return achievements
+    
+    def parse_achievements_data(self, api_data, target_version=None):
+        """解析成就数据
+
+        api_data 可以是完整的接口JSON（dict），也可以是 get_achievement_data 流式产出的HTML迭代器
+        """
+        achievements = []
+        try:
+            # 必须有target_version才进行筛选
+            if not target_version:
+                raise Exception("必须指定版本号才能爬取数据")
+
+            if isinstance(api_data, dict):
+                html_blobs = self._iter_filter_component_html(api_data)
+            else:
+                html_blobs = api_data
+
+            # 每个表格解析完立即按版本筛选，只保留目标版本的数据
+            self.progress.emit("解析成就数据...")
+            total_count = 0
+            version_filtered = []
+            for html_content in html_blobs:
+                with metrics.span("爬取：解析表格"):
+                    parsed = self.parse_html_table_with_categories(html_content)
+                total_count += len(parsed)
+                version_filtered.extend(ach for ach in parsed if ach.get('版本') == target_version)
+
+            if total_count == 0:
+                raise Exception("获取数据失败")
+
+            print(f"[DEBUG] 过滤后剩余 {total_count} 条成就数据")
+            print(f"[DEBUG] 版本 {target_version} 筛选后剩余 {len(version_filtered)} 条成就数据")
+            
+            if not version_filtered:
+                raise Exception(f"版本 {target_version} 没有找到任何成就数据")
+                
+            achievements = version_filtered
+                
+        except Exception as e:
+            raise Exception(f"解析数据失败: {str(e)}")
+
+        return achievements
+
+    def _iter_filter_component_html(self, api_data):
+        """从完整的接口JSON中提取 filter-component 的HTML"""
+        content = api_data.get('data', {}).get('content', {})
+        for module in content.get('modules', []):
+            for component in module.get('components', []):
+                if component.get('type') == 'filter-component':
+                    yield component.get('content', '')
+    
+    
+    
+    def fill_serial_numbers(self, achievements):
+            """根据分类自动填充绝对编号和编号"""
+            # 获取分类配置
+            first_categories = self.first_categories
+            second_categories = self.second_categories
+            
+            def get_sort_key(achievement):
+                """获取排序键"""
+                # 第一分类排序
+                first_cat = achievement.get('第一分类', '')
+                first_order = first_categories.get(first_cat, 999)
+
+                # 第二分类排序
+                second_cat = achievement.get('第二分类', '')
+                first_cat_second = second_categories.get(first_cat, {})
+                second_order = int(first_cat_second.get(second_cat, 999)) if second_cat in first_cat_second else 999
+
+                # 版本号排序（正序）
+                version = version_key(achievement.get('version', '0.0'))
+
+                # 原编号（用于保持相对稳定）
+                original_id = achievement.get('serial_number', '99999999')
+
+                return (first_order, second_order, version, original_id)
+            
+            # 按新规则排序
+            sorted_achievements = sorted(achievements, key=get_sort_key)
+            # 用于跟踪每个分类组合的当前序号
+            current_numbers = {}
+            
+            # 为每个成就分配编号
+            for achievement in sorted_achievements:
+                first_cat = achievement.get('第一分类', '')
+                second_cat = achievement.get('第二分类', '')
+                
+                if not first_cat or not second_cat:
+                    achievement['serial_number'] = ''
+                    continue
+                
+                # 获取第一分类
+                first_category_detail = first_cat
+                first_category = self.get_first_category(first_category_detail)
+                
+                # 获取第二分类后缀
+                suffix = self.get_second_category_suffix(first_category, second_cat)
+                
+                # 获取第一分类排序号
+                first_category_order = self.first_categories.get(first_category, 1)
+                
+                # 生成完整前缀：第一分类(1位) + 第二分类后缀(补齐到3位)
+                # 确保第二分类后缀至少3位，不足前面补0
+                suffix_padded = f"{int(suffix):03d}"
+                full_prefix = f"{first_category_order}{suffix_padded}"
+                
+                # 获取当前序号
+                category_key = (first_cat, second_cat)
+                current_num = current_numbers.get(category_key, 1)
+                
+                # 生成编号：4位分类码 + 4位序号
+                achievement['serial_number'] = f"{full_prefix}{current_num:04d}"
+                
+                # 更新序号
+                current_numbers[category_key] = current_num + 1
+            
+            return sorted_achievements
+    
+    def get_first_category(self, first_category_detail):
+        """获取第一分类，如果不存在则智能分配并添加到配置"""
+        # 如果分类已存在，直接返回
+        if first_category_detail in self.first_categories:
+            return first_category_detail
+        
+        # 为新分类分配排序号（当前最大排序号+1）
+        max_order = max(self.first_categories.values()) if self.first_categories else 0
+        new_order = max_order + 1
+        
+        # 添加新分类到配置
+        self.first_categories[first_category_detail] = new_order
+        self.second_categories[first_category_detail] = {}
+        
+        # 保存配置
+        self.save_category_config()
+        
+        return first_category_detail
+    
+    def get_second_category_suffix(self, first_category, second_category):
+        """获取第二分类后缀，如果不存在则智能分配"""
+        # 获取该第一分类下的第二分类配置
+        category_config = self.second_categories.get(first_category, {})
+        
+        # 如果已存在，返回现有后缀
+        if second_category in category_config:
+            return category_config[second_category]
+        
+        # 智能分配新后缀
+        existing_suffixes = set()
+        for suffix in category_config.values():
+            try:
+                existing_suffixes.add(int(suffix))
+            except (ValueError, TypeError):
+                pass
+        
+        # 找到最小的未使用后缀
+        new_suffix = 10
+        while new_suffix in existing_suffixes:
+            new_suffix += 10
+        
+        # 保存新配置
+        category_config[second_category] = str(new_suffix)
+        self.second_categories[first_category] = category_config
+        
+        # 保存到配置文件
+        self.save_category_config()
+        
+        return str(new_suffix)
+    
+    def save_category_config(self):
+        """保存分类配置到文件"""
+        updated_config = {
+            "first_categories": self.first_categories,
+            "second_categories": self.second_categories
+        }
+        from core.config import config
+        config.save_category_config(updated_config)
+        print("[INFO] 分类配置已保存")
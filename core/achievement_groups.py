@@ -0,0 +1,351 @@
+"""
+成就组索引模块
+维护 成就组ID -> 成员、编号 -> 成就组ID 和已完成成就组集合，获取状态或成员变化时增量更新，
+成就表格的互斥锁定/解锁、成就管理页统计和设置中的成就组管理共用同一份索引，不再各自遍历全部成就
+
+索引只跟踪创建时传入的记录列表：获取状态须通过 set_status 修改，成员须通过 add_member / remove_member 修改，
+否则计数会过期；记录列表被整体替换后需重新创建索引。只在界面线程中使用
+
+GroupEditSession 在索引之上提供设置对话框的成就组编辑会话：多次修改只在内存中进行，保存时一次写回基础数据文件
+"""
+from bisect import bisect
+
+COMPLETED = '已完成'
+UNAVAILABLE = '暂不可获取'
+INCOMPLETE = '未完成'
+
+
+def _is_incomplete(status):
+    return (status or INCOMPLETE) == INCOMPLETE
+
+
+class _GroupState:
+    """单个成就组的成员（按记录列表顺序）和成员状态计数"""
+    __slots__ = ('members', 'completed', 'unavailable', 'hidden')
+
+    def __init__(self):
+        self.members = []
+        self.completed = 0
+        self.unavailable = 0
+        self.hidden = 0
+
+
+class AchievementGroupIndex:
+    """成就组索引"""
+
+    def __init__(self, achievements=()):
+        self.achievements = achievements
+        self._groups = {}  # 成就组ID -> _GroupState
+        self._group_of = {}  # 编号 -> 成就组ID
+        self._records = {}  # 编号 -> 记录
+        self._positions = {}  # id(记录) -> 在记录列表中的位置
+        self.completed_groups = set()
+        self._unavailable_groups = set()
+        self._hidden_groups = set()
+        # 不属于成就组的记录
+        self._ungrouped = 0
+        self._ungrouped_completed = 0
+        self._ungrouped_incomplete = 0
+        self._ungrouped_unavailable = 0
+        self._ungrouped_hidden = 0
+        self.hidden_records = 0
+
+        for position, record in enumerate(achievements):
+            self._positions[id(record)] = position
+            code = record.get('编号', '')
+            if code:
+                self._records.setdefault(code, record)
+            group_id = record.get('成就组ID')
+            if group_id:
+                state = self._groups.get(group_id)
+                if state is None:
+                    state = self._groups[group_id] = _GroupState()
+                state.members.append(record)
+                if code:
+                    self._group_of[code] = group_id
+            self._count(record, group_id, 1)
+
+    # ---------- 查询 ----------
+
+    def __contains__(self, record):
+        return id(record) in self._positions
+
+    def group_ids(self):
+        return list(self._groups)
+
+    def members(self, group_id):
+        """成就组的成员（按记录列表顺序），不存在的组返回空列表"""
+        state = self._groups.get(group_id)
+        return list(state.members) if state is not None else []
+
+    def group_of(self, code):
+        return self._group_of.get(code)
+
+    def record(self, code):
+        return self._records.get(code)
+
+    def is_completed(self, group_id):
+        return group_id in self.completed_groups
+
+    def summary(self):
+        """与 calculate_manage_statistics 对完整记录列表的结果相同
+
+        成就组的状态：有成员已完成时为已完成，否则有成员暂不可获取时为暂不可获取，否则取首个成员的状态
+        """
+        incomplete = sum(1 for state in self._groups.values()
+                         if not state.completed and not state.unavailable
+                         and _is_incomplete(state.members[0].get('获取状态', '')))
+        return {
+            'total': len(self._groups) + self._ungrouped,
+            'completed': len(self.completed_groups) + self._ungrouped_completed,
+            'incomplete': incomplete + self._ungrouped_incomplete,
+            'hidden': len(self._hidden_groups) + self._ungrouped_hidden,
+            'unavailable': len(self._unavailable_groups) + self._ungrouped_unavailable,
+            'multi_choice': len(self._groups)
+        }
+
+    # ---------- 修改 ----------
+
+    def set_status(self, record, status):
+        """修改记录的获取状态并更新计数，不在索引中的记录只修改状态"""
+        if record not in self:
+            record['获取状态'] = status
+            return
+        group_id = record.get('成就组ID')
+        self._count(record, group_id, -1)
+        record['获取状态'] = status
+        self._count(record, group_id, 1)
+
+    def add_member(self, record, group_id):
+        """把记录加入成就组（已在其他组时先移出），返回是否有变化"""
+        old_group_id = record.get('成就组ID')
+        if old_group_id == group_id:
+            return False
+        self._detach(record, old_group_id)
+        record['成就组ID'] = group_id
+        self._attach(record, group_id)
+        return True
+
+    def remove_member(self, record):
+        """把记录移出所属成就组并清除互斥成就，返回是否有变化"""
+        group_id = record.get('成就组ID')
+        if not group_id:
+            return False
+        self._detach(record, group_id)
+        record.pop('成就组ID', None)
+        record.pop('互斥成就', None)
+        self._attach(record, None)
+        return True
+
+    def dissolve(self, group_id):
+        """解散成就组，返回原成员"""
+        members = self.members(group_id)
+        for record in members:
+            self.remove_member(record)
+        return members
+
+    def update_mutex(self, group_id):
+        """互斥成就 = 组内其他成员的编号，返回是否有成员的列表发生变化"""
+        members = self.members(group_id)
+        codes = [member.get('编号', '') for member in members]
+        changed = False
+        for member in members:
+            code = member.get('编号', '')
+            mutex = [other for other in codes if other != code]
+            if member.get('互斥成就') != mutex:
+                member['互斥成就'] = mutex
+                changed = True
+        return changed
+
+    # ---------- 内部 ----------
+
+    def _count(self, record, group_id, delta):
+        status = record.get('获取状态', '')
+        hidden = record.get('是否隐藏') == '隐藏'
+        if hidden:
+            self.hidden_records += delta
+
+        if not group_id:
+            self._ungrouped += delta
+            if status == COMPLETED:
+                self._ungrouped_completed += delta
+            elif status == UNAVAILABLE:
+                self._ungrouped_unavailable += delta
+            elif _is_incomplete(status):
+                self._ungrouped_incomplete += delta
+            if hidden:
+                self._ungrouped_hidden += delta
+            return
+
+        state = self._groups[group_id]
+        if status == COMPLETED:
+            state.completed += delta
+            _mark(self.completed_groups, group_id, state.completed)
+        elif status == UNAVAILABLE:
+            state.unavailable += delta
+            _mark(self._unavailable_groups, group_id, state.unavailable)
+        if hidden:
+            state.hidden += delta
+            _mark(self._hidden_groups, group_id, state.hidden)
+
+    def _attach(self, record, group_id):
+        if group_id:
+            state = self._groups.get(group_id)
+            if state is None:
+                state = self._groups[group_id] = _GroupState()
+            # 按记录列表中的位置插入，成员顺序与遍历记录列表时一致
+            positions = [self._positions.get(id(member), len(self._positions)) for member in state.members]
+            position = self._positions.get(id(record), len(self._positions))
+            state.members.insert(bisect(positions, position), record)
+            code = record.get('编号', '')
+            if code:
+                self._group_of[code] = group_id
+        self._count(record, group_id, 1)
+
+    def _detach(self, record, group_id):
+        self._count(record, group_id, -1)
+        if not group_id:
+            return
+        state = self._groups[group_id]
+        state.members = [member for member in state.members if member is not record]
+        if not state.members:
+            del self._groups[group_id]
+        code = record.get('编号', '')
+        if code and self._group_of.get(code) == group_id:
+            del self._group_of[code]
+
+
+def _mark(groups, group_id, count):
+    if count > 0:
+        groups.add(group_id)
+    else:
+        groups.discard(group_id)
+
+
+def _base_file_signature():
+    from core.base_store import base_store
+    return base_store.signature()
+
+
+class GroupEditSession:
+    """成就组编辑会话：打开时读取一次基础成就数据，成员修改只在内存中进行（互斥成就随之按组更新），
+    commit 时一次写回
+
+    会话记录每次修改；提交时若基础数据文件已被其他操作改写，则重新读取文件并按顺序重放修改后再保存，
+    重放时编号对应的成就名称已变化（文件被重新编号）的修改会被跳过
+    """
+
+    def __init__(self):
+        self.index = None
+        self.signature = None
+        self._edits = []  # [(编号, 名称, 原成就组ID, 新成就组ID)]，新成就组ID为 None 表示移出
+        self.reload()
+
+    def reload(self):
+        """丢弃未提交的修改，重新读取基础成就数据"""
+        from core.config import config
+        self.signature = _base_file_signature()
+        self.index = AchievementGroupIndex(config.load_base_achievements())
+        self._edits = []
+
+    @property
+    def achievements(self):
+        return self.index.achievements
+
+    @property
+    def has_changes(self):
+        return bool(self._edits)
+
+    def is_outdated(self):
+        """基础数据文件在会话打开后被改写"""
+        signature = _base_file_signature()
+        return signature is None or signature != self.signature
+
+    def group_ids(self):
+        return self.index.group_ids()
+
+    def members(self, group_id):
+        return self.index.members(group_id)
+
+    def add(self, group_id, codes):
+        """把成就加入成就组，已在该组中或找不到的编号跳过，返回加入的数量"""
+        added = 0
+        for code in codes:
+            if _apply_add(self.index, code, group_id):
+                self._edits.append((code, self.index.record(code).get('名称', ''), None, group_id))
+                added += 1
+        return added
+
+    def remove(self, group_id, code):
+        """把成就移出成就组，组内只剩1个成员时解散该组，返回是否有变化"""
+        if not _apply_remove(self.index, code, group_id):
+            return False
+        self._edits.append((code, self.index.record(code).get('名称', ''), group_id, None))
+        return True
+
+    def dissolve(self, group_id):
+        """解散成就组，返回是否有变化"""
+        members = self.index.members(group_id)
+        for member in members:
+            self.remove(group_id, member.get('编号', ''))
+        return bool(members)
+
+    def commit(self):
+        """写回基础成就数据，返回是否成功；失败时保留未提交的修改"""
+        from core.config import config
+        if not self._edits:
+            return True
+
+        index = self.index
+        if self.is_outdated():
+            # 文件已被改写：在最新数据上重放本次会话的修改
+            print(f"[INFO] 基础成就数据已变化，重新应用 {len(self._edits)} 项成就组修改")
+            index = AchievementGroupIndex(config.load_base_achievements())
+            for code, name, old_group_id, new_group_id in self._edits:
+                record = index.record(code)
+                if record is None or record.get('名称', '') != name:
+                    print(f"[WARNING] 成就 {code}（{name}）已不存在或编号已变化，跳过该成就组修改")
+                    continue
+                if new_group_id is None:
+                    _apply_remove(index, code, old_group_id)
+                else:
+                    _apply_add(index, code, new_group_id)
+
+        if not config.save_base_achievements(index.achievements):
+            return False
+        self.index = index
+        self.signature = _base_file_signature()
+        print(f"[SUCCESS] 已保存 {len(self._edits)} 项成就组修改")
+        self._edits = []
+        return True
+
+
+def _apply_add(index, code, group_id):
+    record = index.record(code)
+    if record is None:
+        print(f"[ERROR] 未找到编号为 {code} 的成就")
+        return False
+    old_group_id = record.get('成就组ID')
+    if not index.add_member(record, group_id):
+        return False
+    index.update_mutex(group_id)
+    if old_group_id:
+        _settle_group(index, old_group_id)
+    return True
+
+
+def _apply_remove(index, code, group_id):
+    record = index.record(code)
+    if record is None or index.group_of(code) != group_id:
+        return False
+    index.remove_member(record)
+    _settle_group(index, group_id)
+    return True
+
+
+def _settle_group(index, group_id):
+    """成员减少后：只剩1个成员时解散该组，否则更新组内互斥成就"""
+    if len(index.members(group_id)) <= 1:
+        index.dissolve(group_id)
+    else:
+        index.update_mutex(group_id)
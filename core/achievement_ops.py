@@ -0,0 +1,298 @@
+"""
+成就数据操作模块
+成就重新编码、爬取数据合并等不依赖界面的数据处理逻辑，供界面与命令行共用
+"""
+import re
+
+from core.config import config
+from core.game_version import version_key
+
+
+def load_first_category_map():
+    """加载分类配置，返回 第二分类 -> 第一分类 的映射"""
+    try:
+        category_config = config.load_category_config()
+        if not isinstance(category_config, dict):
+            print(f"[ERROR] category_config不是字典类型: {type(category_config)}")
+            category_config = {}
+        second_categories = category_config.get("second_categories", {})
+        if not isinstance(second_categories, dict):
+            second_categories = {}
+    except Exception as e:
+        print(f"[ERROR] 加载分类配置失败: {str(e)}")
+        print("[INFO] 使用默认分类配置")
+        second_categories = {}
+
+    first_category_map = {}
+    for first_cat, second_cats in second_categories.items():
+        for second_cat in second_cats:
+            first_category_map[second_cat] = first_cat
+    return first_category_map
+
+
+def load_category_orders():
+    """加载分类配置，返回 (第一分类排序, 第二分类后缀)，加载失败时为空字典"""
+    try:
+        category_config = config.load_category_config()
+        if not isinstance(category_config, dict):
+            category_config = {}
+        first_categories = category_config.get("first_categories", {})
+        second_categories = category_config.get("second_categories", {})
+    except Exception as e:
+        print(f"[ERROR] 加载分类配置失败: {str(e)}")
+        first_categories = {}
+        second_categories = {}
+    return first_categories, second_categories
+
+
+class ReencodeResult:
+    """重新编码的结果：id_map 只包含编号发生变化的成就（旧编号 -> 新编号）"""
+    __slots__ = ('achievements', 'id_map', 'renumbered', 'kept', 'abs_changed', 'changed')
+
+    def __init__(self, achievements, id_map, renumbered, kept, abs_changed, changed):
+        self.achievements = achievements
+        self.id_map = id_map
+        self.renumbered = renumbered  # 重新编号的 (第一分类, 第二分类)
+        self.kept = kept  # 编号无需变化的分类数
+        self.abs_changed = abs_changed  # 绝对编号变化的成就数
+        self.changed = changed  # 是否有任何字段被修改
+
+
+def _ordered_if_unchanged(members, prefix, class_keys):
+    """分类内的成就编号已是 前缀+1..n 且顺序与排序规则一致时，按序号返回成员，否则返回 None"""
+    if len({class_keys[id(member)] for member in members}) != 1:
+        return None
+    ordered = [None] * len(members)
+    width = len(prefix) + 4
+    for member in members:
+        code = member.get('编号', '')
+        if len(code) != width or not code.startswith(prefix) or not code[len(prefix):].isdigit():
+            return None
+        seq = int(code[len(prefix):])
+        if not 1 <= seq <= len(members) or ordered[seq - 1] is not None:
+            return None
+        ordered[seq - 1] = member
+    # 同一分类内按版本号排序，版本相同时按原编号（即序号）排序
+    versions = [version_key(member.get('版本', '0.0')) for member in ordered]
+    if any(previous > current for previous, current in zip(versions, versions[1:])):
+        return None
+    return ordered
+
+
+def reencode_achievements(achievements):
+    """按分类配置重新编码成就，只为编号前缀或顺序变化的分类重新编号
+
+    排序规则：第一分类排序、第二分类排序、版本号正序、原编号（保持相对稳定）；
+    编号为 第一分类排序(1位) + 第二分类后缀(3位) + 分类内序号(4位)，绝对编号为排序后的位置。
+    结果与对全部成就重新排序、逐个重新编号完全相同：编号已符合规则的分类保持不变，
+    绝对编号只需按分类顺序线性遍历一次
+    """
+    first_categories, second_categories = load_category_orders()
+
+    # 第二分类到第一分类的映射（补充缺失的第一分类）
+    first_category_map = {}
+    for first_cat, second_cats in second_categories.items():
+        for second_cat in second_cats:
+            first_category_map[second_cat] = first_cat
+
+    classes = {}  # (第一分类排序, 第二分类排序) -> 成就
+    class_keys = {}  # id(成就) -> 排序分组
+    original_ids = {}  # id(成就) -> 原编号
+    buckets = {}  # (第一分类, 第二分类) -> 成就
+    changed = False
+    for achievement in achievements:
+        # 排序分组按补充第一分类之前的分类计算
+        first_cat = achievement.get('第一分类', '')
+        second_cat = achievement.get('第二分类', '')
+        first_order = first_categories.get(first_cat, 999)
+        first_cat_second = second_categories.get(first_cat, {})
+        second_order = int(first_cat_second.get(second_cat, 999)) if second_cat in first_cat_second else 999
+        class_key = (first_order, second_order)
+        classes.setdefault(class_key, []).append(achievement)
+        class_keys[id(achievement)] = class_key
+        original_ids[id(achievement)] = achievement.get('编号', '99999999')
+
+        # 如果第一分类为空，根据第二分类映射自动补充
+        if not first_cat and second_cat:
+            first_cat = first_category_map.get(second_cat, '')
+            if first_cat:
+                achievement['第一分类'] = first_cat
+                changed = True
+                print(f"[INFO] 自动补充第一分类 '{first_cat}' 用于第二分类 '{second_cat}'")
+
+        if first_cat and second_cat:
+            buckets.setdefault((first_cat, second_cat), []).append(achievement)
+        elif achievement.get('编号', ''):
+            achievement['编号'] = ''
+            changed = True
+
+    # 找出编号需要变化的分类
+    prefixes = {}
+    kept = {}  # (第一分类, 第二分类) -> 按序号排列的成员
+    for category_key, members in buckets.items():
+        first_cat, second_cat = category_key
+        suffix = second_categories.get(first_cat, {}).get(second_cat, '10')
+        prefix = f"{first_categories.get(first_cat, 1)}{int(suffix):03d}"
+        prefixes[category_key] = prefix
+        ordered = _ordered_if_unchanged(members, prefix, class_keys)
+        if ordered is not None:
+            kept[category_key] = ordered
+
+    def sort_key(achievement):
+        return version_key(achievement.get('版本', '0.0')), original_ids[id(achievement)]
+
+    # 按排序分组依次遍历：编号不变的分类直接使用其序号顺序，其余分组按版本号和原编号排序
+    sorted_achievements = []
+    for class_key in sorted(classes):
+        members = classes[class_key]
+        first = members[0]
+        category_key = (first.get('第一分类', ''), first.get('第二分类', ''))
+        ordered = kept.get(category_key)
+        if ordered is not None and len(ordered) == len(members):
+            sorted_achievements.extend(ordered)
+        else:
+            sorted_achievements.extend(sorted(members, key=sort_key))
+
+    # 线性遍历一次：重新编号变化的分类并更新绝对编号
+    assigned = {}  # 旧编号 -> 新编号（存在重复编号时以排序靠后的成就为准）
+    current_numbers = {}
+    abs_changed = 0
+    for index, achievement in enumerate(sorted_achievements, start=1):
+        category_key = (achievement.get('第一分类', ''), achievement.get('第二分类', ''))
+        if category_key in prefixes:
+            old_id = achievement.get('编号', '')
+            new_id = old_id
+            if category_key not in kept:
+                current_num = current_numbers.get(category_key, 1)
+                current_numbers[category_key] = current_num + 1
+                new_id = f"{prefixes[category_key]}{current_num:04d}"
+                if old_id != new_id:
+                    achievement['编号'] = new_id
+                    changed = True
+            if old_id:
+                assigned[old_id] = new_id
+
+        abs_id = str(index)
+        if achievement.get('绝对编号') != abs_id:
+            achievement['绝对编号'] = abs_id
+            abs_changed += 1
+
+    id_map = {old_id: new_id for old_id, new_id in assigned.items() if old_id != new_id}
+
+    # 更新引用了变化编号的互斥成就
+    if id_map:
+        for achievement in sorted_achievements:
+            mutex_achievements = achievement.get('互斥成就', [])
+            if mutex_achievements and any(mutex_id in id_map for mutex_id in mutex_achievements):
+                updated_mutex = [id_map.get(mutex_id, mutex_id) for mutex_id in mutex_achievements]
+                achievement['互斥成就'] = updated_mutex
+                print(f"[INFO] 更新互斥成就: {achievement.get('名称', '')} - {mutex_achievements} -> {updated_mutex}")
+
+    renumbered = [category_key for category_key in buckets if category_key not in kept]
+    print(f"[INFO] 重新编码: {len(renumbered)} 个分类重新编号，{len(kept)} 个分类编号不变，"
+          f"{len(id_map)} 个编号变化，{abs_changed} 个绝对编号变化")
+    return ReencodeResult(sorted_achievements, id_map, renumbered, len(kept), abs_changed,
+                          changed or abs_changed > 0)
+
+
+def smart_reencode_achievements(achievements):
+    """智能重新编码成就，返回 (排序后的成就, 旧编号 -> 新编号)，映射只包含编号变化的成就"""
+    result = reencode_achievements(achievements)
+    return result.achievements, result.id_map
+
+
+def clean_description(desc):
+    """去掉描述末尾的标点符号"""
+    if not desc:
+        return desc
+    # 去掉末尾的标点符号：。，；：！？、
+    return re.sub(r'[.,…。，；：！？、]+$', '', desc).strip()
+
+
+def merge_new_achievements(current_achievements, new_achievements, reencode=True):
+    """将新爬取的成就合并到现有成就中（仅添加名称+描述不存在的成就）
+
+    返回 (合并后的成就列表, 新增的成就列表, 是否新增了分类)
+    新分类会自动分配排序/后缀并保存到分类配置；reencode 为 False 时不重新编号，
+    由调用方通过 config.reencode_all_user_progress 统一重新编码基础数据和用户存档
+    """
+    # 创建名称+描述的组合键，用于精确判断重复
+    current_achievements_keys = set()
+    for a in current_achievements:
+        key = (a.get('名称', ''), clean_description(a.get('描述', '')))
+        current_achievements_keys.add(key)
+
+    # 仅筛选出不存在的成就进行添加
+    to_add = []
+    for achievement in new_achievements:
+        key = (achievement.get('名称', ''), clean_description(achievement.get('描述', '')))
+        if key not in current_achievements_keys:
+            to_add.append(achievement)
+
+    if not to_add:
+        return list(current_achievements), [], False
+
+    # 获取分类配置
+    category_config = config.load_category_config()
+    first_categories = category_config.get("first_categories", {})
+    second_categories = category_config.get("second_categories", {})
+
+    # 复制一份配置用于更新
+    updated_first_categories = first_categories.copy()
+    updated_second_categories = {}
+    for key, value in second_categories.items():
+        updated_second_categories[key] = value.copy()
+
+    # 标记是否有新的分类需要保存
+    has_new_categories = False
+
+    # 检查新成就中是否有新的分类
+    for achievement in to_add:
+        first_cat = achievement.get('第一分类', '')
+        second_cat = achievement.get('第二分类', '')
+
+        if first_cat and second_cat:
+            # 智能处理第一分类（如果不存在则分配新排序）
+            if first_cat not in updated_first_categories:
+                max_order = max(updated_first_categories.values()) if updated_first_categories else 0
+                updated_first_categories[first_cat] = max_order + 1
+                updated_second_categories[first_cat] = {}
+                has_new_categories = True
+                print(f"[INFO] 发现新第一分类 '{first_cat}'，分配排序: {max_order + 1}")
+
+            # 智能处理第二分类（如果不存在则分配新后缀）
+            if first_cat not in updated_second_categories:
+                updated_second_categories[first_cat] = {}
+
+            if second_cat not in updated_second_categories[first_cat]:
+                # 找到该第一分类下最小的未使用后缀
+                existing_suffixes = set()
+                for suffix in updated_second_categories[first_cat].values():
+                    try:
+                        existing_suffixes.add(int(suffix))
+                    except (ValueError, TypeError):
+                        pass
+
+                new_suffix = 10
+                while new_suffix in existing_suffixes:
+                    new_suffix += 10
+
+                updated_second_categories[first_cat][second_cat] = str(new_suffix)
+                has_new_categories = True
+                print(f"[INFO] 发现新第二分类 '{first_cat} - {second_cat}'，分配后缀: {new_suffix}")
+
+    # 先保存新的分类配置（如果有新分类），重新编码时需要使用
+    if has_new_categories:
+        updated_config = {
+            "first_categories": updated_first_categories,
+            "second_categories": updated_second_categories
+        }
+        config.save_category_config(updated_config)
+        print("[INFO] 已更新分类配置，新增的分类已自动分配排序和后缀")
+
+    # 合并数据：现有成就 + 新增的成就，并重新生成编号和绝对编号
+    all_achievements = list(current_achievements) + to_add
+    if reencode:
+        all_achievements, _ = smart_reencode_achievements(all_achievements)
+
+    return all_achievements, to_add, has_new_categories
@@ -0,0 +1,184 @@
+"""
+成就记录模块
+内存中的成就记录使用带 __slots__ 的 Achievement 类代替中文键字典：
+版本、分类、奖励等大量重复的字符串驻留为同一对象，获取状态和是否隐藏按枚举编号存储
+
+Achievement 实现了字典的读写接口（get / [] / in / items / copy 等），按字段名访问的现有代码无需修改；
+读写JSON时通过 Achievement.from_dict / to_dict 显式转换
+"""
+import sys
+from collections.abc import MutableMapping
+
+# 字段名 -> 属性名（按基础数据文件中的字段顺序，迭代记录时也按此顺序）
+FIELD_SLOTS = {
+    '绝对编号': 'absolute_id',
+    '版本': 'version',
+    '第一分类': 'first_category',
+    '第二分类': 'second_category',
+    '编号': 'code',
+    '名称': 'name',
+    '描述': 'description',
+    '奖励': 'reward',
+    '是否隐藏': 'hidden',
+    '获取状态': 'status',
+    '成就组ID': 'group_id',
+    '互斥成就': 'exclusive_ids',
+    'is_hidden': 'is_hidden',
+}
+
+# 取值重复度高的字段，驻留后所有记录共享同一个字符串对象
+INTERNED_FIELDS = frozenset(('版本', '第一分类', '第二分类', '奖励'))
+
+# 枚举编码的字段：存储取值在元组中的下标，不在元组中的取值按原样保存
+STATUS_VALUES = ('', '未完成', '已完成', '暂不可获取')
+HIDDEN_VALUES = ('', '隐藏')
+_CODED_FIELDS = {'获取状态': STATUS_VALUES, '是否隐藏': HIDDEN_VALUES}
+_CODES = {field: {value: code for code, value in enumerate(values)} for field, values in _CODED_FIELDS.items()}
+
+_MISSING = object()
+_SLOT_NAMES = tuple(FIELD_SLOTS.values())
+_FIELD_ITEMS = tuple(FIELD_SLOTS.items())
+
+
+def _encode(field, value):
+    if type(value) is str:
+        codes = _CODES.get(field)
+        if codes is not None:
+            return codes.get(value, value)
+        if field in INTERNED_FIELDS:
+            return sys.intern(value)
+    return value
+
+
+def _decode(field, value):
+    if type(value) is int and field in _CODED_FIELDS:
+        return _CODED_FIELDS[field][value]
+    return value
+
+
+class Achievement(MutableMapping):
+    """成就记录，未设置的字段视为不存在；FIELD_SLOTS 以外的字段保存在附加字典中"""
+    __slots__ = _SLOT_NAMES + ('_extra',)
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls.__new__(cls)
+        for field, value in data.items():
+            encoder = _ENCODERS.get(field)
+            if encoder is None:
+                record[field] = value
+                continue
+            setter, codes, interned = encoder
+            if type(value) is str:
+                if codes is not None:
+                    value = codes.get(value, value)
+                elif interned:
+                    value = sys.intern(value)
+            setter(record, value)
+        return record
+
+    def to_dict(self):
+        return {field: self[field] for field in self}
+
+    def __getitem__(self, field):
+        slot = FIELD_SLOTS.get(field)
+        if slot is None:
+            extra = getattr(self, '_extra', None)
+            if extra is None:
+                raise KeyError(field)
+            return extra[field]
+        value = getattr(self, slot, _MISSING)
+        if value is _MISSING:
+            raise KeyError(field)
+        return _decode(field, value)
+
+    def get(self, field, default=None):
+        slot = FIELD_SLOTS.get(field)
+        if slot is None:
+            extra = getattr(self, '_extra', None)
+            return default if extra is None else extra.get(field, default)
+        value = getattr(self, slot, _MISSING)
+        return default if value is _MISSING else _decode(field, value)
+
+    def __setitem__(self, field, value):
+        slot = FIELD_SLOTS.get(field)
+        if slot is None:
+            extra = getattr(self, '_extra', None)
+            if extra is None:
+                self._extra = extra = {}
+            extra[field] = value
+        else:
+            setattr(self, slot, _encode(field, value))
+
+    def __delitem__(self, field):
+        slot = FIELD_SLOTS.get(field)
+        try:
+            if slot is None:
+                del self._extra[field]
+            else:
+                delattr(self, slot)
+        except (AttributeError, TypeError):
+            raise KeyError(field) from None
+
+    def __contains__(self, field):
+        slot = FIELD_SLOTS.get(field)
+        if slot is None:
+            extra = getattr(self, '_extra', None)
+            return extra is not None and field in extra
+        return hasattr(self, slot)
+
+    def __iter__(self):
+        for field, slot in _FIELD_ITEMS:
+            if hasattr(self, slot):
+                yield field
+        extra = getattr(self, '_extra', None)
+        if extra:
+            yield from extra
+
+    def __len__(self):
+        extra = getattr(self, '_extra', None)
+        return sum(1 for slot in _SLOT_NAMES if hasattr(self, slot)) + (len(extra) if extra else 0)
+
+    def copy(self):
+        """浅拷贝（与 dict.copy 相同，互斥成就等列表不复制）"""
+        record = Achievement.__new__(Achievement)
+        for slot in _SLOT_NAMES:
+            value = getattr(self, slot, _MISSING)
+            if value is not _MISSING:
+                setattr(record, slot, value)
+        extra = getattr(self, '_extra', None)
+        if extra:
+            record._extra = extra.copy()
+        return record
+
+    def __repr__(self):
+        return f"Achievement({self.to_dict()!r})"
+
+
+# 字段名 -> (属性描述符的赋值方法, 枚举编码表, 是否驻留)，批量构建记录时跳过 __setitem__ 的查找
+_ENCODERS = {field: (getattr(Achievement, slot).__set__, _CODES.get(field), field in INTERNED_FIELDS)
+             for field, slot in FIELD_SLOTS.items()}
+
+
+def records_from_columns(fields, columns, count, missing):
+    """按列批量构建记录，列中值为 missing 表示该记录缺少此字段"""
+    records = [Achievement.__new__(Achievement) for _ in range(count)]
+    for field, column in zip(fields, columns):
+        encoder = _ENCODERS.get(field)
+        if encoder is None:
+            for record, value in zip(records, column):
+                if value is not missing:
+                    record[field] = value
+            continue
+        setter, codes, interned = encoder
+        if codes is not None or interned:
+            # 列中相同的字符串只编码一次
+            encoded = {}
+            for value in column:
+                if type(value) is str and value not in encoded:
+                    encoded[value] = _encode(field, value)
+            column = [encoded.get(value, value) if type(value) is str else value for value in column]
+        for record, value in zip(records, column):
+            if value is not missing:
+                setter(record, value)
+    return records
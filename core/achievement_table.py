@@ -3,6 +3,7 @@ from PySide6.QtWidgets import QTableWidget, QTableWidgetItem, QComboBox, QStyled
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QColor
 from core.styles import BaseStyles
+from core.instrumentation import metrics
 
 
 class CustomComboBox(QComboBox):
@@ -137,6 +138,7 @@ class AchievementTable(QTableWidget):
         self.long_press_timer.setSingleShot(True)
         self.long_press_timer.timeout.connect(self.on_long_press)
         self.pressed_row = -1
+        self._rows = {}  # id(成就) -> 行号
         
         # 加载分类配置
         self.load_category_config()
@@ -213,10 +215,19 @@ class AchievementTable(QTableWidget):
         self.second_category_delegate = ComboBoxDelegate([], self)
         self.setItemDelegateForColumn(7, self.second_category_delegate)  # 第二分类列
         
+    @metrics.timed("加载成就表格")
     def load_data(self, achievements):
         """加载数据"""
         self.setRowCount(len(achievements))
         self.achievements = achievements  # 保存数据引用
+        self._rows = {id(achievement): row for row, achievement in enumerate(achievements)}
+        
+        # 表格的行来自成就管理器的记录，确保共享的成就组索引包含这些行
+        manager = self._find_manager()
+        if manager is not None:
+            missing = manager.sync_groups(achievements)
+            if missing:
+                print(f"[ERROR] 表格中有 {missing} 条成就不属于成就管理器的数据，修改其状态时不会更新成就组")
         
         for row, achievement in enumerate(achievements):
             # 状态
@@ -333,7 +344,8 @@ class AchievementTable(QTableWidget):
                 
                 # 更新数据
                 if 0 <= self.pressed_row < len(self.achievements):
-                    self.achievements[self.pressed_row]['获取状态'] = '暂不可获取'
+                    achievement = self.achievements[self.pressed_row]
+                    self._get_group_index(achievement).set_status(achievement, '暂不可获取')
                     # 立即保存数据（兼容不同的父组件）
                     parent = self.parent()
                     if hasattr(parent, 'save_local_data'):
@@ -484,7 +496,7 @@ class AchievementTable(QTableWidget):
                 # 立即更新数据
                 if 0 <= row < len(self.achievements):
                     achievement = self.achievements[row]
-                    achievement['获取状态'] = new_status
+                    self._get_group_index(achievement).set_status(achievement, new_status)
                     
                     # 成就组逻辑处理
                     if new_status == '已完成':
@@ -696,6 +708,31 @@ class AchievementTable(QTableWidget):
         # 确保编辑完成后立即保存
         self.clearSelection()
         
+    def _find_manager(self):
+        """所在成就管理页的成就管理器，尚未放入成就管理页时返回 None"""
+        parent = self.parent()
+        while parent and not hasattr(parent, 'manager'):
+            parent = parent.parent()
+        return parent.manager if parent else None
+
+    def _get_group_index(self, achievement):
+        """成就管理页共享的成就组索引（加载表格时已与表格的行同步）"""
+        manager = self._find_manager()
+        if manager is None:
+            raise RuntimeError("成就表格不在成就管理页中，无法获取成就组索引")
+        group_index = manager.groups
+        if achievement not in group_index:
+            print(f"[ERROR] 成就 {achievement.get('名称', '')} 不在成就组索引中，只修改其获取状态")
+        return group_index
+
+    def _set_row_status(self, achievement, status, color):
+        """更新成就所在行的状态显示（成就不在当前表格中时跳过）"""
+        row = self._rows.get(id(achievement))
+        status_item = self.item(row, 0) if row is not None else None
+        if status_item:
+            status_item.setText(status)
+            status_item.setForeground(color)
+
     def _handle_achievement_group_completion(self, completed_row, completed_achievement):
         """处理成就组完成逻辑"""
         group_id = completed_achievement.get('成就组ID')
@@ -706,31 +743,22 @@ class AchievementTable(QTableWidget):
         if not mutex_achievements:
             return
         
-        completed_code = completed_achievement.get('编号', '')
-        
-        # 锁定同组其他成就
-        for i, achievement in enumerate(self.achievements):
-            if i == completed_row:
+        # 锁定同组其他成就（包括被筛选掉、不在表格中的成员）
+        group_index = self._get_group_index(completed_achievement)
+        for achievement in group_index.members(group_id):
+            if achievement is completed_achievement:
                 continue  # 跳过已完成的成就
             
-            achievement_code = achievement.get('编号', '')
-            if achievement_code in mutex_achievements:
+            if achievement.get('编号', '') in mutex_achievements:
                 # 设置为已占用状态
-                achievement['获取状态'] = '已占用'
-                
-                # 更新表格显示
-                status_item = self.item(i, 0)
-                if status_item:
-                    status_item.setText('已占用')
-                    status_item.setForeground(QColor(255, 69, 0))  # 红橙色
-                
+                group_index.set_status(achievement, '已占用')
+                self._set_row_status(achievement, '已占用', QColor(255, 69, 0))  # 红橙色
                 print(f"[INFO] 成就组 {group_id}：已占用成就 {achievement.get('名称', '')}")
         
-                # 强制重绘
-                self.viewport().update()
-                self.update()
-                # 即时刷新统计信息
-                self._refresh_statistics()
+        # 强制重绘
+        self.viewport().update()
+        # 即时刷新统计信息
+        self._refresh_statistics()
         
     def _unlock_group_achievements(self, unlocked_achievement):
         """解锁同组其他成就 - 将同组所有成就都设为未完成"""
@@ -738,28 +766,18 @@ class AchievementTable(QTableWidget):
         if not group_id:
             return
         
-        unlocked_code = unlocked_achievement.get('编号', '')
-        
         # 将同组所有成就都设为未完成状态
-        for i, achievement in enumerate(self.achievements):
-            if achievement.get('成就组ID') == group_id:
-                achievement_code = achievement.get('编号', '')
-                if achievement_code != unlocked_code:  # 跳过当前成就
-                    # 不管当前状态是什么，都设置为未完成
-                    old_status = achievement.get('获取状态', '')
-                    achievement['获取状态'] = '未完成'
-                    
-                    # 更新表格显示
-                    status_item = self.item(i, 0)
-                    if status_item:
-                        status_item.setText('未完成')
-                        status_item.setForeground(QColor(128, 128, 128))  # 灰色
-                    
-                    print(f"[INFO] 成就组 {group_id}：成就 {achievement.get('名称', '')} 从 {old_status} 变为未完成")
+        group_index = self._get_group_index(unlocked_achievement)
+        for achievement in group_index.members(group_id):
+            if achievement is not unlocked_achievement:  # 跳过当前成就
+                # 不管当前状态是什么，都设置为未完成
+                old_status = achievement.get('获取状态', '')
+                group_index.set_status(achievement, '未完成')
+                self._set_row_status(achievement, '未完成', QColor(128, 128, 128))  # 灰色
+                print(f"[INFO] 成就组 {group_id}：成就 {achievement.get('名称', '')} 从 {old_status} 变为未完成")
         
         # 强制重绘
         self.viewport().update()
-        self.update()
         
         # 即时刷新统计信息
         self._refresh_statistics()
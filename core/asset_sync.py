@@ -0,0 +1,377 @@
+"""
+头像与角色肖像资源同步模块
+从库街区wiki角色列表获取头像、肖像图，有界并发下载（支持断点续传、按内容哈希去重），
+并在下载时生成预缩放的变体：头像选择器的60px头像、主界面的100px头像、500px肖像图
+
+变体写入图片服务的磁盘缩略图缓存（core.image_service），尺寸和缩放方式与界面请求的一致，
+界面解码时直接命中；缩略图自身记录原图签名，原图被替换后重新生成
+
+资源清单（resources/asset_manifest.json）：
+    files     {"类型/文件名": {"url", "sha256", "size"}}，下载的原图
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from core.config import get_resource_path
+
+# 库街区wiki接口
+DEFAULT_API_BASE = "https://api.kurobbs.com"
+CATALOGUE_PAGE_PATH = "/wiki/core/catalogue/item/getPage"
+
+# 角色头像列表（sid=1363）与角色列表（sid=1105），与 resources 说明文件中的链接一致
+AVATAR_CATALOGUE_ID = "1363"
+PORTRAIT_CATALOGUE_ID = "1105"
+
+# 预缩放变体：名称 -> (尺寸, 缩放方式)，与界面向图片服务请求的尺寸一致
+THUMBNAIL_VARIANTS = {
+    "avatar_60": (60, "cover"),     # 头像选择器中的圆形头像（显示时裁剪为圆形）
+    "avatar_100": (100, "cover"),   # 主界面的当前用户头像
+    "portrait_500": (500, "fit")    # 主界面角色肖像
+}
+
+# 各类资源生成的变体
+ASSET_KINDS = {
+    "profile": {"catalogue_id": AVATAR_CATALOGUE_ID, "suffix": ".png", "variants": ("avatar_60", "avatar_100")},
+    "characters": {"catalogue_id": PORTRAIT_CATALOGUE_ID, "suffix": ".webp", "variants": ("portrait_500",)}
+}
+
+CHUNK_SIZE = 65536
+
+# 资源名称中不允许出现的字符（路径分隔符、Windows 文件名保留字符和控制字符）
+_UNSAFE_NAME_RE = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+def safe_asset_name(name):
+    """列表中的名称可以直接用作文件名时返回去掉首尾空白的名称，否则返回 None，避免写到资源目录之外"""
+    name = (name or '').strip()
+    if not name or _UNSAFE_NAME_RE.search(name) or not name.strip('.'):
+        return None
+    return name
+
+
+def _content_range(response):
+    """解析 Content-Range 响应头，返回 (起始位置, 总大小)，无法解析的部分为 None"""
+    match = re.match(r'bytes (?:(\d+)-\d+|\*)/(\d+|\*)', response.headers.get('Content-Range', ''))
+    if not match:
+        return None, None
+    start, total = match.groups()
+    return (int(start) if start else None), (int(total) if total != '*' else None)
+
+
+def _thumbnail_cache_dir(resources_dir=None):
+    return (resources_dir or get_resource_path("resources")) / "cache" / "thumbnails"
+
+
+def get_thumbnail_path(variant, source_path, resources_dir=None):
+    """获取原图预缩放变体的路径，变体不存在或不是由当前原图生成时返回None"""
+    from PySide6.QtCore import QSize
+    from core.image_service import thumbnail_cache_path, is_thumbnail_current
+
+    size, mode = THUMBNAIL_VARIANTS[variant]
+    path = thumbnail_cache_path(source_path, QSize(size, size), mode, _thumbnail_cache_dir(resources_dir))
+    return path if is_thumbnail_current(path, source_path) else None
+
+
+def generate_variants(kind, source_path, resources_dir=None, same_as=None):
+    """生成原图缺失或过期的预缩放变体，返回重新生成的数量
+
+    same_as 为内容相同的另一张原图，直接复用它已生成的变体，避免重复解码
+    """
+    from PySide6.QtCore import QSize
+    from core.image_service import ensure_thumbnail
+
+    generated = 0
+    for variant in ASSET_KINDS[kind]["variants"]:
+        size, mode = THUMBNAIL_VARIANTS[variant]
+        if ensure_thumbnail(source_path, QSize(size, size), mode, _thumbnail_cache_dir(resources_dir), same_as):
+            generated += 1
+    return generated
+
+
+def file_sha256(path):
+    """分块计算文件的 SHA-256"""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def load_manifest(resources_dir=None):
+    """加载资源清单"""
+    manifest_file = (resources_dir or get_resource_path("resources")) / "asset_manifest.json"
+    if manifest_file.exists():
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            manifest.setdefault("files", {})
+            # 旧版清单记录的变体签名已由缩略图自身记录
+            manifest.pop("variants", None)
+            return manifest
+        except Exception as e:
+            print(f"[WARNING] 读取资源清单失败: {e}")
+    return {"files": {}}
+
+
+def save_manifest(manifest, resources_dir=None):
+    """原子写入资源清单"""
+    manifest_file = (resources_dir or get_resource_path("resources")) / "asset_manifest.json"
+    temp_file = manifest_file.with_name(manifest_file.name + ".tmp")
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(temp_file, manifest_file)
+
+
+class AssetSyncer:
+    """资源同步器
+
+    api_base 可指向本地替身服务器，resources_dir 可指向临时目录，便于离线调试
+    """
+
+    def __init__(self, api_base=DEFAULT_API_BASE, max_workers=4, timeout=30, progress_callback=None,
+                 resources_dir=None):
+        self.api_base = api_base.rstrip("/")
+        self.max_workers = max(1, int(max_workers))
+        self.timeout = timeout
+        self.progress_callback = progress_callback
+        self.resources_dir = resources_dir or get_resource_path("resources")
+        self.manifest = load_manifest(self.resources_dir)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _emit(self, message):
+        print(f"[INFO] {message}")
+        if self.progress_callback:
+            try:
+                self.progress_callback(message)
+            except Exception as e:
+                print(f"[WARNING] 进度回调失败: {e}")
+
+    def _session(self):
+        """每个下载线程使用独立的Session"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                'Origin': 'https://wiki.kurobbs.com',
+                'Referer': 'https://wiki.kurobbs.com/',
+                'wiki_type': '9'
+            })
+            self._local.session = session
+        return session
+
+    def fetch_catalogue(self, catalogue_id):
+        """获取wiki列表页的条目，返回 [(名称, 图片URL), ...]"""
+        url = f"{self.api_base}{CATALOGUE_PAGE_PATH}"
+        data = {'catalogueId': catalogue_id, 'page': 1, 'limit': 1000}
+        response = self._session().post(url, data=data, timeout=self.timeout)
+        response.raise_for_status()
+        payload = response.json()
+
+        body = payload.get('data') or {}
+        results = body.get('results') if isinstance(body.get('results'), dict) else body
+        records = results.get('records', []) if isinstance(results, dict) else []
+
+        entries = []
+        for record in records:
+            name = safe_asset_name(record.get('name'))
+            content = record.get('content') or {}
+            image_url = content.get('contentUrl') if isinstance(content, dict) else None
+            image_url = image_url or record.get('contentUrl') or record.get('icon')
+            if name is None:
+                if record.get('name'):
+                    print(f"[WARNING] 跳过名称不能用作文件名的条目: {record.get('name')!r}")
+                continue
+            if image_url:
+                entries.append((name, image_url))
+        return entries
+
+    def _download(self, url, target_path):
+        """断点续传下载到 .part 文件，完成后返回 (临时文件, sha256)
+
+        .part 旁的 .part.url 记录下载地址，地址变化时丢弃旧的 .part 从头下载；
+        下载结束后按响应声明的总大小校验，不完整时删除 .part 并抛出异常，不会替换正式文件
+        """
+        part_path = target_path.with_name(target_path.name + ".part")
+        url_path = part_path.with_name(part_path.name + ".url")
+        part_path.parent.mkdir(parents=True, exist_ok=True)
+        existing = part_path.stat().st_size if part_path.exists() else 0
+        if existing:
+            try:
+                same_url = url_path.read_text(encoding='utf-8') == url
+            except OSError:
+                same_url = False
+            if not same_url:
+                part_path.unlink()
+                existing = 0
+        url_path.write_text(url, encoding='utf-8')
+
+        headers = {'Range': f"bytes={existing}-"} if existing else {}
+        hasher = hashlib.sha256()
+        with self._session().get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 416 and existing:
+                # 服务器认为已完整下载，只有声明的总大小与 .part 一致时才采用
+                mode = None
+                total = _content_range(response)[1]
+            elif response.status_code == 206 and existing:
+                start, total = _content_range(response)
+                if start != existing:
+                    raise IOError(f"断点续传的起始位置不一致: {url}")
+                mode = 'ab'
+            else:
+                response.raise_for_status()
+                mode = 'wb'
+                length = response.headers.get('Content-Length')
+                # 压缩传输时 Content-Length 是压缩后的大小，无法用于校验
+                encoded = response.headers.get('Content-Encoding', 'identity') != 'identity'
+                total = int(length) if length and length.isdigit() and not encoded else None
+
+            if mode != 'wb':
+                with open(part_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                        hasher.update(chunk)
+
+            if mode is not None:
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        if chunk:
+                            f.write(chunk)
+                            hasher.update(chunk)
+
+        size = part_path.stat().st_size
+        if (total is not None and size != total) or (mode is None and total is None):
+            part_path.unlink()
+            url_path.unlink(missing_ok=True)
+            if mode is None:
+                # 无法确认 .part 是否完整，从头重新下载
+                return self._download(url, target_path)
+            raise IOError(f"下载不完整: {url}（{size}/{total} 字节）")
+        url_path.unlink(missing_ok=True)
+        return part_path, hasher.hexdigest()
+
+    def _sync_one(self, kind, name, url, hash_index):
+        """同步单个资源，返回结果状态"""
+        spec = ASSET_KINDS[kind]
+        if safe_asset_name(name) != name:
+            raise ValueError(f"资源名称不能用作文件名: {name!r}")
+        target_path = self.resources_dir / kind / f"{name}{spec['suffix']}"
+        manifest_key = f"{kind}/{target_path.name}"
+
+        with self._lock:
+            record = dict(self.manifest["files"].get(manifest_key, {}))
+
+        # URL未变化且文件仍在：无需下载，只重新生成原图已被替换的变体
+        if record.get("url") == url and target_path.exists():
+            return "variants" if generate_variants(kind, target_path, self.resources_dir) else "skipped"
+
+        part_path, digest = self._download(url, target_path)
+
+        if record.get("sha256") == digest and target_path.exists():
+            # 内容未变化，仅更新来源URL；本地文件可能已被手动替换，变体按实际文件检查
+            part_path.unlink()
+            status = "unchanged"
+        else:
+            os.replace(part_path, target_path)
+            status = "downloaded"
+
+        with self._lock:
+            duplicate_of = hash_index.get((kind, digest))
+            if duplicate_of is None:
+                hash_index[(kind, digest)] = name
+
+        # 只有刚下载的文件确定与哈希对应；未变化时本地文件可能已被手动替换
+        same_as = None
+        if duplicate_of and duplicate_of != name and status == "downloaded":
+            same_as = self.resources_dir / kind / f"{duplicate_of}{spec['suffix']}"
+        generate_variants(kind, target_path, self.resources_dir, same_as)
+
+        if duplicate_of and duplicate_of != name and status == "downloaded":
+            status = "deduped"
+
+        with self._lock:
+            self.manifest["files"][manifest_key] = {
+                "url": url,
+                "sha256": digest,
+                "size": target_path.stat().st_size
+            }
+        return status
+
+    def sync(self, kinds=("profile", "characters")):
+        """同步资源，返回汇总信息"""
+        summary = {"downloaded": 0, "unchanged": 0, "skipped": 0, "deduped": 0,
+                   "variants": 0, "failed": 0, "errors": []}
+
+        # 已有文件的哈希索引，用于内容去重
+        hash_index = {}
+        for key, record in self.manifest["files"].items():
+            kind, _, filename = key.partition("/")
+            if record.get("sha256"):
+                hash_index.setdefault((kind, record["sha256"]), os.path.splitext(filename)[0])
+
+        tasks = []
+        for kind in kinds:
+            spec = ASSET_KINDS[kind]
+            self._emit(f"正在获取资源列表: {kind}")
+            try:
+                entries = self.fetch_catalogue(spec["catalogue_id"])
+            except Exception as e:
+                print(f"[ERROR] 获取资源列表失败({kind}): {e}")
+                summary["failed"] += 1
+                summary["errors"].append({"kind": kind, "error": str(e)})
+                continue
+            self._emit(f"{kind} 共 {len(entries)} 个条目")
+            tasks.extend((kind, name, url) for name, url in entries)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._sync_one, kind, name, url, hash_index): (kind, name)
+                       for kind, name, url in tasks}
+            for index, future in enumerate(as_completed(futures), 1):
+                kind, name = futures[future]
+                try:
+                    status = future.result()
+                    summary[status] += 1
+                except Exception as e:
+                    print(f"[ERROR] 同步资源失败 {kind}/{name}: {e}")
+                    summary["failed"] += 1
+                    summary["errors"].append({"kind": kind, "name": name, "error": str(e)})
+                if index % 10 == 0 or index == len(futures):
+                    self._emit(f"资源同步进度: {index}/{len(futures)}")
+
+        try:
+            save_manifest(self.manifest, self.resources_dir)
+        except Exception as e:
+            print(f"[ERROR] 保存资源清单失败: {e}")
+
+        print(f"[SUCCESS] 资源同步完成: 下载{summary['downloaded']} 去重{summary['deduped']} "
+              f"未变化{summary['unchanged']} 跳过{summary['skipped']} 失败{summary['failed']}")
+        return summary
+
+
+def build_local_thumbnails(resources_dir=None):
+    """为手动放入或替换的头像/肖像生成缺失或过期的预缩放变体，返回生成数量"""
+    resources_dir = resources_dir or get_resource_path("resources")
+    generated = 0
+    for kind in ASSET_KINDS:
+        kind_dir = resources_dir / kind
+        if not kind_dir.exists():
+            continue
+        for source_path in kind_dir.iterdir():
+            if source_path.suffix.lower() not in (".png", ".webp"):
+                continue
+            try:
+                generated += generate_variants(kind, source_path, resources_dir)
+            except Exception as e:
+                print(f"[WARNING] 生成缩略图失败 {source_path.name}: {e}")
+    print(f"[INFO] 已生成 {generated} 个缩略图")
+    return generated
+
+
+def sync_assets(api_base=DEFAULT_API_BASE, max_workers=4, progress_callback=None):
+    """同步头像与角色肖像资源"""
+    return AssetSyncer(api_base, max_workers, progress_callback=progress_callback).sync()
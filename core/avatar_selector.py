@@ -1,116 +1,138 @@
-﻿import os
-from PySide6.QtWidgets import (QWidget, QMainWindow, QVBoxLayout, QLabel,
-                               QScrollArea, QGridLayout, QFrame)
-from PySide6.QtCore import Qt, Signal, QTimer
-from PySide6.QtGui import QPixmap, QPainter, QMouseEvent, QPainterPath
+﻿from PySide6.QtWidgets import QWidget, QMainWindow, QVBoxLayout, QListView, QFrame
+from PySide6.QtCore import Qt, Signal, QSize, QAbstractListModel, QModelIndex
+from PySide6.QtGui import QPixmap, QPainter, QPainterPath, QColor
 
 from core.config import config, get_resource_path
 from core.signal_bus import signal_bus
+from core.image_service import image_service, COVER
 from core.widgets import BackgroundWidget, load_background_image
 from core.custom_title_bar import CustomTitleBar
-from core.styles import get_dialog_style, get_scroll_area_style, get_label_style
+from core.styles import get_dialog_style, get_avatar_grid_style
 
 
-class AvatarItem(QWidget):
-    """单个头像项"""
-    clicked = Signal(str, str)  # 信号：头像路径，头像名称
-    
-    def __init__(self, avatar_path, avatar_name):
-        super().__init__()
-        self.avatar_path = avatar_path
-        self.avatar_name = avatar_name
-        self.is_selected = False
-        self.init_ui()
-    
-    def init_ui(self):
-        """初始化UI"""
-        layout = QVBoxLayout(self)
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.setSpacing(5)
-        
-        # 头像容器（圆形）
-        self.avatar_container = QLabel()
-        self.avatar_container.setFixedSize(70, 70)
-        self.avatar_container.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.avatar_container.setCursor(Qt.CursorShape.PointingHandCursor)
-        
-        # 继承主窗口样式，不设置额外样式
-        
-        # 加载头像图片
-        self.load_avatar()
-        
-        # 头像名称标签
-        name_label = QLabel(self.avatar_name)
-        name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        name_label.setMaximumWidth(80)
-        name_label.setWordWrap(True)
-        name_label.setStyleSheet(get_label_style(config.theme))
-        
+# 头像显示直径和网格单元尺寸
+AVATAR_DIAMETER = 60
+GRID_CELL_SIZE = QSize(105, 100)
 
-        
-        layout.addWidget(self.avatar_container)
-        layout.addWidget(name_label)
 
-    
-    def load_avatar(self):
-        """加载头像图片"""
-        if os.path.exists(self.avatar_path):
-            pixmap = QPixmap(self.avatar_path)
-            if not pixmap.isNull():
-                # 创建圆形头像
-                circular_pixmap = self.create_circular_pixmap(pixmap, 60)
-                self.avatar_container.setPixmap(circular_pixmap)
+def create_circular_pixmap(pixmap, diameter):
+    """创建圆形图片"""
+    circular_pixmap = QPixmap(diameter, diameter)
+    circular_pixmap.fill(Qt.GlobalColor.transparent)
 
-    def create_circular_pixmap(self, pixmap, diameter):
-        """创建圆形图片"""
-        circular_pixmap = QPixmap(diameter, diameter)
-        circular_pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(circular_pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        painter = QPainter(circular_pixmap)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    # 创建圆形路径 - 使用 QPainterPath
+    path = QPainterPath()
+    path.addEllipse(0, 0, diameter, diameter)
 
-        # 创建圆形路径 - 使用 QPainterPath
-        path = QPainterPath()
-        path.addEllipse(0, 0, diameter, diameter)
+    painter.setClipPath(path)
 
-        painter.setClipPath(path)
+    # 缩放并居中图片
+    scaled_pixmap = pixmap.scaled(
+        diameter, diameter,
+        Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+        Qt.TransformationMode.SmoothTransformation
+    )
 
-        # 缩放并居中图片
-        scaled_pixmap = pixmap.scaled(
-            diameter, diameter,
-            Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-            Qt.TransformationMode.SmoothTransformation
-        )
+    # 计算居中位置
+    x = (diameter - scaled_pixmap.width()) // 2
+    y = (diameter - scaled_pixmap.height()) // 2
 
-        # 计算居中位置
-        x = (diameter - scaled_pixmap.width()) // 2
-        y = (diameter - scaled_pixmap.height()) // 2
+    painter.drawPixmap(x, y, scaled_pixmap)
+    painter.end()
 
-        painter.drawPixmap(x, y, scaled_pixmap)
-        painter.end()
+    return circular_pixmap
 
-        return circular_pixmap
-    
-    def mousePressEvent(self, event: QMouseEvent):
-        """鼠标点击事件"""
-        if event.button() == Qt.MouseButton.LeftButton:
-            # 发送点击信号
-            self.clicked.emit(self.avatar_path, self.avatar_name)
-            
-            # 添加选中效果
-            self.set_selected(True)
-            
-            # 延迟后恢复
-            QTimer.singleShot(200, lambda: self.set_selected(False))
-    
-    def set_selected(self, selected):
-        """设置选中状态"""
-        self.is_selected = selected
-        # 简化选中状态，只设置一个简单的边框变化
-        if selected:
-            self.avatar_container.setStyleSheet("border: 3px solid #4a90e2; border-radius: 35px;")
+
+def create_placeholder_pixmap(diameter):
+    """解码完成前显示的灰色圆形占位图"""
+    placeholder = QPixmap(diameter, diameter)
+    placeholder.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(placeholder)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(QColor(128, 128, 128, 60))
+    painter.drawEllipse(0, 0, diameter, diameter)
+    painter.end()
+    return placeholder
+
+
+class AvatarListModel(QAbstractListModel):
+    """头像列表模型
+
+    只在视图请求某一行的图标（即该格可见）时才解码对应头像，
+    解码后的圆形头像按图片请求键缓存，重复打开选择器时直接使用
+    """
+    PathRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._avatars = []      # [(头像路径, 头像名称)]
+        self._icons = {}        # 行号 -> 圆形头像
+        self._pending = {}      # 图片请求键 -> 行号
+        self._circular_cache = {}  # 图片请求键 -> 圆形头像
+        self._placeholder = create_placeholder_pixmap(AVATAR_DIAMETER)
+        image_service.image_ready.connect(self._on_image_ready)
+
+    def set_avatars(self, avatars):
+        self.beginResetModel()
+        self._avatars = list(avatars)
+        self._icons = {}
+        self._pending = {}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._avatars)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        avatar_path, avatar_name = self._avatars[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return avatar_name
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icon_for_row(index.row())
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return avatar_name
+        if role == self.PathRole:
+            return avatar_path
+        return None
+
+    def _icon_for_row(self, row):
+        icon = self._icons.get(row)
+        if icon is not None:
+            return icon
+
+        avatar_path, _ = self._avatars[row]
+        # 在后台按60px解码，资源同步预先生成过的缩略图会直接从磁盘缓存读取
+        key, pixmap = image_service.request(avatar_path, QSize(AVATAR_DIAMETER, AVATAR_DIAMETER), COVER)
+        if key is None:
+            return self._placeholder
+
+        if key in self._circular_cache:
+            icon = self._circular_cache[key]
+        elif pixmap is not None:
+            icon = self._make_icon(key, pixmap)
         else:
-            self.avatar_container.setStyleSheet("border: 2px solid #dee2e6; border-radius: 35px;")
+            self._pending[key] = row
+            return self._placeholder
+        self._icons[row] = icon
+        return icon
+
+    def _make_icon(self, key, pixmap):
+        icon = create_circular_pixmap(pixmap, AVATAR_DIAMETER)
+        self._circular_cache[key] = icon
+        return icon
+
+    def _on_image_ready(self, key, pixmap):
+        row = self._pending.pop(key, None)
+        if row is None or pixmap.isNull():
+            return
+        self._icons[row] = self._make_icon(key, pixmap)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
 
 
 class AvatarSelector(QMainWindow):
@@ -164,24 +186,24 @@ class AvatarSelector(QMainWindow):
         
         
         
-        # 滚动区域
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setFrameShape(QFrame.Shape.NoFrame)
-        
-        # 使用现有的滚动区域样式（已包含滚动条）
-        scroll_area.setStyleSheet(get_scroll_area_style(config.theme))
-        
-        # 滚动区域的内容部件
-        self.scroll_content = QWidget()
-        self.grid_layout = QGridLayout(self.scroll_content)
-        self.grid_layout.setSpacing(15)  # 调整间距以完整显示6个头像
-        self.grid_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        
-        scroll_area.setWidget(self.scroll_content)
-        content_layout.addWidget(scroll_area)
-        
-        
+        # 头像网格：图标模式的列表视图，只绘制可见的格子
+        self.avatar_model = AvatarListModel(self)
+        self.avatar_view = QListView()
+        self.avatar_view.setViewMode(QListView.ViewMode.IconMode)
+        self.avatar_view.setMovement(QListView.Movement.Static)
+        self.avatar_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.avatar_view.setUniformItemSizes(True)
+        self.avatar_view.setWordWrap(True)
+        self.avatar_view.setIconSize(QSize(AVATAR_DIAMETER, AVATAR_DIAMETER))
+        self.avatar_view.setGridSize(GRID_CELL_SIZE)
+        self.avatar_view.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.avatar_view.setFrameShape(QFrame.Shape.NoFrame)
+        self.avatar_view.setMouseTracking(True)
+        self.avatar_view.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+        self.avatar_view.setStyleSheet(get_avatar_grid_style(config.theme))
+        self.avatar_view.setModel(self.avatar_model)
+        self.avatar_view.clicked.connect(self.on_avatar_index_clicked)
+        content_layout.addWidget(self.avatar_view)
     
     def load_avatars(self):
         """加载所有头像"""
@@ -202,28 +224,8 @@ class AvatarSelector(QMainWindow):
             self.create_test_avatars()
             return
         
-        # 清空现有布局
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # 每行显示的头像数量
-        columns = 6
-        
-        # 添加头像项
-        for i, avatar_file in enumerate(png_files):
-            row = i // columns
-            col = i % columns
-            
-            # 获取文件名（不带扩展名）
-            avatar_name = avatar_file.stem
-            
-            # 创建头像项
-            avatar_item = AvatarItem(str(avatar_file), avatar_name)
-            avatar_item.clicked.connect(self.on_avatar_clicked)
-            
-            self.grid_layout.addWidget(avatar_item, row, col)
+        # 只收集文件列表，头像图片在格子可见时才解码
+        self.avatar_model.set_avatars((str(avatar_file), avatar_file.stem) for avatar_file in png_files)
     
     def create_test_avatars(self):
         """创建测试头像（用于演示）"""
@@ -245,19 +247,9 @@ class AvatarSelector(QMainWindow):
         # 刷新头像样式
         self.refresh_avatar_styles()
     
-    def refresh_avatar_styles(self):
-        """刷新所有头像的样式"""
-        for i in range(self.grid_layout.count()):
-            item = self.grid_layout.itemAt(i)
-            if item and item.widget():
-                widget = item.widget()
-                if hasattr(widget, 'avatar_container') and widget.avatar_container:
-                    # 重置为默认样式
-                    widget.avatar_container.setStyleSheet("border: 2px solid #dee2e6; border-radius: 35px;")
-                    # 更新文字样式以支持主题切换
-                    for child in widget.findChildren(QLabel):
-                        if child is not widget.avatar_container:
-                            child.setStyleSheet(get_label_style(config.theme))
+    def refresh_avatar_styles(self, theme=None):
+        """刷新头像网格的样式"""
+        self.avatar_view.setStyleSheet(get_avatar_grid_style(theme or config.theme))
     
     def on_theme_changed(self, theme):
         """主题切换信号处理"""
@@ -269,8 +261,12 @@ class AvatarSelector(QMainWindow):
         if isinstance(central, BackgroundWidget):
             central.set_background(self.background_pixmap, theme)
         # 刷新头像样式
-        self.refresh_avatar_styles()
+        self.refresh_avatar_styles(theme)
     
+    def on_avatar_index_clicked(self, index):
+        """处理头像格子点击事件"""
+        self.on_avatar_clicked(index.data(AvatarListModel.PathRole), index.data(Qt.ItemDataRole.DisplayRole))
+
     def on_avatar_clicked(self, avatar_path, avatar_name):
         """处理头像项点击事件"""
         # 发送选择信号
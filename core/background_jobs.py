@@ -0,0 +1,234 @@
+"""
+后台任务模块
+导入导出在后台线程中执行，按批次校验和转换数据，汇报处理速度与剩余时间，支持取消；
+逐行错误汇总后保存为输入文件旁的错误报告，只有全部批次成功时才提交数据
+"""
+import csv
+import os
+import time
+
+from PySide6.QtCore import QThread, Signal, Qt
+
+# 默认每批处理的行数
+DEFAULT_BATCH_SIZE = 500
+
+# 进度信号的最小发送间隔（秒），避免大量信号堵塞界面线程
+PROGRESS_INTERVAL = 0.1
+
+
+class JobCancelled(Exception):
+    """任务被用户取消"""
+
+
+class RowError(Exception):
+    """单行数据校验失败"""
+
+    def __init__(self, message, field=''):
+        super().__init__(message)
+        self.field = field
+
+
+class RowErrorReport:
+    """逐行错误汇总"""
+
+    def __init__(self):
+        self.errors = []  # [(行号, 字段, 错误信息)]
+
+    def add(self, row, message, field=''):
+        self.errors.append((row, field, message))
+
+    def __len__(self):
+        return len(self.errors)
+
+    def __bool__(self):
+        return bool(self.errors)
+
+    def summary(self, limit=5):
+        """前几条错误的简要描述"""
+        lines = [f"第{row}行{f'[{field}]' if field else ''}: {message}"
+                 for row, field, message in self.errors[:limit]]
+        if len(self.errors) > limit:
+            lines.append(f"……共 {len(self.errors)} 条错误")
+        return '\n'.join(lines)
+
+    def save_next_to(self, source_path):
+        """将错误报告保存到源文件旁，返回报告路径"""
+        base, _ = os.path.splitext(source_path)
+        report_path = f"{base}.errors.csv"
+        # utf-8-sig 便于直接用Excel打开
+        with open(report_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['行号', '字段', '错误'])
+            writer.writerows(self.errors)
+        print(f"[INFO] 错误报告已保存到: {report_path}")
+        return report_path
+
+
+class BackgroundJob(QThread):
+    """在后台线程中执行 func(job, *args)
+
+    func 内部通过 job.report() 汇报进度、job.check_cancelled() 响应取消，
+    不得直接访问界面控件；界面更新放在 succeeded 信号的处理函数中
+    """
+    progress = Signal(dict)     # {"done", "total", "rate", "eta", "message"}
+    succeeded = Signal(object)  # 任务返回值
+    failed = Signal(str)        # 错误信息
+    cancelled = Signal()
+
+    def __init__(self, title, func, *args, parent=None):
+        super().__init__(parent)
+        self.title = title
+        self._func = func
+        self._args = args
+        self._cancel_requested = False
+        self._start_time = 0.0
+        self._last_emit = 0.0
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def is_cancel_requested(self):
+        return self._cancel_requested
+
+    def check_cancelled(self):
+        if self._cancel_requested:
+            raise JobCancelled()
+
+    def report(self, done, total=0, message='', force=False):
+        """汇报进度（按时间间隔节流），同时计算行/秒和剩余时间"""
+        now = time.perf_counter()
+        if not force and now - self._last_emit < PROGRESS_INTERVAL:
+            return
+        self._last_emit = now
+        elapsed = max(now - self._start_time, 1e-6)
+        rate = done / elapsed
+        eta = (total - done) / rate if total and rate > 0 else None
+        self.progress.emit({"done": done, "total": total, "rate": rate, "eta": eta, "message": message})
+
+    def run(self):
+        self._start_time = time.perf_counter()
+        try:
+            result = self._func(self, *self._args)
+        except JobCancelled:
+            print(f"[INFO] 任务已取消: {self.title}")
+            self.cancelled.emit()
+        except Exception as e:
+            print(f"[ERROR] {self.title}失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            self.failed.emit(str(e))
+        else:
+            elapsed = time.perf_counter() - self._start_time
+            print(f"[INFO] {self.title}完成，用时 {elapsed:.2f} 秒")
+            self.succeeded.emit(result)
+
+
+def run_in_batches(job, rows, transform, errors, total=0, batch_size=DEFAULT_BATCH_SIZE, message=''):
+    """按批次校验并转换数据
+
+    rows 产出 (行号, 行数据)，transform(行号, 行数据) 返回转换结果，返回 None 表示跳过该行，
+    抛出 RowError/ValueError 时记录到 errors 并继续处理后续行；每批结束后响应取消并汇报进度
+    """
+    results = []
+    done = 0
+    for row_idx, row in rows:
+        try:
+            item = transform(row_idx, row)
+        except (RowError, ValueError, TypeError) as e:
+            errors.add(row_idx, str(e), getattr(e, 'field', ''))
+        else:
+            if item is not None:
+                results.append(item)
+        done += 1
+        if done % batch_size == 0:
+            job.check_cancelled()
+            job.report(done, total, message)
+    job.check_cancelled()
+    job.report(done, total, message, force=True)
+    return results
+
+
+def iter_in_batches(job, items, batch_size=DEFAULT_BATCH_SIZE, message=''):
+    """迭代列表，每批结束后响应取消并汇报进度（用于导出）"""
+    total = len(items)
+    for index, item in enumerate(items, 1):
+        yield item
+        if index % batch_size == 0:
+            job.check_cancelled()
+            job.report(index, total, message)
+    job.check_cancelled()
+    job.report(total, total, message, force=True)
+
+
+def format_progress(info):
+    """格式化进度文本：已处理行数、行/秒、剩余时间"""
+    done, total = info["done"], info["total"]
+    text = f"已处理 {done}/{total} 行" if total else f"已处理 {done} 行"
+    text += f" · {info['rate']:.0f} 行/秒"
+    if info["eta"] is not None:
+        text += f" · 剩余约 {info['eta']:.0f} 秒"
+    if info.get("message"):
+        text = f"{info['message']}\n{text}"
+    return text
+
+
+def start_job(parent, title, func, *args, on_success=None, on_failure=None):
+    """启动后台任务并显示带取消按钮的进度对话框，返回任务对象"""
+    from PySide6.QtWidgets import QProgressDialog
+
+    job = BackgroundJob(title, func, *args, parent=parent)
+
+    dialog = QProgressDialog(f"{title}…", "取消", 0, 100, parent)
+    dialog.setWindowTitle(title)
+    dialog.setWindowModality(Qt.WindowModal)
+    dialog.setMinimumDuration(300)
+    dialog.setAutoClose(False)
+    dialog.setAutoReset(False)
+    dialog.setValue(0)
+
+    def on_progress(info):
+        if info["total"]:
+            dialog.setValue(min(100, int(info["done"] * 100 / info["total"])))
+        dialog.setLabelText(format_progress(info))
+
+    def on_cancel_clicked():
+        dialog.setLabelText("正在取消…")
+        job.cancel()
+
+    def cleanup():
+        dialog.canceled.disconnect(on_cancel_clicked)
+        dialog.close()
+        dialog.deleteLater()
+
+    def release():
+        jobs = getattr(parent, '_background_jobs', [])
+        if job in jobs:
+            jobs.remove(job)
+        job.deleteLater()
+
+    def handle_success(result):
+        cleanup()
+        if on_success:
+            on_success(result)
+
+    def handle_failure(message):
+        cleanup()
+        if on_failure:
+            on_failure(message)
+
+    job.progress.connect(on_progress)
+    job.succeeded.connect(handle_success)
+    job.failed.connect(handle_failure)
+    job.cancelled.connect(cleanup)
+    dialog.canceled.connect(on_cancel_clicked)
+    # 线程真正结束后才释放任务对象
+    job.finished.connect(release)
+
+    # 保存引用，防止任务对象在运行中被回收
+    if not hasattr(parent, '_background_jobs'):
+        parent._background_jobs = []
+    parent._background_jobs.append(job)
+
+    print(f"[INFO] 开始后台任务: {title}")
+    job.start()
+    return job
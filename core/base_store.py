@@ -0,0 +1,348 @@
+"""
+基础成就分片存储模块
+基础成就数据按版本拆分为分片文件，清单记录每个分片的文件名、成就数和 SHA-256 校验值，
+以及所有成就的排列顺序（按版本分段）：
+
+    resources/base_achievements/manifest.json
+    resources/base_achievements/v1.0.json
+    resources/base_achievements/v2.7.json
+    ...
+
+只读的场景（如命令行导出指定版本）加载时可以只读取需要的版本的分片；
+删除版本只需删除一个分片并改写清单；保存时只写入内容变化的分片，
+合并新版本的爬取数据只写入该版本的分片，只修改获取状态时基础数据不变，不写入任何文件。
+绝对编号通常是连续的序号，记录在清单的分段中而不写入分片，重新编码只移动绝对编号时分片不变
+
+清单格式：
+    format   清单格式版本
+    shards   {版本: {"file": 分片文件名, "count": 成就数, "sha256": 分片文件的校验值}}
+    runs     [[版本, 成就数, 起始绝对编号], ...]，按顺序依次从对应分片取出成就；
+             起始绝对编号为 null 时该段成就的绝对编号不是连续序号，保存在分片的记录中
+
+分片目录是基础成就数据唯一的来源。旧版本的单文件 resources/base_achievements.json 由启动时的
+migrate_legacy 一次性迁移为分片，之后改名为 base_achievements.json.bak，不会与分片同时存在；
+迁移前读取时直接读取旧文件（只读）
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from itertools import islice
+
+from core.config import get_resource_path
+from core.instrumentation import metrics
+
+MANIFEST_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+
+# 基础成就只保存这些字段（成就组字段有值时才保存），用户相关的字段不写入
+BASE_FIELDS = ("绝对编号", "版本", "第一分类", "第二分类", "编号", "名称", "描述", "奖励", "是否隐藏")
+GROUP_FIELDS = ("成就组ID", "互斥成就")
+
+
+def base_record(achievement):
+    """只保留基础信息的成就记录，列表字段复制一份，不与调用方共享"""
+    get = achievement.get
+    record = {field: get(field, "") for field in BASE_FIELDS}
+    for field in GROUP_FIELDS:
+        value = get(field)
+        if value:
+            record[field] = list(value) if isinstance(value, list) else value
+    return record
+
+
+def shard_file_name(version):
+    """版本对应的分片文件名，含文件名不允许的字符时附加版本号的哈希以免重名"""
+    safe = re.sub(r'[^0-9A-Za-z._-]', '_', version)
+    if safe != version or not version:
+        safe = f"{safe}-{hashlib.sha1(version.encode('utf-8')).hexdigest()[:8]}"
+    return f"v{safe}.json"
+
+
+def _sequence_number(value):
+    """连续序号形式的绝对编号（"1"、"2"……）返回整数，其他形式返回 None"""
+    if isinstance(value, str) and value.isascii() and value.isdigit() and str(int(value)) == value:
+        return int(value)
+    return None
+
+
+def _append_run(runs, version, count, start):
+    """追加一段成就，能与上一段连续时合并"""
+    if runs:
+        last = runs[-1]
+        if last[0] == version and (start is None if last[2] is None else start == last[2] + last[1]):
+            last[1] += count
+            return
+    runs.append([version, count, start])
+
+
+def _partition(achievements):
+    """按版本拆分为分片记录，返回 ({版本: [分片记录]}, 分段)"""
+    shards = {}
+    runs = []
+    run = None
+    expected = None  # 当前分段延续时下一条成就的绝对编号
+    for achievement in achievements:
+        record = base_record(achievement)
+        version = str(record["版本"])
+        number = record["绝对编号"]
+        if run is not None and run[0] == version and run[2] is not None and number == expected:
+            run[1] += 1
+            del record["绝对编号"]
+        else:
+            start = _sequence_number(number)
+            if start is not None:
+                del record["绝对编号"]
+            _append_run(runs, version, 1, start)
+            run = runs[-1]
+        if run[2] is not None:
+            expected = str(run[2] + run[1])
+        shards.setdefault(version, []).append(record)
+    return shards, runs
+
+
+def _restore(record, number):
+    """分片记录还原为基础成就（绝对编号在前），互斥成就列表复制一份，不与缓存共享"""
+    restored = {"绝对编号": str(number)} if number is not None else {}
+    restored.update(record)
+    mutex = restored.get("互斥成就")
+    if isinstance(mutex, list):
+        restored["互斥成就"] = list(mutex)
+    return restored
+
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return None
+
+
+def _write_atomic(path, data):
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    metrics.add_bytes(len(data))
+
+
+def _dump(data):
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+class BaseAchievementStore:
+    """按版本分片的基础成就存储，清单或分片无法读取时抛出异常，由调用方处理"""
+
+    def __init__(self, directory=None, legacy_file=None):
+        self.directory = directory or get_resource_path("resources/base_achievements")
+        self.legacy_file = legacy_file or get_resource_path("resources/base_achievements.json")
+        self.manifest_file = self.directory / MANIFEST_NAME
+        # 分片文件名 -> (文件签名, 校验值, 分片记录)，保存时与之比较即可跳过未变化的分片
+        self._cache = {}
+        # 用户会话在后台线程中预取时也会加载基础数据
+        self._lock = threading.RLock()
+
+    # ---------- 读取 ----------
+
+    def _read_manifest(self):
+        """读取清单，不存在时返回 None"""
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        if not isinstance(manifest, dict) or manifest.get("format") != MANIFEST_FORMAT:
+            raise ValueError(f"无法识别的清单格式: {self.manifest_file}")
+        return manifest
+
+    def _manifest(self):
+        """读取清单，不存在时返回 None（只读，不迁移旧文件）"""
+        return self._read_manifest()
+
+    def _read_legacy(self):
+        """迁移前读取旧的单文件数据，不存在时返回空列表"""
+        try:
+            with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def _read_shard(self, version, entry):
+        """读取分片记录，文件与上次读取或写入时相同则直接使用缓存"""
+        path = self.directory / entry["file"]
+        cached = self._cache.get(entry["file"])
+        if cached is not None and cached[0] == _file_signature(path) and cached[1] == entry["sha256"]:
+            return cached[2]
+
+        with open(path, 'rb') as f:
+            signature = os.fstat(f.fileno())
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        records = json.loads(data)
+        if not isinstance(records, list) or len(records) != entry["count"]:
+            raise ValueError(f"版本 {version} 的分片 {entry['file']} 与清单记录的成就数不一致")
+        if digest != entry["sha256"]:
+            print(f"[WARNING] 版本 {version} 的分片 {entry['file']} 校验值与清单不一致（可能被手动修改）")
+        self._cache[entry["file"]] = ((signature.st_mtime_ns, signature.st_size), digest, records)
+        return records
+
+    def load(self, versions=None):
+        """按保存时的顺序加载基础成就，versions 不为 None 时只读取这些版本的分片
+
+        只加载部分版本的结果只能用于读取：保存它会删除其他版本的分片，需要保存时必须加载全部
+        """
+        with self._lock:
+            manifest = self._manifest()
+            wanted = None if versions is None else {str(version) for version in versions}
+            if manifest is None:
+                return [achievement for achievement in self._read_legacy()
+                        if wanted is None or str(achievement.get("版本", "")) in wanted]
+            shards = {version: iter(self._read_shard(version, entry))
+                      for version, entry in manifest["shards"].items()
+                      if wanted is None or version in wanted}
+
+            achievements = []
+            for version, count, start in manifest["runs"]:
+                records = shards.get(version)
+                if records is None:
+                    continue
+                for offset, record in enumerate(islice(records, count)):
+                    achievements.append(_restore(record, None if start is None else start + offset))
+            return achievements
+
+    def versions(self):
+        """{版本: 成就数}，只读取清单"""
+        with self._lock:
+            manifest = self._manifest()
+            if manifest is None:
+                counts = {}
+                for achievement in self._read_legacy():
+                    version = str(achievement.get("版本", ""))
+                    counts[version] = counts.get(version, 0) + 1
+                return counts
+        return {version: entry["count"] for version, entry in manifest["shards"].items()}
+
+    def signature(self):
+        """清单和各分片文件的 (文件名, 修改时间, 大小)，迁移前为旧文件的签名，都不存在时返回 None"""
+        try:
+            with os.scandir(self.directory) as entries:
+                files = sorted((entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+                               for entry in entries if entry.name.endswith(".json"))
+        except OSError:
+            files = []
+        if not files:
+            legacy = _file_signature(self.legacy_file)
+            return ((self.legacy_file.name,) + legacy,) if legacy else None
+        return tuple(files)
+
+    # ---------- 写入 ----------
+
+    def _unchanged(self, file_name, records):
+        """分片内容与上次读取或写入时相同（文件也未被改写）时返回其校验值"""
+        cached = self._cache.get(file_name)
+        if cached is not None and cached[2] == records and cached[0] == _file_signature(self.directory / file_name):
+            return cached[1]
+        return None
+
+    def save(self, achievements):
+        """保存基础成就（只保存基础字段），只写入内容变化的分片，返回写入的分片数"""
+        with self._lock:
+            old_manifest = self._read_manifest() or {"shards": {}, "runs": []}
+            shards, runs = _partition(achievements)
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+            entries = {}
+            written = 0
+            for version, records in shards.items():
+                file_name = shard_file_name(version)
+                digest = self._unchanged(file_name, records)
+                if digest is None:
+                    path = self.directory / file_name
+                    data = _dump(records)
+                    digest = hashlib.sha256(data).hexdigest()
+                    try:
+                        with open(path, 'rb') as f:
+                            unchanged = f.read() == data
+                    except FileNotFoundError:
+                        unchanged = False
+                    if not unchanged:
+                        _write_atomic(path, data)
+                        written += 1
+                    self._cache[file_name] = (_file_signature(path), digest, records)
+                entries[version] = {"file": file_name, "count": len(records), "sha256": digest}
+
+            manifest = {"format": MANIFEST_FORMAT, "shards": entries, "runs": runs}
+            if manifest != old_manifest:
+                _write_atomic(self.manifest_file, _dump(manifest))
+            # 清单写入后再删除不再使用的分片
+            for version, entry in old_manifest["shards"].items():
+                if version not in entries:
+                    self._remove_shard(entry["file"])
+            # 分片已写入，旧的单文件数据不再有效
+            self._retire_legacy()
+
+        dropped = len(old_manifest["shards"].keys() - entries.keys())
+        print(f"[INFO] 基础成就数据已保存: {len(entries)} 个版本分片，写入 {written} 个，删除 {dropped} 个")
+        return written
+
+    def drop_version(self, version):
+        """删除一个版本的分片并改写清单（不读取其他分片），返回删除的成就数"""
+        version = str(version)
+        with self._lock:
+            if self._manifest() is None:
+                self.migrate_legacy()
+            manifest = self._manifest()
+            if manifest is None:
+                return 0
+            entry = manifest["shards"].pop(version, None)
+            if entry is None:
+                return 0
+            runs = []
+            for run_version, count, start in manifest["runs"]:
+                if run_version != version:
+                    _append_run(runs, run_version, count, start)
+            manifest["runs"] = runs
+            _write_atomic(self.manifest_file, _dump(manifest))
+            self._remove_shard(entry["file"])
+        print(f"[INFO] 已删除版本 {version} 的基础成就分片（{entry['count']} 条成就）")
+        return entry["count"]
+
+    def migrate_legacy(self):
+        """把旧的单文件基础成就数据迁移为分片，启动时在界面线程（或命令行）中调用，返回是否处理了旧文件
+
+        清单已存在时旧文件不会被读取，同样改名并提示，避免两份数据同时存在
+        """
+        with self._lock:
+            if not self.legacy_file.exists():
+                return False
+            if self._read_manifest() is None:
+                print(f"[INFO] 基础成就数据迁移为按版本分片存储: {self.directory}")
+                self.save(self._read_legacy())
+            else:
+                print(f"[WARNING] 基础成就数据以 {self.directory.name}/ 为准，{self.legacy_file.name} 不会被读取")
+                self._retire_legacy()
+            return True
+
+    def _retire_legacy(self):
+        """把旧的单文件数据改名为 .bak（已有同名备份时加序号，不覆盖）"""
+        if not self.legacy_file.exists():
+            return
+        backup = self.legacy_file.with_name(self.legacy_file.name + ".bak")
+        index = 1
+        while backup.exists():
+            backup = self.legacy_file.with_name(f"{self.legacy_file.name}.{index}.bak")
+            index += 1
+        os.replace(self.legacy_file, backup)
+        print(f"[INFO] 旧的基础成就文件已改名为 {backup.name}")
+
+    def _remove_shard(self, file_name):
+        self._cache.pop(file_name, None)
+        try:
+            os.remove(self.directory / file_name)
+        except FileNotFoundError:
+            pass
+
+
+base_store = BaseAchievementStore()
@@ -0,0 +1,817 @@
+"""
+性能基准模块
+生成合成成就数据，对比旧实现与优化实现的耗时和内存峰值，
+通过命令行 python -m cli bench <目标> 运行
+"""
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+
+def synthetic_achievements(count):
+    """生成指定数量的合成成就数据"""
+    statuses = ['已完成', '未完成', '暂不可获取', '']
+    rewards = ['星声*5', '星声*10', '星声*20']
+    achievements = []
+    for index in range(count):
+        first_order = index % 4 + 1
+        achievements.append({
+            '绝对编号': str(index + 1),
+            '版本': f"{index % 3 + 1}.{index % 8}",
+            '第一分类': f"第一分类{first_order}",
+            '第二分类': f"第二分类{first_order}-{index % 12}",
+            '编号': f"{first_order}{(index % 12 + 1) * 10:03d}{index % 10000:04d}",
+            '名称': f"成就{index}",
+            '描述': f"完成第{index}项挑战，这是一段用于基准测试的描述文本。",
+            '奖励': rewards[index % 3],
+            '是否隐藏': '隐藏' if index % 7 == 0 else '',
+            '获取状态': statuses[index % 4],
+            '成就组ID': f"group_{index // 3}" if index % 10 == 0 else '',
+            '互斥成就': []
+        })
+    return achievements
+
+
+def measure(func, *args, **kwargs):
+    """测量函数耗时（秒）与Python内存峰值（MB），返回 (结果, 指标)
+
+    tracemalloc 会显著拖慢执行，因此耗时与内存分两次测量
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, {"seconds": round(elapsed, 3), "peak_mb": round(peak / 1024 / 1024, 2)}
+
+
+# ---------- Excel ----------
+
+_EXCEL_COLUMNS = ['绝对编号', '版本', '第一分类', '第二分类', '编号', '名称',
+                  '描述', '奖励', '是否隐藏', '获取状态', '成就组ID', '互斥成就']
+
+
+def _legacy_excel_export(achievements, file_path):
+    """旧实现：完整DOM工作簿，逐个单元格创建样式对象"""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+
+    workbook = Workbook()
+    sheet = workbook.active
+    for col, header in enumerate(_EXCEL_COLUMNS, 1):
+        cell = sheet.cell(row=1, column=col, value=header)
+        cell.font = Font(bold=True, color="FFFFFF")
+        cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        cell.alignment = Alignment(horizontal="center", vertical="center")
+    for row_idx, item in enumerate(achievements, 2):
+        for col_idx, field_name in enumerate(_EXCEL_COLUMNS, 1):
+            cell = sheet.cell(row=row_idx, column=col_idx, value=str(item.get(field_name, '')))
+            cell.border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                                 top=Side(style='thin'), bottom=Side(style='thin'))
+            if field_name == '名称':
+                cell.font = Font(bold=True)
+    workbook.save(file_path)
+
+
+def _streaming_excel_export(achievements, file_path):
+    """优化实现：write_only 工作表 + 共享命名样式"""
+    from core.excel_io import create_write_only_workbook, create_sheet, styled, append_styled_row
+
+    workbook = create_write_only_workbook()
+    sheet = create_sheet(workbook, "成就数据", [15] * len(_EXCEL_COLUMNS))
+    append_styled_row(sheet, _EXCEL_COLUMNS, "ww_header")
+    for item in achievements:
+        sheet.append([styled(sheet, str(item.get(field_name, '')),
+                             "ww_name" if field_name == '名称' else "ww_cell")
+                      for field_name in _EXCEL_COLUMNS])
+    workbook.save(file_path)
+
+
+def _legacy_excel_import(file_path):
+    """旧实现：完整加载工作簿，按单元格对象取值"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path)
+    sheet = workbook.active
+    headers = [cell.value for cell in sheet[1]]
+    col_index = {header: idx for idx, header in enumerate(headers)}
+    count = 0
+    for row in sheet.iter_rows(min_row=2):
+        if not any(cell.value for cell in row):
+            continue
+        _ = {name: row[idx].value for name, idx in col_index.items()}
+        count += 1
+    workbook.close()
+    return count
+
+
+def _streaming_excel_import(file_path):
+    """优化实现：read_only + values_only，列索引只解析一次"""
+    from core.excel_io import ExcelRowReader
+
+    count = 0
+    with ExcelRowReader(file_path) as reader:
+        col_index = reader.col_index
+        for _, row in reader.iter_rows():
+            _ = {name: row[idx] for name, idx in col_index.items()}
+            count += 1
+    return count
+
+
+def bench_excel(rows=50000):
+    """Excel导入导出基准"""
+    achievements = synthetic_achievements(rows)
+    results = {"rows": rows}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        legacy_path = os.path.join(temp_dir, "legacy.xlsx")
+        streaming_path = os.path.join(temp_dir, "streaming.xlsx")
+
+        _, results["export_legacy"] = measure(_legacy_excel_export, achievements, legacy_path)
+        _, results["export_streaming"] = measure(_streaming_excel_export, achievements, streaming_path)
+        _, results["import_legacy"] = measure(_legacy_excel_import, legacy_path)
+        _, results["import_streaming"] = measure(_streaming_excel_import, streaming_path)
+    return results
+
+
+# ---------- 启动 ----------
+
+# 在独立进程中执行，保证模块导入耗时被计入
+_STARTUP_SCRIPT = r"""
+import json, sys, time
+start = time.perf_counter()
+sys.argv[0] = "main.py"
+from PySide6.QtCore import QObject, QEvent
+from PySide6.QtWidgets import QApplication
+app = QApplication(sys.argv[:1])
+result = {}
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and "first_paint" not in result:
+            result["first_paint"] = time.perf_counter() - start
+            result["heavy_modules"] = [name for name in ("requests", "bs4", "openpyxl") if name in sys.modules]
+        return False
+
+from core.main_window import TemplateMainWindow
+window = TemplateMainWindow()
+paint_filter = FirstPaint()
+window.centralWidget().installEventFilter(paint_filter)
+window.show()
+while "first_paint" not in result:
+    app.processEvents()
+app.processEvents()
+result["first_tab"] = time.perf_counter() - start
+for index in range(window.tab_widget.count()):
+    window.tab_widget.setCurrentIndex(index)
+    app.processEvents()
+result["all_tabs"] = time.perf_counter() - start
+print(json.dumps(result))
+"""
+
+
+def bench_startup(runs=3):
+    """主窗口启动基准：首次绘制、当前标签页可用、全部标签页构建完成的耗时（取多次运行的最小值）"""
+    import json
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    project_dir = Path(__file__).resolve().parent.parent
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT], cwd=project_dir, env=env,
+                                capture_output=True, text=True, encoding="utf-8", check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    return {
+        "runs": runs,
+        "first_paint_seconds": round(min(sample["first_paint"] for sample in samples), 3),
+        "first_tab_seconds": round(min(sample["first_tab"] for sample in samples), 3),
+        "all_tabs_seconds": round(min(sample["all_tabs"] for sample in samples), 3),
+        "heavy_modules_at_first_paint": samples[-1]["heavy_modules"],
+    }
+
+
+# ---------- 热启动快照 ----------
+
+def _cold_load(base_path, progress_path):
+    """旧流程：解析两个JSON文件并合并、计算筛选器选项"""
+    import json
+    from core.manage_tab import merge_user_progress, compute_filter_facets
+
+    with open(base_path, 'r', encoding='utf-8') as f:
+        base_achievements = json.load(f)
+    with open(progress_path, 'r', encoding='utf-8') as f:
+        user_progress = json.load(f)
+    achievements = merge_user_progress(base_achievements, user_progress)
+    return achievements, compute_filter_facets(achievements, {})
+
+
+def _warm_load(snapshot_path):
+    """快照流程：读取列存储快照并还原记录"""
+    import pickle
+    from core.warm_snapshot import _from_columns
+
+    with open(snapshot_path, 'rb') as f:
+        payload = pickle.load(f)
+    return _from_columns(payload["fields"], payload["columns"], payload["count"]), payload["facets"]
+
+
+def bench_snapshot(rows=50000):
+    """热启动快照基准：JSON解析+合并 对比 读取快照"""
+    import json
+    import pickle
+    from core.warm_snapshot import _to_columns
+
+    achievements = synthetic_achievements(rows)
+    base_achievements = [{k: v for k, v in item.items() if k != '获取状态'} for item in achievements]
+    user_progress = {item['编号']: {'获取状态': item['获取状态'] or '未完成'} for item in achievements}
+
+    results = {"rows": rows}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base_path = os.path.join(temp_dir, "base_achievements.json")
+        progress_path = os.path.join(temp_dir, "user_progress.json")
+        snapshot_path = os.path.join(temp_dir, "warm_start.pickle")
+        with open(base_path, 'w', encoding='utf-8') as f:
+            json.dump(base_achievements, f, ensure_ascii=False, indent=2)
+        with open(progress_path, 'w', encoding='utf-8') as f:
+            json.dump(user_progress, f, ensure_ascii=False, indent=2)
+
+        (merged, facets), results["cold"] = measure(_cold_load, base_path, progress_path)
+        fields, columns = _to_columns(merged)
+        with open(snapshot_path, 'wb') as f:
+            pickle.dump({"fields": fields, "columns": columns, "count": len(merged), "facets": facets},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        (restored, _), results["warm"] = measure(_warm_load, snapshot_path)
+
+        results["identical"] = restored == merged
+        results["json_kb"] = round((os.path.getsize(base_path) + os.path.getsize(progress_path)) / 1024)
+        results["snapshot_kb"] = round(os.path.getsize(snapshot_path) / 1024)
+    return results
+
+
+# ---------- 成就记录 ----------
+
+def _retained(func, *args):
+    """执行函数并返回 (结果, 结果占用的Python内存MB)，中间数据在返回前已释放"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, round(current / 1024 / 1024, 2)
+
+
+def bench_records(rows=50000):
+    """成就记录基准：字典 对比 Achievement 的内存占用、构建与复制耗时"""
+    import json
+    from core.achievement_record import Achievement
+
+    text = json.dumps(synthetic_achievements(rows), ensure_ascii=False)
+    results = {"rows": rows}
+
+    # 与加载流程一致：解析JSON后复制/转换为内存记录，解析结果随后释放
+    dicts, results["dict_mb"] = _retained(lambda: [item.copy() for item in json.loads(text)])
+    records, results["record_mb"] = _retained(
+        lambda: [Achievement.from_dict(item) for item in json.loads(text)])
+
+    _, results["dict_copy"] = measure(lambda: [item.copy() for item in dicts])
+    _, results["record_copy"] = measure(lambda: [record.copy() for record in records])
+    parsed = json.loads(text)
+    _, results["record_from_dict"] = measure(lambda: [Achievement.from_dict(item) for item in parsed])
+    results["identical"] = records == dicts
+    return results
+
+
+# ---------- 列存储筛选与统计 ----------
+
+_FILTER_CASES = [
+    {},
+    {"version": "2.3", "first_category": "第一分类2"},
+    {"hidden_type": "hidden_only", "priority": "未完成优先"},
+    {"search_text": "成就1", "obtainable": "可获取"},
+    {"obtainable": "多选一"},
+]
+
+
+def _best_of(func, repeat=3):
+    """多次运行取最短耗时（秒）"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, round(best, 4)
+
+
+def bench_columnar(rows=None):
+    """列存储基准：成就管理筛选、汇总统计和统计页统计，逐条实现 对比 numpy 列存储"""
+    from core.columnar_store import AchievementColumns, load_numpy
+    from core.manage_tab import AchievementManager
+    from core import columnar_store, statistics_tab
+
+    if load_numpy() is None:
+        raise RuntimeError("列存储基准需要安装 numpy")
+
+    results = {}
+    for count in ([rows] if rows else [1000, 10000, 100000]):
+        achievements = synthetic_achievements(count)
+        # 每3条组成一个成就组，组内完成记录不一定排在最前
+        for index, achievement in enumerate(achievements):
+            achievement['成就组ID'] = f"group_{index // 30}" if index % 10 == 0 else ''
+
+        loop_manager = AchievementManager()
+        loop_manager.columnar_min_rows = float('inf')
+        loop_manager.achievements = achievements
+        column_manager = AchievementManager()
+        column_manager.columnar_min_rows = 0
+        column_manager.achievements = achievements
+
+        loop_filters, loop_filter_seconds = _best_of(
+            lambda: [list(loop_manager.filter_data(**case)) for case in _FILTER_CASES])
+        _, build_seconds = _best_of(lambda: AchievementColumns.build(achievements))
+        column_filters, column_filter_seconds = _best_of(
+            lambda: [list(column_manager.filter_data(**case)) for case in _FILTER_CASES])
+
+        loop_stats, loop_stats_seconds = _best_of(lambda: (
+            loop_manager.get_statistics(),
+            statistics_tab.calculate_statistics(achievements, '全部'),
+            statistics_tab.calculate_statistics(achievements, '2.3'),
+            statistics_tab.calculate_version_stats(achievements, '全部')))
+        column_stats, column_stats_seconds = _best_of(lambda: (
+            column_manager.get_statistics(),
+            columnar_store.calculate_statistics(achievements, '全部'),
+            columnar_store.calculate_statistics(achievements, '2.3'),
+            columnar_store.calculate_version_stats(achievements, '全部')))
+
+        results[str(count)] = {
+            "filter_loop": loop_filter_seconds,
+            "filter_columnar": column_filter_seconds,
+            "index_build": build_seconds,
+            "stats_loop": loop_stats_seconds,
+            "stats_columnar": column_stats_seconds,
+            "identical": loop_filters == column_filters and loop_stats == column_stats,
+        }
+    return results
+
+
+# ---------- 用户进度文件 ----------
+
+def _save_progress(progress_data, file_path):
+    import json
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(progress_data, f, ensure_ascii=False, indent=2)
+
+
+def bench_progress(rows=50000, completed=500):
+    """用户进度文件基准：完整进度（每个成就一条）对比 只保存非默认状态"""
+    from core.config import sparse_progress
+
+    # 合成数据的编号每1万条重复一次，这里用序号作为键
+    dense = {f"{index:08d}": {'获取状态': '已完成' if index < completed else '未完成'} for index in range(rows)}
+
+    results = {"rows": rows, "completed": completed}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dense_path = os.path.join(temp_dir, "dense.json")
+        sparse_path = os.path.join(temp_dir, "sparse.json")
+        _, results["save_dense"] = measure(_save_progress, dense, dense_path)
+        _, results["save_sparse"] = measure(lambda: _save_progress(sparse_progress(dense), sparse_path))
+        results["dense_kb"] = round(os.path.getsize(dense_path) / 1024)
+        results["sparse_kb"] = round(os.path.getsize(sparse_path) / 1024)
+    return results
+
+
+def _load_progress_files(progress_files):
+    import json
+    all_progress = {}
+    for uid, file_path in progress_files.items():
+        with open(file_path, 'r', encoding='utf-8') as f:
+            all_progress[uid] = json.load(f)
+    return all_progress
+
+
+def bench_matrix(rows=50000, users=20, completed=5000):
+    """多用户进度基准：逐个读取用户进度JSON 对比 进度矩阵（单用户一行 / 所有用户一次解码）"""
+    from pathlib import Path
+    from core.progress_matrix import ProgressMatrix
+
+    results = {"rows": rows, "users": users, "completed": completed}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        matrix = ProgressMatrix(Path(temp_dir) / "user_progress.matrix")
+        progress_files = {}
+        expected = {}
+        for user in range(users):
+            uid = str(100000000 + user)
+            # 每个用户完成不同的一段成就，少量暂不可获取
+            progress = {f"{index:08d}": {'获取状态': '暂不可获取' if index % 50 == 0 else '已完成'}
+                        for index in sorted((user * 997 + offset * 7) % rows for offset in range(completed))}
+            file_path = os.path.join(temp_dir, f"user_progress_{uid}.json")
+            _save_progress(progress, file_path)
+            progress_files[uid] = file_path
+            expected[uid] = progress
+
+        _, build_seconds = _best_of(lambda: [matrix.store_user(uid, file_path, expected[uid])
+                                             for uid, file_path in progress_files.items()], repeat=1)
+        first_uid = next(iter(progress_files))
+        json_one, results["user_json"] = _best_of(
+            lambda: _load_progress_files({first_uid: progress_files[first_uid]}))
+        matrix_one, results["user_matrix"] = _best_of(
+            lambda: matrix.read_user(first_uid, progress_files[first_uid]))
+        json_all, results["all_json"] = _best_of(lambda: _load_progress_files(progress_files))
+        matrix_all, results["all_matrix"] = _best_of(lambda: matrix.read_users(progress_files))
+        results["build"] = build_seconds
+        results["json_kb"] = round(sum(os.path.getsize(path) for path in progress_files.values()) / 1024)
+        results["matrix_kb"] = round(os.path.getsize(matrix.path) / 1024)
+        results["identical"] = (json_one[first_uid] == matrix_one and json_all == matrix_all == expected)
+    return results
+
+
+def bench_groups(rows=10000, toggles=200):
+    """成就组索引基准：每次切换获取状态后重新统计全部记录 对比 增量维护的成就组索引"""
+    import random
+    from core.achievement_groups import AchievementGroupIndex
+    from core.manage_tab import calculate_manage_statistics
+
+    achievements = synthetic_achievements(rows)
+    for index, achievement in enumerate(achievements):
+        achievement['成就组ID'] = f"group_{index // 30}" if index % 10 == 0 else ''
+    picks = random.Random(0).sample(range(rows), min(toggles, rows))
+    statuses = ('已完成', '未完成', '暂不可获取')
+
+    def run_scan(records):
+        results = []
+        for step, row in enumerate(picks):
+            records[row]['获取状态'] = statuses[step % 3]
+            results.append(calculate_manage_statistics(records))
+        return results
+
+    def run_index(records):
+        group_index = AchievementGroupIndex(records)
+        results = []
+        for step, row in enumerate(picks):
+            group_index.set_status(records[row], statuses[step % 3])
+            results.append(group_index.summary())
+        return results
+
+    scan_results, scan_seconds = _best_of(lambda: run_scan([a.copy() for a in achievements]), repeat=1)
+    index_results, index_seconds = _best_of(lambda: run_index([a.copy() for a in achievements]), repeat=1)
+    _, build_seconds = _best_of(lambda: AchievementGroupIndex(achievements))
+    return {
+        "rows": rows,
+        "toggles": len(picks),
+        "scan": scan_seconds,
+        "index": index_seconds,
+        "index_build": build_seconds,
+        "identical": scan_results == index_results,
+    }
+
+
+# ---------- 基础成就分片存储 ----------
+
+def _save_monolithic(records, file_path):
+    import json
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+
+
+def _load_monolithic(file_path):
+    import json
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def bench_shards(rows=50000):
+    """基础成就存储基准：单个JSON文件 对比 按版本分片（加载、无变化保存、合并新版本、删除版本）"""
+    from pathlib import Path
+    from core.base_store import BaseAchievementStore, base_record
+    from core.game_version import version_key
+
+    # 与重新编码后的数据一样按分类、版本排列，绝对编号为排序后的位置
+    achievements = sorted(synthetic_achievements(rows),
+                          key=lambda a: (a['第一分类'], a['第二分类'], version_key(a['版本'])))
+    for index, achievement in enumerate(achievements):
+        achievement['绝对编号'] = str(index + 1)
+    records = [base_record(achievement) for achievement in achievements]
+    new_version = [dict(record, 版本='9.0', 编号=f"9{index:07d}", 名称=f"新成就{index}")
+                   for index, record in enumerate(records[:max(rows // 100, 1)])]
+    dropped_version = records[0]['版本']
+
+    results = {"rows": rows}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "base_achievements.json")
+        # 旧单文件路径指向不存在的文件，保存分片时不会改名单文件基准使用的文件
+        store = BaseAchievementStore(Path(temp_dir) / "base_achievements", Path(temp_dir) / "legacy.json")
+
+        _, results["save_file"] = _best_of(lambda: _save_monolithic(records, file_path), repeat=1)
+        _, results["save_shards"] = _best_of(lambda: store.save(records), repeat=1)
+        loaded_file, results["load_file"] = _best_of(lambda: _load_monolithic(file_path))
+        # 新建存储对象，不使用上次保存时的缓存
+        loaded_shards, results["load_shards"] = _best_of(
+            lambda: BaseAchievementStore(store.directory, store.legacy_file).load())
+        one_version, results["load_one_version"] = _best_of(
+            lambda: BaseAchievementStore(store.directory, store.legacy_file).load([dropped_version]))
+        written, results["save_unchanged"] = _best_of(lambda: store.save(records), repeat=1)
+
+        merged = records + new_version
+        _, results["merge_file"] = _best_of(lambda: _save_monolithic(merged, file_path), repeat=1)
+        merge_written, results["merge_shards"] = _best_of(lambda: store.save(merged), repeat=1)
+
+        remaining = [record for record in merged if record['版本'] != dropped_version]
+        _, results["drop_file"] = _best_of(
+            lambda: _save_monolithic([r for r in _load_monolithic(file_path) if r['版本'] != dropped_version],
+                                     file_path), repeat=1)
+        _, results["drop_shards"] = _best_of(lambda: store.drop_version(dropped_version), repeat=1)
+
+        results["shards"] = len(store.versions())
+        results["unchanged_written"] = written
+        results["merge_written"] = merge_written
+        results["identical"] = (loaded_file == loaded_shards == records
+                                and one_version == [r for r in records if r['版本'] == dropped_version]
+                                and store.load() == remaining == _load_monolithic(file_path))
+    return results
+
+
+# ---------- 资源同步 ----------
+
+def _image_bytes(size, color):
+    """生成纯色PNG图片的字节"""
+    from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+    from PySide6.QtGui import QColor, QImage
+
+    image = QImage(size, size, QImage.Format.Format_ARGB32)
+    image.fill(QColor(color))
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    buffer.close()
+    return bytes(data)
+
+
+def _center_color(path):
+    from PySide6.QtGui import QImage
+
+    image = QImage(str(path))
+    return image.pixelColor(image.width() // 2, image.height() // 2).name()
+
+
+def _image_size(path):
+    from PySide6.QtGui import QImage
+
+    image = QImage(str(path))
+    return image.width(), image.height()
+
+
+class _StandInAssetServer:
+    """本地替身wiki服务器：POST 返回角色列表，GET 返回图片（支持 Range），记录并发数和请求"""
+
+    def __init__(self, delay=0.02):
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import parse_qs
+
+        self.delay = delay
+        self.catalogues = {}   # 列表ID -> [(名称, 图片路径)]
+        self.images = {}       # 图片路径 -> 字节
+        self.gets = []         # (图片路径, Range请求头, 状态码)
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                form = parse_qs(self.rfile.read(length).decode('utf-8'))
+                entries = server.catalogues.get(form.get('catalogueId', [''])[0], [])
+                records = [{"name": name, "content": {"contentUrl": f"{server.base_url}{path}"}}
+                           for name, path in entries]
+                self._reply(200, json.dumps({"data": {"results": {"records": records}}}).encode('utf-8'),
+                            'application/json')
+
+            def do_GET(self):
+                with server._lock:
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                try:
+                    time.sleep(server.delay)
+                    data = server.images.get(self.path)
+                    range_header = self.headers.get('Range')
+                    if data is None:
+                        status, body, headers = 404, b'', {}
+                    elif range_header:
+                        start = int(range_header.split('=')[1].split('-')[0])
+                        if start >= len(data):
+                            status, body, headers = 416, b'', {'Content-Range': f"bytes */{len(data)}"}
+                        else:
+                            status, body = 206, data[start:]
+                            headers = {'Content-Range': f"bytes {start}-{len(data) - 1}/{len(data)}"}
+                    else:
+                        status, body, headers = 200, data, {}
+                    with server._lock:
+                        server.gets.append((self.path, range_header, status))
+                    self._reply(status, body, 'image/png', headers)
+                finally:
+                    with server._lock:
+                        server.active -= 1
+
+            def _reply(self, status, body, content_type, headers=None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
+        return False
+
+    def reset_counters(self):
+        with self._lock:
+            self.gets = []
+            self.max_active = 0
+
+
+def bench_assets(rows=24, workers=4):
+    """资源同步基准与检查：本地替身服务器上对比顺序下载与并发下载，
+    并检查 .part 断点续传（地址变化时丢弃旧的 .part）、不安全的名称、内容哈希去重、变体生成，
+    以及原图被替换后重新生成变体（覆盖图片服务磁盘缓存中的旧缩略图，缓存文件数不增长）"""
+    from pathlib import Path
+    from core.asset_sync import (ASSET_KINDS, AVATAR_CATALOGUE_ID, PORTRAIT_CATALOGUE_ID, THUMBNAIL_VARIANTS,
+                                 AssetSyncer, build_local_thumbnails, get_thumbnail_path)
+
+    duplicates = max(rows // 8, 1)
+    portraits = max(rows // 4, 1)
+    results = {"rows": rows, "workers": workers}
+
+    with _StandInAssetServer() as server, tempfile.TemporaryDirectory() as temp_dir:
+        # 头像：最后 duplicates 个与前面的头像内容相同；肖像尺寸大于500，需要缩放
+        avatars = []
+        for index in range(rows):
+            path = f"/img/avatar{index}.png"
+            source = index - (rows - duplicates) if index >= rows - duplicates else index
+            server.images[path] = _image_bytes(256, f"#{(source * 40) % 256:02x}{(source * 90) % 256:02x}80")
+            avatars.append((f"头像{index}", path))
+        characters = []
+        for index in range(portraits):
+            path = f"/img/portrait{index}.webp"
+            server.images[path] = _image_bytes(800, f"#80{(index * 60) % 256:02x}{(index * 30) % 256:02x}")
+            characters.append((f"角色{index}", path))
+        # 名称不能用作文件名的条目应被跳过
+        unsafe = [("../逃逸", avatars[0][1]), ("子目录/头像", avatars[0][1]), ("..", avatars[0][1])]
+        server.catalogues = {AVATAR_CATALOGUE_ID: avatars + unsafe, PORTRAIT_CATALOGUE_ID: characters}
+        total = len(avatars) + len(characters)
+
+        def source(resources_dir, kind, name):
+            return resources_dir / kind / f"{name}{ASSET_KINDS[kind]['suffix']}"
+
+        def variant_path(variant, kind, name, resources_dir=None):
+            return get_thumbnail_path(variant, source(resources_dir or concurrent_dir, kind, name),
+                                      resources_dir or concurrent_dir)
+
+        def run(resources_dir, max_workers):
+            server.reset_counters()
+            syncer = AssetSyncer(server.base_url, max_workers, timeout=10, resources_dir=resources_dir)
+            start = time.perf_counter()
+            summary = syncer.sync()
+            return summary, round(time.perf_counter() - start, 3)
+
+        sequential_dir = Path(temp_dir) / "sequential"
+        summary, results["sequential"] = run(sequential_dir, 1)
+        results["sequential_max_active"] = server.max_active
+
+        # 并发下载前预置 .part 文件：同一地址下载了一半、同一地址已下载完整、其他地址留下的
+        concurrent_dir = Path(temp_dir) / "concurrent"
+        profile_dir = concurrent_dir / "profile"
+        profile_dir.mkdir(parents=True)
+
+        def seed_part(name, url, data):
+            (profile_dir / f"{name}.png.part").write_bytes(data)
+            (profile_dir / f"{name}.png.part.url").write_text(url, encoding='utf-8')
+
+        resume_name, resume_path = avatars[0]
+        resume_data = server.images[resume_path]
+        seed_part(resume_name, f"{server.base_url}{resume_path}", resume_data[:len(resume_data) // 2])
+        complete_name, complete_path = avatars[1]
+        seed_part(complete_name, f"{server.base_url}{complete_path}", server.images[complete_path])
+        stale_name, stale_path = avatars[2]
+        seed_part(stale_name, f"{server.base_url}/img/old.png", b"stale" * 1000)
+        summary, results["concurrent"] = run(concurrent_dir, workers)
+        results["concurrent_max_active"] = server.max_active
+        results["summary"] = {key: summary[key] for key in ("downloaded", "deduped", "variants", "failed")}
+
+        results["part_resumed"] = (
+            (resume_path, f"bytes={len(resume_data) // 2}-", 206) in server.gets
+            and (profile_dir / f"{resume_name}.png").read_bytes() == resume_data
+            and (complete_path, f"bytes={len(server.images[complete_path])}-", 416) in server.gets
+            and (profile_dir / f"{complete_name}.png").read_bytes() == server.images[complete_path]
+            and (stale_path, None, 200) in server.gets
+            and (profile_dir / f"{stale_name}.png").read_bytes() == server.images[stale_path]
+            and not any(concurrent_dir.glob("*/*.part*")))
+        results["unsafe_names_skipped"] = (
+            not any(Path(temp_dir).glob("*.png")) and not (profile_dir / "子目录").exists()
+            and len(list(profile_dir.glob("*.png"))) == len(avatars))
+        # 哪个内容相同的头像先完成是不确定的，只检查去重数量和变体内容
+        results["deduped"] = summary["deduped"] == duplicates and all(
+            _center_color(variant_path(variant, "profile", f"头像{rows - duplicates + index}"))
+            == _center_color(variant_path(variant, "profile", f"头像{index}"))
+            for index in range(duplicates) for variant in ASSET_KINDS["profile"]["variants"])
+
+        expected_variants = {kind: spec["variants"] for kind, spec in ASSET_KINDS.items()}
+        variants_ok = summary["downloaded"] + summary["deduped"] == total and summary["failed"] == 0
+        for kind, entries in (("profile", avatars), ("characters", characters)):
+            for name, _ in entries:
+                for variant in expected_variants[kind]:
+                    path = variant_path(variant, kind, name)
+                    size = THUMBNAIL_VARIANTS[variant][0]
+                    variants_ok = variants_ok and path is not None and _image_size(path) == (size, size)
+        results["variants"] = variants_ok
+
+        # 再次同步：URL与文件都未变化，不下载任何图片
+        summary, results["resync"] = run(concurrent_dir, workers)
+        results["resync_skipped"] = summary["skipped"] == total and not server.gets
+
+        # 服务器上的图片被替换（新URL）：重新下载并重新生成变体
+        replaced_name, _ = characters[0]
+        server.images["/img/portrait0-new.webp"] = _image_bytes(800, "#ff0000")
+        characters[0] = (replaced_name, "/img/portrait0-new.webp")
+        summary, _ = run(concurrent_dir, workers)
+        results["replaced_remote"] = (
+            summary["downloaded"] == 1
+            and _center_color(variant_path("portrait_500", "characters", replaced_name)) == "#ff0000")
+
+        # 本地原图被手动替换：旧变体不再有效，build_local_thumbnails 只重新生成该原图的变体
+        local_name = avatars[1][0]
+        local_source = source(concurrent_dir, "profile", local_name)
+        local_source.write_bytes(_image_bytes(256, "#00ff00"))
+        os.utime(local_source, ns=(time.time_ns() + 10 ** 9, time.time_ns() + 10 ** 9))
+        stale_hidden = variant_path("avatar_60", "profile", local_name) is None
+        generated = build_local_thumbnails(concurrent_dir)
+        results["replaced_local"] = (
+            stale_hidden
+            and generated == len(ASSET_KINDS["profile"]["variants"])
+            and _center_color(variant_path("avatar_100", "profile", local_name)) == "#00ff00"
+            and build_local_thumbnails(concurrent_dir) == 0)
+
+        # 新缩略图覆盖旧文件：每个原图的每个变体只对应一个缓存文件
+        expected_files = sum(len(ASSET_KINDS[kind]["variants"]) * len(entries)
+                             for kind, entries in (("profile", avatars), ("characters", characters)))
+        results["cache_files"] = len(list((concurrent_dir / "cache" / "thumbnails").glob("*.png")))
+        results["cache_bounded"] = results["cache_files"] == expected_files
+    return results
+
+
+BENCHMARKS = {
+    "excel": bench_excel,
+    "startup": bench_startup,
+    "snapshot": bench_snapshot,
+    "records": bench_records,
+    "columnar": bench_columnar,
+    "progress": bench_progress,
+    "matrix": bench_matrix,
+    "groups": bench_groups,
+    "shards": bench_shards,
+    "assets": bench_assets,
+}
+
+
+def run_benchmark(name, **kwargs):
+    """运行指定基准并打印结果"""
+    if name not in BENCHMARKS:
+        raise ValueError(f"未知的基准: {name}，可选: {', '.join(BENCHMARKS)}")
+    print(f"[INFO] 正在运行基准: {name}")
+    results = BENCHMARKS[name](**kwargs)
+    for key, value in results.items():
+        print(f"[INFO] {key}: {value}")
+    return results
@@ -1,9 +1,11 @@
 ﻿import os
 from PySide6.QtWidgets import QLabel
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QSize, QPointF
 from PySide6.QtGui import QPixmap, QPainter, QPen, QColor, QPainterPath
 
 from core.config import config
+from core.image_service import image_service, COVER
+from core.startup_profiler import profiler
 
 
 class CircularAvatar(QLabel):
@@ -21,6 +23,10 @@ class CircularAvatar(QLabel):
         # 边框样式
         self.border_width = 3
         self.border_color = QColor("#4a90e2")
+        self._avatar_key = None
+        # 绘制好的圆形头像，头像、主题或尺寸变化时重新生成
+        self._rendered = None
+        image_service.image_ready.connect(self._on_image_ready)
         
         # 应用主题
         self.apply_theme()
@@ -47,8 +53,21 @@ class CircularAvatar(QLabel):
         return ""
 
     def paintEvent(self, event):
-        """重绘事件，绘制圆形头像"""
+        """重绘事件，直接绘制缓存的圆形头像"""
+        device_pixel_ratio = self.devicePixelRatioF()
+        if self._rendered is None or self._rendered.devicePixelRatio() != device_pixel_ratio:
+            self._rendered = self._render_avatar(device_pixel_ratio)
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._rendered)
+        painter.end()
+
+    def _render_avatar(self, device_pixel_ratio):
+        """按物理像素绘制带边框的圆形头像"""
+        rendered = QPixmap(self.size() * device_pixel_ratio)
+        rendered.setDevicePixelRatio(device_pixel_ratio)
+        rendered.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(rendered)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         # 绘制圆形边框
@@ -70,21 +89,33 @@ class CircularAvatar(QLabel):
 
         # 绘制头像图片
         if self.pixmap() and not self.pixmap().isNull():
+            inner_size = QSize(self.width() - 2 * self.border_width,
+                               self.height() - 2 * self.border_width)
             pixmap = self.pixmap().scaled(
-                self.width() - 2 * self.border_width,
-                self.height() - 2 * self.border_width,
+                inner_size * device_pixel_ratio,
                 Qt.AspectRatioMode.KeepAspectRatioByExpanding,
                 Qt.TransformationMode.SmoothTransformation
             )
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
 
             # 计算居中位置
-            x = (self.width() - pixmap.width()) // 2
-            y = (self.height() - pixmap.height()) // 2
+            x = (self.width() - pixmap.width() / device_pixel_ratio) / 2
+            y = (self.height() - pixmap.height() / device_pixel_ratio) / 2
 
-            painter.drawPixmap(x, y, pixmap)
+            painter.drawPixmap(QPointF(x, y), pixmap)
 
         painter.end()
+        return rendered
+
+    def _invalidate(self):
+        self._rendered = None
+        self.update()
+
+    def resizeEvent(self, event):
+        self._rendered = None
+        super().resizeEvent(event)
     
+    @profiler.timed("加载头像", "image")
     def update_avatar(self, avatar_path=None):
         """更新头像"""
         # 优先使用传入的头像路径
@@ -100,15 +131,32 @@ class CircularAvatar(QLabel):
                 # 使用默认头像
                 self.current_avatar = self.default_avatar
         
-        # 加载图片
+        # 按显示尺寸在后台解码，完成前保留当前图片
+        self._avatar_key = None
         if self.current_avatar and os.path.exists(self.current_avatar):
-            pixmap = QPixmap(self.current_avatar)
-            self.setPixmap(pixmap)
+            decode_size = QSize(self.avatar_size, self.avatar_size) * self.devicePixelRatioF()
+            self._avatar_key, pixmap = image_service.request(self.current_avatar, decode_size, COVER)
+            if pixmap is not None:
+                self.setPixmap(pixmap)
         else:
             # 如果没有图片，清空
             self.clear()
         
-        self.update()
+        self._invalidate()
+
+    def prefetch(self, avatar_path):
+        """按显示尺寸提前解码头像，结果留在图片服务的内存缓存中，之后 update_avatar 可直接显示"""
+        if avatar_path and os.path.exists(avatar_path):
+            decode_size = QSize(self.avatar_size, self.avatar_size) * self.devicePixelRatioF()
+            image_service.request(avatar_path, decode_size, COVER)
+
+    def _on_image_ready(self, key, pixmap):
+        if key == self._avatar_key:
+            if pixmap.isNull():
+                self.clear()
+            else:
+                self.setPixmap(pixmap)
+            self._invalidate()
     
     def apply_theme(self, theme=None):
         """应用主题"""
@@ -121,4 +169,4 @@ class CircularAvatar(QLabel):
         else:
             self.border_color = QColor("#ffc107")  # 太阳金黄色
             
-        self.update()
\ No newline at end of file
+        self._invalidate()
\ No newline at end of file
@@ -0,0 +1,221 @@
+"""
+列存储成就索引（可选，依赖 numpy）
+把版本、分类、是否隐藏、成就组等字段编码为整数数组，筛选用布尔掩码完成，
+按分类/版本的统计用 bincount 归约，成就组去重用每组首条记录的掩码
+
+成就数量达到 COLUMNAR_MIN_ROWS 且已安装 numpy 时才启用，否则调用方使用逐条记录的实现；
+两种实现的结果完全一致。获取状态会在表格中被直接修改，因此每次调用都从记录重新读取
+"""
+
+from core.game_version import parse_version
+
+# 少于该数量时逐条处理已足够快，不值得导入 numpy
+COLUMNAR_MIN_ROWS = 5000
+
+_numpy = None
+
+
+def load_numpy():
+    """导入 numpy，未安装时返回 None"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            print("[INFO] 未安装 numpy，使用逐条筛选与统计")
+            _numpy = False
+    return _numpy or None
+
+
+def _encode(np, values):
+    """按首次出现顺序编码，返回 (编码数组, 取值列表)"""
+    index = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int32)
+    return codes, list(index)
+
+
+def _group_codes(np, achievements):
+    """成就组编码，不属于成就组的记录为 -1"""
+    index = {}
+    codes = np.fromiter(
+        (index.setdefault(group_id, len(index)) if group_id else -1
+         for group_id in (achievement.get('成就组ID') for achievement in achievements)),
+        dtype=np.int32)
+    return codes, len(index)
+
+
+def _status_masks(np, achievements):
+    """(已完成, 暂不可获取) 掩码"""
+    codes, values = _encode(np, (achievement.get('获取状态', '') for achievement in achievements))
+    lookup = np.array([value == '已完成' for value in values] or [False])
+    unavailable_lookup = np.array([value == '暂不可获取' for value in values] or [False])
+    return lookup[codes], unavailable_lookup[codes]
+
+
+class AchievementColumns:
+    """成就管理页的列存储索引，记录列表被替换后需重新创建"""
+
+    def __init__(self, np, achievements):
+        self.np = np
+        self.count = len(achievements)
+        self.versions, self.version_values = _encode(np, (a.get('版本', '') for a in achievements))
+        self.first_categories, self.first_category_values = _encode(np, (a.get('第一分类', '') for a in achievements))
+        self.second_categories, self.second_category_values = _encode(
+            np, (a.get('第二分类', '') for a in achievements))
+        self.hidden = np.fromiter((a.get('是否隐藏') == '隐藏' for a in achievements), dtype=bool)
+        self.groups, self.group_count = _group_codes(np, achievements)
+        self.absolute_ids = np.fromiter((int(a.get('绝对编号', '0')) for a in achievements), dtype=np.int64)
+
+    @classmethod
+    def build(cls, achievements):
+        """创建索引；未安装 numpy 或绝对编号无法解析时返回 None（由逐条实现处理）"""
+        np = load_numpy()
+        if np is None:
+            return None
+        try:
+            return cls(np, achievements)
+        except (ValueError, TypeError, OverflowError):
+            return None
+
+    def _equals(self, codes, values, value):
+        try:
+            return codes == values.index(value)
+        except ValueError:
+            return self.np.zeros(self.count, dtype=bool)
+
+    def filter(self, achievements, search_text="", version="", first_category="", second_category="",
+               hidden_type="all", priority="默认排序", obtainable="全部"):
+        """与 AchievementManager.filter_data 的逐条实现结果相同"""
+        np = self.np
+        mask = np.ones(self.count, dtype=bool)
+        if version and version != "所有版本":
+            mask &= self._equals(self.versions, self.version_values, version)
+        if first_category and first_category != "全部":
+            mask &= self._equals(self.first_categories, self.first_category_values, first_category)
+        if second_category and second_category != "全部":
+            mask &= self._equals(self.second_categories, self.second_category_values, second_category)
+        if hidden_type == "hidden_only":
+            mask &= self.hidden
+        elif hidden_type == "not_hidden":
+            mask &= ~self.hidden
+
+        statuses = None
+        if obtainable in ("可获取", "暂不可获取") or priority == "未完成优先":
+            statuses = [achievement.get('获取状态', '') for achievement in achievements]
+        if obtainable == "可获取":
+            mask &= np.fromiter((status != "暂不可获取" for status in statuses), dtype=bool, count=self.count)
+        elif obtainable == "暂不可获取":
+            mask &= np.fromiter((status == "暂不可获取" for status in statuses), dtype=bool, count=self.count)
+        elif obtainable == "多选一":
+            mask &= self.groups >= 0
+
+        rows = np.flatnonzero(mask)
+        # 文本搜索只检查通过其他条件的记录
+        if search_text:
+            text = search_text.lower()
+            rows = np.array([row for row in rows.tolist()
+                             if text in achievements[row].get('名称', '').lower()
+                             or text in achievements[row].get('描述', '').lower()], dtype=np.int64)
+
+        if priority == "未完成优先":
+            pending = np.array([statuses[row] not in ('', '未完成') for row in rows.tolist()], dtype=bool)
+            order = np.lexsort((self.absolute_ids[rows], pending))
+        else:
+            order = np.argsort(self.absolute_ids[rows], kind='stable')
+        return [achievements[row] for row in rows[order].tolist()]
+
+
+def _category_totals(np, categories, values, groups, normal, done, first_done):
+    """按分类统计 total/completed：普通成就逐条计数，成就组在每个分类中只计一次，
+    且仅当该组在本分类首条记录之前（含）已有完成记录时计为完成（与逐条实现的处理顺序一致）"""
+    size = len(values)
+    total = np.bincount(categories[normal], minlength=size)
+    completed = np.bincount(categories[normal & done], minlength=size)
+
+    grouped = ~normal
+    if grouped.any():
+        rows = np.flatnonzero(grouped)
+        pairs = groups[rows].astype(np.int64) * size + categories[rows]
+        unique_pairs, first = np.unique(pairs, return_index=True)
+        pair_categories = unique_pairs % size
+        pair_completed = first_done[unique_pairs // size] <= rows[first]
+        total = total + np.bincount(pair_categories, minlength=size)
+        completed = completed + np.bincount(pair_categories[pair_completed], minlength=size)
+
+    return {value: {'total': int(total[code]), 'completed': int(completed[code])}
+            for code, value in enumerate(values)}
+
+
+def _version_totals(np, achievements, groups, version_filter):
+    """按版本统计：普通成就逐条计数，成就组只按其首条记录计一次"""
+    counted = groups < 0
+    grouped_rows = np.flatnonzero(~counted)
+    if grouped_rows.size:
+        _, first = np.unique(groups[grouped_rows], return_index=True)
+        counted[grouped_rows[first]] = True
+    codes, values = _encode(np, (achievements[row].get('版本', '未知') for row in np.flatnonzero(counted).tolist()))
+
+    filter_major = parse_version(version_filter).major_label if version_filter != '全部' else None
+    labels = []
+    for version in values:
+        if version == '未知':
+            labels.append('未知')
+        elif filter_major is None:
+            labels.append(parse_version(version).major_label)
+        else:
+            labels.append(version if parse_version(version).major_label == filter_major else None)
+
+    # 版本按首次出现顺序编码，标签编码因此也按首次被计数的顺序，与逐条实现的字典顺序一致
+    label_index = {}
+    label_lookup = np.array([label_index.setdefault(label, len(label_index)) if label is not None else -1
+                             for label in labels] or [-1], dtype=np.int64)
+    label_codes = label_lookup[codes]
+    counts = np.bincount(label_codes[label_codes >= 0], minlength=len(label_index))
+    return {label: int(counts[code]) for label, code in label_index.items()}
+
+
+def calculate_statistics(achievements, version_filter='全部'):
+    """与 statistics_tab.calculate_statistics 的逐条实现结果相同，未安装 numpy 时返回 None"""
+    np = load_numpy()
+    if np is None:
+        return None
+
+    groups, _ = _group_codes(np, achievements)
+    done, unavailable = _status_masks(np, achievements)
+    normal = groups < 0
+
+    group_rows = np.flatnonzero(~normal)
+    group_ids = np.unique(groups[group_rows])
+    first_done = np.full(max(int(groups.max(initial=-1)) + 1, 1), np.iinfo(np.int64).max, dtype=np.int64)
+    done_rows = np.flatnonzero(done & ~normal)
+    np.minimum.at(first_done, groups[done_rows], done_rows)
+    completed_groups = int((first_done[group_ids] != np.iinfo(np.int64).max).sum())
+
+    first_categories, first_values = _encode(np, (a.get('第一分类', '未知') for a in achievements))
+    second_categories, second_values = _encode(np, (a.get('第二分类', '未知') for a in achievements))
+
+    stats = {
+        'total': int(group_ids.size) + int(normal.sum()),
+        'completed': int((done & normal).sum()) + completed_groups,
+        'incomplete': int(group_ids.size) - completed_groups + int((normal & ~done & ~unavailable).sum()),
+        'unavailable': int(unavailable.sum()),
+        'completion_rate': 0,
+        'categories': _category_totals(np, first_categories, first_values, groups, normal, done, first_done),
+        'subcategories': _category_totals(np, second_categories, second_values, groups, normal, done, first_done),
+        'versions': _version_totals(np, achievements, groups, version_filter)
+    }
+
+    if stats['total'] > 0:
+        stats['completion_rate'] = int(stats['completed'] * 100 / stats['total'])
+        stats['unavailable_rate'] = int(stats['unavailable'] * 100 / stats['total'])
+    return stats
+
+
+def calculate_version_stats(achievements, version_filter):
+    """与 statistics_tab 的 calculate_version_stats 结果相同，未安装 numpy 时返回 None"""
+    np = load_numpy()
+    if np is None:
+        return None
+    groups, _ = _group_codes(np, achievements)
+    return _version_totals(np, achievements, groups, version_filter)
@@ -3,6 +3,9 @@ import sys
 import os
 from pathlib import Path
 
+from core.startup_profiler import profiler
+from core.instrumentation import metrics
+
 
 def setup_resources_structure():
     """检查并创建resources文件夹结构"""
@@ -45,7 +48,35 @@ def get_resource_path(relative_path):
     return base_path / relative_path
 
 
-setup_resources_structure()
+with profiler.span("检查resources目录", "config"):
+    setup_resources_structure()
+
+
+# 用户进度文件只保存非默认状态，文件中没有的成就视为未完成
+DEFAULT_PROGRESS_STATUS = "未完成"
+
+
+def sparse_progress(progress_data):
+    """去掉默认状态（未完成或空）的进度条目"""
+    return {
+        achievement_id: progress_info for achievement_id, progress_info in progress_data.items()
+        if not (isinstance(progress_info, dict) and set(progress_info) <= {'获取状态'}
+                and progress_info.get('获取状态', '') in ('', DEFAULT_PROGRESS_STATUS))
+    }
+
+
+def write_json_atomic(file_path, data):
+    """先写入同目录的临时文件再替换，写入中断时不会留下半截文件，返回写入的字节数"""
+    payload = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    temp_path = file_path.with_name(file_path.name + ".tmp")
+    with open(temp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(temp_path, file_path)
+    return len(payload)
+
+
+# 最近使用用户列表的长度
+RECENT_USERS_LIMIT = 5
 
 
 class Config:
@@ -57,11 +88,14 @@ class Config:
         # 直接定义属性，与模板保持一致
         self.current_user = ""
         self.users = {}
+        self.recent_users = []  # 最近使用的用户（最近的在前），用于预取用户会话
         self.devcode = ""
         self.token = ""
         self.theme = "light"
         self.auto_save = True
         self.use_background = True
+        self.use_progress_matrix = True  # 多用户进度矩阵缓存（resources/cache/user_progress.matrix）
+        self.sparse_progress_migrated = False  # 旧格式的完整进度文件是否已精简（migrate_data_files）
         self.custom_background_light = ""
         self.custom_background_dark = ""
         self.current_profile = ""
@@ -121,9 +155,12 @@ class Config:
             data = {
                 "current_user": self.current_user,
                 "users": self.users,
+                "recent_users": self.recent_users,
                 "theme": self.theme,
                 "auto_save": self.auto_save,
                 "use_background": self.use_background,
+                "use_progress_matrix": self.use_progress_matrix,
+                "sparse_progress_migrated": self.sparse_progress_migrated,
                 "custom_background_light": self.custom_background_light,
                 "custom_background_dark": self.custom_background_dark,
                 "current_profile": self.current_profile,
@@ -151,12 +188,14 @@ class Config:
             user_data = {}
         self.users[username] = user_data
         self.current_user = username
+        self._touch_recent_user(username)
         self.save_config()
 
     def switch_user(self, username):
         """切换用户"""
         if username in self.users:
             self.current_user = username
+            self._touch_recent_user(username)
             self.save_config()
             # 发送用户切换信号
             from core.signal_bus import signal_bus
@@ -164,6 +203,11 @@ class Config:
             return True
         return False
 
+    def _touch_recent_user(self, username):
+        """把用户移到最近使用列表的最前面"""
+        self.recent_users = [username] + [name for name in self.recent_users
+                                          if name != username and name in self.users][:RECENT_USERS_LIMIT - 1]
+
     def get_current_user(self):
         """获取当前用户"""
         return self.current_user
@@ -223,98 +267,157 @@ class Config:
         return self.get_user_character_name(current_user)
 
     def save_base_achievements(self, achievements):
-        """保存基础成就数据"""
-        base_file = get_resource_path("resources/base_achievements.json")
+        """保存基础成就数据（按版本分片，只写入变化的分片）"""
+        from core.base_store import base_store
         try:
-            # 只保存基础信息，排除用户相关的字段
-            base_data = []
-            for achievement in achievements:
-                base_achievement = {
-                    "绝对编号": achievement.get("绝对编号", ""),  # 仅用于排序
-                    "版本": achievement.get("版本", ""),
-                    "第一分类": achievement.get("第一分类", ""),
-                    "第二分类": achievement.get("第二分类", ""),
-                    "编号": achievement.get("编号", ""),  # 作为主键
-                    "名称": achievement.get("名称", ""),
-                    "描述": achievement.get("描述", ""),
-                    "奖励": achievement.get("奖励", ""),
-                    "是否隐藏": achievement.get("是否隐藏", "")
-                }
-
-                # 添加成就组相关字段（如果有）
-                if achievement.get("成就组ID"):
-                    base_achievement["成就组ID"] = achievement.get("成就组ID")
-                if achievement.get("互斥成就"):
-                    base_achievement["互斥成就"] = achievement.get("互斥成就")
-
-                base_data.append(base_achievement)
-
-            with open(base_file, 'w', encoding='utf-8') as f:
-                json.dump(base_data, f, ensure_ascii=False, indent=2)
-            print(f"[INFO] 基础成就数据已保存到: {base_file}")
+            base_store.save(achievements)
             return True
         except Exception as e:
             print(f"[ERROR] 保存基础成就数据失败: {str(e)}")
             return False
 
-    def load_base_achievements(self):
-        """加载基础成就数据"""
-        base_file = get_resource_path("resources/base_achievements.json")
+    @profiler.timed("加载基础成就数据", "data")
+    def load_base_achievements(self, versions=None):
+        """加载基础成就数据，versions 不为 None 时只读取这些版本的分片（结果只读，不能用于保存）"""
+        from core.base_store import base_store
         try:
-            if base_file.exists():
-                with open(base_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                print("[INFO] 基础成就数据文件不存在，创建空文件")
-                # 确保目录存在
-                base_file.parent.mkdir(parents=True, exist_ok=True)
-                # 创建空文件
-                with open(base_file, 'w', encoding='utf-8') as f:
-                    json.dump([], f, ensure_ascii=False, indent=2)
-                return []
+            return base_store.load(versions)
         except Exception as e:
             print(f"[ERROR] 加载基础成就数据失败: {str(e)}")
             return []
 
-    def save_user_progress(self, username, progress_data):
-        """保存用户进度数据"""
-        # 获取用户的UID
-        users = self.get_users()
-        user_data = users.get(username, {})
-        uid = user_data.get('uid', username) if isinstance(user_data, dict) else username
+    def get_base_versions(self):
+        """基础成就数据中的版本及各版本的成就数（只读取分片清单）"""
+        from core.base_store import base_store
+        try:
+            return base_store.versions()
+        except Exception as e:
+            print(f"[ERROR] 读取基础成就清单失败: {str(e)}")
+            return {}
 
-        progress_file = get_resource_path(f"resources/user_progress_{uid}.json")
+    def delete_base_version(self, version):
+        """删除一个版本的基础成就分片，返回删除的成就数，失败时返回 None"""
+        from core.base_store import base_store
+        try:
+            return base_store.drop_version(version)
+        except Exception as e:
+            print(f"[ERROR] 删除版本 {version} 的基础成就数据失败: {str(e)}")
+            return None
+
+    def get_user_uid(self, username):
+        """获取用户的UID，没有设置时使用用户名"""
+        user_data = self.get_users().get(username, {})
+        return user_data.get('uid', username) if isinstance(user_data, dict) else username
+
+    def get_user_progress_path(self, username):
+        """用户进度文件路径"""
+        return get_resource_path(f"resources/user_progress_{self.get_user_uid(username)}.json")
+
+    def save_user_progress(self, username, progress_data):
+        """保存用户进度数据（只写入非默认状态）"""
+        progress_file = self.get_user_progress_path(username)
         try:
-            with open(progress_file, 'w', encoding='utf-8') as f:
-                json.dump(progress_data, f, ensure_ascii=False, indent=2)
+            sparse_data = sparse_progress(progress_data)
+            metrics.add_bytes(write_json_atomic(progress_file, sparse_data))
+            self._store_progress_row(username, sparse_data)
             return True
         except Exception as e:
             print(f"[ERROR] 保存用户进度数据失败: {str(e)}")
             return False
 
-    def load_user_progress(self, username):
-        """加载用户进度数据"""
-        # 获取用户的UID
-        users = self.get_users()
-        user_data = users.get(username, {})
-        uid = user_data.get('uid', username) if isinstance(user_data, dict) else username
-
-        progress_file = get_resource_path(f"resources/user_progress_{uid}.json")
+    @profiler.timed("加载用户进度", "data")
+    def load_user_progress(self, username, update_matrix=True):
+        """加载用户进度数据，没有记录的成就视为未完成；不改写或创建进度文件
+
+        update_matrix 为 False 时读取JSON文件后不写入进度矩阵（后台线程中只读取）
+        """
+        uid = self.get_user_uid(username)
+        progress_file = self.get_user_progress_path(username)
+        if self.use_progress_matrix:
+            from core.progress_matrix import progress_matrix
+            progress_data = progress_matrix.read_user(uid, progress_file)
+            if progress_data is not None:
+                return progress_data
         try:
-            if progress_file.exists():
-                with open(progress_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                print(f"[INFO] 用户 {username} (UID: {uid}) 的进度数据文件不存在，创建空数据文件")
-                # 创建空的进度数据文件
-                empty_progress = {}
-                with open(progress_file, 'w', encoding='utf-8') as f:
-                    json.dump(empty_progress, f, ensure_ascii=False, indent=2)
-                return empty_progress
+            if not progress_file.exists():
+                print(f"[INFO] 用户 {username} (UID: {uid}) 的进度数据文件不存在，视为没有进度")
+                return {}
+            with open(progress_file, 'r', encoding='utf-8') as f:
+                progress_data = json.load(f)
+            if not isinstance(progress_data, dict):
+                return progress_data
+            # 旧格式的完整进度文件由 migrate_data_files 一次性精简，这里只在内存中去掉默认状态
+            sparse_data = sparse_progress(progress_data)
+            if update_matrix:
+                self._store_progress_row(username, sparse_data)
+            return sparse_data
         except Exception as e:
             print(f"[ERROR] 加载用户进度数据失败: {str(e)}")
             return {}
 
+    def migrate_data_files(self):
+        """一次性迁移旧格式的数据文件，启动时在界面线程（或命令行）中调用，加载数据时不会改写文件
+
+        旧的单文件基础成就数据迁移为按版本分片存储；旧格式的完整进度文件（每个成就一条）
+        精简为只保存非默认状态，全部完成后记录在配置中，之后不再检查
+        """
+        from core.base_store import base_store
+        try:
+            base_store.migrate_legacy()
+        except Exception as e:
+            print(f"[ERROR] 迁移基础成就数据失败: {str(e)}")
+        if not self.sparse_progress_migrated:
+            self._migrate_sparse_progress()
+
+    def _migrate_sparse_progress(self):
+        """把旧格式的完整进度文件精简为只保存非默认状态"""
+        for username in list(self.get_users()):
+            progress_file = self.get_user_progress_path(username)
+            if not progress_file.exists():
+                continue
+            try:
+                with open(progress_file, 'r', encoding='utf-8') as f:
+                    progress_data = json.load(f)
+            except Exception as e:
+                print(f"[WARNING] 读取用户 {username} 的进度文件失败，跳过精简: {str(e)}")
+                continue
+            if not isinstance(progress_data, dict):
+                continue
+            sparse_data = sparse_progress(progress_data)
+            if len(sparse_data) < len(progress_data):
+                print(f"[INFO] 精简用户 {username} (UID: {self.get_user_uid(username)}) 的进度文件: "
+                      f"{len(progress_data)} -> {len(sparse_data)} 条")
+                if not self.save_user_progress(username, sparse_data):
+                    # 下次启动时重试
+                    return
+        self.sparse_progress_migrated = True
+        if self.users:
+            self.save_config()
+
+    def load_all_user_progress(self):
+        """加载所有用户的进度数据，返回 {用户名: 进度}；进度矩阵中有效的行一次解码，其余用户读取JSON文件"""
+        users = list(self.get_users())
+        all_progress = {}
+        if self.use_progress_matrix:
+            from core.progress_matrix import progress_matrix
+            rows = progress_matrix.read_users(
+                {self.get_user_uid(username): self.get_user_progress_path(username) for username in users})
+            for username in users:
+                uid = str(self.get_user_uid(username))
+                if uid in rows:
+                    all_progress[username] = rows[uid]
+        for username in users:
+            if username not in all_progress:
+                all_progress[username] = self.load_user_progress(username)
+        return all_progress
+
+    def _store_progress_row(self, username, progress_data):
+        """把用户进度同步到进度矩阵"""
+        if self.use_progress_matrix:
+            from core.progress_matrix import progress_matrix
+            progress_matrix.store_user(self.get_user_uid(username), self.get_user_progress_path(username),
+                                       progress_data)
+
     def save_category_config(self, category_config):
         """保存分类配置"""
         config_file = get_resource_path("resources/category_config.json")
@@ -327,6 +430,7 @@ class Config:
             print(f"[ERROR] 保存分类配置失败: {str(e)}")
             return False
 
+    @profiler.timed("加载分类配置", "data")
     def load_category_config(self):
         """加载分类配置"""
         config_file = get_resource_path("resources/category_config.json")
@@ -392,8 +496,13 @@ class Config:
             }
         }
 
+    @metrics.timed("重新编码用户存档")
     def reencode_all_user_progress(self):
-        """重新编码所有用户的存档数据和基础数据"""
+        """重新编码所有用户的存档数据和基础数据
+
+        只有编号前缀或顺序变化的分类会重新编号；基础数据没有变化时不重写，
+        用户进度只修补编号变化的条目，没有受影响条目的用户不重写
+        """
         try:
             # 加载基础成就数据
             base_achievements = self.load_base_achievements()
@@ -401,250 +510,84 @@ class Config:
                 print("[ERROR] 基础成就数据为空，无法重新编码")
                 return False
 
-            # 导入成就管理器来重新编号
-            from core.manage_tab import ManageTab
-            manage_tab = ManageTab()
-
-            # 先保存原始编号映射（使用成就名称+第一分类+第二分类作为唯一标识）
-            original_mapping = {}
-            for achievement in base_achievements:
-                # 使用成就名称+第一分类+第二分类作为唯一标识
-                name = achievement.get('名称', '')
-                first_cat = achievement.get('第一分类', '')
-                second_cat = achievement.get('第二分类', '')
-                code = achievement.get('编号', '')
-                abs_id = achievement.get('绝对编号', '')
-
-                if name and first_cat and second_cat and code:
-                    key = f"{name}|{first_cat}|{second_cat}"
-                    original_mapping[key] = {
-                        'code': code,
-                        'abs_id': abs_id
-                    }
-
-            # 复制一份基础数据用于重新编号
-            import copy
-            achievements_for_reencode = copy.deepcopy(base_achievements)
-
-            # 使用新的分类配置重新生成编号和绝对编号
-            reencoded_achievements, old_to_new_id_map = manage_tab._smart_reencode_achievements(
-                achievements_for_reencode)
-
-            # 创建编号映射：旧编号 -> 新编号
-            id_mapping = {}
-            # 创建绝对编号映射：旧绝对编号 -> 新绝对编号
-            abs_id_mapping = {}
-
-            # 创建成就名称到新编号的映射
-            name_to_new_id = {}
-            for achievement in reencoded_achievements:
-                name = achievement.get('名称', '')
-                first_cat = achievement.get('第一分类', '')
-                second_cat = achievement.get('第二分类', '')
-                new_id = achievement.get('编号', '')
-                new_abs_id = achievement.get('绝对编号', '')
-
-                if name and first_cat and second_cat and new_id:
-                    key = f"{name}|{first_cat}|{second_cat}"
-                    name_to_new_id[key] = new_id
-
-            # 为每个用户创建个性化的编号映射
-            user_id_mappings = {}
-            users = self.get_users()
+            # 导入重新编号逻辑（不依赖界面，命令行下也可使用）
+            from core.achievement_ops import reencode_achievements
 
-            for username in users:
-                user_progress = self.load_user_progress(username)
-                if not user_progress:
-                    continue
+            original_codes = set(achievement.get('编号', '') for achievement in base_achievements)
 
-                user_id_mapping = {}
-                print(f"[DEBUG] 为用户 {username} 创建编号映射...")
-
-                # 遍历用户进度中的每个成就
-                for old_id in user_progress.keys():
-                    # 在重新编码后的成就中查找匹配的成就
-                    found = False
-                    for achievement in reencoded_achievements:
-                        if achievement.get('编号', '') == old_id:
-                            # 如果编号没变，不需要映射
-                            found = True
-                            break
-
-                    if not found:
-                        # 编号变了，需要通过名称查找新编号
-                        # 在原始成就中查找这个编号对应的成就
-                        for achievement in base_achievements:
-                            if achievement.get('编号', '') == old_id:
-                                name = achievement.get('名称', '')
-                                first_cat = achievement.get('第一分类', '')
-                                second_cat = achievement.get('第二分类', '')
-                                key = f"{name}|{first_cat}|{second_cat}"
-                                new_id = name_to_new_id.get(key, '')
-
-                                if new_id and new_id != old_id:
-                                    user_id_mapping[old_id] = new_id
-                                    print(f"[DEBUG] 用户 {username} 编号映射: {old_id} -> {new_id}")
-                                break
-
-                user_id_mappings[username] = user_id_mapping
-
-            # 使用第一个用户的映射作为全局映射（保持兼容性）
-            if user_id_mappings:
-                first_user = list(user_id_mappings.keys())[0]
-                id_mapping = user_id_mappings[first_user]
+            # 使用新的分类配置重新生成编号和绝对编号（只包含编号变化的成就：旧编号 -> 新编号）
+            result = reencode_achievements(base_achievements)
+            reencoded_achievements = result.achievements
+            id_mapping = result.id_map
 
             # 更新成就组的互斥成就列表
             print("[DEBUG] 开始更新成就组的互斥成就列表...")
-            self._update_achievement_groups_mutex_relations(reencoded_achievements, id_mapping)
+            mutex_changed = self._update_achievement_groups_mutex_relations(reencoded_achievements, id_mapping)
             print("[DEBUG] 成就组的互斥成就列表更新完成")
 
-            # 检查基础成就数据是否被错误修改
-            print("[DEBUG] 检查基础成就数据完整性...")
-            for i, achievement in enumerate(reencoded_achievements):
-                if i < 5:  # 只检查前5个
-                    for key, value in achievement.items():
-                        if isinstance(value, list) and key != '互斥成就':
-                            print(
-                                f"[ERROR] 基础成就数据中发现非互斥成就的列表格式: {key} -> {type(value)}, 值: {value}")
-
-            # 按绝对编号排序后再保存基础数据
-            sorted_achievements = sorted(reencoded_achievements, key=lambda x: int(x.get('绝对编号', '0')))
-
-            # 检查基础成就数据是否被错误修改
-            print("[DEBUG] 检查基础成就数据完整性...")
-            print(f"[DEBUG] 重新编码后的成就数量: {len(sorted_achievements)}")
-            print(f"[DEBUG] 原始成就数量: {len(base_achievements)}")
-
             # 检查是否有成就丢失
-            reencoded_codes = set(achievement.get('编号', '') for achievement in sorted_achievements)
-            original_codes = set(achievement.get('编号', '') for achievement in base_achievements)
-
-            missing_codes = original_codes - reencoded_codes
+            reencoded_codes = set(achievement.get('编号', '') for achievement in reencoded_achievements)
+            missing_codes = original_codes - reencoded_codes - set(id_mapping)
             if missing_codes:
                 print(f"[ERROR] 重新编码后丢失的成就编号: {missing_codes}")
 
-            extra_codes = reencoded_codes - original_codes
-            if extra_codes:
-                print(f"[DEBUG] 重新编码后新增的成就编号: {extra_codes}")
-
-            for i, achievement in enumerate(reencoded_achievements):
-                if i < 5:  # 只检查前5个
-                    for key, value in achievement.items():
-                        if isinstance(value, list) and key != '互斥成就':
-                            print(f"[ERROR] 基础成就数据中发现列表格式: {key} -> {type(value)}, 值: {value}")
-                        elif key == '互斥成就' and not isinstance(value, list):
-                            print(f"[DEBUG] 互斥成就数据格式正常: {key} -> {type(value)}, 值: {value}")
-
-            # 保存重新编码后的基础数据
-            if not self.save_base_achievements(sorted_achievements):
-                print("[ERROR] 保存重新编码后的基础成就数据失败")
-                return False
-            print("[INFO] 基础成就数据已更新")
+            # 保存重新编码后的基础数据（已按绝对编号排序）
+            if result.changed or mutex_changed:
+                if not self.save_base_achievements(reencoded_achievements):
+                    print("[ERROR] 保存重新编码后的基础成就数据失败")
+                    return False
+                print("[INFO] 基础成就数据已更新")
+            else:
+                print("[INFO] 基础成就数据无需更新")
 
-            # 获取所有用户
-            users = self.get_users()
+            # 更新受影响用户的进度数据
             updated_count = 0
-
-            # 更新每个用户的进度数据
-            for username in users:
-                # 加载用户进度
-                user_progress = self.load_user_progress(username)
-
+            updated_users = 0
+            all_progress = self.load_all_user_progress()
+            for username in self.get_users():
+                user_progress = all_progress.get(username)
                 if not user_progress:
                     continue
-
-                # 获取该用户的编号映射
-                user_id_mapping = user_id_mappings.get(username, {})
-
-                # 调试：检查用户进度数据
-                print(f"[DEBUG] 处理用户: {username}")
-                print(f"[DEBUG] 用户进度数据类型: {type(user_progress)}")
-                if isinstance(user_progress, dict):
-                    print(f"[DEBUG] 用户进度键数量: {len(user_progress)}")
-                    # 检查前几个键值对的格式
-                    for i, (key, value) in enumerate(user_progress.items()):
-                        if i < 3:  # 只检查前3个
-                            print(f"[DEBUG] 键: {key}, 值类型: {type(value)}, 值: {value}")
-                else:
+                if not isinstance(user_progress, dict):
                     print(f"[ERROR] 用户进度数据格式错误，期望dict，实际{type(user_progress)}")
                     continue
 
-                # 创建新的进度数据
-                new_progress = {}
+                # 进度文件只保存非默认状态，只有编号变化、成就已不存在或格式错误的条目需要修补
+                affected = [code for code, progress_info in user_progress.items()
+                            if code in id_mapping or code not in reencoded_codes
+                            or not isinstance(progress_info, dict)]
+                if not affected:
+                    continue
 
-                # 更新成就进度中的编号
+                new_progress = {}
                 for old_id, progress_info in user_progress.items():
-                    # 查找新编号（使用该用户的映射）
-                    new_id = user_id_mapping.get(old_id, old_id)
+                    new_id = id_mapping.get(old_id, old_id)
 
                     # 检查progress_info的类型，确保是字典格式
                     if not isinstance(progress_info, dict):
                         print(f"[ERROR] 用户进度数据格式错误: {old_id} -> {type(progress_info)}, 期望dict")
-                        print(f"[ERROR] 进度信息内容: {progress_info}")
-                        print(f"[ERROR] 前一个键: {prev_key if 'prev_key' in locals() else 'None'}")
-                        print(f"[ERROR] 前一个值类型: {type(prev_value) if 'prev_value' in locals() else 'None'}")
-                        # 尝试修复格式
                         if isinstance(progress_info, list) and len(progress_info) > 0:
                             # 如果是列表，尝试使用第一个元素作为状态
-                            print(f"[DEBUG] 修复列表格式: {progress_info} -> {{'获取状态': {str(progress_info[0])}}}")
                             progress_info = {'获取状态': str(progress_info[0])}
                         else:
-                            # 其他情况，设置为未完成
-                            print(f"[DEBUG] 修复其他格式: {progress_info} -> {{'获取状态': '未完成'}}")
                             progress_info = {'获取状态': '未完成'}
 
-                    # 使用新编号（如果有变化）或保持原编号
+                    if new_id not in reencoded_codes:
+                        print(f"[DEBUG] 移除多余的进度 {old_id}")
+                        continue
                     new_progress[new_id] = progress_info
-
-                    # 如果编号有变化，增加计数
                     if new_id != old_id:
                         updated_count += 1
 
-                    # 保存当前键值对，用于调试
-                    prev_key = old_id
-                    prev_value = progress_info
-
-                # 检查是否有成就没有对应的进度
-                if len(new_progress) < len(reencoded_achievements):
-                    print(
-                        f"[WARNING] 用户 {username} 的进度数量({len(new_progress)})少于成就数量({len(reencoded_achievements)})")
-
-                    # 找出缺失的成就
-                    achievement_ids = set(achievement.get('编号', '') for achievement in reencoded_achievements)
-                    progress_ids = set(new_progress.keys())
-                    missing_ids = achievement_ids - progress_ids
-
-                    if missing_ids:
-                        print(f"[DEBUG] 缺失进度的成就编号: {sorted(list(missing_ids))}")
-                        # 为缺失的成就添加默认进度
-                        for missing_id in missing_ids:
-                            new_progress[missing_id] = {'获取状态': '未完成'}
-                            print(f"[DEBUG] 为成就 {missing_id} 添加默认进度")
-                elif len(new_progress) > len(reencoded_achievements):
-                    print(
-                        f"[WARNING] 用户 {username} 的进度数量({len(new_progress)})多于成就数量({len(reencoded_achievements)})")
-
-                    # 找出多余的进度
-                    achievement_ids = set(achievement.get('编号', '') for achievement in reencoded_achievements)
-                    progress_ids = set(new_progress.keys())
-                    extra_ids = progress_ids - achievement_ids
-
-                    if extra_ids:
-                        # 移除多余的进度
-                        for extra_id in extra_ids:
-                            del new_progress[extra_id]
-                            print(f"[DEBUG] 移除多余的进度 {extra_id}")
-
                 # 按编号顺序排序后再保存用户进度
                 sorted_progress = dict(sorted(new_progress.items(), key=lambda x: x[0]))
-
-                # 保存更新后的进度
                 if self.save_user_progress(username, sorted_progress):
-                    print(f"[INFO] 用户 {username} 的进度数据已更新")
+                    updated_users += 1
+                    print(f"[INFO] 用户 {username} 的进度数据已更新（{len(affected)} 条受影响）")
                 else:
                     print(f"[ERROR] 保存用户 {username} 的进度数据失败")
 
-            print(f"[INFO] 重新编码完成，共更新 {updated_count} 条记录")
+            print(f"[INFO] 重新编码完成，共更新 {updated_count} 条记录，{updated_users} 个用户的进度")
             return True
 
         except Exception as e:
@@ -652,40 +595,24 @@ class Config:
             return False
 
     def _update_achievement_groups_mutex_relations(self, achievements, id_mapping):
-        """更新成就组的互斥成就列表"""
+        """更新成就组的互斥成就列表，返回是否有列表发生变化"""
         try:
-            # 收集所有成就组
-            groups = {}
-            for achievement in achievements:
-                group_id = achievement.get('成就组ID')
-                if group_id:
-                    if group_id not in groups:
-                        groups[group_id] = []
-                    groups[group_id].append(achievement)
-
-            # 为每个成就组更新互斥关系
-            updated_groups = 0
-            for group_id, members in groups.items():
-                if len(members) < 2:
-                    continue  # 至少需要2个成员才有互斥关系
-
-                # 获取组内所有成员的新编号
-                member_codes = [member.get('编号', '') for member in members]
-
-                # 为每个成员更新互斥列表
-                for member in members:
-                    current_code = member.get('编号', '')
-                    # 互斥列表 = 组内其他成员的新编号
-                    mutex_list = [code for code in member_codes if code != current_code]
-                    member['互斥成就'] = mutex_list
-
-                updated_groups += 1
-
+            from core.achievement_groups import AchievementGroupIndex
+            groups = AchievementGroupIndex(achievements)
 
+            # 为每个成就组更新互斥关系（互斥列表 = 组内其他成员的新编号）
+            changed = False
+            for group_id in groups.group_ids():
+                if len(groups.members(group_id)) < 2:
+                    continue  # 至少需要2个成员才有互斥关系
+                changed = groups.update_mutex(group_id) or changed
+            return changed
 
         except Exception as e:
             print(f"[ERROR] 更新成就组互斥关系失败: {str(e)}")
+            return False
 
 
 # 创建全局配置实例
-config = Config()
\ No newline at end of file
+with profiler.span("加载配置", "config"):
+    config = Config()
\ No newline at end of file
@@ -1,382 +1,193 @@
 ﻿from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
                                QTableWidget, QTableWidgetItem, QLineEdit,
                                QGroupBox, QFileDialog)
-from PySide6.QtCore import Qt, QThread, Signal, QObject
+from PySide6.QtCore import Qt, QThread
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QColor
 import json
-
-import requests
-from bs4 import BeautifulSoup
-import re
-import html
 import os
 
+from core.achievement_crawler import AchievementCrawler
 from core.config import config
+from core.game_version import sort_versions
 from core.manage_tab import show_notification
 from core.signal_bus import signal_bus
 from core.styles import (get_button_style, get_font_gray_style)
 
 
-class AchievementCrawler(QObject):
-    """成就爬虫类"""
-    progress = Signal(str)
-    finished = Signal(list)
-    error = Signal(str)
+def _crawl_excel_row_to_achievement(row, col_index, first_category_map):
+    """将Excel中的一行清洗为爬取成就数据，第一分类无法确定时留空"""
+    from core.background_jobs import RowError
 
-    def __init__(self, target_version=None):
-        super().__init__()
-        self.target_version = target_version
-        self.devcode = ""
-        self.token = ""
-        
-        # 从配置文件加载分类配置
-        self.category_config = config.load_category_config()
-        self.first_categories = self.category_config.get("first_categories", {})
-        self.second_categories = self.category_config.get("second_categories", {})
-        
-        # 创建第二分类到第一分类的映射
-        self.first_category_map = {}
-        for first_cat, second_cats in self.second_categories.items():
-            for second_cat in second_cats:
-                self.first_category_map[second_cat] = first_cat
-    
-    def _load_auth_config(self):
-        """从配置中加载认证信息"""
-        self.devcode, self.token = config.get_auth_data()
+    achievement = {}
 
-    def crawl(self):
-        try:
-            # 加载认证信息
-            self._load_auth_config()
-            self.progress.emit("正在获取成就数据...")
-            data = self.get_achievement_data()
-            if data:
-                self.progress.emit("解析成就数据...")
-                achievements = self.parse_achievements_data(data, self.target_version)
-                self.finished.emit(achievements)
-            else:
-                self.error.emit("获取数据失败")
-        except Exception as e:
-            self.error.emit(str(e))
+    # 1. 名称列：去除「隐藏成就」
+    name_value = row[col_index['名称']]
+    name = str(name_value).strip() if name_value else ''
+    if '「隐藏成就」' in name:
+        name = name.replace('「隐藏成就」', '').strip()
+    achievement['名称'] = name
 
-    def get_achievement_data(self):
-        from core.config import get_resource_path
-        import json
-        
-        cache_file = get_resource_path("resources") / "achievement_cache.json"
-        
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cached_data = json.load(f)
-                self.progress.emit("使用本地缓存数据...")
-                print("[INFO] 使用本地缓存数据")
-                return cached_data
-            except Exception as e:
-                print(f"[WARNING] 读取缓存失败: {str(e)}，将重新请求")
-        
-        url = "https://api.kurobbs.com/wiki/core/catalogue/item/getEntryDetail"
-        headers = {
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6',
-            'Connection': 'keep-alive',
-            'Content-Type': 'application/x-www-form-urlencoded;charset=UTF-8',
-            'Origin': 'https://wiki.kurobbs.com',
-            'Referer': 'https://wiki.kurobbs.com/',
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'devcode': self.devcode,
-            'token': self.token,
-            'wiki_type': '9'
-        }
-        data = {'id': '1220879855033786368'}
+    # 2. 描述列
+    desc_value = row[col_index['描述']] if '描述' in col_index else ''
+    description = str(desc_value).strip() if desc_value else ''
+    achievement['描述'] = description
 
-        try:
-            response = requests.post(url, headers=headers, data=data, timeout=30)
-            response.encoding = 'utf-8'
-            response_data = response.json()
-            
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(response_data, f, ensure_ascii=False, indent=2)
-            print(f"[INFO] 已保存缓存到: {cache_file}")
-            
-            return response_data
-        except Exception as e:
-            raise Exception(f"网络请求失败: {str(e)}")
-
-    def clean_text(self, text):
-        if text is None:
-            return ""
-        text = re.sub(r'\s+', ' ', text).strip()
-        text = html.unescape(text)
-        return text
-
-    def parse_html_table(self, html_content):
-        achievements = []
-        soup = BeautifulSoup(html_content, 'html.parser')
-        rows = soup.find_all('tr')
-
-        for row in rows[1:]:
-            cells = row.find_all('td')
-            if len(cells) >= 5:
-                name_text = self.clean_text(cells[0].get_text(strip=True))
-                is_hidden = '隐藏成就' in name_text
-
-                if '「隐藏成就」' in name_text:
-                    name_text = name_text.replace('「隐藏成就」', '').strip()
-
-                # 从data-filter-tag属性中获取分类信息
-                filter_tag = row.get('data-filter-tag', '')
-                categories = []
-                if filter_tag:
-                    # 分割filter_tag获取分类信息
-                    tags = filter_tag.split(',')
-                    for tag in tags:
-                        if tag.startswith('合集-'):
-                            category = tag[3:]  # 去掉'合集-'前缀
-                            categories.append(category)
-                
-                # 使用合集作为第二分类
-                second_category = categories[0] if categories else self.clean_text(cells[2].get_text(strip=True))
-                
-                achievement = {
-                    '名称': name_text,
-                    '版本': self.clean_text(cells[1].get_text(strip=True)),
-                    '第一分类': '',  # 第一分类需要后续推断
-                    '第二分类': second_category,
-                    '描述': self.clean_text(cells[3].get_text(strip=True)),
-                    '奖励': self.clean_text(cells[4].get_text(strip=True)),
-                    '是否隐藏': '隐藏' if is_hidden else ''
-                }
-                achievements.append(achievement)
-        return achievements
-    
-    def parse_html_table_with_categories(self, html_content):
-                """解析包含折叠分类结构的HTML表格"""
-                achievements = []
-                soup = BeautifulSoup(html_content, 'html.parser')
-                
-                # 查找所有的details标签
-                details_list = soup.find_all('details', class_='kr-collapse-details')
-                
-                for details in details_list:
-                    # 获取第一分类名称
-                    summary = details.find('summary', class_='kr-collapse-summary')
-                    if summary:
-                        first_category = self.clean_text(summary.get_text(strip=True))
-                    else:
-                        first_category = ''
-                    
-                    # 在details内查找表格
-                    table = details.find('table', class_='kr-table-filter')
-                    if not table:
-                        continue
-                        
-                    # 查找表格中的所有行
-                    rows = table.find_all('tr')
-                    
-                    # 跳过表头行
-                    for row in rows[1:]:
-                        cells = row.find_all('td')
-                        if len(cells) >= 5:
-                            name_text = self.clean_text(cells[0].get_text(strip=True))
-                            is_hidden = '隐藏成就' in name_text
-        
-                            if '「隐藏成就」' in name_text:
-                                name_text = name_text.replace('「隐藏成就」', '').strip()
-        
-                            # 从data-filter-tag属性中获取分类信息
-                            filter_tag = row.get('data-filter-tag', '')
-                            second_category = ''
-                            if filter_tag:
-                                # 分割filter_tag获取分类信息
-                                tags = filter_tag.split(',')
-                                for tag in tags:
-                                    if tag.startswith('合集-'):
-                                        second_category = tag[3:]  # 去掉'合集-'前缀
-                                        break
-                            
-                            # 如果没有从filter-tag获取到，使用第三列
-                            if not second_category and len(cells) > 2:
-                                second_category = self.clean_text(cells[2].get_text(strip=True))
-        
-                            achievement = {
-                                '名称': name_text,
-                                '版本': self.clean_text(cells[1].get_text(strip=True)),
-                                '第一分类': first_category,
-                                '第二分类': second_category,
-                                '描述': self.clean_text(cells[3].get_text(strip=True)),
-                                '奖励': self.clean_text(cells[4].get_text(strip=True)),
-                                '是否隐藏': '隐藏' if is_hidden else ''
-                            }
-                            achievements.append(achievement)
-                
-                return achievements
-    
-    def parse_achievements_data(self, api_data, target_version=None):
-        achievements = []
-        try:
-            content = api_data.get('data', {}).get('content', {})
-            modules = content.get('modules', [])
-
-            for module in modules:
-                components = module.get('components', [])
-                for component in components:
-                    if component.get('type') == 'filter-component':
-                        html_content = component.get('content', '')
-                        parsed = self.parse_html_table_with_categories(html_content)
-                        achievements.extend(parsed)
-            
-            print(f"[DEBUG] 过滤后剩余 {len(achievements)} 条成就数据")
+    # 3. 版本列：没有小数点时补充.0
+    version_value = row[col_index['版本']] if '版本' in col_index else ''
+    version = str(version_value).strip() if version_value else ''
+    if version and '.' not in version:
+        version = f"{version}.0"
+    achievement['版本'] = version
 
-            # 必须有target_version才进行筛选
-            if not target_version:
-                raise Exception("必须指定版本号才能爬取数据")
-                
-            version_filtered = [ach for ach in achievements if ach.get('版本') == target_version]
-            print(f"[DEBUG] 版本 {target_version} 筛选后剩余 {len(version_filtered)} 条成就数据")
-            
-            if not version_filtered:
-                raise Exception(f"版本 {target_version} 没有找到任何成就数据")
-                
-            achievements = version_filtered
-                
-        except Exception as e:
-            raise Exception(f"解析数据失败: {str(e)}")
+    # 4. 奖励列：纯数字拼接"星声*"
+    reward_value = row[col_index['奖励']] if '奖励' in col_index else ''
+    reward = str(reward_value).strip() if reward_value else ''
+    if reward.isdigit():
+        reward = f"星声*{reward}"
+    achievement['奖励'] = reward
 
-        return achievements
-    
-    
-    
-    def fill_serial_numbers(self, achievements):
-            """根据分类自动填充绝对编号和编号"""
-            # 获取分类配置
-            first_categories = self.first_categories
-            second_categories = self.second_categories
-            
-            def get_sort_key(achievement):
-                """获取排序键"""
-                # 第一分类排序
-                first_cat = achievement.get('第一分类', '')
-                first_order = first_categories.get(first_cat, 999)
-
-                # 第二分类排序
-                second_cat = achievement.get('第二分类', '')
-                first_cat_second = second_categories.get(first_cat, {})
-                second_order = int(first_cat_second.get(second_cat, 999)) if second_cat in first_cat_second else 999
-
-                # 版本号排序（浮点型正序）
-                version_str = achievement.get('version', '0.0')
-                try:
-                    version = float(version_str)
-                except ValueError:
-                    version = 0.0
+    # 5. 是否隐藏列：简化判断，只判断是否包含"隐藏"
+    if '是否隐藏' in col_index:
+        hidden_value = row[col_index['是否隐藏']]
+        is_hidden = str(hidden_value).strip() if hidden_value else ''
+        achievement['是否隐藏'] = '隐藏' if '隐藏' in is_hidden else ''
+    else:
+        # 根据名称判断
+        achievement['是否隐藏'] = '隐藏' if '隐藏' in name else ''
 
-                # 原编号（用于保持相对稳定）
-                original_id = achievement.get('serial_number', '99999999')
+    # 6. 第二分类列：必须有
+    second_category_value = row[col_index['第二分类']]
+    second_category = str(second_category_value).strip() if second_category_value else ''
+    if not second_category:
+        raise RowError("第二分类不能为空", '第二分类')
+    achievement['第二分类'] = second_category
 
-                return (first_order, second_order, version, original_id)
-            
-            # 按新规则排序
-            sorted_achievements = sorted(achievements, key=get_sort_key)
-            # 用于跟踪每个分类组合的当前序号
-            current_numbers = {}
-            
-            # 为每个成就分配编号
-            for achievement in sorted_achievements:
-                first_cat = achievement.get('第一分类', '')
-                second_cat = achievement.get('第二分类', '')
-                
-                if not first_cat or not second_cat:
-                    achievement['serial_number'] = ''
-                    continue
-                
-                # 获取第一分类
-                first_category_detail = first_cat
-                first_category = self.get_first_category(first_category_detail)
-                
-                # 获取第二分类后缀
-                suffix = self.get_second_category_suffix(first_category, second_cat)
-                
-                # 获取第一分类排序号
-                first_category_order = self.first_categories.get(first_category, 1)
-                
-                # 生成完整前缀：第一分类(1位) + 第二分类后缀(补齐到3位)
-                # 确保第二分类后缀至少3位，不足前面补0
-                suffix_padded = f"{int(suffix):03d}"
-                full_prefix = f"{first_category_order}{suffix_padded}"
-                
-                # 获取当前序号
-                category_key = (first_cat, second_cat)
-                current_num = current_numbers.get(category_key, 1)
-                
-                # 生成编号：4位分类码 + 4位序号
-                achievement['serial_number'] = f"{full_prefix}{current_num:04d}"
-                
-                # 更新序号
-                current_numbers[category_key] = current_num + 1
-            
-            return sorted_achievements
-    
-    def get_first_category(self, first_category_detail):
-        """获取第一分类，如果不存在则智能分配并添加到配置"""
-        # 如果分类已存在，直接返回
-        if first_category_detail in self.first_categories:
-            return first_category_detail
-        
-        # 为新分类分配排序号（当前最大排序号+1）
-        max_order = max(self.first_categories.values()) if self.first_categories else 0
-        new_order = max_order + 1
-        
-        # 添加新分类到配置
-        self.first_categories[first_category_detail] = new_order
-        self.second_categories[first_category_detail] = {}
-        
-        # 保存配置
-        self.save_category_config()
-        
-        return first_category_detail
-    
-    def get_second_category_suffix(self, first_category, second_category):
-        """获取第二分类后缀，如果不存在则智能分配"""
-        # 获取该第一分类下的第二分类配置
-        category_config = self.second_categories.get(first_category, {})
-        
-        # 如果已存在，返回现有后缀
-        if second_category in category_config:
-            return category_config[second_category]
-        
-        # 智能分配新后缀
-        existing_suffixes = set()
-        for suffix in category_config.values():
-            try:
-                existing_suffixes.add(int(suffix))
-            except (ValueError, TypeError):
-                pass
-        
-        # 找到最小的未使用后缀
-        new_suffix = 10
-        while new_suffix in existing_suffixes:
-            new_suffix += 10
-        
-        # 保存新配置
-        category_config[second_category] = str(new_suffix)
-        self.second_categories[first_category] = category_config
-        
-        # 保存到配置文件
-        self.save_category_config()
-        
-        return str(new_suffix)
-    
-    def save_category_config(self):
-        """保存分类配置到文件"""
-        updated_config = {
-            "first_categories": self.first_categories,
-            "second_categories": self.second_categories
-        }
-        from core.config import config
-        config.save_category_config(updated_config)
-        print("[INFO] 分类配置已保存")
+    # 7. 第一分类列：如果没有提供，根据第二分类获取
+    first_category = ''
+    if '第一分类' in col_index:
+        first_category_value = row[col_index['第一分类']]
+        first_category = str(first_category_value).strip() if first_category_value else ''
+    if not first_category:
+        first_category = first_category_map.get(second_category, '')
+    achievement['第一分类'] = first_category
+
+    return achievement
+
+
+def _crawl_excel_import_job(job, excel_path):
+    """后台线程：读取并清洗Excel数据，不访问界面控件"""
+    from core.excel_io import ExcelRowReader
+    from core.achievement_ops import load_first_category_map
+    from core.background_jobs import RowErrorReport, run_in_batches
+
+    # 流式读取Excel文件（read_only），表头与列索引只解析一次
+    print(f"[INFO] 正在读取Excel文件: {excel_path}")
+    with ExcelRowReader(excel_path, detect_info_row=False) as reader:
+        # 检查必要的列
+        missing_columns = reader.missing_columns(['名称', '第二分类'])
+        if missing_columns:
+            raise Exception(f"缺少必要的列: {', '.join(missing_columns)}")
+
+        # 列名到索引的映射
+        col_index = reader.col_index
+
+        # 数据清洗和转换
+        print(f"[INFO] 开始数据清洗...")
+        first_category_map = load_first_category_map()
+        errors = RowErrorReport()
+        missing_categories = set()
+
+        def transform(row_idx, row):
+            achievement = _crawl_excel_row_to_achievement(row, col_index, first_category_map)
+            if not achievement['第一分类']:
+                # 找不到对应的第一分类，收集所有缺失的分类后统一提示
+                missing_categories.add(achievement['第二分类'])
+                return None
+            return achievement
+
+        cleaned_achievements = run_in_batches(job, reader.iter_rows(), transform, errors,
+                                              total=reader.total_rows, message="正在清洗数据")
+
+    # 任一行失败时不提交任何数据
+    if errors:
+        print(f"[ERROR] Excel中有 {len(errors)} 行数据校验失败，未导入任何数据")
+        return {"errors": errors, "report_path": errors.save_next_to(excel_path)}
+    return {"achievements": cleaned_achievements, "missing_categories": missing_categories}
+
+
+def _crawl_json_export_job(job, json_path, achievements):
+    """后台线程：导出全字段 JSON，先写临时文件，完成后再替换目标文件"""
+    from core.background_jobs import iter_in_batches
+
+    export_data = []
+    for achievement in iter_in_batches(job, achievements, message="正在整理导出数据"):
+        export_data.append({
+            '绝对编号': achievement.get('绝对编号', ''),
+            '版本': achievement.get('版本', ''),
+            '第一分类': achievement.get('第一分类', ''),
+            '第二分类': achievement.get('第二分类', ''),
+            '编号': achievement.get('编号', ''),
+            '名称': achievement.get('名称', ''),
+            '描述': achievement.get('描述', ''),
+            '奖励': achievement.get('奖励', ''),
+            '是否隐藏': achievement.get('是否隐藏', ''),
+            '获取状态': achievement.get('获取状态', '')
+        })
+
+    temp_path = f"{json_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(export_data, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, json_path)
+
+    print(f"[SUCCESS] 全字段数据已导出到: {json_path}")
+    print(f"[INFO] 包含 {len(export_data)} 条成就数据")
+    return len(export_data)
+
+
+def _crawl_excel_export_job(job, excel_path, achievements):
+    """后台线程：导出为Excel格式，取消时不生成文件"""
+    from core.excel_io import create_write_only_workbook, create_sheet, styled, append_styled_row
+    from core.background_jobs import iter_in_batches
+
+    # 定义列顺序（与GUI表格保持一致）
+    column_order = [
+        '名称', '描述', '奖励', '版本', '是否隐藏', '第一分类', '第二分类'
+    ]
+
+    # 列宽
+    column_widths = {
+        '名称': 25, '描述': 40, '版本': 10, '奖励': 15, '是否隐藏': 10,
+        '第一分类': 15, '第二分类': 20
+    }
+
+    # write_only 工作簿，所有单元格共享命名样式
+    wb = create_write_only_workbook()
+    sheet = create_sheet(wb, "成就数据", [column_widths.get(field_name, 15) for field_name in column_order])
+
+    # 写入表头
+    append_styled_row(sheet, column_order, "ww_header_blue")
+
+    # 写入数据
+    for achievement in iter_in_batches(job, achievements, message="正在写入Excel"):
+        row = []
+        for field_name in column_order:
+            value = achievement.get(field_name, '')
+
+            # 特殊处理名称列，隐藏成就用橙色
+            if field_name == '名称' and value:
+                style = "ww_name_hidden" if achievement.get('是否隐藏') == '隐藏' else "ww_name"
+                row.append(styled(sheet, value, style))
+            else:
+                row.append(styled(sheet, str(value), "ww_cell"))
+        sheet.append(row)
+
+    # 保存文件
+    wb.save(excel_path)
+
+    print(f"[SUCCESS] Excel数据已导出到: {excel_path}")
+    print(f"[INFO] 包含 {len(achievements)} 条成就数据")
+    return len(achievements)
 
 
 class CrawlerThread(QThread):
@@ -719,7 +530,7 @@ class CrawlTab(QWidget):
                     target_version = list(versions)[0]
                 else:
                     # 排序版本并获取范围
-                    sorted_versions = sorted(versions, key=lambda x: float(x) if x.replace('.', '').isdigit() else 0)
+                    sorted_versions = sort_versions(versions)
                     target_version = f"{sorted_versions[0]}-{sorted_versions[-1]}"
         
         if target_version:
@@ -810,103 +621,16 @@ class CrawlTab(QWidget):
         
         current_achievements = manage_tab.manager.achievements
         
-        # 创建名称+描述的组合键，用于精确判断重复
-        # 去掉描述末尾符号后再比较
-        import re
-        def clean_description(desc):
-            """去掉描述末尾的标点符号"""
-            if not desc:
-                return desc
-            # 去掉末尾的标点符号：。，；：！？、
-            return re.sub(r'[.,…。，；：！？、]+$', '', desc).strip()
-        
-        current_achievements_keys = set()
-        for a in current_achievements:
-            name = a.get('名称', '')
-            desc = clean_description(a.get('描述', ''))
-            key = (name, desc)  # 使用元组作为组合键
-            current_achievements_keys.add(key)
-        
-        # 仅筛选出不存在的成就进行添加
-        to_add = []     # 需要新增的成就
-        
-        for achievement in self.achievements:
-            name = achievement.get('名称', '')
-            desc = clean_description(achievement.get('描述', ''))
-            key = (name, desc)
-            
-            if key not in current_achievements_keys:
-                # 新成就（名称+描述组合不存在）
-                to_add.append(achievement)
+        # 合并新成就（名称+描述组合不存在的才添加），新分类自动分配排序和后缀，并重新编码
+        from core.achievement_ops import merge_new_achievements
+        all_achievements, to_add, has_new_categories = merge_new_achievements(
+            current_achievements, self.achievements)
         
         if not to_add:
             print("[INFO] 所有成就已存在，无需添加")
             self.show_notification("所有成就已存在，无需添加")
             return
         
-        # 获取分类配置
-        from core.config import config
-        category_config = config.load_category_config()
-        first_categories = category_config.get("first_categories", {})
-        second_categories = category_config.get("second_categories", {})
-        
-        # 复制一份配置用于更新
-        updated_first_categories = first_categories.copy()
-        updated_second_categories = {}
-        for key, value in second_categories.items():
-            updated_second_categories[key] = value.copy()
-        
-        # 标记是否有新的分类需要保存
-        has_new_categories = False
-        
-        # 检查新成就中是否有新的分类
-        for achievement in to_add:
-            first_cat = achievement.get('第一分类', '')
-            second_cat = achievement.get('第二分类', '')
-            
-            if first_cat and second_cat:
-                # 智能处理第一分类（如果不存在则分配新排序）
-                if first_cat not in updated_first_categories:
-                    max_order = max(updated_first_categories.values()) if updated_first_categories else 0
-                    updated_first_categories[first_cat] = max_order + 1
-                    updated_second_categories[first_cat] = {}
-                    has_new_categories = True
-                    print(f"[INFO] 发现新第一分类 '{first_cat}'，分配排序: {max_order + 1}")
-                
-                # 智能处理第二分类（如果不存在则分配新后缀）
-                if first_cat not in updated_second_categories:
-                    updated_second_categories[first_cat] = {}
-                
-                if second_cat not in updated_second_categories[first_cat]:
-                    # 找到该第一分类下最小的未使用后缀
-                    existing_suffixes = set()
-                    for suffix in updated_second_categories[first_cat].values():
-                        try:
-                            existing_suffixes.add(int(suffix))
-                        except (ValueError, TypeError):
-                            pass
-                    
-                    new_suffix = 10
-                    while new_suffix in existing_suffixes:
-                        new_suffix += 10
-                    
-                    updated_second_categories[first_cat][second_cat] = str(new_suffix)
-                    has_new_categories = True
-                    print(f"[INFO] 发现新第二分类 '{first_cat} - {second_cat}'，分配后缀: {new_suffix}")
-        
-        # 先保存新的分类配置（如果有新分类）
-        if has_new_categories:
-            updated_config = {
-                "first_categories": updated_first_categories,
-                "second_categories": updated_second_categories
-            }
-            config.save_category_config(updated_config)
-            print("[INFO] 已更新分类配置，新增的分类已自动分配排序和后缀")        # 合并数据：现有成就 + 新增的成就
-        all_achievements = current_achievements + to_add
-        
-        # 使用ManageTab的智能重新编码方法来重新生成编号和绝对编号
-        all_achievements = manage_tab._smart_reencode_achievements(all_achievements)
-        
         # 直接更新管理器的数据，而不是调用load_data
         manage_tab.manager.achievements = all_achievements
         manage_tab.manager.filtered_achievements = all_achievements.copy()
@@ -1354,198 +1078,52 @@ class CrawlTab(QWidget):
                 self.show_notification(f"导入失败: {str(e)}")
     
     def import_from_excel(self, excel_path):
-        """从Excel文件导入数据并进行清洗"""
-        try:
-            from openpyxl import load_workbook
-            
-            # 读取Excel文件
-            print(f"[INFO] 正在读取Excel文件: {excel_path}")
-            workbook = load_workbook(excel_path)
-            sheet = workbook.active
-            
-            # 获取表头
-            headers = []
-            for cell in sheet[1]:
-                headers.append(cell.value)
-            
-            # 检查必要的列
-            required_columns = ['名称', '第二分类']
-            missing_columns = [col for col in required_columns if col not in headers]
-            if missing_columns:
-                raise Exception(f"缺少必要的列: {', '.join(missing_columns)}")
-            
-            # 创建列名到索引的映射
-            col_index = {header: idx for idx, header in enumerate(headers)}
-            
-            # 数据清洗和转换
-            print(f"[INFO] 开始数据清洗...")
-            cleaned_achievements = []
-            
-            # 加载分类配置
-            try:
-                # 确保config对象已正确初始化
-                if not hasattr(config, 'load_category_config'):
-                    print("[ERROR] config对象缺少load_category_config方法")
-                    raise Exception("配置对象未正确初始化")
-                
-                category_config = config.load_category_config()
-                if not isinstance(category_config, dict):
-                    print(f"[ERROR] category_config不是字典类型: {type(category_config)}")
-                    category_config = {}
-                
-                first_categories = category_config.get("first_categories", {})
-                second_categories = category_config.get("second_categories", {})
-                
-                # 确保返回的是字典
-                if not isinstance(first_categories, dict):
-                    first_categories = {}
-                if not isinstance(second_categories, dict):
-                    second_categories = {}
-                    
-            except Exception as e:
-                print(f"[ERROR] 加载分类配置失败: {str(e)}")
-                # 使用默认配置
-                first_categories = {}
-                second_categories = {}
-                print("[INFO] 使用默认分类配置")
-            
-            # 创建第二分类到第一分类的映射
-            first_category_map = {}
-            for first_cat, second_cats in second_categories.items():
-                for second_cat in second_cats:
-                    first_category_map[second_cat] = first_cat
-            
-            # 从第二行开始读取数据
-            for row_idx, row in enumerate(sheet.iter_rows(min_row=2), start=2):
-                if not any(cell.value for cell in row):
-                    continue  # 跳过空行
-                
-                achievement = {}
-                
-                # 1. 名称列：去除「隐藏成就」
-                name_value = row[col_index['名称']].value
-                name = str(name_value).strip() if name_value else ''
-                if '「隐藏成就」' in name:
-                    name = name.replace('「隐藏成就」', '').strip()
-                achievement['名称'] = name
-                
-                # 2. 描述列
-                desc_value = row[col_index['描述']].value if '描述' in col_index else ''
-                description = str(desc_value).strip() if desc_value else ''
-                achievement['描述'] = description
-                
-                # 3. 版本列：智能处理小数
-                version_value = row[col_index['版本']].value if '版本' in col_index else ''
-                version = str(version_value).strip() if version_value else ''
-                if version:
-                    # 检查是否已经包含小数点
-                    if '.' in version:
-                        # 已经有小数点，保持原样
-                        pass
-                    else:
-                        # 没有小数点，补充.0
-                        version = f"{version}.0"
-                achievement['版本'] = version
-                
-                # 4. 奖励列：纯数字拼接"星声*"
-                reward_value = row[col_index['奖励']].value if '奖励' in col_index else ''
-                reward = str(reward_value).strip() if reward_value else ''
-                if reward.isdigit():
-                    reward = f"星声*{reward}"
-                achievement['奖励'] = reward
-                
-                # 5. 是否隐藏列：简化判断，只判断是否包含"隐藏"
-                if '是否隐藏' in col_index:
-                    hidden_value = row[col_index['是否隐藏']].value
-                    is_hidden = str(hidden_value).strip() if hidden_value else ''
-                    achievement['是否隐藏'] = '隐藏' if '隐藏' in is_hidden else ''
-                else:
-                    # 根据名称判断
-                    achievement['是否隐藏'] = '隐藏' if '隐藏' in name else ''
-                
-                # 6. 第二分类列：必须有
-                second_category_value = row[col_index['第二分类']].value
-                second_category = str(second_category_value).strip() if second_category_value else ''
-                if not second_category:
-                    raise Exception(f"第{row_idx}行：第二分类不能为空")
-                achievement['第二分类'] = second_category
-                
-                # 7. 第一分类列：如果没有提供，根据第二分类获取
-                if '第一分类' in col_index:
-                    first_category_value = row[col_index['第一分类']].value
-                    first_category = str(first_category_value).strip() if first_category_value else ''
-                    if first_category:
-                        achievement['第一分类'] = first_category
-                    else:
-                        # 根据第二分类映射获取第一分类
-                        first_category = first_category_map.get(second_category, '')
-                        if first_category:
-                            achievement['第一分类'] = first_category
-                        else:
-                            # 如果找不到对应的第一分类，收集所有缺失的分类
-                            if not hasattr(self, 'missing_categories'):
-                                self.missing_categories = set()
-                            self.missing_categories.add(second_category)
-                            continue  # 跳过这一行，继续检查下一行
-                else:
-                    # 根据第二分类映射获取第一分类
-                    first_category = first_category_map.get(second_category, '')
-                    if first_category:
-                        achievement['第一分类'] = first_category
-                    else:
-                        # 如果找不到对应的第一分类，收集所有缺失的分类
-                        if not hasattr(self, 'missing_categories'):
-                            self.missing_categories = set()
-                        self.missing_categories.add(second_category)
-                        continue  # 跳过这一行，继续检查下一行
-                
-                cleaned_achievements.append(achievement)
-            
-            # 检查是否有缺失的分类
-            if hasattr(self, 'missing_categories') and self.missing_categories:
-                missing_list = sorted(list(self.missing_categories))
-                missing_str = "、".join(missing_list)
-                
-                workbook.close()
-                
-                # 显示错误提示，中断导入
-                error_msg = f"发现未配置的第二分类: {missing_str}\n\n"
-                error_msg += "请在 设置→分类管理 中将这些分类添加到对应的第一分类下，然后重新导入。"
-                
-                print(f"[ERROR] 导入中断：发现未配置的分类: {missing_str}")
-                print(f"[INFO] 请在 设置→分类管理 中添加这些分类后重新导入")
-                
-                # 显示错误提示
-                from core.custom_message_box import CustomMessageBox
-                CustomMessageBox.warning(self, "导入中断", error_msg)
-                
-                # 不更新数据，保持原状
-                return
-            
-            workbook.close()
-            
-            # 更新数据
-            self.achievements = cleaned_achievements
-            self.table.load_data(cleaned_achievements)
-            self.export_btn.setEnabled(True)
-            self.export_excel_btn.setEnabled(True)
-            self.merge_btn.setEnabled(True)
-            
-            print(f"[SUCCESS] 导入完成，共 {len(cleaned_achievements)} 条成就数据")
-            
-            # 检查是否有缺失的分类需要提示用户
-            if hasattr(self, 'missing_categories') and self.missing_categories:
-                missing_list = sorted(list(self.missing_categories))
-                missing_str = "、".join(missing_list)
-                print(f"[INFO] 发现未配置的第二分类: {missing_str}")
-                print(f"[INFO] 请在 设置→分类管理 中将这些分类添加到对应的第一分类下")
-                self.show_notification(f"导入成功！发现未配置分类: {missing_str}，请在设置→分类管理中添加")
-            else:
-                self.show_notification(f"导入成功，共 {len(cleaned_achievements)} 条成就数据")
-            
-        except Exception as e:
-            print(f"[ERROR] 导入Excel失败: {str(e)}")
-            raise Exception(f"导入Excel失败: {str(e)}")
+        """在后台导入Excel：逐批清洗数据，全部成功后才替换当前爬取数据"""
+        from core.background_jobs import start_job
+        start_job(self, "导入Excel", _crawl_excel_import_job, excel_path,
+                  on_success=self._on_excel_import_finished,
+                  on_failure=lambda message: self.show_notification(f"导入失败: {message}"))
+
+    def _on_excel_import_finished(self, result):
+        """界面线程：根据后台导入结果提示或刷新表格"""
+        from core.custom_message_box import CustomMessageBox
+
+        if "errors" in result:
+            errors = result["errors"]
+            CustomMessageBox.warning(
+                self,
+                "导入中断",
+                f"Excel中有 {len(errors)} 行数据无效，未导入任何数据：\n\n{errors.summary()}\n\n"
+                f"完整错误报告已保存到：\n{result['report_path']}"
+            )
+            return
+
+        # 检查是否有缺失的分类
+        if result.get("missing_categories"):
+            missing_str = "、".join(sorted(result["missing_categories"]))
+
+            # 显示错误提示，中断导入
+            error_msg = f"发现未配置的第二分类: {missing_str}\n\n"
+            error_msg += "请在 设置→分类管理 中将这些分类添加到对应的第一分类下，然后重新导入。"
+
+            print(f"[ERROR] 导入中断：发现未配置的分类: {missing_str}")
+            print(f"[INFO] 请在 设置→分类管理 中添加这些分类后重新导入")
+            CustomMessageBox.warning(self, "导入中断", error_msg)
+
+            # 不更新数据，保持原状
+            return
+
+        cleaned_achievements = result["achievements"]
+
+        # 更新数据
+        self.achievements = cleaned_achievements
+        self.table.load_data(cleaned_achievements)
+        self.export_btn.setEnabled(True)
+        self.export_excel_btn.setEnabled(True)
+        self.merge_btn.setEnabled(True)
+
+        print(f"[SUCCESS] 导入完成，共 {len(cleaned_achievements)} 条成就数据")
+        self.show_notification(f"导入成功，共 {len(cleaned_achievements)} 条成就数据")
 
     def export_json(self):
         """导出数据"""
@@ -1568,30 +1146,11 @@ class CrawlTab(QWidget):
                 print(f"[ERROR] 导出失败: {str(e)}")
     
     def export_to_json(self, json_path):
-        """导出为全字段 JSON 格式"""
-        try:
-            export_data = []
-            for achievement in self.achievements:
-                export_data.append({
-                    '绝对编号': achievement.get('绝对编号', ''),
-                    '版本': achievement.get('版本', ''),
-                    '第一分类': achievement.get('第一分类', ''),
-                    '第二分类': achievement.get('第二分类', ''),
-                    '编号': achievement.get('编号', ''),
-                    '名称': achievement.get('名称', ''),
-                    '描述': achievement.get('描述', ''),
-                    '奖励': achievement.get('奖励', ''),
-                    '是否隐藏': achievement.get('是否隐藏', ''),
-                    '获取状态': achievement.get('获取状态', '')
-                })
-            
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, ensure_ascii=False, indent=2)
-            
-            print(f"[SUCCESS] 全字段数据已导出到: {json_path}")
-            print(f"[INFO] 包含 {len(export_data)} 条成就数据")
-        except Exception as e:
-            print(f"[ERROR] 导出 JSON 失败: {str(e)}")
+        """在后台导出为全字段 JSON 格式"""
+        from core.background_jobs import start_job
+        start_job(self, "导出JSON", _crawl_json_export_job, json_path, list(self.achievements),
+                  on_success=lambda count: self.show_notification(f"成功导出 {count} 条成就数据"),
+                  on_failure=lambda message: print(f"[ERROR] 导出 JSON 失败: {message}"))
     
     def export_excel(self):
         """导出Excel文件"""
@@ -1616,7 +1175,7 @@ class CrawlTab(QWidget):
                     version = list(versions)[0]
                 else:
                     # 排序版本并获取范围
-                    sorted_versions = sorted(versions, key=lambda x: float(x) if x.replace('.', '').isdigit() else 0)
+                    sorted_versions = sort_versions(versions)
                     version = f"{sorted_versions[0]}-{sorted_versions[-1]}"
         
         if version:
@@ -1636,72 +1195,11 @@ class CrawlTab(QWidget):
                 self.show_notification(f"导出Excel失败: {str(e)}")
     
     def export_to_excel(self, excel_path):
-        """导出为Excel格式"""
-        try:
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-            from openpyxl.utils import get_column_letter
-            wb = Workbook()
-            sheet = wb.active
-            sheet.title = "成就数据"
-            
-            # 定义列顺序（与GUI表格保持一致）
-            column_order = [
-                '名称', '描述', '奖励', '版本', '是否隐藏', '第一分类', '第二分类'
-            ]
-            
-            # 写入表头
-            for col_idx, field_name in enumerate(column_order, 1):
-                cell = sheet.cell(row=1, column=col_idx, value=field_name)
-                cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-                cell.font = Font(color="FFFFFF", bold=True)
-                cell.alignment = Alignment(horizontal="center")
-            
-            # 写入数据
-            for row_idx, achievement in enumerate(self.achievements, start=2):
-                for col_idx, field_name in enumerate(column_order, 1):
-                    value = achievement.get(field_name, '')
-                    
-                    # 特殊处理名称列
-                    if field_name == '名称' and value:
-                        cell = sheet.cell(row=row_idx, column=col_idx, value=value)
-                        cell.font = Font(bold=True)
-                        
-                        # 隐藏成就用橙色
-                        if achievement.get('是否隐藏') == '隐藏':
-                            cell.font = Font(bold=True, color="FFA500")
-                    else:
-                        cell = sheet.cell(row=row_idx, column=col_idx, value=str(value))
-                    
-                    # 设置边框
-                    thin_border = Border(
-                        left=Side(style='thin'),
-                        right=Side(style='thin'),
-                        top=Side(style='thin'),
-                        bottom=Side(style='thin')
-                    )
-                    cell.border = thin_border
-            
-            # 调整列宽
-            column_widths = {
-                '名称': 25, '描述': 40, '版本': 10, '奖励': 15, '是否隐藏': 10, 
-                '第一分类': 15, '第二分类': 20
-            }
-            
-            for col_idx, field_name in enumerate(column_order, 1):
-                col_letter = get_column_letter(col_idx)
-                sheet.column_dimensions[col_letter].width = column_widths.get(field_name, 15)
-            
-            # 保存文件
-            wb.save(excel_path)
-            
-            print(f"[SUCCESS] Excel数据已导出到: {excel_path}")
-            print(f"[INFO] 包含 {len(self.achievements)} 条成就数据")
-            show_notification(self, f"成功导出 {len(self.achievements)} 条成就数据到Excel")
-            
-        except Exception as e:
-            print(f"[ERROR] 导出Excel失败: {str(e)}")
-            raise Exception(f"导出Excel失败: {str(e)}")
+        """在后台导出为Excel格式"""
+        from core.background_jobs import start_job
+        start_job(self, "导出Excel", _crawl_excel_export_job, excel_path, list(self.achievements),
+                  on_success=lambda count: show_notification(self, f"成功导出 {count} 条成就数据到Excel"),
+                  on_failure=lambda message: self.show_notification(f"导出Excel失败: {message}"))
     
     def load_local_data(self):
         """加载本地保存的数据"""
@@ -1,12 +1,20 @@
 ﻿# ui/custom_title_bar.py
 import math
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QLabel, QApplication
-from PySide6.QtCore import Qt, QPoint, Signal, QPropertyAnimation, QEasingCurve, Property, QEvent, QTimer, QPointF, QRectF
-from PySide6.QtGui import QPainter, QColor, QPaintEvent, QMouseEvent, QBrush, QPen, QRadialGradient, QPainterPath
+from PySide6.QtCore import (Qt, QPoint, Signal, QPropertyAnimation, QEasingCurve, Property, QEvent, QTimer, QPointF, QRectF,
+                            QSize, QElapsedTimer, QAbstractAnimation)
+from PySide6.QtGui import QPainter, QPixmap, QColor, QPaintEvent, QMouseEvent, QBrush, QPen, QRadialGradient, QPainterPath
 
 from core.config import config
 from core.signal_bus import signal_bus
 
+# 悬停动画的帧间隔（毫秒），约60帧/秒
+FRAME_INTERVAL_MS = 16
+# 动画速度参数对应的基准步长（毫秒）
+BASE_TICK_MS = 50
+# 单帧最多推进的步数，避免卡顿后动画跳跃
+MAX_STEP = 3.0
+
 
 class SunMoonButton(QWidget):
     """日月切换按钮 - 用于主题切换"""
@@ -30,10 +38,18 @@ class SunMoonButton(QWidget):
         self.ball_animation = None
         self.sky_animation = None
         
-        # 动画更新定时器
+        # 动画更新定时器：只在悬停动画进行时运行，空闲时停止
         self.animation_timer = QTimer(self)
+        self.animation_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.animation_timer.setInterval(FRAME_INTERVAL_MS)
         self.animation_timer.timeout.connect(self._update_animations)
-        self.animation_timer.start(50)
+        self._frame_clock = QElapsedTimer()
+        
+        # 绘制缓存：空闲时的完整画面、天空+光晕静态层、太阳/月亮精灵图
+        self._frame = None
+        self._static_layer = None
+        self._static_layer_key = None
+        self._ball_sprites = {}
         
         # 云朵数据
         self.clouds = [
@@ -119,6 +135,7 @@ class SunMoonButton(QWidget):
         
     def set_ball_position(self, pos):
         self._ball_position = pos
+        self._frame = None
         self.update()
         
     def get_sky_color_progress(self):
@@ -126,6 +143,7 @@ class SunMoonButton(QWidget):
         
     def set_sky_color_progress(self, progress):
         self._sky_color_progress = progress
+        self._frame = None
         self.update()
         
     ball_position = Property(float, get_ball_position, set_ball_position)
@@ -182,6 +200,15 @@ class SunMoonButton(QWidget):
         self.moon_rotating = False
         self.meteor_active = False
         self.birds_active = False
+        self.animation_timer.stop()
+        self._frame = None
+        self.update()
+
+    def resizeEvent(self, event):
+        self._frame = None
+        self._static_layer = None
+        self._ball_sprites = {}
+        super().resizeEvent(event)
         
     def _start_hover_animations(self):
         if not self._hovering:
@@ -196,65 +223,117 @@ class SunMoonButton(QWidget):
         else:
             self.cloud_shaking = True
             self.birds_active = True
+        if not self.animation_timer.isActive():
+            self._frame_clock.start()
+            self.animation_timer.start()
             
     def _update_animations(self):
+        # 按实际经过的时间推进（速度参数以 BASE_TICK_MS 为一步），帧间隔变化时动画速度不变
+        step = min(self._frame_clock.restart() / BASE_TICK_MS, MAX_STEP)
         need_update = False
         if self._hovering and not self._is_night:
             for cloud in self.clouds:
-                cloud["x"] += cloud["speed"]
+                cloud["x"] += cloud["speed"] * step
                 if cloud["x"] > 1.2:
                     cloud["x"] = -0.2
             need_update = True
         if self.cloud_shaking and self._hovering and not self._is_night:
-            self.cloud_shake_time += 0.05
+            self.cloud_shake_time += 0.05 * step
             need_update = True
             
         # 飞鸟移动
         if self.birds_active and self._hovering and not self._is_night:
             for bird in self.birds:
-                bird["progress"] += bird["speed"]
-                bird["wing_phase"] += 0.3
+                bird["progress"] += bird["speed"] * step
+                bird["wing_phase"] += 0.3 * step
                 if bird["progress"] > 1.2:
                     bird["progress"] = -0.2
             need_update = True
         if self._hovering and self._is_night:
-            self.star_twinkle_time += 0.1
+            self.star_twinkle_time += 0.1 * step
             for star in self.stars:
                 star["brightness"] = 0.5 + 0.5 * abs(math.sin(self.star_twinkle_time + star["phase"]))
             need_update = True
         if self.meteor_active and self._hovering and self._is_night:
             # 更新所有流星
             for meteor in self.meteors:
-                meteor["progress"] += meteor["speed"]
+                meteor["progress"] += meteor["speed"] * step
                 if meteor["progress"] > 1.2:
                     meteor["progress"] = -0.1  # 循环播放
             need_update = True
         if self.moon_rotating and self._hovering and self._is_night:
-            self.moon_rotation += 0.5
+            self.moon_rotation += 0.5 * step
             if self.moon_rotation >= 360:
                 self.moon_rotation = 0
             need_update = True
         if need_update:
+            self._frame = None
             self.update()
+        else:
+            # 没有进行中的动画，停止定时器
+            self.animation_timer.stop()
+
+    def _is_animating(self):
+        if self.animation_timer.isActive():
+            return True
+        return any(animation is not None and animation.state() == QAbstractAnimation.State.Running
+                   for animation in (self.ball_animation, self.sky_animation))
     
     def paintEvent(self, event):
+        device_pixel_ratio = self.devicePixelRatioF()
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if self._is_animating():
+            # 动画进行中：静态层和太阳/月亮使用缓存，只重绘移动的元素
+            self._frame = None
+            self._draw_frame(painter, device_pixel_ratio)
+            return
         
+        # 空闲时整幅画面只绘制一次，之后的重绘直接使用缓存
+        if self._frame is None or self._frame.devicePixelRatio() != device_pixel_ratio:
+            self._frame = self._new_layer(device_pixel_ratio)
+            frame_painter = QPainter(self._frame)
+            self._draw_frame(frame_painter, device_pixel_ratio)
+            frame_painter.end()
+        painter.drawPixmap(0, 0, self._frame)
+
+    def _new_layer(self, device_pixel_ratio, size=None):
+        layer = QPixmap((size or self.size()) * device_pixel_ratio)
+        layer.setDevicePixelRatio(device_pixel_ratio)
+        layer.fill(Qt.GlobalColor.transparent)
+        return layer
+
+    def _clip_to_capsule(self, painter):
         clip_path = QPainterPath()
         clip_path.addRoundedRect(QRectF(self.rect()), self.height() / 2, self.height() / 2)
         painter.setClipPath(clip_path)
+
+    def _draw_frame(self, painter, device_pixel_ratio):
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.drawPixmap(0, 0, self._get_static_layer(device_pixel_ratio))
         
-        self._draw_sky(painter)
-        self._draw_halo(painter)
+        self._clip_to_capsule(painter)
         if self._sky_color_progress > 0.3:
             self._draw_stars(painter)
         if self._sky_color_progress < 0.7:
             self._draw_clouds(painter)
             if self.birds_active:
                 self._draw_birds(painter)
-        self._draw_ball(painter)
+        self._draw_ball(painter, device_pixel_ratio)
         self._draw_inner_shadow(painter)
+
+    def _get_static_layer(self, device_pixel_ratio):
+        """天空和光晕只随日夜切换动画变化，悬停动画期间复用"""
+        key = (device_pixel_ratio, self._sky_color_progress, self._ball_position)
+        if self._static_layer is None or self._static_layer_key != key:
+            self._static_layer = self._new_layer(device_pixel_ratio)
+            layer_painter = QPainter(self._static_layer)
+            layer_painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            self._clip_to_capsule(layer_painter)
+            self._draw_sky(layer_painter)
+            self._draw_halo(layer_painter)
+            layer_painter.end()
+            self._static_layer_key = key
+        return self._static_layer
         
     def _draw_sky(self, painter):
         r = int(self.day_color.red() * (1 - self._sky_color_progress) + self.night_color.red() * self._sky_color_progress)
@@ -487,16 +566,54 @@ class SunMoonButton(QWidget):
         
         painter.restore()
                 
-    def _draw_ball(self, painter):
+    def _draw_ball(self, painter, device_pixel_ratio):
         ball_size = self.button_size * 0.85
         margin = self.button_size * 0.1
         ball_x = margin + ball_size / 2 + (self.width() - ball_size - 2 * margin) * self._ball_position
         ball_y = self.height() / 2
+        is_sun = self._ball_position < 0.5
+        half = ball_size * 0.6
+        # 精灵图按整数位置绘制，球心的小数偏移（量化到1/4像素）画在精灵图内部
+        left, top = math.floor(ball_x - half), math.floor(ball_y - half)
+        offset = (round((ball_x - left) * 4) / 4, round((ball_y - top) * 4) / 4)
+        sprite = self._get_ball_sprite(is_sun, ball_size, offset, device_pixel_ratio)
+        painter.drawPixmap(left, top, sprite)
+        if not is_sun:
+            # 陨石坑会随悬停旋转，每帧绘制
+            painter.save()
+            painter.setPen(Qt.PenStyle.NoPen)
+            if self.moon_rotating:
+                painter.translate(ball_x, ball_y)
+                painter.rotate(self.moon_rotation)
+                painter.translate(-ball_x, -ball_y)
+            crater_positions = [(0.38, 0.15, 0.18), (0.13, 0.46, 0.32), (0.61, 0.61, 0.22)]
+            painter.setBrush(QBrush(QColor(145, 151, 165)))
+            for x_ratio, y_ratio, size_ratio in crater_positions:
+                crater_x = ball_x - ball_size / 2 + ball_size * x_ratio
+                crater_y = ball_y - ball_size / 2 + ball_size * y_ratio
+                crater_size = ball_size * size_ratio
+                painter.drawEllipse(QPointF(crater_x, crater_y), crater_size / 2, crater_size / 2)
+            painter.restore()
+
+    def _get_ball_sprite(self, is_sun, ball_size, center, device_pixel_ratio):
+        """太阳（含日冕）或月亮本体（含阴影）的精灵图，center 为球心在精灵图中的位置"""
+        key = (is_sun, center, device_pixel_ratio)
+        if key not in self._ball_sprites:
+            side = math.ceil(ball_size * 1.2) + 1
+            sprite = self._new_layer(device_pixel_ratio, QSize(side, side))
+            painter = QPainter(sprite)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            self._paint_ball(painter, center[0], center[1], ball_size, is_sun)
+            painter.end()
+            self._ball_sprites[key] = sprite
+        return self._ball_sprites[key]
+
+    def _paint_ball(self, painter, ball_x, ball_y, ball_size, is_sun):
         painter.setBrush(QBrush(QColor(0, 0, 0, 100)))
         painter.setPen(Qt.PenStyle.NoPen)
         shadow_offset = ball_size * 0.05
         painter.drawEllipse(QPointF(ball_x + shadow_offset, ball_y + shadow_offset), ball_size / 2, ball_size / 2)
-        if self._ball_position < 0.5:
+        if is_sun:
             painter.save()
             painter.setPen(Qt.PenStyle.NoPen)
             corona_layers = [
@@ -523,20 +640,6 @@ class SunMoonButton(QWidget):
             painter.setBrush(QBrush(gradient))
         painter.setPen(Qt.PenStyle.NoPen)
         painter.drawEllipse(QPointF(ball_x, ball_y), ball_size / 2, ball_size / 2)
-        if self._ball_position >= 0.5:
-            painter.save()
-            if self.moon_rotating:
-                painter.translate(ball_x, ball_y)
-                painter.rotate(self.moon_rotation)
-                painter.translate(-ball_x, -ball_y)
-            crater_positions = [(0.38, 0.15, 0.18), (0.13, 0.46, 0.32), (0.61, 0.61, 0.22)]
-            painter.setBrush(QBrush(QColor(145, 151, 165)))
-            for x_ratio, y_ratio, size_ratio in crater_positions:
-                crater_x = ball_x - ball_size / 2 + ball_size * x_ratio
-                crater_y = ball_y - ball_size / 2 + ball_size * y_ratio
-                crater_size = ball_size * size_ratio
-                painter.drawEllipse(QPointF(crater_x, crater_y), crater_size / 2, crater_size / 2)
-            painter.restore()
             
     def _draw_inner_shadow(self, painter):
         pass
@@ -722,12 +825,9 @@ class CustomTitleBar(QWidget):
         
         self.update_theme()
         
-        # 发送主题切换信号
+        # 发送主题切换信号（主窗口监听该信号并调用 apply_theme）
         signal_bus.theme_changed.emit(config.theme)
         
-        if self.parent_window and hasattr(self.parent_window, 'apply_theme'):
-            self.parent_window.apply_theme()
-        
         if self.parent_window and saved_pos is not None:
             self.parent_window.move(saved_pos)
             if saved_size is not None:
@@ -0,0 +1,174 @@
+"""
+Excel读写模块
+导入使用 read_only + values_only 流式迭代，表头和列索引只解析一次；
+导出使用 write_only 工作表和共享的命名样式，避免逐个单元格创建样式对象
+"""
+
+# 导出信息行的标志（ManageTab导出的第一行为时间/用户信息）
+INFO_ROW_MARKERS = ("导出时间:", "用户:")
+
+# 共享命名样式：名称 -> 样式参数
+_STYLE_SPECS = {
+    "ww_header": {"font": {"bold": True, "color": "FFFFFF"}, "fill": "366092",
+                  "alignment": {"horizontal": "center", "vertical": "center"}, "border": True},
+    "ww_header_blue": {"font": {"bold": True, "color": "FFFFFF"}, "fill": "4472C4",
+                       "alignment": {"horizontal": "center"}},
+    "ww_info": {"font": {"size": 10, "color": "666666"},
+                "alignment": {"horizontal": "left", "vertical": "center"}},
+    "ww_cell": {"border": True},
+    "ww_name": {"font": {"bold": True}, "border": True},
+    "ww_name_hidden": {"font": {"bold": True, "color": "FFA500"}, "border": True},
+    "ww_hidden": {"font": {"color": "FF9900"}, "border": True},
+    "ww_reward_20": {"font": {"color": "FF6B35"}, "border": True},
+    "ww_reward_10": {"font": {"color": "4ECDC4"}, "border": True},
+    "ww_reward_5": {"font": {"color": "45B7D1"}, "border": True},
+    "ww_status_completed": {"font": {"color": "00AA00"}, "fill": "E8F5E8", "border": True},
+    "ww_status_occupied": {"font": {"color": "FF6B35"}, "fill": "FFE8E0", "border": True},
+    "ww_status_incomplete": {"font": {"color": "888888"}, "fill": "F5F5F5", "border": True},
+    "ww_status_unavailable": {"font": {"color": "999999"}, "fill": "EEEEEE", "border": True},
+}
+
+# 获取状态 -> 样式名称
+STATUS_STYLES = {
+    '已完成': "ww_status_completed",
+    '已占用': "ww_status_occupied",
+    '未完成': "ww_status_incomplete",
+    '暂不可获取': "ww_status_unavailable",
+}
+
+
+def _build_named_style(name, spec):
+    from openpyxl.styles import NamedStyle, Font, Alignment, PatternFill, Border, Side
+
+    style = NamedStyle(name=name)
+    if "font" in spec:
+        style.font = Font(**spec["font"])
+    if "fill" in spec:
+        style.fill = PatternFill(start_color=spec["fill"], end_color=spec["fill"], fill_type="solid")
+    if "alignment" in spec:
+        style.alignment = Alignment(**spec["alignment"])
+    if spec.get("border"):
+        thin = Side(style='thin')
+        style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    return style
+
+
+def create_write_only_workbook():
+    """创建 write_only 工作簿并注册共享命名样式"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for name, spec in _STYLE_SPECS.items():
+        workbook.add_named_style(_build_named_style(name, spec))
+    return workbook
+
+
+def create_sheet(workbook, title, column_widths):
+    """创建工作表并设置列宽（write_only 模式下必须在写入数据前设置）"""
+    from openpyxl.utils import get_column_letter
+
+    sheet = workbook.create_sheet(title=title)
+    for col_idx, width in enumerate(column_widths, 1):
+        sheet.column_dimensions[get_column_letter(col_idx)].width = width
+    return sheet
+
+
+def styled(sheet, value, style):
+    """创建带命名样式的单元格，style 为 None 时直接返回值"""
+    if style is None:
+        return value
+    from openpyxl.cell import WriteOnlyCell
+
+    cell = WriteOnlyCell(sheet, value=value)
+    cell.style = style
+    return cell
+
+
+def append_styled_row(sheet, values, style):
+    """写入一行，所有单元格使用同一命名样式"""
+    sheet.append([styled(sheet, value, style) for value in values])
+
+
+def reward_style(value):
+    """根据星声数量返回奖励列样式"""
+    text = str(value)
+    if '星声*' not in text:
+        return "ww_cell"
+    if '20' in text:
+        return "ww_reward_20"
+    if '10' in text:
+        return "ww_reward_10"
+    if '5' in text:
+        return "ww_reward_5"
+    return "ww_cell"
+
+
+def add_list_validation(sheet, options, cell_range, error, error_title='输入错误', prompt=None, prompt_title=None):
+    """为 write_only 工作表添加下拉框验证"""
+    from openpyxl.worksheet.datavalidation import DataValidation
+
+    dv = DataValidation(type="list", formula1=f'"{options}"', allow_blank=True)
+    dv.error = error
+    dv.errorTitle = error_title
+    if prompt:
+        dv.prompt = prompt
+        dv.promptTitle = prompt_title
+    dv.add(cell_range)
+    sheet.data_validations.append(dv)
+    return dv
+
+
+class ExcelRowReader:
+    """流式读取Excel第一个工作表
+
+    自动识别导出文件的信息行，表头与列索引只解析一次；
+    iter_rows 产出 (行号, 值元组)，值元组已补齐到表头长度，空行自动跳过
+    """
+
+    def __init__(self, excel_path, detect_info_row=True):
+        from openpyxl import load_workbook
+
+        self.excel_path = excel_path
+        self.workbook = load_workbook(excel_path, read_only=True, data_only=True)
+        self.sheet = self.workbook.active
+
+        first_rows = list(self.sheet.iter_rows(min_row=1, max_row=2, values_only=True))
+        first_row = first_rows[0] if first_rows else ()
+        self.has_info_row = detect_info_row and any(
+            any(marker in str(val) for marker in INFO_ROW_MARKERS) for val in first_row if val)
+
+        if self.has_info_row:
+            # 第一行是信息行，表头在第二行
+            self.header_row = 2
+            header_values = first_rows[1] if len(first_rows) > 1 else ()
+        else:
+            self.header_row = 1
+            header_values = first_row
+        self.data_start_row = self.header_row + 1
+
+        self.headers = list(header_values)
+        self.col_index = {header: idx for idx, header in enumerate(self.headers) if header is not None}
+        self.total_rows = max(0, (self.sheet.max_row or 0) - self.header_row)
+
+    def missing_columns(self, required_columns):
+        return [col for col in required_columns if col not in self.col_index]
+
+    def iter_rows(self):
+        width = len(self.headers)
+        for row_idx, values in enumerate(
+                self.sheet.iter_rows(min_row=self.data_start_row, values_only=True), start=self.data_start_row):
+            if not any(values):
+                continue  # 跳过空行
+            if len(values) < width:
+                values = tuple(values) + (None,) * (width - len(values))
+            yield row_idx, values
+
+    def close(self):
+        self.workbook.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
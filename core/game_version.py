@@ -0,0 +1,78 @@
+"""
+游戏版本号模块（成就的「版本」字段，与应用版本 version.py 无关）
+每个不同的版本字符串只解析一次并缓存，按 (大版本, 小版本, ...) 元组排序，
+"1.10" 排在 "1.9" 之后；无法解析的版本号排在所有有效版本之前
+"""
+from functools import lru_cache, total_ordering
+
+
+@total_ordering
+class Version:
+    """解析后的版本号，可直接比较和排序"""
+    __slots__ = ('text', 'parts', 'key')
+
+    def __init__(self, text):
+        self.text = text
+        parts = str(text).strip().split('.') if text is not None else []
+        if parts and all(part.isdigit() for part in parts):
+            self.parts = tuple(int(part) for part in parts)
+            # 补齐小版本，"2" 与 "2.0" 相等
+            self.key = (1,) + self.parts + (0,) * (2 - len(self.parts))
+        else:
+            self.parts = ()
+            self.key = (0,)
+
+    @property
+    def is_valid(self):
+        return bool(self.parts)
+
+    @property
+    def major(self):
+        return self.parts[0] if self.parts else None
+
+    @property
+    def minor(self):
+        return self.parts[1] if len(self.parts) > 1 else (0 if self.parts else None)
+
+    @property
+    def major_label(self):
+        """大版本标签，如 2.7 -> 2.0（统计图按大版本分组）"""
+        if self.parts:
+            return f"{self.parts[0]}.0"
+        return str(self.text).split('.')[0] + '.0'
+
+    def __eq__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.key == other.key
+
+    def __lt__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.key < other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __str__(self):
+        return str(self.text)
+
+    def __repr__(self):
+        return f"Version({self.text!r})"
+
+
+@lru_cache(maxsize=None)
+def parse_version(text):
+    """解析版本号（按字符串缓存）"""
+    return Version(text)
+
+
+@lru_cache(maxsize=None)
+def version_key(text):
+    """版本字符串的排序键（按字符串缓存）"""
+    return parse_version(text).key
+
+
+def sort_versions(versions, reverse=False):
+    """按版本号排序版本字符串"""
+    return sorted(versions, key=version_key, reverse=reverse)
@@ -0,0 +1,223 @@
+"""
+图片服务模块
+在线程池中解码图片（QImageReader.setScaledSize 直接按目标尺寸解码），
+解码结果在内存中按LRU淘汰缓存，缩放后的结果另存为磁盘缩略图：
+文件按原图路径+目标尺寸+缩放方式命名，PNG 文本字段记录生成时原图的修改时间和大小，
+原图变化后新缩略图覆盖旧文件。资源同步（core.asset_sync）下载时生成的预缩放变体也写在这里
+
+调用方先拿到内存缓存中的图片（没有时显示自己的占位内容），解码完成后通过 image_ready 信号获得图片：
+
+    self._image_key, pixmap = image_service.request(path, QSize(60, 60), COVER)
+    image_service.image_ready.connect(self._on_image_ready)  # 按 key 过滤
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+
+from core.startup_profiler import profiler
+
+# 缩放方式：完整显示在目标尺寸内 / 铺满目标尺寸（超出部分由调用方裁剪）
+FIT = "fit"
+COVER = "cover"
+
+# 内存缓存上限（字节）
+MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+
+# 解码线程数
+MAX_WORKERS = 2
+
+# 磁盘缩略图中记录原图签名的 PNG 文本字段
+SOURCE_STAMP_KEY = "source"
+
+
+def get_thumbnail_cache_dir():
+    from core.config import get_resource_path
+    return get_resource_path("resources/cache/thumbnails")
+
+
+def thumbnail_cache_path(path, size, mode=FIT, cache_dir=None):
+    """磁盘缩略图路径，同一原图、尺寸和缩放方式始终对应同一个文件"""
+    key = f"{os.path.abspath(path)}|{size.width()}x{size.height()}|{mode}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return (cache_dir or get_thumbnail_cache_dir()) / f"{digest}.png"
+
+
+def source_stamp(path):
+    """原图签名：修改时间 + 文件大小，文件不存在时返回 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{stat.st_mtime_ns}|{stat.st_size}"
+
+
+def is_thumbnail_current(thumbnail_path, path):
+    """磁盘缩略图是否由当前的原图生成（只读取 PNG 文件头）"""
+    stamp = source_stamp(path)
+    return (stamp is not None and os.path.exists(thumbnail_path)
+            and QImageReader(str(thumbnail_path)).text(SOURCE_STAMP_KEY) == stamp)
+
+
+def _target_size(source_size, size, mode):
+    """按缩放方式计算解码尺寸，只缩小不放大；无需缩放时返回 None"""
+    if size is None or not source_size.isValid():
+        return None
+    aspect = Qt.AspectRatioMode.KeepAspectRatio if mode == FIT else Qt.AspectRatioMode.KeepAspectRatioByExpanding
+    scaled = source_size.scaled(size, aspect)
+    if scaled.width() >= source_size.width() or scaled.height() >= source_size.height():
+        return None
+    return scaled
+
+
+def decode_image(path, size=None, mode=FIT, thumbnail_path=None):
+    """解码图片（可在任意线程调用），有缩放时读写磁盘缩略图，失败时返回空 QImage"""
+    # 先取签名再解码：解码期间原图被替换时，缩略图记录的是旧签名，下次会重新生成
+    stamp = source_stamp(path) if thumbnail_path else None
+    if stamp is not None and os.path.exists(thumbnail_path):
+        reader = QImageReader(thumbnail_path)
+        if reader.text(SOURCE_STAMP_KEY) == stamp:
+            image = reader.read()
+            if not image.isNull():
+                return image
+
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    scaled_size = _target_size(reader.size(), size, mode)
+    if scaled_size is not None:
+        reader.setScaledSize(scaled_size)
+    image = reader.read()
+    if image.isNull():
+        print(f"[WARNING] 无法解码图片: {path} ({reader.errorString()})")
+        return image
+
+    if scaled_size is not None and stamp is not None:
+        _save_thumbnail(image, thumbnail_path, stamp)
+    return image
+
+
+def _save_thumbnail(image, thumbnail_path, stamp):
+    """原子写入磁盘缩略图，覆盖同一原图之前的缩略图"""
+    try:
+        os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+        temp_path = f"{thumbnail_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        image.setText(SOURCE_STAMP_KEY, stamp)
+        if image.save(temp_path, "PNG"):
+            os.replace(temp_path, thumbnail_path)
+    except OSError as e:
+        print(f"[WARNING] 保存缩略图缓存失败: {str(e)}")
+
+
+def ensure_thumbnail(path, size, mode=FIT, cache_dir=None, same_as=None):
+    """预先生成磁盘缩略图（可在任意线程调用），返回是否重新生成
+
+    缩略图已由当前原图生成、或原图不大于目标尺寸（运行时直接解码原图）时不生成；
+    same_as 为内容相同的另一张原图，它的缩略图已是最新时直接复用，不再解码原图。无法解码时抛出 ValueError
+    """
+    thumbnail_path = thumbnail_cache_path(path, size, mode, cache_dir)
+    if is_thumbnail_current(thumbnail_path, path):
+        return False
+    if _target_size(QImageReader(str(path)).size(), size, mode) is None:
+        return False
+    if same_as is not None:
+        same_path = thumbnail_cache_path(same_as, size, mode, cache_dir)
+        if is_thumbnail_current(same_path, same_as):
+            image = QImageReader(str(same_path)).read()
+            stamp = source_stamp(path)
+            if not image.isNull() and stamp is not None:
+                _save_thumbnail(image, str(thumbnail_path), stamp)
+                return True
+    if decode_image(str(path), size, mode, str(thumbnail_path)).isNull():
+        raise ValueError(f"无法解码图片: {path}")
+    return True
+
+
+class _DecodeTask(QRunnable):
+    def __init__(self, service, key, path, size, mode, thumbnail_path):
+        super().__init__()
+        self._service = service
+        self._key = key
+        self._path = path
+        self._size = size
+        self._mode = mode
+        self._thumbnail_path = thumbnail_path
+
+    def run(self):
+        with profiler.span(f"解码图片: {os.path.basename(self._path)}", "image"):
+            image = decode_image(self._path, self._size, self._mode, self._thumbnail_path)
+        # 跨线程信号，在界面线程中转换为 QPixmap
+        self._service._decoded.emit(self._key, image)
+
+
+class ImageService(QObject):
+    """共享的异步图片加载服务"""
+    image_ready = Signal(str, QPixmap)  # (请求键, 图片)，解码失败时图片为空
+    _decoded = Signal(str, QImage)
+
+    def __init__(self):
+        super().__init__()
+        self._memory_cache = OrderedDict()
+        self._memory_bytes = 0
+        self._pending = set()
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(MAX_WORKERS)
+        self._decoded.connect(self._on_decoded)
+
+    @staticmethod
+    def request_key(path, size=None, mode=FIT):
+        """请求键：路径 + 修改时间 + 文件大小 + 目标尺寸 + 缩放方式，文件不存在时返回 None"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        size_text = f"{size.width()}x{size.height()}" if size is not None else "full"
+        return f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{size_text}|{mode}"
+
+    def request(self, path, size=None, mode=FIT):
+        """请求图片，返回 (请求键, 已缓存的图片或 None)
+
+        未缓存时在后台解码，完成后发送 image_ready 信号；文件不存在时返回 (None, None)
+        """
+        path = str(path)
+        key = self.request_key(path, size, mode)
+        if key is None:
+            return None, None
+
+        pixmap = self._memory_cache.get(key)
+        if pixmap is not None:
+            self._memory_cache.move_to_end(key)
+            return key, pixmap
+
+        if key not in self._pending:
+            self._pending.add(key)
+            thumbnail_path = str(thumbnail_cache_path(path, size, mode)) if size is not None else None
+            self._pool.start(_DecodeTask(self, key, path, size, mode, thumbnail_path))
+        return key, None
+
+    def _on_decoded(self, key, image):
+        self._pending.discard(key)
+        pixmap = QPixmap.fromImage(image) if not image.isNull() else QPixmap()
+        if not pixmap.isNull():
+            self._remember(key, pixmap)
+        self.image_ready.emit(key, pixmap)
+
+    def _remember(self, key, pixmap):
+        self._memory_cache[key] = pixmap
+        self._memory_bytes += self._pixmap_bytes(pixmap)
+        while self._memory_bytes > MEMORY_CACHE_BYTES and len(self._memory_cache) > 1:
+            _, evicted = self._memory_cache.popitem(last=False)
+            self._memory_bytes -= self._pixmap_bytes(evicted)
+
+    @staticmethod
+    def _pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def wait_for_pending(self, msecs=-1):
+        """等待所有解码任务结束（用于退出前和基准测试）"""
+        return self._pool.waitForDone(msecs)
+
+
+image_service = ImageService()
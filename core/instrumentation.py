@@ -0,0 +1,163 @@
+"""
+热路径性能记录模块
+在筛选、表格加载、保存、统计、重新编码和爬取等热路径上记录调用次数、耗时和写入的字节数，
+每条路径只保留最近 RING_SIZE 次调用的耗时（环形缓冲区），据此计算 p50/p95/最大耗时；
+调用次数和写入字节数为启用以来的累计值
+
+默认关闭，关闭时装饰器和上下文管理器只多一次属性判断。设置环境变量 WW_METRICS=1 在启动时启用，
+或在设置对话框中按 Ctrl+Shift+P 打开性能面板后启用。可在多个线程中记录（爬虫和后台任务）
+
+本模块不依赖 core 中的其他模块
+"""
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+
+ENV_VAR = "WW_METRICS"
+
+# 每条路径保留的最近耗时样本数
+RING_SIZE = 512
+
+
+class _PathStats:
+    __slots__ = ('samples', 'count', 'written', 'total')
+
+    def __init__(self):
+        self.samples = deque(maxlen=RING_SIZE)
+        self.count = 0
+        self.written = 0
+        self.total = 0.0
+
+
+def _percentile(values, fraction):
+    """最近秩法百分位数，values 已排序且不为空"""
+    return values[max(math.ceil(fraction * len(values)) - 1, 0)]
+
+
+class HotPathMetrics:
+    """热路径耗时与写入字节数记录"""
+
+    def __init__(self):
+        self.enabled = os.environ.get(ENV_VAR, "").strip() not in ("", "0")
+        self._paths = {}
+        self._lock = threading.Lock()
+        # 每个线程中正在记录的路径，写入的字节数计入其中所有路径
+        self._local = threading.local()
+
+    def set_enabled(self, enabled):
+        self.enabled = bool(enabled)
+        print(f"[INFO] 热路径性能记录已{'启用' if self.enabled else '关闭'}")
+
+    def record(self, name, seconds, written=0):
+        with self._lock:
+            stats = self._paths.get(name)
+            if stats is None:
+                stats = self._paths[name] = _PathStats()
+            stats.samples.append(seconds)
+            stats.count += 1
+            stats.written += written
+            stats.total += seconds
+
+    def span(self, name):
+        """记录一段代码的上下文管理器，未启用时返回不做任何事的对象"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def timed(self, name=None):
+        """记录函数耗时的装饰器"""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def add_bytes(self, count):
+        """把写入的字节数计入当前线程中正在记录的所有路径"""
+        if not self.enabled:
+            return
+        for span in getattr(self._local, 'spans', ()):
+            span.written += count
+
+    def snapshot(self):
+        """各路径的统计：{路径: {count, p50_ms, p95_ms, max_ms, total_ms, bytes, samples}}"""
+        with self._lock:
+            paths = [(name, sorted(stats.samples), stats.count, stats.written, stats.total)
+                     for name, stats in self._paths.items()]
+        result = {}
+        for name, samples, count, written, total in paths:
+            result[name] = {
+                "count": count,
+                "p50_ms": round(_percentile(samples, 0.5) * 1000, 3),
+                "p95_ms": round(_percentile(samples, 0.95) * 1000, 3),
+                "max_ms": round(samples[-1] * 1000, 3),
+                "total_ms": round(total * 1000, 1),
+                "bytes": written,
+                "samples": len(samples),
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._paths.clear()
+
+    def export_json(self, file_path):
+        """导出当前统计为JSON文件"""
+        data = {
+            "exported_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "ring_size": RING_SIZE,
+            "paths": self.snapshot(),
+        }
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"[SUCCESS] 性能统计已导出到: {file_path}")
+
+
+class _Span:
+    __slots__ = ('metrics', 'name', 'start', 'written')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self.start = None
+        self.written = 0
+
+    def __enter__(self):
+        local = self.metrics._local
+        spans = getattr(local, 'spans', None)
+        if spans is None:
+            spans = local.spans = []
+        spans.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        elapsed = time.perf_counter() - self.start
+        self.metrics._local.spans.remove(self)
+        self.metrics.record(self.name, elapsed, self.written)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+metrics = HotPathMetrics()
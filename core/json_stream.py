@@ -0,0 +1,224 @@
+"""
+流式JSON解析模块
+增量解析库街区wiki接口返回的JSON，只提取 data.content.modules[].components[] 中
+type 为 filter-component 的 content 字段（成就表格HTML），其余内容解析后即丢弃
+"""
+import re
+from json import JSONDecodeError
+from json.decoder import scanstring
+
+# 数字与字面量的匹配规则
+_NUMBER_RE = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?')
+_NUMBER_TAIL_RE = re.compile(r'[-+.eE\d]*')
+_LITERALS = ('true', 'false', 'null')
+_STRING_SPECIAL_RE = re.compile(r'["\\]')
+_WHITESPACE = ' \t\n\r'
+
+# 组件对象所在路径：根对象.data.content.modules[i].components[j]
+_COMPONENT_PATH = ('data', 'content', 'modules', None, 'components', None)
+
+
+class _Frame:
+    """解析栈中的一层容器（对象或数组）"""
+    __slots__ = ('is_object', 'key', 'index', 'expect_key', 'is_component', 'fields')
+
+    def __init__(self, is_object, is_component=False):
+        self.is_object = is_object
+        self.key = None
+        self.index = 0
+        self.expect_key = is_object
+        self.is_component = is_component
+        self.fields = {} if is_component else None
+
+
+class FilterComponentStream:
+    """增量提取 filter-component HTML 的流式解析器
+
+    用法：
+        stream = FilterComponentStream()
+        for chunk in chunks:
+            for html_content in stream.feed(chunk):
+                ...
+        stream.close()
+    """
+
+    def __init__(self, component_type='filter-component'):
+        self.component_type = component_type
+        self._stack = []
+        self._buffer = ''
+        self._pending = []          # 等待字符串结束时暂存的数据块，避免反复拼接大字符串
+        self._wait_quote = False    # 当前字符串未结束，只有新数据中出现未转义的引号才重试
+        self._escaped = False       # 已收到的数据以未配对的反斜杠结尾，下一个字符被转义
+        self._root_done = False
+        self.component_count = 0
+
+    def feed(self, text):
+        """喂入一段文本，返回本次解析完成的HTML内容列表"""
+        if not text:
+            return []
+        if self._wait_quote:
+            self._pending.append(text)
+            # 只扫描新数据，不从字符串开头重新扫描
+            if not self._find_string_end(text):
+                return []
+            text = ''.join(self._pending)
+            self._pending = []
+            self._wait_quote = False
+        self._buffer += text
+        return self._parse(final=False)
+
+    def close(self):
+        """输入结束，返回剩余的HTML内容并校验JSON是否完整"""
+        if self._pending:
+            self._buffer += ''.join(self._pending)
+            self._pending = []
+            self._wait_quote = False
+        results = self._parse(final=True)
+        if self._buffer.strip() or self._stack or not self._root_done:
+            raise JSONDecodeError("JSON数据不完整", self._buffer, 0)
+        return results
+
+    def _find_string_end(self, text):
+        """新数据中是否有结束当前字符串的引号，转义状态跨数据块保留"""
+        pos = 0
+        if self._escaped:
+            self._escaped = False
+            pos = 1
+        while True:
+            match = _STRING_SPECIAL_RE.search(text, pos)
+            if match is None:
+                return False
+            if match.group() == '"':
+                return True
+            if match.end() == len(text):
+                self._escaped = True
+                return False
+            pos = match.end() + 1
+
+    def _is_component_path(self):
+        """判断即将入栈的对象是否为组件对象"""
+        if len(self._stack) != len(_COMPONENT_PATH):
+            return False
+        for frame, expected in zip(self._stack, _COMPONENT_PATH):
+            if expected is None:
+                if frame.is_object:
+                    return False
+            elif not frame.is_object or frame.key != expected:
+                return False
+        return True
+
+    def _on_value(self, value):
+        """一个标量值解析完成"""
+        if not self._stack:
+            self._root_done = True
+            return
+        frame = self._stack[-1]
+        if frame.is_component and frame.key in ('type', 'content') and isinstance(value, str):
+            frame.fields[frame.key] = value
+
+    def _parse(self, final):
+        buf = self._buffer
+        pos = 0
+        length = len(buf)
+        results = []
+
+        while pos < length:
+            ch = buf[pos]
+
+            if ch in _WHITESPACE:
+                pos += 1
+                continue
+
+            if self._root_done:
+                raise JSONDecodeError("JSON之后存在多余数据", buf, pos)
+
+            frame = self._stack[-1] if self._stack else None
+
+            if ch == '"':
+                try:
+                    value, end = scanstring(buf, pos + 1)
+                except JSONDecodeError:
+                    if final:
+                        raise
+                    # 字符串跨越数据块边界，等待后续数据
+                    self._wait_quote = True
+                    self._escaped = (len(buf) - len(buf.rstrip('\\'))) % 2 == 1
+                    break
+                pos = end
+                if frame is not None and frame.is_object and frame.expect_key:
+                    frame.key = value
+                    frame.expect_key = False
+                else:
+                    self._on_value(value)
+                continue
+
+            if ch == '{' or ch == '[':
+                is_object = ch == '{'
+                is_component = is_object and self._is_component_path()
+                self._stack.append(_Frame(is_object, is_component))
+                pos += 1
+                continue
+
+            if ch == '}' or ch == ']':
+                if frame is None or frame.is_object != (ch == '}'):
+                    raise JSONDecodeError("JSON括号不匹配", buf, pos)
+                self._stack.pop()
+                if frame.is_component:
+                    self.component_count += 1
+                    if frame.fields.get('type') == self.component_type:
+                        results.append(frame.fields.get('content', ''))
+                if not self._stack:
+                    self._root_done = True
+                pos += 1
+                continue
+
+            if ch == ',':
+                if frame is None:
+                    raise JSONDecodeError("意外的逗号", buf, pos)
+                if frame.is_object:
+                    frame.expect_key = True
+                    frame.key = None
+                else:
+                    frame.index += 1
+                pos += 1
+                continue
+
+            if ch == ':':
+                pos += 1
+                continue
+
+            # 数字或字面量
+            match = _NUMBER_RE.match(buf, pos)
+            if match:
+                end = match.end()
+                if not final and _NUMBER_TAIL_RE.match(buf, end).end() >= length:
+                    # 数字可能被数据块截断，等待后续数据
+                    break
+                token = match.group()
+                self._on_value(float(token) if any(c in token for c in '.eE') else int(token))
+                pos = end
+                continue
+
+            for literal in _LITERALS:
+                if buf.startswith(literal, pos):
+                    self._on_value({'true': True, 'false': False, 'null': None}[literal])
+                    pos += len(literal)
+                    break
+            else:
+                rest = buf[pos:]
+                if not final and (rest == '-' or any(literal.startswith(rest) for literal in _LITERALS)):
+                    break
+                raise JSONDecodeError("无法识别的JSON内容", buf, pos)
+
+        self._buffer = buf[pos:]
+        return results
+
+
+def iter_filter_components(chunks, component_type='filter-component'):
+    """从文本块迭代器中流式提取组件HTML"""
+    stream = FilterComponentStream(component_type)
+    for chunk in chunks:
+        for html_content in stream.feed(chunk):
+            yield html_content
+    for html_content in stream.close():
+        yield html_content
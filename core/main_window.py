@@ -1,16 +1,31 @@
 ﻿import os
+import importlib
+from functools import partial
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                                QTabWidget, QDialog)
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QPixmap
+from PySide6.QtCore import Qt, QTimer, QSize
 
 from core.config import config
 from core.signal_bus import signal_bus
+from core.image_service import image_service
+from core.startup_profiler import profiler
 
-from core.styles import get_main_window_style, ColorPalette
-from core.widgets import BackgroundWidget, load_background_image
+from core.styles import get_main_window_style, get_scrollbar_style, ColorPalette
+from core.widgets import BackgroundWidget, LazyTab, load_background_image, updates_suspended
 from core.circular_avatar import CircularAvatar
 from core.avatar_selector import AvatarSelector
+from core.user_sessions import PREFETCH_DELAY_MS
+
+# 角色立绘的解码尺寸
+PORTRAIT_SIZE = 500
+
+
+# 标签页定义：(属性名, 模块, 类名, 标题)
+TAB_SPECS = [
+    ("manage_tab", "core.manage_tab", "ManageTab", "🏆 成就管理"),
+    ("statistics_tab", "core.statistics_tab", "StatisticsTab", "📈 统计图表"),
+    ("crawl_tab", "core.crawl_tab", "CrawlTab", "📊 数据爬取"),
+]
 
 
 class TemplateMainWindow(QMainWindow):
@@ -28,17 +43,16 @@ class TemplateMainWindow(QMainWindow):
         from core.styles import get_icon
         self.setWindowIcon(get_icon("logo"))
         
-        # 加载背景图片
+        # 加载背景图片（未缓存时在后台解码）
         self.background_pixmap = load_background_image(config.theme)
+        self._portrait_key = None
+        image_service.image_ready.connect(self._on_image_ready)
 
-        # 设置现代UI样式
-        self.setup_modern_ui()
-        self.init_ui()
-
-        # 应用滚动条样式
-        from core.styles import get_scrollbar_style
-        self.setStyleSheet(self.styleSheet() + get_scrollbar_style(config.theme))
-        
+        # 设置现代UI样式（含滚动条样式）
+        with profiler.span("主窗口样式表", "style"):
+            self.setup_modern_ui()
+        with profiler.span("主窗口界面初始化", "window"):
+            self.init_ui()
         
         # 连接数据共享信号
         self.setup_data_sharing()
@@ -50,9 +64,12 @@ class TemplateMainWindow(QMainWindow):
         # 启动时检查更新（后台进行）
         self.setup_update_check()
 
+        # 界面稳定后预取最近使用的其他用户
+        QTimer.singleShot(PREFETCH_DELAY_MS, self.prefetch_recent_users)
+
     def setup_modern_ui(self):
-        """设置现代化UI样式"""
-        self.setStyleSheet(get_main_window_style(config.theme))
+        """设置现代化UI样式（含滚动条样式，整个窗口只设置一次样式表）"""
+        self.setStyleSheet(get_main_window_style(config.theme) + get_scrollbar_style(config.theme))
 
     def init_ui(self):
         """初始化UI"""
@@ -70,7 +87,8 @@ class TemplateMainWindow(QMainWindow):
         
         # 添加自定义标题栏（主窗口显示主题切换按钮）
         from core.custom_title_bar import CustomTitleBar
-        self.title_bar = CustomTitleBar(self, show_theme_toggle=True)
+        with profiler.span("创建标题栏", "widget"):
+            self.title_bar = CustomTitleBar(self, show_theme_toggle=True)
         main_container_layout.addWidget(self.title_bar)
         
         # 内容区域
@@ -109,7 +127,8 @@ class TemplateMainWindow(QMainWindow):
         left_layout.addWidget(avatar_widget)
         
         # 创建头像选择器窗口但不显示
-        self.avatar_selector = AvatarSelector()
+        with profiler.span("创建头像选择器", "widget"):
+            self.avatar_selector = AvatarSelector()
         self.setup_avatar_signals()
         
         left_layout.addStretch()
@@ -123,24 +142,15 @@ class TemplateMainWindow(QMainWindow):
         # 创建标签页
         self.tab_widget = QTabWidget()
 
-        # 添加成就管理标签页
-        from core.manage_tab import ManageTab
-        self.manage_tab = ManageTab()
-        self.tab_widget.addTab(self.manage_tab, "🏆 成就管理")
-
-        # 添加统计信息标签页
-        from core.statistics_tab import StatisticsTab
-        self.statistics_tab = StatisticsTab()
-        self.tab_widget.addTab(self.statistics_tab, "📈 统计图表")
-        
-        # 添加数据爬取标签页
-        from core.crawl_tab import CrawlTab
-        self.crawl_tab = CrawlTab()
-        self.tab_widget.addTab(self.crawl_tab, "📊 数据爬取")
-
-        # 应用滚动条样式到标签页
-        from core.styles import get_scrollbar_style
-        self.tab_widget.setStyleSheet(self.tab_widget.styleSheet() + get_scrollbar_style(config.theme))
+        # 标签页在首次激活时才导入模块并构建，启动时只放置轻量占位
+        self._lazy_tabs = {}
+        for attr_name, module_name, class_name, title in TAB_SPECS:
+            lazy_tab = LazyTab(partial(self._create_tab, module_name, class_name), title)
+            self._lazy_tabs[attr_name] = lazy_tab
+            self.tab_widget.addTab(lazy_tab, title)
+        self.tab_widget.currentChanged.connect(self._on_tab_activated)
+        # 窗口首次绘制后再构建当前标签页
+        QTimer.singleShot(0, lambda: self._on_tab_activated(self.tab_widget.currentIndex()))
 
         right_layout.addWidget(self.tab_widget)
 
@@ -171,6 +181,36 @@ class TemplateMainWindow(QMainWindow):
         self.update_nickname_display()
         self.update_avatar_display()
     
+    @staticmethod
+    def _create_tab(module_name, class_name):
+        module = importlib.import_module(module_name)
+        return getattr(module, class_name)()
+
+    def _on_tab_activated(self, index):
+        """标签页首次激活时构建"""
+        lazy_tab = self.tab_widget.widget(index)
+        if isinstance(lazy_tab, LazyTab):
+            lazy_tab.widget()
+
+    def loaded_tab(self, attr_name):
+        """返回已构建的标签页，未构建时返回 None"""
+        lazy_tabs = getattr(self, '_lazy_tabs', {})
+        lazy_tab = lazy_tabs.get(attr_name)
+        return lazy_tab.loaded_widget() if lazy_tab else None
+
+    # 其他模块通过这些属性访问标签页时按需构建
+    @property
+    def manage_tab(self):
+        return self._lazy_tabs["manage_tab"].widget()
+
+    @property
+    def statistics_tab(self):
+        return self._lazy_tabs["statistics_tab"].widget()
+
+    @property
+    def crawl_tab(self):
+        return self._lazy_tabs["crawl_tab"].widget()
+
     def position_character_portrait(self):
         """定位角色立绘到左下角"""
         # 获取标题栏高度
@@ -207,6 +247,19 @@ class TemplateMainWindow(QMainWindow):
         character_name = config.get_current_user_character_name()
         print(f"[DEBUG] 用户切换: {username}, 角色名: {character_name}")
         self.update_character_portrait(character_name)
+        # 之前的用户也成为“最近使用”，稍后预取其他最近用户
+        QTimer.singleShot(PREFETCH_DELAY_MS, self.prefetch_recent_users)
+
+    def prefetch_recent_users(self):
+        """在后台预取最近使用的其他用户的会话数据，并提前解码他们的头像和角色立绘"""
+        from core.user_sessions import user_sessions
+        usernames = user_sessions.prefetch_candidates()
+        user_sessions.prefetch(usernames)
+        for username in usernames:
+            self.avatar_label.prefetch(config.get_user_avatar(username))
+            portrait_path = self.get_character_portrait_path(config.get_user_character_name(username))
+            if portrait_path:
+                image_service.request(portrait_path, QSize(PORTRAIT_SIZE, PORTRAIT_SIZE))
     
     def update_nickname_display(self):
         """更新昵称显示"""
@@ -271,43 +324,49 @@ class TemplateMainWindow(QMainWindow):
         # 发送日志消息
         signal_bus.log_message.emit("INFO", f"已选择头像: {avatar_name}", {})
     
-    def update_character_portrait(self, character_name):
-        """更新角色立绘"""
+    @staticmethod
+    def get_character_portrait_path(character_name):
+        """角色立绘文件路径，找不到时返回 None
+
+        按500x500请求时，资源同步预先生成过的肖像会直接从图片服务的磁盘缓存读取
+        """
         from core.config import get_resource_path
         
-        # 尝试查找角色立绘文件（支持 png 和 webp 格式）
         characters_dir = get_resource_path("resources/characters")
-        portrait_path = None
-        
-        if characters_dir.exists():
-            # 优先尝试 webp 格式
-            webp_path = characters_dir / f"{character_name}.webp"
-            png_path = characters_dir / f"{character_name}.png"
-            
-            if webp_path.exists():
-                portrait_path = webp_path
-            elif png_path.exists():
-                portrait_path = png_path
-        
-        # 加载并显示图片
-        if portrait_path and portrait_path.exists():
-            portrait_pixmap = QPixmap(str(portrait_path))
-            if not portrait_pixmap.isNull():
-                # 设置图片大小为500x500，保持宽高比
-                scaled_pixmap = portrait_pixmap.scaled(
-                    500, 500,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                self.character_portrait_label.setPixmap(scaled_pixmap)
+        # 优先尝试 webp 格式
+        for suffix in (".webp", ".png"):
+            candidate = characters_dir / f"{character_name}{suffix}"
+            if candidate.exists():
+                return candidate
+        return None
+
+    @profiler.timed("加载角色立绘", "image")
+    def update_character_portrait(self, character_name):
+        """更新角色立绘"""
+        portrait_path = self.get_character_portrait_path(character_name)
+        
+        # 在后台按500x500解码（保持宽高比），完成前保留当前立绘
+        self._portrait_key = None
+        self._portrait_name = character_name
+        if portrait_path:
+            self._portrait_key, portrait_pixmap = image_service.request(portrait_path, QSize(PORTRAIT_SIZE, PORTRAIT_SIZE))
+            if portrait_pixmap is not None:
+                self.character_portrait_label.setPixmap(portrait_pixmap)
                 print(f"[DEBUG] 已更新角色立绘: {character_name}")
-            else:
-                print(f"[WARNING] 无法加载角色立绘: {portrait_path}")
-                self.character_portrait_label.clear()
         else:
             print(f"[WARNING] 未找到角色立绘: {character_name}")
             self.character_portrait_label.clear()
 
+    def _on_image_ready(self, key, pixmap):
+        if key != self._portrait_key:
+            return
+        if pixmap.isNull():
+            print(f"[WARNING] 无法加载角色立绘: {key.split('|')[0]}")
+            self.character_portrait_label.clear()
+        else:
+            self.character_portrait_label.setPixmap(pixmap)
+            print(f"[DEBUG] 已更新角色立绘: {self._portrait_name}")
+
     def on_settings_saved(self, settings):
         """设置保存回调"""
         signal_bus.log_message.emit("SUCCESS", "设置已保存", {})
@@ -315,47 +374,34 @@ class TemplateMainWindow(QMainWindow):
         self.apply_theme()
 
     def apply_theme(self):
-        """应用主题到所有组件"""
-        
-        # 更新背景图片
-        self.background_pixmap = load_background_image(config.theme)
-        central = self.centralWidget()
-        if isinstance(central, BackgroundWidget):
-            central.set_background(self.background_pixmap, config.theme)
-        
-        # 更新自定义标题栏主题
-        if hasattr(self, 'title_bar'):
-            self.title_bar.update_theme()
-        
-        self.setStyleSheet(get_main_window_style(config.theme))
-        
-        # 更新头像边框颜色
-        if hasattr(self, 'avatar_label'):
-            self.avatar_label.apply_theme(config.theme)
-        
-        # 更新昵称样式
-        if hasattr(self, 'nickname_label'):
-            self.update_nickname_style()
-        
-        # 数据爬取标签页
-        if hasattr(self, 'crawl_tab'):
-            if hasattr(self.crawl_tab, 'apply_theme'):
-                self.crawl_tab.apply_theme(config.theme)
-        
-        # 成就管理标签页
-        if hasattr(self, 'manage_tab'):
-            if hasattr(self.manage_tab, 'apply_theme'):
-                self.manage_tab.apply_theme(config.theme)
-        
-        for i in range(self.findChildren(QWidget).__len__()):
-            widget = self.findChildren(QWidget)[i]
-            if hasattr(widget, 'apply_theme'):
-                widget.apply_theme(config.theme)
+        """应用主题到所有组件（切换过程中暂停重绘，结束后统一重绘一次）"""
+        with updates_suspended(self):
+            # 更新背景图片
+            self.background_pixmap = load_background_image(config.theme)
+            central = self.centralWidget()
+            if isinstance(central, BackgroundWidget):
+                central.set_background(self.background_pixmap, config.theme)
+            
+            # 更新自定义标题栏主题
+            if hasattr(self, 'title_bar'):
+                self.title_bar.update_theme()
+            
+            self.setup_modern_ui()
+            
+            # 更新昵称样式
+            if hasattr(self, 'nickname_label'):
+                self.update_nickname_style()
+            
+            # 头像、已构建的标签页等带 apply_theme 的子控件各更新一次
+            # （未构建的标签页在构建时读取当前主题）
+            for widget in self.findChildren(QWidget):
+                if hasattr(widget, 'apply_theme'):
+                    widget.apply_theme(config.theme)
 
     def setup_data_sharing(self):
             """设置数据共享机制"""
             # 监听爬虫完成信号
-            if hasattr(self, 'crawl_tab'):
+            if 'crawl_tab' in getattr(self, '_lazy_tabs', {}):
                 # 连接爬虫完成信号到管理标签页
                 from PySide6.QtCore import QTimer
                 # 使用定时器延迟连接，确保组件已完全初始化
@@ -429,9 +475,10 @@ class TemplateMainWindow(QMainWindow):
     
     def on_category_config_updated(self):
         """处理分类配置更新"""
-        # 重新加载成就管理标签页的数据
-        if hasattr(self, 'manage_tab') and hasattr(self.manage_tab, 'load_local_data'):
-            self.manage_tab.load_local_data()
+        # 重新加载成就管理标签页的数据（未构建时会在首次激活时加载最新数据）
+        manage_tab = self.loaded_tab('manage_tab')
+        if manage_tab is not None:
+            manage_tab.load_local_data()
             print("[INFO] 成就管理数据已重新加载")
 
     def show_first_run_dialog(self):
@@ -550,4 +597,6 @@ class TemplateMainWindow(QMainWindow):
 
     def closeEvent(self, event):
             """窗口关闭事件"""
+            from core.user_sessions import user_sessions
+            user_sessions.cancel_prefetch()
             event.accept()
@@ -2,10 +2,15 @@
                                QComboBox, QGroupBox, QFileDialog, QApplication)
 from PySide6.QtCore import Qt
 import os
+import re
 import json
 
-from core.config import config, get_resource_path
+from core.config import config, DEFAULT_PROGRESS_STATUS
 from core.styles import get_font_gray_style, get_button_style
+from core.startup_profiler import profiler
+from core.instrumentation import metrics
+from core.columnar_store import COLUMNAR_MIN_ROWS
+from core.game_version import sort_versions
 
 # 导入爬虫相关的类
 from .achievement_table import AchievementTable
@@ -70,21 +75,419 @@ def _standardize_achievement_fields(achievement):
     return standardized
 
 
+def _excel_row_to_achievement(row_idx, row, col_index, first_category_map):
+    """将Excel中的一行转换为成就数据，数据无效时抛出 RowError"""
+    from core.background_jobs import RowError
+
+    achievement = {}
+
+    # 1. 绝对编号列：暂时不生成，在最后统一重新生成
+    abs_id = ''
+    if '绝对编号' in col_index:
+        abs_id_value = row[col_index['绝对编号']]
+        abs_id = str(abs_id_value).strip() if abs_id_value else ''
+    achievement['绝对编号'] = abs_id
+
+    # 2. 名称列：去除「隐藏成就」
+    name_value = row[col_index['名称']]
+    name = str(name_value).strip() if name_value else ''
+    if '「隐藏成就」' in name:
+        name = name.replace('「隐藏成就」', '').strip()
+    achievement['名称'] = name
+
+    # 3. 描述列
+    desc_value = row[col_index['描述']] if '描述' in col_index else ''
+    description = str(desc_value).strip() if desc_value else ''
+    achievement['描述'] = description
+
+    # 4. 版本列：智能处理小数
+    version_value = row[col_index['版本']] if '版本' in col_index else ''
+    version = str(version_value).strip() if version_value else ''
+    if version:
+        if '.' in version:
+            pass  # 已经有小数点，保持原样
+        else:
+            version = f"{version}.0"
+    achievement['版本'] = version
+
+    # 5. 奖励列：纯数字拼接"星声*"
+    reward_value = row[col_index['奖励']] if '奖励' in col_index else ''
+    reward = str(reward_value).strip() if reward_value else ''
+    if reward.isdigit():
+        reward = f"星声*{reward}"
+    achievement['奖励'] = reward
+
+    # 6. 是否隐藏列：简化判断，只判断是否包含"隐藏"
+    if '是否隐藏' in col_index:
+        hidden_value = row[col_index['是否隐藏']]
+        is_hidden = str(hidden_value).strip() if hidden_value else ''
+        achievement['是否隐藏'] = '隐藏' if '隐藏' in is_hidden else ''
+    else:
+        achievement['是否隐藏'] = ''
+
+    # 7. 第二分类列：必须有
+    second_category_value = row[col_index['第二分类']]
+    second_category = str(second_category_value).strip() if second_category_value else ''
+    if not second_category:
+        raise RowError("第二分类不能为空", '第二分类')
+    achievement['第二分类'] = second_category
+
+    # 8. 第一分类列：如果为空，根据第二分类映射自动补充
+    first_category = ''
+    if '第一分类' in col_index:
+        first_category_value = row[col_index['第一分类']]
+        first_category = str(first_category_value).strip() if first_category_value else ''
+    if not first_category:
+        first_category = first_category_map.get(second_category, '')
+    achievement['第一分类'] = first_category
+
+    # 9. 编号列：暂时不生成，在最后统一重新生成
+    serial_number = ''
+    if '编号' in col_index:
+        serial_value = row[col_index['编号']]
+        serial_number = str(serial_value).strip() if serial_value else ''
+    achievement['编号'] = serial_number
+
+    # 10. 获取状态列
+    if '获取状态' in col_index:
+        status_value = row[col_index['获取状态']]
+        achievement['获取状态'] = str(status_value).strip() if status_value else ''
+    else:
+        achievement['获取状态'] = ''
+
+    # 11. 成就组ID列
+    if '成就组ID' in col_index:
+        group_id_value = row[col_index['成就组ID']]
+        achievement['成就组ID'] = str(group_id_value).strip() if group_id_value else ''
+    else:
+        achievement['成就组ID'] = ''
+
+    # 12. 互斥成就列
+    achievement['互斥成就'] = []
+    if '互斥成就' in col_index:
+        exclusive_value = row[col_index['互斥成就']]
+        if exclusive_value:
+            # 如果是字符串，按逗号、分号或空格分割
+            if isinstance(exclusive_value, str):
+                parts = re.split(r'[,;，；\s]+', exclusive_value.strip())
+                achievement['互斥成就'] = [part.strip() for part in parts if part.strip()]
+            else:
+                achievement['互斥成就'] = [str(exclusive_value)]
+
+    return achievement
+
+
+def _full_json_export_job(job, file_path, achievements):
+    """后台线程：导出全字段 JSON，先写临时文件，完成后再替换目标文件"""
+    from core.background_jobs import iter_in_batches
+
+    # 准备全字段数据
+    export_data = []
+    for achievement in iter_in_batches(job, achievements, message="正在整理导出数据"):
+        export_data.append({
+            '绝对编号': achievement.get('绝对编号', ''),
+            '版本': achievement.get('版本', ''),
+            '第一分类': achievement.get('第一分类', ''),
+            '第二分类': achievement.get('第二分类', ''),
+            '编号': achievement.get('编号', ''),
+            '名称': achievement.get('名称', ''),
+            '描述': achievement.get('描述', ''),
+            '奖励': achievement.get('奖励', ''),
+            '是否隐藏': achievement.get('是否隐藏', ''),
+            '获取状态': achievement.get('获取状态', '')
+        })
+
+    # 保存到 JSON
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(export_data, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, file_path)
+
+    file_size = os.path.getsize(file_path)
+    print(f"[SUCCESS] 全字段数据已导出到: {file_path}")
+    print(f"[SUCCESS] 文件大小: {file_size} 字节")
+    print(f"[INFO] 包含 {len(export_data)} 条成就数据")
+    return len(export_data)
+
+
+def merge_user_progress(base_achievements, user_progress):
+    """合并基础成就和用户进度，返回新的成就记录（Achievement）列表"""
+    from core.achievement_record import Achievement
+
+    achievements = []
+    for base_achievement in base_achievements:
+        achievement = Achievement.from_dict(base_achievement)
+        achievement_id = achievement.get("编号", "")
+
+        # 添加用户进度
+        if achievement_id in user_progress:
+            progress = user_progress[achievement_id]
+            achievement["获取状态"] = progress["获取状态"]
+        else:
+            achievement["获取状态"] = ""
+
+        # 转换为内部使用的字段名
+        if "是否隐藏" in achievement:
+            achievement["is_hidden"] = achievement["是否隐藏"] == "隐藏"
+
+        achievements.append(achievement)
+    return achievements
+
+
+def compute_filter_facets(achievements, category_config):
+    """计算筛选器选项：版本倒序、第一分类按配置顺序、第二分类按字母顺序"""
+    versions = set()
+    first_categories = set()
+    second_categories = set()
+
+    for achievement in achievements:
+        versions.add(achievement.get('版本', ''))
+        first_categories.add(achievement.get('第一分类', ''))
+        second_categories.add(achievement.get('第二分类', ''))
+
+    # 版本号倒序，无法解析的放在最后
+    sorted_versions = sort_versions([v for v in versions if v], reverse=True)
+
+    # 按照配置中的排序顺序
+    first_category_order = category_config.get("first_categories", {})
+    ordered_first_categories = sorted(first_categories, key=lambda x: first_category_order.get(x, 999))
+
+    return {
+        "versions": sorted_versions,
+        "first_categories": [category for category in ordered_first_categories if category],
+        "second_categories": [category for category in sorted(second_categories) if category],
+    }
+
+
+def calculate_manage_statistics(data):
+    """计算成就管理页的汇总统计（考虑成就组），与 ManageTab.update_statistics 逻辑相同"""
+    # 正确统计总计（考虑成就组）
+    total_groups = set()
+    total_achievements = 0
+    for achievement in data:
+        group_id = achievement.get('成就组ID')
+        if group_id:
+            total_groups.add(group_id)
+        else:
+            total_achievements += 1
+    total = len(total_groups) + total_achievements
+
+    # 统计每个成就组的状态
+    group_status = {}  # group_id -> {'status': 'completed'/'incomplete'/'unavailable', 'has_hidden': bool}
+    for achievement in data:
+        status = achievement.get('获取状态', '') or '未完成'
+        group_id = achievement.get('成就组ID')
+        is_hidden = achievement.get('是否隐藏') == '隐藏'
+
+        if group_id:
+            if group_id not in group_status:
+                group_status[group_id] = {'status': status, 'has_hidden': is_hidden}
+            else:
+                # 更新状态：已完成 > 暂不可获取 > 未完成
+                current = group_status[group_id]['status']
+                if status == '已完成' or (status == '暂不可获取' and current != '已完成'):
+                    group_status[group_id]['status'] = status
+                if is_hidden:
+                    group_status[group_id]['has_hidden'] = True
+
+    # 统计已完成（考虑成就组）
+    completed = 0
+    for group_id, info in group_status.items():
+        if info['status'] == '已完成':
+            completed += 1
+
+    # 统计普通已完成成就
+    for achievement in data:
+        if achievement.get('获取状态', '') == '已完成' and not achievement.get('成就组ID'):
+            completed += 1
+
+    # 统计未完成（考虑成就组）
+    incomplete = 0
+    for group_id, info in group_status.items():
+        if info['status'] == '未完成':
+            incomplete += 1
+
+    # 统计普通未完成成就
+    for achievement in data:
+        status = achievement.get('获取状态', '') or '未完成'
+        if status == '未完成' and not achievement.get('成就组ID'):
+            incomplete += 1
+
+    # 统计隐藏成就（考虑成就组）
+    hidden = 0
+    processed_hidden_groups = set()
+    for achievement in data:
+        is_hidden = achievement.get('是否隐藏') == '隐藏'
+        group_id = achievement.get('成就组ID')
+
+        if is_hidden:
+            if group_id:
+                # 成就组：只计算一次
+                if group_id not in processed_hidden_groups:
+                    hidden += 1
+                    processed_hidden_groups.add(group_id)
+            else:
+                # 普通成就
+                hidden += 1
+
+    # 统计暂不可获取数量（考虑成就组）
+    unavailable = 0
+    processed_unavailable_groups = set()
+    for achievement in data:
+        status = achievement.get('获取状态', '')
+        group_id = achievement.get('成就组ID')
+
+        if status == '暂不可获取':
+            if group_id:
+                # 成就组：只计算一次
+                if group_id not in processed_unavailable_groups:
+                    unavailable += 1
+                    processed_unavailable_groups.add(group_id)
+            else:
+                # 普通成就
+                unavailable += 1
+
+    # 统计多选一数量（每个组只计算一次）
+    multi_choice_groups = set()
+    for achievement in data:
+        group_id = achievement.get('成就组ID')
+        if group_id:
+            multi_choice_groups.add(group_id)
+    multi_choice = len(multi_choice_groups)
+
+    return {
+        'total': total,
+        'completed': completed,
+        'incomplete': incomplete,
+        'hidden': hidden,
+        'unavailable': unavailable,
+        'multi_choice': multi_choice
+    }
+
+
+def load_filter_category_config():
+    """获取分类配置（筛选器排序用）"""
+    try:
+        category_config = config.load_category_config()
+        if not isinstance(category_config, dict):
+            category_config = {}
+    except Exception as e:
+        print(f"[ERROR] 加载分类配置失败: {str(e)}")
+        # 尝试直接访问属性
+        try:
+            if hasattr(config, 'category_config'):
+                category_config = getattr(config, 'category_config', {})
+            else:
+                category_config = {}
+        except:
+            category_config = {}
+        print("[INFO] 使用备用配置加载方式")
+    return category_config
+
+
+def load_user_achievements(username, user_progress=None, write_snapshot=True):
+    """加载用户的成就记录，返回 (记录列表, 筛选器选项, 统计信息)，基础数据不存在时返回 None
+
+    源文件未变化时直接使用热启动快照，否则合并基础数据和用户进度并重新保存快照（write_snapshot 为 False 时不保存）；
+    不访问界面，后台线程中调用时应传入 write_snapshot=False，只读取文件
+    """
+    from core.warm_snapshot import load_snapshot, save_snapshot
+
+    uid = config.get_user_uid(username)
+    snapshot = load_snapshot(username)
+    if snapshot is not None:
+        print(f"[INFO] 从热启动快照加载了 {len(snapshot[0])} 条成就数据（用户 {username}，UID: {uid}）")
+        return snapshot
+
+    # 加载基础成就数据
+    base_achievements = config.load_base_achievements()
+    if not base_achievements:
+        print("[WARNING] 基础成就数据文件不存在")
+        return None
+
+    # 加载用户进度数据
+    if user_progress is None:
+        print(f"[INFO] 加载用户 {username} (UID: {uid}) 的进度数据")
+        user_progress = config.load_user_progress(username)
+
+    # 合并数据
+    achievements = merge_user_progress(base_achievements, user_progress)
+    print(f"[INFO] 加载了 {len(achievements)} 条成就数据（基础数据 + 用户进度）")
+
+    # 预先计算筛选器选项和统计信息，与合并结果一起保存为快照
+    facets = compute_filter_facets(achievements, load_filter_category_config())
+    statistics = calculate_manage_statistics(achievements)
+    if achievements and write_snapshot:
+        save_snapshot(username, achievements, facets, statistics)
+    return achievements, facets, statistics
+
+
 class AchievementManager:
-    """成就管理器"""
+    """成就管理器，成就数量达到 columnar_min_rows 时筛选使用列存储索引，汇总统计使用成就组索引"""
+    columnar_min_rows = COLUMNAR_MIN_ROWS
 
     def __init__(self):
-        self.achievements = []
+        self._achievements = []
+        self._columns = None
+        self._groups = None
         self.filtered_achievements = []
 
+    @property
+    def achievements(self):
+        return self._achievements
+
+    @achievements.setter
+    def achievements(self, achievements):
+        # 记录列表被替换后列存储索引和成就组索引失效
+        self._achievements = achievements
+        self._columns = None
+        self._groups = None
+
+    @property
+    def groups(self):
+        """成就组索引（首次使用时创建）"""
+        if self._groups is None:
+            from core.achievement_groups import AchievementGroupIndex
+            self._groups = AchievementGroupIndex(self._achievements)
+        return self._groups
+
+    def sync_groups(self, records):
+        """确保这些记录都在成就组索引中，返回不属于 achievements 的记录数
+
+        记录列表被原地修改（增加或替换记录）后索引中缺少新记录，此时重建共享的索引，不另建副本
+        """
+        groups = self.groups
+        if all(record in groups for record in records):
+            return 0
+        self._groups = None
+        self._columns = None
+        groups = self.groups
+        return sum(1 for record in records if record not in groups)
+
+    def _get_columns(self):
+        """返回列存储索引，成就较少或未安装 numpy 时返回 None"""
+        if len(self._achievements) < self.columnar_min_rows:
+            return None
+        if self._columns is None or self._columns.count != len(self._achievements):
+            from core.columnar_store import AchievementColumns
+            self._columns = AchievementColumns.build(self._achievements)
+        return self._columns
+
     def load_data(self, achievements):
         """加载数据"""
         self.achievements = achievements
         self.filtered_achievements = achievements.copy()
 
+    @metrics.timed("筛选成就")
     def filter_data(self, search_text="", version="", first_category="", second_category="",
                     hidden_type="all", priority="默认排序", obtainable="全部"):
         """筛选数据"""
+        columns = self._get_columns()
+        if columns is not None:
+            self.filtered_achievements = columns.filter(self.achievements, search_text, version, first_category,
+                                                        second_category, hidden_type, priority, obtainable)
+            return self.filtered_achievements
+
         self.filtered_achievements = []
 
         for achievement in self.achievements:
@@ -140,40 +543,12 @@ class AchievementManager:
 
     def get_statistics(self):
         """获取统计信息"""
-        # 正确统计总计（考虑成就组）
-        total_groups = set()
-        total_achievements = 0
-        for achievement in self.achievements:
-            group_id = achievement.get('成就组ID')
-            if group_id:
-                total_groups.add(group_id)
-            else:
-                total_achievements += 1
-        total = len(total_groups) + total_achievements
-
-        # 正确统计完成数（考虑成就组）
-        completed = 0
-        processed_groups = set()
-        for achievement in self.achievements:
-            status = achievement.get('获取状态', '')
-            group_id = achievement.get('成就组ID')
-
-            if status == '已完成':
-                if group_id:
-                    # 成就组：只计算一次
-                    if group_id not in processed_groups:
-                        completed += 1
-                        processed_groups.add(group_id)
-                else:
-                    # 普通成就
-                    completed += 1
-
-        hidden = sum(1 for a in self.achievements if a.get('是否隐藏') == '隐藏')
-
+        groups = self.groups
+        summary = groups.summary()
         return {
-            'total': total,
-            'completed': completed,
-            'hidden': hidden
+            'total': summary['total'],
+            'completed': summary['completed'],
+            'hidden': groups.hidden_records
         }
 
 
@@ -455,21 +830,8 @@ class ManageTab(QWidget):
         # 更新版本下拉框
         self.version_filter.clear()
         self.version_filter.addItem("所有版本")
-        # 将版本号转换为浮点数进行倒序排序
-        valid_versions = []
-
-        for v in versions:
-            if v:
-                try:
-                    # 尝试转换为浮点数进行排序
-                    float_val = float(v)
-                    valid_versions.append((float_val, v))
-                except (ValueError, TypeError):
-                    # 如果转换失败，使用原始字符串排序
-                    valid_versions.append((-1, v))
-
-        # 按浮点数值倒序排序，无法转换的放在最后
-        sorted_versions = [v[1] for v in sorted(valid_versions, key=lambda x: x[0], reverse=True)]
+        # 版本号倒序，无法解析的放在最后
+        sorted_versions = sort_versions([v for v in versions if v], reverse=True)
 
         for version in sorted_versions:
             self.version_filter.addItem(version)
@@ -550,6 +912,10 @@ class ManageTab(QWidget):
 
     def filter_data(self):
         """筛选数据"""
+        self._refresh_view()
+
+    def _refresh_view(self, statistics=None):
+        """按当前筛选条件刷新表格和统计（statistics 为全部数据的预计算统计，可选）"""
         search_text = self.search_input.text().strip()
         version = self.version_filter.currentText()
         first_category = self.first_category_filter.currentText()
@@ -594,8 +960,11 @@ class ManageTab(QWidget):
         # 更新表格
         self.manager_table.load_data(filtered)
 
-        # 更新统计信息
-        self.update_statistics(filtered)
+        # 更新统计信息（未筛选掉任何数据时可直接使用预计算的统计）
+        if statistics is not None and len(filtered) == len(self.manager.achievements):
+            self._show_statistics(statistics)
+        else:
+            self.update_statistics(filtered)
 
     def update_statistics(self, data=None):
         """更新统计信息"""
@@ -603,8 +972,9 @@ class ManageTab(QWidget):
             data = self.manager.filtered_achievements
 
         # 使用统一的统计方法
-        statistics = self.calculate_statistics(data)
+        self._show_statistics(self.calculate_statistics(data))
 
+    def _show_statistics(self, statistics):
         self.total_label.setText(f"📊 总计: {statistics['total']}")
         self.completed_label.setText(f"✅ 已完成: {statistics['completed']}")
         self.incomplete_label.setText(f"⭕ 未完成: {statistics['incomplete']}")
@@ -651,441 +1021,242 @@ class ManageTab(QWidget):
                 show_notification(self, f"导入Excel失败: {str(e)}")
 
     def import_from_excel(self, excel_path):
-        """从Excel文件导入数据并转换为base_achievements和user_progress"""
-        try:
-            from openpyxl import load_workbook
-
-            # 读取Excel文件
-            print(f"[INFO] 正在读取Excel文件: {excel_path}")
-            workbook = load_workbook(excel_path)
-            sheet = workbook.active
-
-            # 检查第一行是否为时间信息行
-            first_row_values = [cell.value for cell in sheet[1]]
-            is_info_row = any("导出时间:" in str(val) or "用户:" in str(val) for val in first_row_values if val)
-
-            # 根据第一行内容确定表头位置
-            if is_info_row:
-                # 第一行是信息行，表头在第二行
-                header_row = 2
-                data_start_row = 3
-            else:
-                # 第一行就是表头
-                header_row = 1
-                data_start_row = 2
-
-            # 获取表头
-            headers = []
-            for cell in sheet[header_row]:
-                headers.append(cell.value)
-
+        """在后台读取并校验Excel，全部成功后回到界面线程写入基础成就和用户进度"""
+        from core.background_jobs import start_job
+        start_job(self, "导入Excel", self._excel_import_job, excel_path,
+                  on_success=self._on_excel_import_finished,
+                  on_failure=lambda message: show_notification(self, f"导入Excel失败: {message}"))
+
+    def _excel_import_job(self, job, excel_path):
+        """后台线程：读取并校验Excel，不访问界面控件"""
+        from core.excel_io import ExcelRowReader
+        from core.achievement_ops import load_first_category_map
+        from core.background_jobs import RowErrorReport, run_in_batches
+
+        # 流式读取Excel文件（read_only），表头与列索引只解析一次
+        print(f"[INFO] 正在读取Excel文件: {excel_path}")
+        with ExcelRowReader(excel_path) as reader:
             # 检查必要的列
-            required_columns = ['名称', '第二分类']
-            missing_columns = [col for col in required_columns if col not in headers]
+            missing_columns = reader.missing_columns(['名称', '第二分类'])
             if missing_columns:
                 raise Exception(f"缺少必要的列: {', '.join(missing_columns)}")
 
-            # 创建列名到索引的映射
-            col_index = {header: idx for idx, header in enumerate(headers)}
+            # 列名到索引的映射
+            col_index = reader.col_index
+            data_start_row = reader.data_start_row
 
             # 数据清洗和转换
             print(f"[INFO] 开始数据清洗...")
-            print(f"[DEBUG] 总行数: {sheet.max_row}, 数据开始行: {data_start_row}")
+            print(f"[DEBUG] 总行数: {reader.total_rows}, 数据开始行: {data_start_row}")
             print(f"[DEBUG] 列索引: {col_index}")
-            achievements = []
-
-            # 加载分类配置
-            try:
-                # 确保config对象已正确初始化
-                if not hasattr(config, 'load_category_config'):
-                    print("[ERROR] config对象缺少load_category_config方法")
-                    raise Exception("配置对象未正确初始化")
-
-                category_config = config.load_category_config()
-                if not isinstance(category_config, dict):
-                    print(f"[ERROR] category_config不是字典类型: {type(category_config)}")
-                    category_config = {}
-
-                first_categories = category_config.get("first_categories", {})
-                second_categories = category_config.get("second_categories", {})
-
-                # 确保返回的是字典
-                if not isinstance(first_categories, dict):
-                    first_categories = {}
-                if not isinstance(second_categories, dict):
-                    second_categories = {}
-
-            except Exception as e:
-                print(f"[ERROR] 加载分类配置失败: {str(e)}")
-                # 使用默认配置
-                first_categories = {}
-                second_categories = {}
-                print("[INFO] 使用默认分类配置")
 
             # 创建第二分类到第一分类的映射
-            first_category_map = {}
-            for first_cat, second_cats in second_categories.items():
-                for second_cat in second_cats:
-                    first_category_map[second_cat] = first_cat
+            first_category_map = load_first_category_map()
 
-            # 预先扫描所有第二分类，检查是否有缺失的
+            errors = RowErrorReport()
             missing_second_categories = set()
-            for row_idx, row in enumerate(sheet.iter_rows(min_row=data_start_row), start=data_start_row):
-                if not any(cell.value for cell in row):
-                    continue  # 跳过空行
-
-                # 获取第二分类
-                if '第二分类' in col_index:
-                    second_category_value = row[col_index['第二分类']].value
-                    second_category = str(second_category_value).strip() if second_category_value else ''
-
-                    if row_idx <= data_start_row + 2:  # 只显示前几行的调试信息
-                        print(f"[DEBUG] 预扫描第{row_idx}行，第二分类: '{second_category}'")
-                        print(
-                            f"[DEBUG] 预扫描第{row_idx}行，是否在first_category_map中: {second_category in first_category_map}")
-
-                    if second_category and second_category not in first_category_map:
-                        missing_second_categories.add(second_category)
-                        if row_idx <= data_start_row + 2:
-                            print(f"[DEBUG] 预扫描第{row_idx}行：发现缺失的第二分类 '{second_category}'")
-
-            # 如果有缺失的第二分类，提示用户
-            if missing_second_categories:
-                missing_list = '\n'.join(f'• {cat}' for cat in sorted(missing_second_categories))
-                from core.custom_message_box import CustomMessageBox
-                reply = CustomMessageBox.warning(
-                    self,
-                    "发现缺失的分类",
-                    f"Excel文件中发现以下第二分类未在分类管理中配置：\n\n{missing_list}\n\n请先在设置→分类管理中添加这些分类，然后重新导入。",
-                    ("确定",)
-                )
-                print(f"[WARNING] 发现缺失的第二分类: {missing_second_categories}")
-                return  # 中断导入
-
-            # 从数据开始行读取数据
-            for row_idx, row in enumerate(sheet.iter_rows(min_row=data_start_row), start=data_start_row):
-                if not any(cell.value for cell in row):
-                    continue  # 跳过空行
 
+            def transform(row_idx, row):
                 if row_idx <= data_start_row + 2:  # 只显示前几行的调试信息
-                    print(f"[DEBUG] 处理第{row_idx}行，数据: {[cell.value for cell in row]}")
-
-                achievement = {}
-
-                # 1. 绝对编号列：暂时不生成，在最后统一重新生成
-                abs_id = ''
-                if '绝对编号' in col_index:
-                    abs_id_value = row[col_index['绝对编号']].value
-                    abs_id = str(abs_id_value).strip() if abs_id_value else ''
-                achievement['绝对编号'] = abs_id
-
-                # 2. 名称列：去除「隐藏成就」
-                name_value = row[col_index['名称']].value
-                name = str(name_value).strip() if name_value else ''
-                if '「隐藏成就」' in name:
-                    name = name.replace('「隐藏成就」', '').strip()
-                achievement['名称'] = name
-
-                # 3. 描述列
-                desc_value = row[col_index['描述']].value if '描述' in col_index else ''
-                description = str(desc_value).strip() if desc_value else ''
-                achievement['描述'] = description
-
-                # 4. 版本列：智能处理小数
-                version_value = row[col_index['版本']].value if '版本' in col_index else ''
-                version = str(version_value).strip() if version_value else ''
-                if version:
-                    if '.' in version:
-                        pass  # 已经有小数点，保持原样
-                    else:
-                        version = f"{version}.0"
-                achievement['版本'] = version
-
-                # 5. 奖励列：纯数字拼接"星声*"
-                reward_value = row[col_index['奖励']].value if '奖励' in col_index else ''
-                reward = str(reward_value).strip() if reward_value else ''
-                if reward.isdigit():
-                    reward = f"星声*{reward}"
-                achievement['奖励'] = reward
-
-                # 6. 是否隐藏列：简化判断，只判断是否包含"隐藏"
-                if '是否隐藏' in col_index:
-                    hidden_value = row[col_index['是否隐藏']].value
-                    is_hidden = str(hidden_value).strip() if hidden_value else ''
-                    achievement['是否隐藏'] = '隐藏' if '隐藏' in is_hidden else ''
-                else:
-                    achievement['是否隐藏'] = ''
-
-                # 7. 第二分类列：必须有
-                second_category_value = row[col_index['第二分类']].value
-                second_category = str(second_category_value).strip() if second_category_value else ''
-                if not second_category:
-                    raise Exception(f"第{row_idx}行：第二分类不能为空")
-                achievement['第二分类'] = second_category
-
-                # 8. 第一分类列：如果为空，根据第二分类映射自动补充
-                first_category = ''
-                has_first_category_column = '第一分类' in col_index
-
-                if has_first_category_column:
-                    first_category_value = row[col_index['第一分类']].value
-                    first_category = str(first_category_value).strip() if first_category_value else ''
-
-                # 如果第一分类为空，根据第二分类映射获取第一分类
-                if not first_category:
-                    print(f"[DEBUG] 第{row_idx}行：尝试为第二分类 '{second_category}' 查找第一分类")
-                    print(f"[DEBUG] 第{row_idx}行：first_category_map包含的分类: {list(first_category_map.keys())}")
-
-                    # 尝试精确匹配
-                    first_category = first_category_map.get(second_category, '')
-
-                    # 如果精确匹配失败，尝试去除空格后匹配
-                    if not first_category:
-                        trimmed_second_category = second_category.strip()
-                        first_category = first_category_map.get(trimmed_second_category, '')
-                        if first_category:
-                            print(f"[DEBUG] 第{row_idx}行：去除空格后匹配成功")
-
-                    if first_category:
-                        print(f"[INFO] 第{row_idx}行：自动补充第一分类 '{first_category}'")
-                    else:
-                        print(f"[WARNING] 第{row_idx}行：无法找到第二分类 '{second_category}' 对应的第一分类")
-
-                achievement['第一分类'] = first_category
-
-                # 9. 编号列：暂时不生成，在最后统一重新生成
-                serial_number = ''
-                if '编号' in col_index:
-                    serial_value = row[col_index['编号']].value
-                    serial_number = str(serial_value).strip() if serial_value else ''
+                    print(f"[DEBUG] 处理第{row_idx}行，数据: {list(row)}")
+                achievement = _excel_row_to_achievement(row_idx, row, col_index, first_category_map)
+                # 收集未在分类管理中配置的第二分类
+                if achievement['第二分类'] not in first_category_map:
+                    missing_second_categories.add(achievement['第二分类'])
+                return achievement
+
+            achievements = run_in_batches(job, reader.iter_rows(), transform, errors,
+                                          total=reader.total_rows, message="正在校验并转换数据")
+
+        # 任一行失败或存在未配置的分类时不提交任何数据
+        if errors:
+            print(f"[ERROR] Excel中有 {len(errors)} 行数据校验失败，未导入任何数据")
+            return {"errors": errors, "report_path": errors.save_next_to(excel_path)}
+        if missing_second_categories:
+            print(f"[WARNING] 发现缺失的第二分类: {missing_second_categories}")
+            return {"missing_categories": missing_second_categories}
+
+        job.check_cancelled()
+        return {"achievements": achievements}
+
+    def _commit_excel_import(self, achievements):
+        """分离并保存基础成就和用户进度，重新编码后同步所有用户存档
+
+        会改写基础成就、用户进度和进度矩阵，只在界面线程中调用，不与其他保存操作并发
+        """
+        # 分离基础成就和用户进度
+        base_achievements = []
+        user_progress = {}
+
+        # 获取当前用户
+        current_user = config.get_current_user()
 
-                # 编号列：暂时不生成，在最后统一重新生成
-                achievement['编号'] = serial_number
+        for achievement in achievements:
+            # 创建基础成就副本（不包含获取状态）
+            base_achievement = achievement.copy()
+            # 只删除获取状态，保留其他所有字段（包括成就组ID和互斥成就）
+            if '获取状态' in base_achievement:
+                del base_achievement['获取状态']
+            base_achievements.append(base_achievement)
+
+            # 如果有获取状态，添加到用户进度
+            # 使用编号作为键（用户进度文件使用编号）
+            # 保存所有状态，包括"未完成"
+            serial_number = achievement.get('编号', '')
+            if serial_number and achievement.get('获取状态') is not None:
+                user_progress[serial_number] = {
+                    '获取状态': achievement['获取状态']
+                }
+            elif serial_number:
+                # 如果编号存在但状态为None，设置为未完成
+                user_progress[serial_number] = {
+                    '获取状态': '未完成'
+                }
 
-                # 10. 获取状态列
-                if '获取状态' in col_index:
-                    status_value = row[col_index['获取状态']].value
-                    achievement['获取状态'] = str(status_value).strip() if status_value else ''
-                else:
-                    achievement['获取状态'] = ''
+        # 保存基础成就数据
+        if not config.save_base_achievements(base_achievements):
+            raise Exception("保存基础成就数据失败")
 
-                # 11. 成就组ID列
-                if '成就组ID' in col_index:
-                    group_id_value = row[col_index['成就组ID']].value
-                    achievement['成就组ID'] = str(group_id_value).strip() if group_id_value else ''
-                else:
-                    achievement['成就组ID'] = ''
-
-                # 12. 互斥成就列
-                if '互斥成就' in col_index:
-                    exclusive_value = row[col_index['互斥成就']].value
-                    if exclusive_value:
-                        # 如果是字符串，尝试分割
-                        if isinstance(exclusive_value, str):
-                            # 尝试按逗号、分号或空格分割
-                            import re
-                            parts = re.split(r'[,;，；\s]+', exclusive_value.strip())
-                            achievement['互斥成就'] = [part.strip() for part in parts if part.strip()]
-                        else:
-                            achievement['互斥成就'] = [str(exclusive_value)]
-                    else:
-                        achievement['互斥成就'] = []
-                else:
-                    achievement['互斥成就'] = []
+        # 保存用户进度数据
+        if user_progress:
+            config.save_user_progress(current_user, user_progress)
 
-                achievements.append(achievement)
+        # 重新生成编号和绝对编号（与爬虫保持一致）
+        print("[INFO] 正在重新生成编号和绝对编号...")
+        base_achievements, id_mapping = self._smart_reencode_achievements(base_achievements)
+        print("[SUCCESS] 编号和绝对编号重新生成完成")
+        print(f"[INFO] 编号映射表包含 {len(id_mapping)} 个映射")
 
-            workbook.close()
+        # 将用户进度映射到新的编号
+        if user_progress:
+            # 创建新的进度数据
+            updated_user_progress = {}
 
-            # 分离基础成就和用户进度
-            base_achievements = []
-            user_progress = {}
+            print(f"[DEBUG] 开始映射用户进度，原始进度数量: {len(user_progress)}")
 
-            # 获取当前用户
-            current_user = config.get_current_user()
+            # 更新成就进度中的编号
+            for i, (old_id, progress_info) in enumerate(user_progress.items()):
+                # 查找新编号
+                new_id = id_mapping.get(old_id, old_id)
 
-            for achievement in achievements:
-                # 创建基础成就副本（不包含获取状态）
-                base_achievement = achievement.copy()
-                # 只删除获取状态，保留其他所有字段（包括成就组ID和互斥成就）
-                if '获取状态' in base_achievement:
-                    del base_achievement['获取状态']
-                base_achievements.append(base_achievement)
-
-                # 如果有获取状态，添加到用户进度
-                # 使用编号作为键（用户进度文件使用编号）
-                # 保存所有状态，包括"未完成"
-                serial_number = achievement.get('编号', '')
-                if serial_number and achievement.get('获取状态') is not None:
-                    user_progress[serial_number] = {
-                        '获取状态': achievement['获取状态']
-                    }
-                elif serial_number:
-                    # 如果编号存在但状态为None，设置为未完成
-                    user_progress[serial_number] = {
-                        '获取状态': '未完成'
-                    }
+                # 调试：检查progress_info类型
+                if i < 5:  # 只检查前5个
+                    print(
+                        f"[DEBUG] 处理进度 {i}: 旧编号={old_id}, 新编号={new_id}, 进度类型={type(progress_info)}, 进度值={progress_info}")
+
+                # 检查progress_info是否是字典
+                if not isinstance(progress_info, dict):
+                    print(f"[ERROR] 进度信息不是字典: {old_id} -> {type(progress_info)}, 值: {progress_info}")
+                    # 尝试修复
+                    if isinstance(progress_info, list):
+                        progress_info = {'获取状态': str(progress_info[0]) if progress_info else '未完成'}
+                    else:
+                        progress_info = {'获取状态': '未完成'}
+                    print(f"[DEBUG] 修复后的进度信息: {progress_info}")
 
-            # 保存基础成就数据
-            base_file = get_resource_path("resources/base_achievements.json")
-            with open(base_file, 'w', encoding='utf-8') as f:
-                json.dump(base_achievements, f, ensure_ascii=False, indent=2)
+                # 使用新编号（如果有变化）或保持原编号
+                updated_user_progress[new_id] = progress_info
 
-            # 保存用户进度数据
-            if user_progress:
-                config.save_user_progress(current_user, user_progress)
-
-            # 重新生成编号和绝对编号（与爬虫保持一致）
-            print("[INFO] 正在重新生成编号和绝对编号...")
-            base_achievements, id_mapping = self._smart_reencode_achievements(base_achievements)
-            print("[SUCCESS] 编号和绝对编号重新生成完成")
-            print(f"[INFO] 编号映射表包含 {len(id_mapping)} 个映射")
-
-            # 将用户进度映射到新的编号
-            if user_progress:
-                # 先保存重新编码前的原始映射（使用成就名称+第一分类+第二分类作为唯一标识）
-                original_mapping = {}
-                for achievement in base_achievements:
-                    # 使用成就名称+第一分类+第二分类作为唯一标识
+            # 检查是否有遗漏的成就（新成就没有在旧用户进度中）
+            for achievement in base_achievements:
+                new_id = achievement.get('编号', '')
+                if new_id and new_id not in updated_user_progress:
+                    # 检查是否是名称+描述的临时键
                     name = achievement.get('名称', '')
-                    first_cat = achievement.get('第一分类', '')
-                    second_cat = achievement.get('第二分类', '')
-                    code = achievement.get('编号', '')
-
-                    if name and first_cat and second_cat and code:
-                        key = f"{name}|{first_cat}|{second_cat}"
-                        original_mapping[key] = code
-
-                # 创建新的进度数据
-                updated_user_progress = {}
-
-                print(f"[DEBUG] 开始映射用户进度，原始进度数量: {len(user_progress)}")
-                print(f"[DEBUG] 编号映射表: {id_mapping}")
-
-                # 更新成就进度中的编号
-                for i, (old_id, progress_info) in enumerate(user_progress.items()):
-                    # 查找新编号
-                    new_id = id_mapping.get(old_id, old_id)
-
-                    # 调试：检查progress_info类型
-                    if i < 5:  # 只检查前5个
-                        print(
-                            f"[DEBUG] 处理进度 {i}: 旧编号={old_id}, 新编号={new_id}, 进度类型={type(progress_info)}, 进度值={progress_info}")
-
-                    # 检查progress_info是否是字典
-                    if not isinstance(progress_info, dict):
-                        print(f"[ERROR] 进度信息不是字典: {old_id} -> {type(progress_info)}, 值: {progress_info}")
-                        # 尝试修复
-                        if isinstance(progress_info, list):
-                            progress_info = {'获取状态': str(progress_info[0]) if progress_info else '未完成'}
-                        else:
-                            progress_info = {'获取状态': '未完成'}
-                        print(f"[DEBUG] 修复后的进度信息: {progress_info}")
-
-                    # 使用新编号（如果有变化）或保持原编号
-                    updated_user_progress[new_id] = progress_info
-
-                    if new_id != old_id:
-                        print(f"[DEBUG] 用户进度编号映射: {old_id} -> {new_id}")
-
-                # 检查是否有遗漏的成就（新成就没有在旧用户进度中）
-                for achievement in base_achievements:
-                    new_id = achievement.get('编号', '')
-                    if new_id and new_id not in updated_user_progress:
-                        # 检查是否是名称+描述的临时键
-                        name = achievement.get('名称', '')
-                        desc = achievement.get('描述', '')
-                        key = f"{name}|{desc}"
-
-                        if key in user_progress:
-                            updated_user_progress[new_id] = {
-                                '获取状态': user_progress[key]['获取状态']
-                            }
-                        else:
-                            # 设置为未完成
-                            updated_user_progress[new_id] = {
-                                '获取状态': '未完成'
-                            }
-
-                user_progress = updated_user_progress
-                print(f"[INFO] 用户进度已映射到新的编号，共 {len(user_progress)} 条")
-
-            # 更新管理器的数据
-            self.manager.achievements = base_achievements
-            self.manager.filtered_achievements = base_achievements.copy()
-
-            # 调试：检查第一分类是否正确补充
-            for i, achievement in enumerate(base_achievements[:3]):
-                print(
-                    f"[DEBUG] 保存前成就{i + 1}: 第一分类='{achievement.get('第一分类', '空')}', 第二分类='{achievement.get('第二分类', '空')}'")
-
-            # 将用户进度状态合并到基础成就数据中，用于表格显示
-            if updated_user_progress:
-                for achievement in base_achievements:
-                    serial_number = achievement.get('编号', '')
-                    if serial_number and serial_number in updated_user_progress:
-                        achievement['获取状态'] = updated_user_progress[serial_number]['获取状态']
+                    desc = achievement.get('描述', '')
+                    key = f"{name}|{desc}"
+
+                    if key in user_progress:
+                        updated_user_progress[new_id] = {
+                            '获取状态': user_progress[key]['获取状态']
+                        }
                     else:
-                        achievement['获取状态'] = '未完成'
+                        # 设置为未完成
+                        updated_user_progress[new_id] = {
+                            '获取状态': '未完成'
+                        }
+
+            user_progress = updated_user_progress
+            print(f"[INFO] 用户进度已映射到新的编号，共 {len(user_progress)} 条")
+
+        # 调试：检查第一分类是否正确补充
+        for i, achievement in enumerate(base_achievements[:3]):
+            print(
+                f"[DEBUG] 保存前成就{i + 1}: 第一分类='{achievement.get('第一分类', '空')}', 第二分类='{achievement.get('第二分类', '空')}'")
+
+        # 将用户进度状态合并到基础成就数据中，用于表格显示
+        for achievement in base_achievements:
+            serial_number = achievement.get('编号', '')
+            if serial_number and serial_number in user_progress:
+                achievement['获取状态'] = user_progress[serial_number]['获取状态']
             else:
-                # 如果没有用户进度，全部设为未完成
-                for achievement in base_achievements:
-                    achievement['获取状态'] = '未完成'
-
-            # 保存基础成就数据
-            base_file = get_resource_path("resources/base_achievements.json")
-            with open(base_file, 'w', encoding='utf-8') as f:
-                json.dump(base_achievements, f, ensure_ascii=False, indent=2)
-
-            # 保存当前用户的进度数据
-            if user_progress:
-                config.save_user_progress(current_user, user_progress)
-
-            # 同步更新所有用户的进度编号
-            print("[INFO] 正在同步更新所有用户的进度编号...")
-            if config.reencode_all_user_progress():
-                print("[SUCCESS] 所有用户进度编号同步更新完成")
-                # 重新加载当前用户的进度
-                user_progress = config.load_user_progress(current_user)
-            else:
-                print("[ERROR] 同步更新所有用户进度编号失败")
+                achievement['获取状态'] = '未完成'
 
-            # 更新表格显示
-            self.manager_table.load_data(base_achievements)
+        # 保存基础成就数据
+        if not config.save_base_achievements(base_achievements):
+            raise Exception("保存基础成就数据失败")
 
-            # 更新筛选器
-            self.update_filters()
+        # 保存当前用户的进度数据
+        if user_progress:
+            config.save_user_progress(current_user, user_progress)
 
-            # 更新统计
-            self.update_statistics()
+        # 同步更新所有用户的进度编号
+        print("[INFO] 正在同步更新所有用户的进度编号...")
+        if config.reencode_all_user_progress():
+            print("[SUCCESS] 所有用户进度编号同步更新完成")
+            # 重新加载当前用户的进度
+            user_progress = config.load_user_progress(current_user)
+        else:
+            print("[ERROR] 同步更新所有用户进度编号失败")
 
-            print(f"[SUCCESS] Excel导入完成，共 {len(base_achievements)} 条基础成就，{len(user_progress)} 条用户进度")
+        return base_achievements, user_progress
 
-            # 检查是否有缺失的分类，如果有则中断导入
-            if hasattr(self, 'missing_categories') and self.missing_categories:
-                missing_list = sorted(list(self.missing_categories))
-                missing_str = "、".join(missing_list)
+    def _on_excel_import_finished(self, result):
+        """界面线程：提交后台校验通过的Excel数据并刷新界面"""
+        from core.custom_message_box import CustomMessageBox
 
-                # 显示错误提示，中断导入
-                error_msg = f"发现未配置的第二分类: {missing_str}\n\n"
-                error_msg += "请在 设置→分类管理 中将这些分类添加到对应的第一分类下，然后重新导入。"
+        if "errors" in result:
+            errors = result["errors"]
+            CustomMessageBox.warning(
+                self,
+                "导入中断",
+                f"Excel中有 {len(errors)} 行数据无效，未导入任何数据：\n\n{errors.summary()}\n\n"
+                f"完整错误报告已保存到：\n{result['report_path']}"
+            )
+            return
 
-                print(f"[ERROR] 导入中断：发现未配置的分类: {missing_str}")
-                print(f"[INFO] 请在 设置→分类管理 中添加这些分类后重新导入")
+        if "missing_categories" in result:
+            # 如果有缺失的第二分类，提示用户
+            missing_list = '\n'.join(f'• {cat}' for cat in sorted(result["missing_categories"]))
+            CustomMessageBox.warning(
+                self,
+                "发现缺失的分类",
+                f"Excel文件中发现以下第二分类未在分类管理中配置：\n\n{missing_list}\n\n请先在设置→分类管理中添加这些分类，然后重新导入。"
+            )
+            return
 
-                # 显示错误提示
-                from core.custom_message_box import CustomMessageBox
-                CustomMessageBox.warning(self, "导入中断", error_msg)
+        try:
+            base_achievements, user_progress = self._commit_excel_import(result["achievements"])
+        except Exception as e:
+            print(f"[ERROR] 导入Excel失败: {str(e)}")
+            show_notification(self, f"导入Excel失败: {str(e)}")
+            return
 
-                # 不更新数据，保持原状
-                return
+        # 更新管理器的数据
+        self.manager.achievements = base_achievements
+        self.manager.filtered_achievements = base_achievements.copy()
 
-            print(f"[SUCCESS] Excel导入完成，共 {len(base_achievements)} 条基础成就，{len(user_progress)} 条用户进度")
-            show_notification(self, f"导入成功，共 {len(base_achievements)} 条成就数据")
+        # 更新表格显示
+        self.manager_table.load_data(base_achievements)
 
-        except Exception as e:
-            print(f"[ERROR] 导入Excel失败: {str(e)}")
-            raise Exception(f"导入Excel失败: {str(e)}")
+        # 更新筛选器
+        self.update_filters()
+
+        # 更新统计
+        self.update_statistics()
+
+        print(f"[SUCCESS] Excel导入完成，共 {len(base_achievements)} 条基础成就，{len(user_progress)} 条用户进度")
+        show_notification(self, f"导入成功，共 {len(base_achievements)} 条成就数据")
 
     def export_excel(self):
         """导出Excel文件（包含基础成就和用户进度）"""
@@ -1103,28 +1274,28 @@ class ManageTab(QWidget):
                 show_notification(self, f"导出Excel失败: {str(e)}")
 
     def export_to_excel(self, file_path):
-        """将基础成就和用户进度合并导出为Excel"""
+        """在后台将基础成就和用户进度合并导出为Excel"""
+        from core.background_jobs import start_job
+
+        # 在界面线程中快照用户进度映射，后台线程不读取界面数据
+        progress_map = {item.get('绝对编号', ''): item.get('获取状态', '')
+                        for item in self.manager.achievements if item.get('绝对编号')}
+        start_job(self, "导出Excel", self._excel_export_job, file_path, progress_map,
+                  on_success=lambda count: show_notification(self, f"导出成功，共 {count} 条成就数据"),
+                  on_failure=lambda message: show_notification(self, message))
+
+    def _excel_export_job(self, job, file_path, progress_map):
+        """后台线程：合并数据并写入Excel，取消时不生成文件"""
+        from core.background_jobs import iter_in_batches, JobCancelled
+
         try:
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
             from openpyxl.utils import get_column_letter
-
-            # 创建工作簿
-            workbook = Workbook()
-            sheet = workbook.active
-            sheet.title = "成就数据"
+            from core.excel_io import (create_write_only_workbook, create_sheet, styled,
+                                       append_styled_row, reward_style, STATUS_STYLES)
 
             # 获取基础成就数据
             base_achievements = config.load_base_achievements()
 
-            # 获取当前用户进度数据
-            current_user = config.get_current_user()
-            user_progress = config.load_user_progress(current_user)
-
-            # 创建用户进度映射
-            progress_map = {item.get('绝对编号', ''): item.get('获取状态', '')
-                            for item in self.manager.achievements if item.get('绝对编号')}
-
             # 合并数据
             merged_data = []
             for achievement in base_achievements:
@@ -1141,6 +1312,27 @@ class ManageTab(QWidget):
                 '成就组ID', '互斥成就'
             ]
 
+            # 列宽
+            column_widths = {
+                '绝对编号': 12,
+                '版本': 10,
+                '第一分类': 15,
+                '第二分类': 20,
+                '编号': 12,
+                '名称': 25,
+                '描述': 40,
+                '奖励': 15,
+                '是否隐藏': 10,
+                '获取状态': 10,
+                '成就组ID': 15,
+                '互斥成就': 20
+            }
+
+            # 创建 write_only 工作簿，所有单元格共享命名样式
+            workbook = create_write_only_workbook()
+            sheet = create_sheet(workbook, "成就数据",
+                                 [column_widths.get(field_name, 15) for field_name in column_order])
+
             # 在第一行添加导出时间信息，使用与统计信息相同的逻辑
             current_user = config.get_current_user()
             users = config.get_users()
@@ -1148,100 +1340,50 @@ class ManageTab(QWidget):
             uid = user_data.get('uid', current_user) if isinstance(user_data, dict) else current_user
             statistics = self.calculate_statistics(merged_data)
             info_text = f"导出时间: {self.get_current_time()} | 用户: {current_user} | UID: {uid} | 成就总数: {statistics['total']} | 已完成: {statistics['completed']} | 未完成: {statistics['incomplete']} | 隐藏成就: {statistics['hidden']} | 暂不可获取: {statistics['unavailable']} | 多选一成就: {statistics['multi_choice']}"
-            info_cell = sheet.cell(row=1, column=1, value=info_text)
-            info_cell.font = Font(size=10, color="666666")
-            info_cell.alignment = Alignment(horizontal="left", vertical="center")
+            sheet.append([styled(sheet, info_text, "ww_info")])
             # 合并信息单元格
-            sheet.merge_cells(start_row=1, start_column=1,
-                              end_row=1, end_column=len(column_order))
+            sheet.merged_cells.add(f"A1:{get_column_letter(len(column_order))}1")
 
             # 设置表头（现在在第二行）
-            for col, header in enumerate(column_order, 1):
-                cell = sheet.cell(row=2, column=col, value=header)
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = Border(left=Side(style='thin'), right=Side(style='thin'),
-                                     top=Side(style='thin'), bottom=Side(style='thin'))
+            append_styled_row(sheet, column_order, "ww_header")
 
             # 填充数据（从第三行开始）
-            for row_idx, item in enumerate(merged_data, 3):
-                for col_idx, field_name in enumerate(column_order, 1):
+            for item in iter_in_batches(job, merged_data, message="正在写入Excel"):
+                row = []
+                for field_name in column_order:
                     value = item.get(field_name, '')
 
                     # 特殊处理互斥成就列 - 保持数组格式，但Excel中显示为逗号分隔的字符串
                     if field_name == '互斥成就' and isinstance(value, list):
                         # 使用逗号分隔，这样导入时可以正确解析
                         value = ', '.join(str(item) for item in value) if value else ''
-
-                    cell = sheet.cell(row=row_idx, column=col_idx, value=str(value))
-
-                    # 设置边框
-                    cell.border = Border(left=Side(style='thin'), right=Side(style='thin'),
-                                         top=Side(style='thin'), bottom=Side(style='thin'))
+                    value = str(value)
 
                     # 特殊格式化
                     if field_name == '名称':
-                        cell.font = Font(bold=True)
+                        style = "ww_name"
                     elif field_name == '是否隐藏' and value == '隐藏':
-                        cell.font = Font(color="FF9900")  # 橙色
-                    elif field_name == '奖励' and '星声*' in str(value):
-                        # 根据星声数量设置不同颜色
-                        if '20' in str(value):
-                            cell.font = Font(color="FF6B35")  # 橙色
-                        elif '10' in str(value):
-                            cell.font = Font(color="4ECDC4")  # 青色
-                        elif '5' in str(value):
-                            cell.font = Font(color="45B7D1")  # 蓝色
+                        style = "ww_hidden"  # 橙色
+                    elif field_name == '奖励':
+                        style = reward_style(value)  # 根据星声数量设置不同颜色
                     elif field_name == '获取状态':
-                        # 根据获取状态设置颜色
-                        if value == '已完成':
-                            cell.font = Font(color="00AA00")  # 绿色
-                            cell.fill = PatternFill(start_color="E8F5E8", end_color="E8F5E8",
-                                                    fill_type="solid")  # 浅绿色背景
-                        elif value == '已占用':
-                            cell.font = Font(color="FF6B35")  # 橙红色
-                            cell.fill = PatternFill(start_color="FFE8E0", end_color="FFE8E0",
-                                                    fill_type="solid")  # 浅橙色背景
-                        elif value == '未完成':
-                            cell.font = Font(color="888888")  # 灰色
-                            cell.fill = PatternFill(start_color="F5F5F5", end_color="F5F5F5",
-                                                    fill_type="solid")  # 浅灰色背景
-                        elif value == '暂不可获取':
-                            cell.font = Font(color="999999")  # 深灰色
-                            cell.fill = PatternFill(start_color="EEEEEE", end_color="EEEEEE",
-                                                    fill_type="solid")  # 深灰色背景
-
-            # 调整列宽
-            column_widths = {
-                '绝对编号': 12,
-                '版本': 10,
-                '第一分类': 15,
-                '第二分类': 20,
-                '编号': 12,
-                '名称': 25,
-                '描述': 40,
-                '奖励': 15,
-                '是否隐藏': 10,
-                '获取状态': 10,
-                '成就组ID': 15,
-                '互斥成就': 20
-            }
-
-            for col_idx, field_name in enumerate(column_order, 1):
-                sheet.column_dimensions[get_column_letter(col_idx)].width = column_widths.get(field_name, 15)
-
-            # 时间信息已经移到顶部第一行，无需在底部重复添加
+                        style = STATUS_STYLES.get(value, "ww_cell")  # 根据获取状态设置颜色
+                    else:
+                        style = "ww_cell"
+                    row.append(styled(sheet, value, style))
+                sheet.append(row)
 
-            # 添加下拉框和条件格式
+            # 添加下拉框
             self.add_excel_validation_and_formatting(sheet, len(merged_data), column_order)
 
             # 保存文件
             workbook.save(file_path)
             print(f"[SUCCESS] Excel数据已导出到: {file_path}")
             print(f"[INFO] 包含 {len(merged_data)} 条成就数据")
-            show_notification(self, f"导出成功，共 {len(merged_data)} 条成就数据")
+            return len(merged_data)
 
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f"[ERROR] 导出Excel失败: {str(e)}")
             raise Exception(f"导出Excel失败: {str(e)}")
@@ -1249,19 +1391,12 @@ class ManageTab(QWidget):
     def get_dynamic_export_filename(self):
         """生成动态导出文件名"""
         try:
-            # 获取基础成就数据
-            base_achievements = config.load_base_achievements()
-
-            # 提取所有版本号并排序
-            versions = set()
-            for achievement in base_achievements:
-                version = achievement.get('版本', '')
-                if version:
-                    versions.add(version)
+            # 提取所有版本号并排序（只读取基础成就的分片清单）
+            versions = {version for version in config.get_base_versions() if version}
 
             if versions:
                 # 排序版本号
-                sorted_versions = sorted(versions, key=lambda x: float(x))
+                sorted_versions = sort_versions(versions)
                 min_version = sorted_versions[0]
                 max_version = sorted_versions[-1]
 
@@ -1287,46 +1422,31 @@ class ManageTab(QWidget):
             return "成就数据.xlsx"
 
     def add_excel_validation_and_formatting(self, sheet, data_rows, column_order):
-        """为Excel添加下拉框和条件格式"""
+        """为Excel添加下拉框（兼容 write_only 工作表）"""
         try:
-            from openpyxl.worksheet.datavalidation import DataValidation
             from openpyxl.utils import get_column_letter
-
-            # 移除分类配置加载，因为不再需要下拉框
+            from core.excel_io import add_list_validation
 
             # 定义下拉框选项
             status_options = '已完成,已占用,未完成,暂不可获取'
             reward_options = '星声*5,星声*10,星声*20'
 
-            # 为每一列添加下拉框
-            for col_idx, field_name in enumerate(column_order, 1):
-                col_letter = get_column_letter(col_idx)
-
-                # 获取状态列 - 添加下拉框
-                if field_name == '获取状态':
-                    dv = DataValidation(type="list", formula1=f'"{status_options}"', allow_blank=True)
-                    dv.error = '请从下拉列表中选择有效的状态'
-                    dv.errorTitle = '输入错误'
-                    # 应用到数据区域（从第3行到最后一行）
-                    sheet.add_data_validation(dv)
-                    dv.add(f"{col_letter}3:{col_letter}{data_rows + 2}")
+            # 获取状态列 - 添加下拉框，应用到数据区域（从第3行到最后一行）
+            if '获取状态' in column_order:
+                col_letter = get_column_letter(column_order.index('获取状态') + 1)
+                add_list_validation(sheet, status_options, f"{col_letter}3:{col_letter}{data_rows + 2}",
+                                    '请从下拉列表中选择有效的状态')
 
-                # 第一分类和第二分类列 - 移除下拉框，允许自由输入
-
-            # 移除条件格式功能，因为Excel动态条件格式支持有限
+            # 第一分类和第二分类列 - 不添加下拉框，允许自由输入
 
             # 为奖励列添加下拉框
             reward_col_idx = column_order.index('奖励') + 1 if '奖励' in column_order else 0
             if reward_col_idx > 0:
                 reward_col_letter = get_column_letter(reward_col_idx)
-                # 添加下拉框验证
-                dv = DataValidation(type="list", formula1=f'"{reward_options}"', allow_blank=True)
-                dv.error = '请从下拉列表中选择有效的奖励数量'
-                dv.errorTitle = '输入错误'
-                dv.prompt = '请选择奖励数量'
-                dv.promptTitle = '提示'
-                sheet.add_data_validation(dv)
-                dv.add(f"{reward_col_letter}3:{reward_col_letter}{data_rows + 2}")
+                add_list_validation(sheet, reward_options,
+                                    f"{reward_col_letter}3:{reward_col_letter}{data_rows + 2}",
+                                    '请从下拉列表中选择有效的奖励数量',
+                                    prompt='请选择奖励数量', prompt_title='提示')
 
             print(f"[INFO] 已添加Excel下拉框 - 数据行数: {data_rows}")
             print(f"[DEBUG] 奖励列索引: {reward_col_idx}")
@@ -1334,110 +1454,13 @@ class ManageTab(QWidget):
         except Exception as e:
             print(f"[WARNING] 添加Excel验证和格式时出错: {str(e)}")
 
+    @metrics.timed("成就管理统计")
     def calculate_statistics(self, data):
         """计算统计信息，与update_statistics逻辑相同"""
-        # 正确统计总计（考虑成就组）
-        total_groups = set()
-        total_achievements = 0
-        for achievement in data:
-            group_id = achievement.get('成就组ID')
-            if group_id:
-                total_groups.add(group_id)
-            else:
-                total_achievements += 1
-        total = len(total_groups) + total_achievements
-
-        # 统计每个成就组的状态
-        group_status = {}  # group_id -> {'status': 'completed'/'incomplete'/'unavailable', 'has_hidden': bool}
-        for achievement in data:
-            status = achievement.get('获取状态', '') or '未完成'
-            group_id = achievement.get('成就组ID')
-            is_hidden = achievement.get('是否隐藏') == '隐藏'
-
-            if group_id:
-                if group_id not in group_status:
-                    group_status[group_id] = {'status': status, 'has_hidden': is_hidden}
-                else:
-                    # 更新状态：已完成 > 暂不可获取 > 未完成
-                    current = group_status[group_id]['status']
-                    if status == '已完成' or (status == '暂不可获取' and current != '已完成'):
-                        group_status[group_id]['status'] = status
-                    if is_hidden:
-                        group_status[group_id]['has_hidden'] = True
-
-        # 统计已完成（考虑成就组）
-        completed = 0
-        for group_id, info in group_status.items():
-            if info['status'] == '已完成':
-                completed += 1
-
-        # 统计普通已完成成就
-        for achievement in data:
-            if achievement.get('获取状态', '') == '已完成' and not achievement.get('成就组ID'):
-                completed += 1
-
-        # 统计未完成（考虑成就组）
-        incomplete = 0
-        for group_id, info in group_status.items():
-            if info['status'] == '未完成':
-                incomplete += 1
-
-        # 统计普通未完成成就
-        for achievement in data:
-            status = achievement.get('获取状态', '') or '未完成'
-            if status == '未完成' and not achievement.get('成就组ID'):
-                incomplete += 1
-
-        # 统计隐藏成就（考虑成就组）
-        hidden = 0
-        processed_hidden_groups = set()
-        for achievement in data:
-            is_hidden = achievement.get('是否隐藏') == '隐藏'
-            group_id = achievement.get('成就组ID')
-
-            if is_hidden:
-                if group_id:
-                    # 成就组：只计算一次
-                    if group_id not in processed_hidden_groups:
-                        hidden += 1
-                        processed_hidden_groups.add(group_id)
-                else:
-                    # 普通成就
-                    hidden += 1
-
-        # 统计暂不可获取数量（考虑成就组）
-        unavailable = 0
-        processed_unavailable_groups = set()
-        for achievement in data:
-            status = achievement.get('获取状态', '')
-            group_id = achievement.get('成就组ID')
-
-            if status == '暂不可获取':
-                if group_id:
-                    # 成就组：只计算一次
-                    if group_id not in processed_unavailable_groups:
-                        unavailable += 1
-                        processed_unavailable_groups.add(group_id)
-                else:
-                    # 普通成就
-                    unavailable += 1
-
-        # 统计多选一数量（每个组只计算一次）
-        multi_choice_groups = set()
-        for achievement in data:
-            group_id = achievement.get('成就组ID')
-            if group_id:
-                multi_choice_groups.add(group_id)
-        multi_choice = len(multi_choice_groups)
-
-        return {
-            'total': total,
-            'completed': completed,
-            'incomplete': incomplete,
-            'hidden': hidden,
-            'unavailable': unavailable,
-            'multi_choice': multi_choice
-        }
+        # 筛选结果包含全部记录时直接使用成就组索引维护的计数
+        if data and len(data) == len(self.manager.achievements) and data[0] in self.manager.groups:
+            return self.manager.groups.summary()
+        return calculate_manage_statistics(data)
 
     # Excel动态下拉框实现复杂，暂时使用静态下拉框，用户需要手动确保分类匹配
 
@@ -1465,94 +1488,128 @@ class ManageTab(QWidget):
             self, "导入JSON文件", "", "JSON Files (*.json)"
         )
         if file_path:
-            try:
-                print(f"[INFO] 开始导入 JSON 文件: {file_path}")
-
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                achievements = []
-                needs_reencoding = False  # 是否需要重新编码
-
-                if isinstance(data, list):
-                    # 数组格式：直接是成就列表
-                    for achievement in data:
-                        # 检查是否需要重新编码
-                        if self._needs_reencoding(achievement):
-                            needs_reencoding = True
-                        # 标准化字段名
-                        standardized = _standardize_achievement_fields(achievement)
-                        achievements.append(standardized)
-                elif isinstance(data, dict):
-                    # 字典格式：可能是进度数据或完整数据
-                    if len(list(data.keys())[0]) <= 10:  # 可能是进度数据
-                        # 进度数据格式，需要与基础数据合并
-                        base_achievements = config.load_base_achievements()
-                        for base_achievement in base_achievements:
-                            achievement = base_achievement.copy()
-                            achievement_id = achievement.get("编号", "")
-
-                            # 添加用户进度
-                            if achievement_id in data:
-                                progress = data[achievement_id]
-                                achievement["获取状态"] = progress.get("获取状态", "")
-                            else:
-                                achievement["获取状态"] = ""
-
-                            # 转换为内部使用的字段名
-                            if "是否隐藏" in achievement:
-                                achievement["is_hidden"] = achievement["是否隐藏"] == "隐藏"
-
-                            achievements.append(achievement)
-                    else:
-                        # 完整数据格式，直接使用
-                        for achievement_id, achievement_data in data.items():
-                            achievement = achievement_data.copy()
-                            achievement["编号"] = achievement_id
+            from core.background_jobs import start_job
+            print(f"[INFO] 开始导入 JSON 文件: {file_path}")
+            start_job(self, "导入JSON", self._json_import_job, file_path,
+                      on_success=self._on_json_import_finished,
+                      on_failure=lambda message: show_notification(self, f"导入失败: {message}"))
+
+    def _json_import_job(self, job, file_path):
+        """后台线程：读取并逐批校验JSON成就数据，不访问界面控件"""
+        from core.background_jobs import RowError, RowErrorReport, run_in_batches
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        errors = RowErrorReport()
+        state = {"needs_reencoding": False}  # 是否需要重新编码
+
+        def standardize(row_idx, achievement):
+            if not isinstance(achievement, dict):
+                raise RowError(f"不是有效的成就对象: {str(achievement)[:50]}")
+            # 检查是否需要重新编码
+            if self._needs_reencoding(achievement):
+                state["needs_reencoding"] = True
+            # 标准化字段名
+            return _standardize_achievement_fields(achievement)
+
+        if isinstance(data, list):
+            # 数组格式：直接是成就列表
+            achievements = run_in_batches(job, enumerate(data, 1), standardize, errors,
+                                          total=len(data), message="正在校验成就数据")
+        elif isinstance(data, dict) and data and len(list(data.keys())[0]) <= 10:  # 可能是进度数据
+            # 进度数据格式，需要与基础数据合并
+            base_achievements = config.load_base_achievements()
 
-                            # 检查是否需要重新编码
-                            if self._needs_reencoding(achievement):
-                                needs_reencoding = True
+            def merge_progress(row_idx, base_achievement):
+                achievement = base_achievement.copy()
+                achievement_id = achievement.get("编号", "")
 
-                            # 标准化字段名
-                            standardized = _standardize_achievement_fields(achievement)
-                            achievements.append(standardized)
+                # 添加用户进度
+                if achievement_id in data:
+                    progress = data[achievement_id]
+                    if not isinstance(progress, dict):
+                        raise RowError(f"进度数据格式错误: {achievement_id}", achievement_id)
+                    achievement["获取状态"] = progress.get("获取状态", "")
+                else:
+                    achievement["获取状态"] = ""
 
-                if achievements:
-                    # 如果需要重新编码，进行智能重新排序和编码
-                    if needs_reencoding:
-                        print("[INFO] 检测到需要重新编码的数据，正在优化排序和编码...")
-                        achievements = self._smart_reencode_achievements(achievements)
+                # 转换为内部使用的字段名
+                if "是否隐藏" in achievement:
+                    achievement["is_hidden"] = achievement["是否隐藏"] == "隐藏"
+                return achievement
+
+            achievements = run_in_batches(job, enumerate(base_achievements, 1), merge_progress, errors,
+                                          total=len(base_achievements), message="正在合并进度数据")
+        elif isinstance(data, dict):
+            # 完整数据格式，直接使用
+            def with_id(row_idx, item):
+                achievement_id, achievement_data = item
+                if not isinstance(achievement_data, dict):
+                    raise RowError(f"不是有效的成就对象: {achievement_id}", achievement_id)
+                achievement = achievement_data.copy()
+                achievement["编号"] = achievement_id
+                return standardize(row_idx, achievement)
+
+            achievements = run_in_batches(job, enumerate(data.items(), 1), with_id, errors,
+                                          total=len(data), message="正在校验成就数据")
+        else:
+            raise Exception("文件格式错误，应为成就列表或对象")
+
+        # 任一条数据无效时不提交任何数据
+        if errors:
+            print(f"[ERROR] JSON中有 {len(errors)} 条数据校验失败，未导入任何数据")
+            return {"errors": errors, "report_path": errors.save_next_to(file_path)}
+
+        # 如果需要重新编码，进行智能重新排序和编码
+        if achievements and state["needs_reencoding"]:
+            print("[INFO] 检测到需要重新编码的数据，正在优化排序和编码...")
+            job.report(len(achievements), len(achievements), "正在优化排序和编码", force=True)
+            achievements, _ = self._smart_reencode_achievements(achievements)
+
+        job.check_cancelled()
+        return {"achievements": achievements, "needs_reencoding": state["needs_reencoding"]}
+
+    def _on_json_import_finished(self, result):
+        """界面线程：提交后台校验通过的JSON数据"""
+        if "errors" in result:
+            from core.custom_message_box import CustomMessageBox
+            errors = result["errors"]
+            CustomMessageBox.warning(
+                self,
+                "导入中断",
+                f"JSON中有 {len(errors)} 条数据无效，未导入任何数据：\n\n{errors.summary()}\n\n"
+                f"完整错误报告已保存到：\n{result['report_path']}"
+            )
+            return
 
-                    # 更新管理器数据
-                    self.manager.load_data(achievements)
+        achievements = result["achievements"]
+        if not achievements:
+            print("[WARNING] 导入的文件中没有数据")
+            return
 
-                    # 更新表格
-                    self.manager_table.load_data(achievements)
+        # 更新管理器数据
+        self.manager.load_data(achievements)
 
-                    # 更新筛选器
-                    self.update_filters()
+        # 更新表格
+        self.manager_table.load_data(achievements)
 
-                    # 更新统计
-                    self.update_statistics()
+        # 更新筛选器
+        self.update_filters()
 
-                    # 保存为JSON
-                    self.save_to_json()
+        # 更新统计
+        self.update_statistics()
 
-                    status_msg = f"成功导入 {len(achievements)} 条成就数据"
-                    if needs_reencoding:
-                        status_msg += "（已优化排序和编码）"
-                    print(f"[SUCCESS] {status_msg}")
+        # 保存为JSON
+        self.save_to_json()
 
-                    # 显示提示
-                    show_notification(self, status_msg)
-                else:
-                    print("[WARNING] 导入的文件中没有数据")
+        status_msg = f"成功导入 {len(achievements)} 条成就数据"
+        if result["needs_reencoding"]:
+            status_msg += "（已优化排序和编码）"
+        print(f"[SUCCESS] {status_msg}")
 
-            except Exception as e:
-                print(f"[ERROR] 导入失败: {str(e)}")
-                import traceback
-                traceback.print_exc()
+        # 显示提示
+        show_notification(self, status_msg)
 
     def _needs_reencoding(self, achievement):
         """判断成就是否需要重新编码"""
@@ -1567,128 +1624,8 @@ class ManageTab(QWidget):
 
     def _smart_reencode_achievements(self, achievements):
         """智能重新编码成就，优化排序"""
-        # 按照要求的排序规则排序：
-        # 1. 保持相对稳定（现有编号尽可能保持不变）
-        # 2. 第一分类排序
-        # 3. 第二分类排序
-        # 4. 版本号按浮点型正序
-
-        # 获取分类配置
-        from core.config import config
-        try:
-            category_config = config.load_category_config()
-            if not isinstance(category_config, dict):
-                category_config = {}
-            first_categories = category_config.get("first_categories", {})
-            second_categories = category_config.get("second_categories", {})
-        except Exception as e:
-            print(f"[ERROR] 加载分类配置失败: {str(e)}")
-            first_categories = {}
-            second_categories = {}
-
-        def get_sort_key(achievement):
-            """获取排序键"""
-            # 第一分类排序
-            first_cat = achievement.get('第一分类', '')
-            first_order = first_categories.get(first_cat, 999)
-
-            # 第二分类排序
-            second_cat = achievement.get('第二分类', '')
-            first_cat_second = second_categories.get(first_cat, {})
-            second_order = int(first_cat_second.get(second_cat, 999)) if second_cat in first_cat_second else 999
-
-            # 版本号排序（浮点型正序）
-            version_str = achievement.get('版本', '0.0')
-            try:
-                version = float(version_str)
-            except ValueError:
-                version = 0.0
-
-            # 原编号（用于保持相对稳定）
-            original_id = achievement.get('编号', '99999999')
-
-            return (first_order, second_order, version, original_id)
-
-        # 创建第二分类到第一分类的映射
-        first_category_map = {}
-        for first_cat, second_cats in second_categories.items():
-            for second_cat in second_cats:
-                first_category_map[second_cat] = first_cat
-
-        # 按新规则排序
-        sorted_achievements = sorted(achievements, key=get_sort_key)
-
-        # 第一步：保存原始编号并创建映射表
-        old_to_new_id_map = {}
-        for achievement in sorted_achievements:
-            old_id = achievement.get('编号', '')
-            if old_id:
-                old_to_new_id_map[old_id] = old_id  # 先映射到自己
-
-        # 第二步：重新分配编号
-        current_numbers = {}
-        for achievement in sorted_achievements:
-            first_cat = achievement.get('第一分类', '')
-            second_cat = achievement.get('第二分类', '')
-
-            # 如果第一分类为空，根据第二分类映射自动补充
-            if not first_cat and second_cat:
-                first_cat = first_category_map.get(second_cat, '')
-                if first_cat:
-                    achievement['第一分类'] = first_cat
-                    print(f"[INFO] 自动补充第一分类 '{first_cat}' 用于第二分类 '{second_cat}'")
-
-            if not first_cat or not second_cat:
-                achievement['编号'] = ''
-                continue
-
-            # 获取第一分类排序号
-            first_category_order = first_categories.get(first_cat, 1)
-
-            # 获取第二分类后缀
-            suffix = second_categories.get(first_cat, {}).get(second_cat, '10')
-
-            # 生成完整前缀：第一分类(1位) + 第二分类后缀(补齐到3位)
-            suffix_padded = f"{int(suffix):03d}"
-            full_prefix = f"{first_category_order}{suffix_padded}"
-
-            # 获取当前序号
-            category_key = (first_cat, second_cat)
-            current_num = current_numbers.get(category_key, 1)
-
-            # 保存旧编号并生成新编号
-            old_id = achievement.get('编号', '')
-            new_id = f"{full_prefix}{current_num:04d}"
-
-            # 更新映射表
-            if old_id:
-                old_to_new_id_map[old_id] = new_id
-
-            # 设置新编号
-            achievement['编号'] = new_id
-
-            # 更新序号
-            current_numbers[category_key] = current_num + 1
-
-        # 重新生成绝对编号（按最终排序顺序从1开始递增）
-        for index, achievement in enumerate(sorted_achievements, start=1):
-            achievement['绝对编号'] = str(index)
-
-        # 更新所有成就的互斥成就编号
-        for achievement in sorted_achievements:
-            mutex_achievements = achievement.get('互斥成就', [])
-            if mutex_achievements:
-                updated_mutex = []
-                for old_mutex_id in mutex_achievements:
-                    # 使用映射表更新编号
-                    new_mutex_id = old_to_new_id_map.get(old_mutex_id, old_mutex_id)
-                    updated_mutex.append(new_mutex_id)
-                achievement['互斥成就'] = updated_mutex
-                if mutex_achievements != updated_mutex:
-                    print(
-                        f"[INFO] 更新互斥成就: {achievement.get('名称', '')} - {mutex_achievements} -> {updated_mutex}")
-
-        return sorted_achievements, old_to_new_id_map
+        from core.achievement_ops import smart_reencode_achievements
+        return smart_reencode_achievements(achievements)
 
     def process_full_field_data(self, data):
         """处理全字段数据，兼容新旧获取状态格式"""
@@ -1768,116 +1705,51 @@ class ManageTab(QWidget):
         )
 
         if file_path:
-            try:
-                print(f"[INFO] 开始导出全字段数据: {file_path}")
-
-                # 准备全字段数据
-                export_data = []
-                for achievement in self.manager.filtered_achievements:
-                    export_data.append({
-                        '绝对编号': achievement.get('绝对编号', ''),
-                        '版本': achievement.get('版本', ''),
-                        '第一分类': achievement.get('第一分类', ''),
-                        '第二分类': achievement.get('第二分类', ''),
-                        '编号': achievement.get('编号', ''),
-                        '名称': achievement.get('名称', ''),
-                        '描述': achievement.get('描述', ''),
-                        '奖励': achievement.get('奖励', ''),
-                        '是否隐藏': achievement.get('是否隐藏', ''),
-                        '获取状态': achievement.get('获取状态', '')
-                    })
-
-                # 保存到 JSON
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(export_data, f, ensure_ascii=False, indent=2)
-
-                file_size = os.path.getsize(file_path)
-                print(f"[SUCCESS] 全字段数据已导出到: {file_path}")
-                print(f"[SUCCESS] 文件大小: {file_size} 字节")
-                print(f"[INFO] 包含 {len(export_data)} 条成就数据")
-
-            except Exception as e:
-                print(f"[ERROR] 导出失败: {str(e)}")
-                import traceback
-                traceback.print_exc()
-
-    def update_filters(self):
-        """更新筛选器选项"""
-        versions = set()
-        first_categories = set()
-        second_categories = set()
-
-        for achievement in self.manager.achievements:
-            versions.add(achievement.get('版本', ''))
-            first_categories.add(achievement.get('第一分类', ''))
-            second_categories.add(achievement.get('第二分类', ''))
-
-        # 更新版本下拉框
-        self.version_filter.clear()
-        self.version_filter.addItem("所有版本")
-
-        # 将版本号转换为浮点数进行倒序排序
-        valid_versions = []
-        for v in versions:
-            if v:
-                try:
-                    # 尝试转换为浮点数进行排序
-                    float_val = float(v)
-                    valid_versions.append((float_val, v))
-                except (ValueError, TypeError):
-                    # 如果转换失败，使用原始字符串排序
-                    valid_versions.append((-1, v))
-
-        # 按浮点数值倒序排序，无法转换的放在最后
-        sorted_versions = [v[1] for v in sorted(valid_versions, key=lambda x: x[0], reverse=True)]
-
-        for version in sorted_versions:
-            self.version_filter.addItem(version)
-
-        # 获取分类配置
+            from core.background_jobs import start_job
+            print(f"[INFO] 开始导出全字段数据: {file_path}")
+            start_job(self, "导出JSON", _full_json_export_job, file_path,
+                      list(self.manager.filtered_achievements),
+                      on_success=lambda count: show_notification(self, f"导出成功，共 {count} 条成就数据"),
+                      on_failure=lambda message: show_notification(self, f"导出失败: {message}"))
+
+    def _load_filter_category_config(self):
+        """获取分类配置（筛选器排序用）"""
+        return load_filter_category_config()
+
+    def update_filters(self, facets=None, statistics=None):
+        """更新筛选器选项
+
+        facets 为热启动快照中预先排好序的选项，为 None 时根据当前数据计算；
+        重建选项期间屏蔽信号，结束后只刷新一次表格
+        """
+        if facets is None:
+            facets = compute_filter_facets(self.manager.achievements, self._load_filter_category_config())
+
+        combos = (self.version_filter, self.first_category_filter, self.second_category_filter)
+        for combo in combos:
+            combo.blockSignals(True)
         try:
-            category_config = config.load_category_config()
-            if not isinstance(category_config, dict):
-                category_config = {}
-        except Exception as e:
-            print(f"[ERROR] 加载分类配置失败: {str(e)}")
-            # 尝试直接访问属性
-            try:
-                if hasattr(config, 'category_config'):
-                    category_config = getattr(config, 'category_config', {})
-                else:
-                    category_config = {}
-            except:
-                category_config = {}
-            print("[INFO] 使用备用配置加载方式")
-        first_category_order = category_config.get("first_categories", {})
-
-        # 更新第一分类下拉框（按配置顺序）
-        self.first_category_filter.clear()
-        self.first_category_filter.addItem("全部")
-        # 按照配置中的排序顺序添加
-        ordered_first_categories = sorted(first_categories, key=lambda x: first_category_order.get(x, 999))
-        for category in ordered_first_categories:
-            if category:
-                self.first_category_filter.addItem(category)
-
-        # 更新第二分类下拉框
-        self.second_category_filter.clear()
-        self.second_category_filter.addItem("全部")
-        # 第二分类需要根据当前选中的第一分类来排序
-        current_first = self.first_category_filter.currentText()
-        if current_first != "全部" and current_first in category_config.get("second_categories", {}):
-            second_category_order = category_config["second_categories"].get(current_first, {})
-            ordered_second_categories = sorted(second_categories, key=lambda x: int(second_category_order.get(x, 999)))
-            for category in ordered_second_categories:
-                if category:
-                    self.second_category_filter.addItem(category)
-        else:
-            # 如果没有选中第一分类或选中"全部"，则按字母顺序
-            for category in sorted(second_categories):
-                if category:
-                    self.second_category_filter.addItem(category)
-
+            # 更新版本下拉框
+            self.version_filter.clear()
+            self.version_filter.addItem("所有版本")
+            self.version_filter.addItems(facets["versions"])
+
+            # 更新第一分类下拉框（按配置顺序）
+            self.first_category_filter.clear()
+            self.first_category_filter.addItem("全部")
+            self.first_category_filter.addItems(facets["first_categories"])
+
+            # 更新第二分类下拉框（未选中第一分类时按字母顺序）
+            self.second_category_filter.clear()
+            self.second_category_filter.addItem("全部")
+            self.second_category_filter.addItems(facets["second_categories"])
+        finally:
+            for combo in combos:
+                combo.blockSignals(False)
+
+        self._refresh_view(statistics)
+
+    @metrics.timed("保存数据")
     def save_to_json(self):
         """分离保存基础数据和用户进度"""
         try:
@@ -1887,88 +1759,50 @@ class ManageTab(QWidget):
             uid = current_user_data.get('uid', current_user) if isinstance(current_user_data, dict) else current_user
 
             # 保存基础成就数据（恢复原始名称）
+            # save_base_achievements 只读取字段，只有需要恢复原始名称的记录才创建副本
             achievements_to_save = []
             for achievement in self.manager.achievements:
-                # 创建副本，避免修改原始数据
-                achievement_copy = achievement.copy()
-                # 如果有原始名称，恢复它
-                if '原始名称' in achievement_copy:
-                    achievement_copy['名称'] = achievement_copy['原始名称']
-                    # 删除临时字段
-                    del achievement_copy['原始名称']
-                achievements_to_save.append(achievement_copy)
+                if '原始名称' in achievement:
+                    achievement = achievement.copy()
+                    achievement['名称'] = achievement.pop('原始名称')
+                achievements_to_save.append(achievement)
 
             if config.save_base_achievements(achievements_to_save):
                 print("[SUCCESS] 基础成就数据已保存")
 
-            # 准备用户进度数据
+            # 准备用户进度数据（只记录非默认状态，未完成的成就不写入文件）
             progress_data = {}
             for achievement in self.manager.achievements:
-                achievement_id = achievement.get("编号", "")
-                status = achievement.get("获取状态", "未完成")
-                # 如果状态为空字符串，设置为"未完成"
-                if not status:
-                    status = "未完成"
-                progress_data[achievement_id] = {
-                    "获取状态": status
-                }
+                status = achievement.get("获取状态", "")
+                if status and status != DEFAULT_PROGRESS_STATUS:
+                    progress_data[achievement.get("编号", "")] = {
+                        "获取状态": status
+                    }
 
             # 保存用户进度数据
             if config.save_user_progress(current_user, progress_data):
                 print(f"[SUCCESS] 用户 {current_user} (UID: {uid}) 的进度数据已保存")
+                # 内存中的记录与刚保存的文件一致，切换回该用户时无需重新加载
+                from core.user_sessions import user_sessions
+                user_sessions.refresh(current_user, self.manager.achievements, progress_data)
 
         except Exception as e:
             print(f"[ERROR] 保存数据失败: {str(e)}")
             import traceback
             traceback.print_exc()
 
+    @profiler.timed("加载成就管理数据", "data")
     def load_local_data(self):
-        """加载本地数据：合并基础数据和用户进度"""
+        """加载当前用户的数据：优先使用用户会话缓存，没有有效会话时读取热启动快照或合并基础数据和用户进度"""
         try:
-            # 加载基础成就数据
-            base_achievements = config.load_base_achievements()
-            if not base_achievements:
-                print("[WARNING] 基础成就数据文件不存在")
-                return
-
-            # 加载当前用户进度数据
-            current_user = config.get_current_user()
-            users = config.get_users()
-            current_user_data = users.get(current_user, {})
-            uid = current_user_data.get('uid', current_user) if isinstance(current_user_data, dict) else current_user
-
-            print(f"[INFO] 加载用户 {current_user} (UID: {uid}) 的进度数据")
-            user_progress = config.load_user_progress(current_user)
-
-            # 合并数据
-            achievements = []
-            for base_achievement in base_achievements:
-                achievement = base_achievement.copy()
-                achievement_id = achievement.get("编号", "")
-
-                # 添加用户进度
-                if achievement_id in user_progress:
-                    progress = user_progress[achievement_id]
-                    achievement["获取状态"] = progress["获取状态"]
-                else:
-                    achievement["获取状态"] = ""
-
-                # 转换为内部使用的字段名
-                if "是否隐藏" in achievement:
-                    achievement["is_hidden"] = achievement["是否隐藏"] == "隐藏"
-
-                achievements.append(achievement)
-
-            print(f"[INFO] 加载了 {len(achievements)} 条成就数据（基础数据 + 用户进度）")
-
-            if achievements:
-                self.manager.load_data(achievements)
+            from core.user_sessions import user_sessions
 
-                # 更新筛选器
-                self.update_filters()
+            session = user_sessions.get(config.get_current_user())
+            if session.achievements:
+                self.manager.load_data(session.achievements)
 
-                # 更新统计
-                self.update_statistics()
+                # 更新筛选器并刷新表格和统计
+                self.update_filters(session.facets, session.statistics)
 
         except Exception as e:
             print(f"[ERROR] 加载本地数据失败: {str(e)}")
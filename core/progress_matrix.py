@@ -0,0 +1,302 @@
+"""
+多用户进度矩阵模块
+把所有用户的进度汇总到一个二进制文件：用户 × 成就序号 的矩阵，每个状态占2位，
+文件头保存成就序号到成就编号的映射，以及每个用户进度文件的修改时间和大小
+
+用户进度JSON文件仍是唯一的数据来源，矩阵只是派生的缓存：某个用户的进度文件变化后矩阵中该行失效，
+下次加载时从JSON读取并更新该行。成就序号只追加不重排，新增编号时已有的行补零即可沿用，
+不再使用的编号超过一半时才解码全部行并重新排列。读取时内存映射文件，切换用户只解码一行；
+导出所有用户进度、重新编码等需要所有用户进度的操作一次解码整个矩阵（安装 numpy 时向量化解码）
+
+文件格式（小端）：
+    文件头    魔数 b"WWPM"、格式版本、成就数、用户数、编号表字节数
+    编号表    按序号排列的成就编号，UTF-8，以换行分隔
+    用户表    每个用户 48 字节 UID + 进度文件修改时间（纳秒）+ 进度文件大小，修改时间为 -1 表示该行无效
+    矩阵      每个用户一行，每字节保存4个成就的状态（低位在前）
+"""
+import mmap
+import os
+import struct
+import threading
+
+from core.config import DEFAULT_PROGRESS_STATUS, get_resource_path
+
+MAGIC = b"WWPM"
+MATRIX_VERSION = 1
+
+_HEADER = struct.Struct("<4sHIII")
+_USER = struct.Struct("<48sqq")
+
+# 状态编码，0 为默认状态（未完成），3 保留
+MATRIX_STATUSES = (DEFAULT_PROGRESS_STATUS, '已完成', '暂不可获取')
+_STATUS_CODES = {status: code for code, status in enumerate(MATRIX_STATUSES) if code}
+
+_INVALID_SOURCE = (-1, 0)
+
+# 每2位一个状态，用于统计行中非默认状态的个数
+_SLOT_MASK_BYTE = 0x55
+
+
+def _source(progress_file):
+    """进度文件的 (修改时间, 大小)，不存在时返回 None"""
+    try:
+        stat = os.stat(progress_file)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _uid_bytes(uid):
+    """用户表中的 UID，超过 48 字节时返回 None（该用户只使用JSON文件）"""
+    data = str(uid).encode('utf-8')
+    return data if 0 < len(data) <= _USER.size - 16 else None
+
+
+def _encodable(progress_data):
+    """精简后的进度是否都能用2位状态表示（只有获取状态一个字段，且为已知状态）"""
+    if not isinstance(progress_data, dict):
+        return False
+    for achievement_id, progress_info in progress_data.items():
+        if not isinstance(achievement_id, str) or '\n' in achievement_id:
+            return False
+        if not isinstance(progress_info, dict) or set(progress_info) != {'获取状态'}:
+            return False
+        if progress_info['获取状态'] not in _STATUS_CODES:
+            return False
+    return True
+
+
+def _encode_row(progress_data, ordinals, row_bytes):
+    row = bytearray(row_bytes)
+    for achievement_id, progress_info in progress_data.items():
+        ordinal = ordinals[achievement_id]
+        row[ordinal >> 2] |= _STATUS_CODES[progress_info['获取状态']] << ((ordinal & 3) * 2)
+    return bytes(row)
+
+
+def _used_count(rows, row_bytes):
+    """所有行中至少有一个用户为非默认状态的成就数"""
+    used = 0
+    for row in rows:
+        used |= int.from_bytes(row, 'little')
+    mask = int.from_bytes(bytes([_SLOT_MASK_BYTE]) * row_bytes, 'little')
+    return bin((used | (used >> 1)) & mask).count('1')
+
+
+def _decode_row(row, ids):
+    """逐字节解码一行，全为默认状态的字节直接跳过"""
+    progress = {}
+    for byte_index, byte in enumerate(row):
+        if not byte:
+            continue
+        for slot in range(4):
+            code = (byte >> (slot * 2)) & 3
+            if code:
+                progress[ids[byte_index * 4 + slot]] = {'获取状态': MATRIX_STATUSES[code]}
+    return progress
+
+
+class _Layout:
+    """解析后的矩阵文件，buffer 可以是 bytes 或内存映射"""
+
+    def __init__(self, buffer, ids_cache=None):
+        magic, version, count, user_count, ids_size = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != MATRIX_VERSION:
+            raise ValueError("矩阵文件格式不匹配")
+        self.buffer = buffer
+        self.count = count
+        self.row_bytes = (count + 3) // 4
+        self.ids_start = _HEADER.size
+        self.users_start = self.ids_start + ids_size
+        self.rows_start = self.users_start + user_count * _USER.size
+        if len(buffer) < self.rows_start + user_count * self.row_bytes:
+            raise ValueError("矩阵文件不完整")
+
+        # UID -> (行号, 进度文件的 (修改时间, 大小))
+        self.users = {}
+        for index in range(user_count):
+            uid, mtime_ns, size = _USER.unpack_from(buffer, self.users_start + index * _USER.size)
+            self.users[uid.rstrip(b'\0').decode('utf-8')] = (index, (mtime_ns, size))
+        self._ids = None
+        self._ids_cache = ids_cache
+
+    @property
+    def ids(self):
+        """序号 -> 成就编号；编号表与上次读取的相同时沿用上次的解码结果"""
+        if self._ids is None:
+            blob = bytes(self.buffer[self.ids_start:self.users_start])
+            cache = self._ids_cache
+            cached = cache.get('ids') if cache is not None else None
+            if cached is not None and cached[0] == blob:
+                self._ids = cached[1]
+            else:
+                self._ids = blob.decode('utf-8').split('\n') if self.count else []
+                if len(self._ids) != self.count:
+                    raise ValueError("矩阵编号表不完整")
+                if cache is not None:
+                    cache['ids'] = (blob, self._ids)
+        return self._ids
+
+    def valid_row(self, uid, progress_file):
+        """该用户的行号，行不存在或进度文件已变化时返回 None"""
+        entry = self.users.get(str(uid))
+        if entry is None or entry[1] == _INVALID_SOURCE or entry[1] != _source(progress_file):
+            return None
+        return entry[0]
+
+    def row(self, index):
+        start = self.rows_start + index * self.row_bytes
+        return bytes(self.buffer[start:start + self.row_bytes])
+
+    def decode_rows(self, indexes):
+        """解码多行，返回 {行号: 进度}；安装 numpy 时一次解包整个矩阵"""
+        from core.columnar_store import load_numpy
+        np = load_numpy()
+        ids = self.ids
+        if np is None or not indexes:
+            return {index: _decode_row(self.row(index), ids) for index in indexes}
+
+        user_count = len(self.users)
+        block = np.frombuffer(bytes(self.buffer[self.rows_start:self.rows_start + user_count * self.row_bytes]),
+                              dtype=np.uint8).reshape(user_count, self.row_bytes)
+        shifts = np.array([0, 2, 4, 6], dtype=np.uint8)
+        codes = ((block[:, :, None] >> shifts) & 3).reshape(user_count, -1)[:, :self.count]
+        statuses = [{'获取状态': status} for status in MATRIX_STATUSES]
+        progress = {}
+        for index in indexes:
+            ordinals = np.flatnonzero(codes[index])
+            progress[index] = {ids[ordinal]: dict(statuses[code])
+                               for ordinal, code in zip(ordinals.tolist(), codes[index, ordinals].tolist())}
+        return progress
+
+
+class ProgressMatrix:
+    """多用户进度矩阵文件，读取失败或数据无效时返回 None，由调用方改为读取JSON文件"""
+
+    def __init__(self, path=None):
+        self.path = path or get_resource_path("resources/cache/user_progress.matrix")
+        self._ids_cache = {}
+        # 用户会话在后台线程中预取时也会更新矩阵
+        self._lock = threading.Lock()
+
+    def _read_mapped(self, reader):
+        """内存映射矩阵文件并调用 reader(layout)，映射在返回前关闭（Windows 下映射中的文件无法替换）"""
+        try:
+            with open(self.path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    return reader(_Layout(buffer, self._ids_cache))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[WARNING] 读取进度矩阵失败: {str(e)}")
+            return None
+
+    def read_user(self, uid, progress_file):
+        """读取单个用户的进度（只解码该用户的一行），该行无效时返回 None"""
+        def reader(layout):
+            index = layout.valid_row(uid, progress_file)
+            if index is None:
+                return None
+            return _decode_row(layout.row(index), layout.ids)
+        return self._read_mapped(reader)
+
+    def read_users(self, progress_files):
+        """读取多个用户的进度，progress_files 为 {UID: 进度文件}，只返回矩阵中有效的用户"""
+        def reader(layout):
+            rows = {}
+            for uid, progress_file in progress_files.items():
+                index = layout.valid_row(uid, progress_file)
+                if index is not None:
+                    rows[uid] = index
+            decoded = layout.decode_rows(sorted(set(rows.values())))
+            return {uid: decoded[index] for uid, index in rows.items()}
+        return self._read_mapped(reader) or {}
+
+    def store_user(self, uid, progress_file, progress_data):
+        """用户进度文件写入或读取后更新矩阵中该用户的行
+
+        编号都已在编号表中且该用户已有行时原地改写这一行，否则重写整个文件
+        """
+        uid = str(uid)
+        uid_key = _uid_bytes(uid)
+        source = _source(progress_file)
+        if uid_key is None or source is None:
+            return
+        encodable = _encodable(progress_data)
+        try:
+            with self._lock:
+                self._store_user(uid, uid_key, source, encodable, progress_data)
+        except Exception as e:
+            print(f"[WARNING] 更新进度矩阵失败: {str(e)}")
+
+    def _store_user(self, uid, uid_key, source, encodable, progress_data):
+        try:
+            with open(self.path, 'rb') as f:
+                layout = _Layout(f.read(), self._ids_cache)
+        except FileNotFoundError:
+            layout = None
+
+        ids = list(layout.ids) if layout is not None else []
+        ordinals = {achievement_id: ordinal for ordinal, achievement_id in enumerate(ids)}
+        if layout is not None and uid in layout.users:
+            if not encodable:
+                self._write_row(layout, uid_key, layout.users[uid][0], _INVALID_SOURCE, None)
+                return
+            if all(achievement_id in ordinals for achievement_id in progress_data):
+                self._write_row(layout, uid_key, layout.users[uid][0], source,
+                                _encode_row(progress_data, ordinals, layout.row_bytes))
+                return
+        if not encodable:
+            return
+        self._rewrite(layout, ids, uid, source, progress_data)
+
+    def _write_row(self, layout, uid_key, index, source, row):
+        with open(self.path, 'r+b') as f:
+            if row is not None:
+                f.seek(layout.rows_start + index * layout.row_bytes)
+                f.write(row)
+            f.seek(layout.users_start + index * _USER.size)
+            f.write(_USER.pack(uid_key, *source))
+
+    def _rewrite(self, layout, ids, uid, source, progress_data):
+        """重写矩阵文件：丢弃进度文件已变化的行，新编号追加到编号表末尾，已有的行补零后原样保留；
+        编号表中不再使用的编号超过一半时，解码全部行并按编号重新排列"""
+        rows = {}
+        if layout is not None:
+            for other_uid, (index, other_source) in layout.users.items():
+                if other_uid != uid and other_source != _INVALID_SOURCE:
+                    rows[other_uid] = (other_source, layout.row(index))
+
+        known = set(ids)
+        ids = ids + sorted(achievement_id for achievement_id in progress_data if achievement_id not in known)
+        row_bytes = (len(ids) + 3) // 4
+        ordinals = {achievement_id: ordinal for ordinal, achievement_id in enumerate(ids)}
+        new_row = _encode_row(progress_data, ordinals, row_bytes)
+        all_rows = [row for _, row in rows.values()] + [new_row]
+
+        if len(ids) > 2 * _used_count(all_rows, row_bytes):
+            decoded = {other_uid: (other_source, _decode_row(row, ids)) for other_uid, (other_source, row) in rows.items()}
+            decoded[uid] = (source, progress_data)
+            ids = sorted({achievement_id for _, progress in decoded.values() for achievement_id in progress})
+            row_bytes = (len(ids) + 3) // 4
+            ordinals = {achievement_id: ordinal for ordinal, achievement_id in enumerate(ids)}
+            rows = {other_uid: (other_source, _encode_row(progress, ordinals, row_bytes))
+                    for other_uid, (other_source, progress) in decoded.items()}
+        else:
+            rows[uid] = (source, new_row)
+
+        ids_blob = '\n'.join(ids).encode('utf-8')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, MATRIX_VERSION, len(ids), len(rows), len(ids_blob)))
+            f.write(ids_blob)
+            for other_uid, (other_source, _) in rows.items():
+                f.write(_USER.pack(_uid_bytes(other_uid), *other_source))
+            for _, row in rows.values():
+                # 编号表变长后，已有的行在末尾补零（新编号均为默认状态）
+                f.write(row.ljust(row_bytes, b'\0'))
+        os.replace(temp_path, self.path)
+
+
+progress_matrix = ProgressMatrix()
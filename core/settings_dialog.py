@@ -2,11 +2,12 @@
                                QWidget, QLabel, QLineEdit, QPushButton,
                                QDialogButtonBox, QFileDialog, QGroupBox, QCheckBox, QTableWidget,
                                QTableWidgetItem, QComboBox, QMessageBox)
-from PySide6.QtGui import QColor
-from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QKeySequence, QShortcut
+from PySide6.QtCore import Qt, QTimer
 
 from core.config import config
 from core.draggable_table import DraggableTableWidget
+from core.game_version import sort_versions
 from core.signal_bus import signal_bus
 from core.styles import (get_dialog_style, get_settings_desc_style, get_button_style)
 from core.custom_message_box import CustomMessageBox
@@ -33,9 +34,21 @@ class TemplateSettingsDialog(QDialog):
         self.background_pixmap = None
         self._load_background_image()
 
+        # 成就组编辑会话（首次使用时打开，点击保存时写回）
+        self._group_session = None
+
         self._init_ui()
         self._load_current_settings()
 
+        # 性能面板默认隐藏，按 Ctrl+Shift+P 显示或隐藏（启动时已启用性能记录则直接显示）
+        self._performance_tab = None
+        self._performance_timer = None
+        performance_shortcut = QShortcut(QKeySequence("Ctrl+Shift+P"), self)
+        performance_shortcut.activated.connect(self._toggle_performance_tab)
+        from core.instrumentation import metrics
+        if metrics.enabled:
+            self._toggle_performance_tab()
+
     def _init_ui(self):
         """初始化UI"""
         # 创建主布局（透明）
@@ -231,6 +244,104 @@ class TemplateSettingsDialog(QDialog):
 
         return widget
 
+    def _toggle_performance_tab(self):
+        """显示或隐藏性能面板"""
+        if self._performance_tab is not None:
+            self._performance_timer.stop()
+            self.tab_widget.removeTab(self.tab_widget.indexOf(self._performance_tab))
+            self._performance_tab.deleteLater()
+            self._performance_tab = None
+            return
+
+        self._performance_tab = self._create_performance_tab()
+        self.tab_widget.addTab(self._performance_tab, "📈 性能")
+        self.tab_widget.setCurrentWidget(self._performance_tab)
+        self._refresh_performance_table()
+        self._performance_timer.start()
+
+    def _create_performance_tab(self) -> QWidget:
+        """创建性能面板（热路径的调用次数、耗时和写入字节数）"""
+        from core.instrumentation import metrics, RING_SIZE
+        from core.styles import get_scrollbar_style
+
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        desc_label = QLabel(
+            "📈 <b>热路径性能：</b>筛选、表格加载、保存、统计、重新编码和爬取的耗时，每秒刷新。<br>"
+            f"p50/p95/最大耗时按最近 {RING_SIZE} 次调用计算，次数、累计耗时和写入字节数为启用以来的累计值。"
+        )
+        desc_label.setWordWrap(True)
+        desc_label.setStyleSheet(get_settings_desc_style(config.theme))
+        layout.addWidget(desc_label)
+
+        controls_layout = QHBoxLayout()
+        enabled_check = QCheckBox("启用记录")
+        enabled_check.setChecked(metrics.enabled)
+        enabled_check.toggled.connect(metrics.set_enabled)
+        controls_layout.addWidget(enabled_check)
+        controls_layout.addStretch()
+
+        reset_btn = QPushButton("清空")
+        reset_btn.setStyleSheet(get_button_style(config.theme))
+        reset_btn.clicked.connect(lambda: (metrics.reset(), self._refresh_performance_table()))
+        controls_layout.addWidget(reset_btn)
+
+        export_btn = QPushButton("导出JSON")
+        export_btn.setStyleSheet(get_button_style(config.theme))
+        export_btn.clicked.connect(self._export_performance_metrics)
+        controls_layout.addWidget(export_btn)
+        layout.addLayout(controls_layout)
+
+        self.performance_table = QTableWidget()
+        self.performance_table.setColumnCount(7)
+        self.performance_table.setHorizontalHeaderLabels(
+            ["路径", "次数", "p50(ms)", "p95(ms)", "最大(ms)", "累计(ms)", "写入"])
+        self.performance_table.horizontalHeader().setStretchLastSection(True)
+        self.performance_table.setColumnWidth(0, 220)
+        self.performance_table.verticalHeader().setVisible(False)
+        self.performance_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.performance_table.setSelectionMode(QTableWidget.SelectionMode.NoSelection)
+        self.performance_table.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.performance_table.setStyleSheet(self.performance_table.styleSheet() + get_scrollbar_style(config.theme))
+        layout.addWidget(self.performance_table)
+
+        self._performance_timer = QTimer(widget)
+        self._performance_timer.setInterval(1000)
+        self._performance_timer.timeout.connect(self._refresh_performance_table)
+        return widget
+
+    def _refresh_performance_table(self):
+        """性能面板可见时刷新统计表格"""
+        if self._performance_tab is None or self.tab_widget.currentWidget() is not self._performance_tab:
+            return
+        from core.instrumentation import metrics
+
+        rows = sorted(metrics.snapshot().items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        self.performance_table.setRowCount(len(rows))
+        for row, (name, stats) in enumerate(rows):
+            values = [name, str(stats["count"]), f"{stats['p50_ms']:.2f}", f"{stats['p95_ms']:.2f}",
+                      f"{stats['max_ms']:.2f}", f"{stats['total_ms']:.1f}", _format_bytes(stats["bytes"])]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.performance_table.setItem(row, column, item)
+
+    def _export_performance_metrics(self):
+        """导出性能统计为JSON文件"""
+        from core.instrumentation import metrics
+        file_path, _ = QFileDialog.getSaveFileName(self, "导出性能统计", "性能统计.json", "JSON Files (*.json)")
+        if not file_path:
+            return
+        try:
+            metrics.export_json(file_path)
+            CustomMessageBox.information(self, "导出成功", f"性能统计已导出到：\n{file_path}")
+        except Exception as e:
+            error_msg = f"导出性能统计失败：{str(e)}"
+            CustomMessageBox.critical(self, "错误", error_msg)
+            print(f"[ERROR] {error_msg}")
+
     def _create_help_tab(self) -> QWidget:
         """创建帮助标签页"""
         from PySide6.QtWidgets import QScrollArea
@@ -360,6 +471,11 @@ class TemplateSettingsDialog(QDialog):
         config.devcode = self.devcode_edit.text().strip()
         config.token = self.token_edit.text().strip()
         
+        # 保存成就组修改（需在分类配置之前，分类配置更新后成就管理页会重新加载数据）
+        if self._group_session is not None and not self._group_session.commit():
+            CustomMessageBox.warning(self, "错误", "成就组修改保存失败，请重试")
+            return
+        
         # 保存分类配置
         self._save_category_config_silent()
         
@@ -856,7 +972,7 @@ class TemplateSettingsDialog(QDialog):
         layout = QVBoxLayout(widget)
         
         # 说明文字
-        info_label = QLabel("管理多选一配置，设置多选一成就关系")
+        info_label = QLabel("管理多选一配置，设置多选一成就关系（点击保存后生效）")
         info_label.setStyleSheet(get_settings_desc_style(config.theme))
         layout.addWidget(info_label)
         
@@ -990,29 +1106,17 @@ class TemplateSettingsDialog(QDialog):
                 if group_id_item:
                     selected_group_id = group_id_item.text()
         
-        # 获取所有成就数据
-        achievements = config.load_base_achievements()
-        print(f"[DEBUG] 加载了 {len(achievements)} 个成就数据")
-        
-        # 收集所有成就组
+        # 获取所有成就组
+        group_session = self._get_group_session()
         groups = {}
-        group_count = 0
-        for achievement in achievements:
-            group_id = achievement.get('成就组ID')
-            if group_id:
-                group_count += 1
-                print(f"[DEBUG] 找到成就组 {group_id}: {achievement.get('名称', '')}")
-                if group_id not in groups:
-                    groups[group_id] = {
-                        'id': group_id,
-                        'name': self._generate_group_name(group_id),  # 自动生成友好的组名
-                        'members': []
-                    }
-                groups[group_id]['members'].append(achievement)
-        
-        print(f"[DEBUG] 共找到 {group_count} 个有组ID的成就，{len(groups)} 个不同的组")
-        for group_id, group_info in groups.items():
-            print(f"[DEBUG] 组 {group_id}: 名称={group_info['name']}, 成员数={len(group_info['members'])}")
+        for group_id in group_session.group_ids():
+            groups[group_id] = {
+                'id': group_id,
+                'name': self._generate_group_name(group_id),  # 自动生成友好的组名
+                'members': group_session.members(group_id)
+            }
+        
+        print(f"[DEBUG] 共找到 {len(groups)} 个不同的组")
         
         # 按组ID排序（按数字顺序）
         sorted_groups = sorted(groups.items(), key=lambda x: int(x[0].split('_')[1]) if x[0].startswith('group_') else 0)
@@ -1026,7 +1130,6 @@ class TemplateSettingsDialog(QDialog):
             name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # 移除可编辑标志
             # 存储组ID作为用户数据，用于后续操作
             name_item.setData(Qt.ItemDataRole.UserRole, group_id)
-            print(f"[DEBUG] 设置表格项: 行={i}, 组ID={group_id}, 组名称={group_info['name']}")
             self.groups_table.setItem(i, 0, name_item)
             
             # 如果这个组之前被选中，记录新的行号
@@ -1046,6 +1149,16 @@ class TemplateSettingsDialog(QDialog):
             from PySide6.QtCore import QTimer
             QTimer.singleShot(50, lambda: self._on_group_cell_clicked(0, 0) if self.groups_table.rowCount() > 0 else None)
     
+    def _get_group_session(self):
+        """成就组编辑会话；没有未保存的修改时，基础数据文件变化后重新读取"""
+        from core.achievement_groups import GroupEditSession
+        if self._group_session is None:
+            self._group_session = GroupEditSession()
+            print(f"[DEBUG] 加载了 {len(self._group_session.achievements)} 个成就数据")
+        elif not self._group_session.has_changes and self._group_session.is_outdated():
+            self._group_session.reload()
+        return self._group_session
+
     def _generate_group_name(self, group_id):
         """根据组ID生成友好的组名"""
         if group_id.startswith('group_'):
@@ -1101,11 +1214,7 @@ class TemplateSettingsDialog(QDialog):
         
         # 加载该组的所有成员
         try:
-            achievements = config.load_base_achievements()
-            members = []
-            for achievement in achievements:
-                if achievement.get('成就组ID') == group_id:
-                    members.append(achievement)
+            members = self._get_group_session().members(group_id)
             
             print(f"[DEBUG] 组 {group_id} 有 {len(members)} 个成员")
             
@@ -1205,16 +1314,9 @@ class TemplateSettingsDialog(QDialog):
         self.groups_table.removeRow(current_row)
         
         # 清除成就数据中的组信息
-        achievements = config.load_base_achievements()
-        modified = False
-        for achievement in achievements:
-            if achievement.get('成就组ID') == group_id:
-                achievement.pop('成就组ID', None)
-                achievement.pop('互斥成就', None)
-                modified = True
+        modified = self._get_group_session().dissolve(group_id)
         
         if modified:
-            config.save_base_achievements(achievements)
             # 重新加载成就组表格
             self._load_achievement_groups()
             CustomMessageBox.information(self, "成功", f"成就组 '{group_id}' 已删除")
@@ -1240,30 +1342,10 @@ class TemplateSettingsDialog(QDialog):
                         if group_id:
                             self._remove_achievement_from_group(group_id, code)
     
-    def _fix_group_mutex_relations(self, group_id, achievements):
-        """修复组内成就的互斥关系"""
-        # 获取组内所有成员
-        group_members = []
-        for achievement in achievements:
-            if achievement.get('成就组ID') == group_id:
-                group_members.append(achievement['编号'])
-        
-        # 为每个成员设置互斥列表
-        for achievement in achievements:
-            if achievement.get('成就组ID') == group_id:
-                code = achievement['编号']
-                # 互斥列表是组内其他所有成员
-                mutex_list = [m for m in group_members if m != code]
-                achievement['互斥成就'] = mutex_list
-    
     def _load_group_members(self, group_id):
         """只加载指定组的成员"""
         try:
-            achievements = config.load_base_achievements()
-            members = []
-            for achievement in achievements:
-                if achievement.get('成就组ID') == group_id:
-                    members.append(achievement)
+            members = self._get_group_session().members(group_id)
             
             print(f"[DEBUG] 组 {group_id} 有 {len(members)} 个成员")
             
@@ -1322,61 +1404,16 @@ class TemplateSettingsDialog(QDialog):
         
         print(f"[DEBUG] 开始添加 {len(achievements)} 个成就到组 {group_id}")
         
-        # 加载当前成就数据
-        all_achievements = config.load_base_achievements()
-        print(f"[DEBUG] 加载了 {len(all_achievements)} 个成就")
-        
-        # 获取当前组的所有成员
-        current_members = []
-        for achievement in all_achievements:
-            if achievement.get('成就组ID') == group_id:
-                current_members.append(achievement['编号'])
-        print(f"[DEBUG] 组 {group_id} 当前有 {len(current_members)} 个成员: {current_members}")
-        
-        # 显示要添加的成就
-        for achievement in achievements:
-            print(f"[DEBUG] 要添加的成就: {achievement.get('编号', '')} - {achievement.get('名称', '')}")
-        
-        # 添加新成员
-        modified = False
-        added_count = 0
-        for achievement in achievements:
-            code = achievement['编号']
-            print(f"[DEBUG] 处理成就 {code}")
-            if code not in current_members:
-                # 为每个成就添加组信息
-                for full_achievement in all_achievements:
-                    if full_achievement['编号'] == code:
-                        print(f"[DEBUG] 找到成就 {code}，设置组ID为 {group_id}")
-                        full_achievement['成就组ID'] = group_id
-                        # 互斥成就列表将在修复时自动生成
-                        modified = True
-                        added_count += 1
-                        break
-                else:
-                    print(f"[ERROR] 未找到编号为 {code} 的成就")
-            else:
-                print(f"[DEBUG] 成就 {code} 已在组中")
+        # 添加新成员（互斥关系随之更新，点击保存后写回）
+        added_count = self._get_group_session().add(group_id, [achievement['编号'] for achievement in achievements])
+        print(f"[DEBUG] 添加了 {added_count} 个新成就")
         
-        print(f"[DEBUG] 添加了 {added_count} 个新成就，修改状态: {modified}")
-        
-        if modified:
-            print(f"[DEBUG] 开始修复组 {group_id} 的互斥关系")
-            # 修复互斥关系
-            self._fix_group_mutex_relations(group_id, all_achievements)
-            # 保存数据
-            print(f"[DEBUG] 保存成就数据")
-            config.save_base_achievements(all_achievements)
-            # 刷新显示
-            print(f"[DEBUG] 重新加载成就组表格")
+        if added_count:
+            # 从内存中的数据刷新显示
             self._load_achievement_groups()  # 重新加载成就组表格（会自动刷新成员列表）
         else:
             print(f"[DEBUG] 没有成就被添加到组 {group_id}")
     
-
-    
-    
-    
     def _remove_member_at_row(self, row):
         """移除指定行的成员"""
         code_item = self.group_members_table.item(row, 0)
@@ -1404,47 +1441,11 @@ class TemplateSettingsDialog(QDialog):
             return
         print(f"[DEBUG] 用户确认移除成就")
         
-        # 加载成就数据
-        print(f"[DEBUG] 开始加载成就数据")
-        achievements = config.load_base_achievements()
-        print(f"[DEBUG] 加载了 {len(achievements)} 个成就")
-        modified = False
-        
-        # 移除组信息
-        print(f"[DEBUG] 查找成就: code='{code}', group_id='{group_id}'")
-        for i, achievement in enumerate(achievements):
-            if i < 5:  # 只打印前5个，避免日志过长
-                print(f"[DEBUG] 成就{i}: 编号='{achievement.get('编号', '')}', 组ID='{achievement.get('成就组ID', '')}'")
-            if achievement['编号'] == code and achievement.get('成就组ID') == group_id:
-                print(f"[DEBUG] 找到成就 {code}，正在移除组信息")
-                achievement.pop('成就组ID', None)
-                achievement.pop('互斥成就', None)
-                modified = True
-                break
-        
-        if not modified:
+        # 移除组信息（组内只剩1个成员时解散该组，否则修复互斥关系）
+        if not self._get_group_session().remove(group_id, code):
             print(f"[DEBUG] 警告：未找到要移除的成就 {code} 在组 {group_id} 中")
             return
         
-        print(f"[DEBUG] 成就信息已修改，开始处理组内剩余成员")
-        # 检查组内剩余成员数量，如果只有1个成员则解散该组
-        remaining_members = [a for a in achievements if a.get('成就组ID') == group_id]
-        print(f"[DEBUG] 组 {group_id} 剩余成员数量: {len(remaining_members)}")
-        if len(remaining_members) <= 1:
-            # 解散该组，清除剩余成员的组信息
-            print(f"[DEBUG] 解散组 {group_id}")
-            for achievement in remaining_members:
-                achievement.pop('成就组ID', None)
-                achievement.pop('互斥成就', None)
-        else:
-            # 修复组内剩余成员的互斥关系
-            print(f"[DEBUG] 修复组 {group_id} 的互斥关系")
-            self._fix_group_mutex_relations(group_id, achievements)
-        
-        # 保存数据
-        print(f"[DEBUG] 开始保存成就数据")
-        config.save_base_achievements(achievements)
-        print(f"[DEBUG] 成就数据已保存")
         # 刷新显示 - 只刷新当前组，避免触发完整重新加载
         print(f"[DEBUG] 开始刷新当前组显示")
         current_row = self.groups_table.currentRow()
@@ -1741,6 +1742,11 @@ class TemplateSettingsDialog(QDialog):
         if reply != CustomMessageBox.Yes:
             return
         
+        # 重新编号会改变成就编号，先写回未保存的成就组修改
+        if self._group_session is not None and not self._group_session.commit():
+            CustomMessageBox.warning(self, "错误", "成就组修改保存失败，请重试")
+            return
+        
         try:
             # 调用config的reencode_all_user_progress方法
             success = config.reencode_all_user_progress()
@@ -1797,7 +1803,7 @@ class TemplateSettingsDialog(QDialog):
         # 清空并重新填充下拉框
         self.version_combo.clear()
         if versions:
-            sorted_versions = sorted(versions, key=lambda x: float(x) if x.replace('.', '').isdigit() else 0)
+            sorted_versions = sort_versions(versions)
             self.version_combo.addItems(sorted_versions)
         
         # 如果有版本，启用删除按钮
@@ -1860,7 +1866,9 @@ class TemplateSettingsDialog(QDialog):
             self._export_all_users_progress_to_excel(to_delete_achievements, str(users_backup_path))
             user_backup_files = [users_backup_filename]
             
-            # 3. 删除指定版本的成就
+            # 3. 删除指定版本的成就（只删除该版本的分片，其他版本的分片不变）
+            if config.delete_base_version(selected_version) is None:
+                raise Exception("删除基础成就分片失败")
             filtered_achievements = [ach for ach in all_achievements if ach.get('版本', '') != selected_version]
             deleted_count = len(to_delete_achievements)
             
@@ -1894,13 +1902,10 @@ class TemplateSettingsDialog(QDialog):
 
     def _export_all_users_progress_to_excel(self, achievements, file_path):
             """导出所有用户的进度数据到一个Excel文件的多个工作表"""
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-            from openpyxl.utils import get_column_letter
+            from core.excel_io import create_write_only_workbook, create_sheet, styled, append_styled_row
 
-            wb = Workbook()
-            # 删除默认工作表
-            wb.remove(wb.active)
+            # write_only 工作簿，所有单元格共享命名样式
+            wb = create_write_only_workbook()
 
             # 获取所有用户
             users = config.get_users()
@@ -1910,6 +1915,16 @@ class TemplateSettingsDialog(QDialog):
                 '名称', '描述', '奖励', '版本', '是否隐藏', '第一分类', '第二分类', '获取状态'
             ]
 
+            # 列宽
+            column_widths = {
+                '名称': 25, '描述': 40, '版本': 10, '奖励': 15, '是否隐藏': 10,
+                '第一分类': 15, '第二分类': 20, '获取状态': 10
+            }
+            widths = [column_widths.get(field_name, 15) for field_name in column_order]
+
+            # 所有用户的进度一次加载（进度矩阵中有效的行一次解码）
+            all_progress = config.load_all_user_progress()
+
             # 为每个用户创建工作表
             for username in users.keys():
                 # 获取用户UID作为工作表名称
@@ -1918,33 +1933,22 @@ class TemplateSettingsDialog(QDialog):
                 sheet_name = str(uid)[:31]  # Excel工作表名称最大31个字符
 
                 # 创建工作表
-                sheet = wb.create_sheet(title=sheet_name)
+                sheet = create_sheet(wb, sheet_name, widths)
 
                 # 写入表头
-                for col_idx, field_name in enumerate(column_order, 1):
-                    cell = sheet.cell(row=1, column=col_idx, value=field_name)
-                    cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-                    cell.font = Font(color="FFFFFF", bold=True)
-                    cell.alignment = Alignment(horizontal="center")
+                append_styled_row(sheet, column_order, "ww_header_blue")
 
                 # 加载用户进度数据
-                user_progress = config.load_user_progress(username)
+                user_progress = all_progress.get(username)
                 if not user_progress:
                     print(f"[INFO] 用户 {username} (UID: {uid}) 没有进度数据")
                     user_progress = {}
 
                 # 写入数据
-                row = 2
                 for achievement in achievements:
                     # 获取成就编号
                     code = achievement.get('编号', '')
 
-                    # 创建行数据
-                    row_data = []
-                    for field_name in column_order[:-1]:  # 除了获取状态
-                        value = achievement.get(field_name, '')
-                        row_data.append(value)
-
                     # 获取用户进度
                     progress_info = user_progress.get(code, None)
                     if progress_info and isinstance(progress_info, dict):
@@ -1952,40 +1956,17 @@ class TemplateSettingsDialog(QDialog):
                     else:
                         status = '未完成'
 
-                    row_data.append(status)
-
-                    # 写入行
-                    for col_idx, value in enumerate(row_data, 1):
-                        cell = sheet.cell(row=row, column=col_idx, value=value)
-
-                        # 设置边框
-                        thin_border = Border(
-                            left=Side(style='thin'),
-                            right=Side(style='thin'),
-                            top=Side(style='thin'),
-                            bottom=Side(style='thin')
-                        )
-                        cell.border = thin_border
-
-                        # 特殊处理名称列
-                        if col_idx == 1 and value:  # 第一列是名称
-                            cell.font = Font(bold=True)
-
-                            # 隐藏成就用橙色
-                            if achievement.get('是否隐藏') == '隐藏':
-                                cell.font = Font(bold=True, color="FFA500")
-
-                    row += 1
-
-                # 调整列宽
-                column_widths = {
-                    '名称': 25, '描述': 40, '版本': 10, '奖励': 15, '是否隐藏': 10,
-                    '第一分类': 15, '第二分类': 20, '获取状态': 10
-                }
-
-                for col_idx, field_name in enumerate(column_order, 1):
-                    col_letter = get_column_letter(col_idx)
-                    sheet.column_dimensions[col_letter].width = column_widths.get(field_name, 15)
+                    # 名称列加粗，隐藏成就用橙色
+                    name = achievement.get('名称', '')
+                    if name:
+                        name_style = "ww_name_hidden" if achievement.get('是否隐藏') == '隐藏' else "ww_name"
+                    else:
+                        name_style = "ww_cell"
+                    row = [styled(sheet, name, name_style)]
+                    for field_name in column_order[1:-1]:
+                        row.append(styled(sheet, achievement.get(field_name, ''), "ww_cell"))
+                    row.append(styled(sheet, status, "ww_cell"))
+                    sheet.append(row)
 
             # 保存文件
             wb.save(file_path)
@@ -1993,13 +1974,7 @@ class TemplateSettingsDialog(QDialog):
 
     def _export_achievements_to_excel(self, achievements, file_path, include_status=True):
         """导出成就数据到Excel文件"""
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-        from openpyxl.utils import get_column_letter
-        
-        wb = Workbook()
-        sheet = wb.active
-        sheet.title = "成就数据"
+        from core.excel_io import create_write_only_workbook, create_sheet, styled, append_styled_row
         
         # 定义列顺序（与数据爬取导出保持一致）
         column_order = [
@@ -2008,53 +1983,47 @@ class TemplateSettingsDialog(QDialog):
         if include_status:
             column_order.append('获取状态')
         
+        # 列宽
+        column_widths = {
+            '名称': 25, '描述': 40, '奖励': 15, '版本': 10, '是否隐藏': 10, 
+            '第一分类': 15, '第二分类': 20, '获取状态': 10
+        }
+        
+        # write_only 工作簿，所有单元格共享命名样式
+        wb = create_write_only_workbook()
+        sheet = create_sheet(wb, "成就数据", [column_widths.get(field_name, 15) for field_name in column_order])
+        
         # 写入表头
-        for col_idx, field_name in enumerate(column_order, 1):
-            cell = sheet.cell(row=1, column=col_idx, value=field_name)
-            cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            cell.font = Font(color="FFFFFF", bold=True)
-            cell.alignment = Alignment(horizontal="center")
+        append_styled_row(sheet, column_order, "ww_header_blue")
         
         # 写入数据
-        for row_idx, achievement in enumerate(achievements, start=2):
-            for col_idx, field_name in enumerate(column_order, 1):
+        for achievement in achievements:
+            row = []
+            for field_name in column_order:
                 value = achievement.get(field_name, '')
                 
-                # 特殊处理名称列
+                # 特殊处理名称列，隐藏成就用橙色
                 if field_name == '名称' and value:
-                    cell = sheet.cell(row=row_idx, column=col_idx, value=value)
-                    cell.font = Font(bold=True)
-                    
-                    # 隐藏成就用橙色
-                    if achievement.get('是否隐藏') == '隐藏':
-                        cell.font = Font(bold=True, color="FFA500")
+                    style = "ww_name_hidden" if achievement.get('是否隐藏') == '隐藏' else "ww_name"
+                    row.append(styled(sheet, value, style))
                 else:
-                    cell = sheet.cell(row=row_idx, column=col_idx, value=str(value))
-                
-                # 设置边框
-                thin_border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
-                cell.border = thin_border
-        
-        # 调整列宽
-        column_widths = {
-            '名称': 25, '描述': 40, '奖励': 15, '版本': 10, '是否隐藏': 10, 
-            '第一分类': 15, '第二分类': 20, '获取状态': 10
-        }
-        
-        for col_idx, field_name in enumerate(column_order, 1):
-            col_letter = get_column_letter(col_idx)
-            sheet.column_dimensions[col_letter].width = column_widths.get(field_name, 15)
+                    row.append(styled(sheet, str(value), "ww_cell"))
+            sheet.append(row)
         
         # 保存文件
         wb.save(file_path)
         print(f"[INFO] 版本数据已导出到: {file_path}")
 
 
+def _format_bytes(count):
+    """字节数显示为 B/KB/MB"""
+    if count < 1024:
+        return f"{count} B"
+    if count < 1024 * 1024:
+        return f"{count / 1024:.1f} KB"
+    return f"{count / 1024 / 1024:.2f} MB"
+
+
 class AchievementSelectionDialog(QDialog):
     """成就选择对话框"""
     
@@ -2170,7 +2139,12 @@ class AchievementSelectionDialog(QDialog):
     def _load_achievements(self):
         """加载成就数据"""
         from core.config import config
-        achievements = config.load_base_achievements()
+        # 从设置对话框打开时使用其成就组编辑会话中的数据（包含未保存的修改）
+        parent = self.parent()
+        if hasattr(parent, '_get_group_session'):
+            achievements = parent._get_group_session().achievements
+        else:
+            achievements = config.load_base_achievements()
         
         # 过滤掉已经有组的成就
         available_achievements = []
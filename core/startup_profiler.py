@@ -0,0 +1,187 @@
+"""
+启动性能分析模块
+设置环境变量 WW_PROFILE_STARTUP=1 或使用 python main.py --profile-startup 启用，
+记录各启动阶段（应用实例创建、模块导入、标签页构建、配置与数据加载、图片解码）的耗时和内存变化，
+输出 Chrome trace-event 格式的跟踪文件（可在 chrome://tracing 或 Perfetto 中打开）并打印汇总表
+
+本模块不依赖 core 中的其他模块，需在其他模块导入之前启用
+"""
+import builtins
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+ENV_VAR = "WW_PROFILE_STARTUP"
+CLI_FLAG = "--profile-startup"
+
+# 短于该时间（毫秒）的模块导入不记录，避免跟踪文件被大量小模块淹没
+MIN_IMPORT_MS = 1.0
+
+
+class StartupProfiler:
+    """记录启动阶段的耗时与Python内存变化"""
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self._origin = time.perf_counter()
+        self._original_import = None
+        self._import_depth = 0
+        self._finished = False
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self._origin = time.perf_counter()
+        tracemalloc.start()
+        self._install_import_hook()
+        print("[INFO] 启动性能分析已启用")
+
+    def _now_us(self):
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def _memory_kb(self):
+        current, _ = tracemalloc.get_traced_memory()
+        return current / 1024
+
+    def record(self, name, category, start_us, end_us, memory_before_kb, **args):
+        memory_after_kb = self._memory_kb()
+        self.events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round(start_us, 1),
+            "dur": round(end_us - start_us, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": dict(args, memory_kb=round(memory_after_kb, 1),
+                         memory_delta_kb=round(memory_after_kb - memory_before_kb, 1)),
+        })
+
+    def span(self, name, category="phase"):
+        """记录一个阶段的上下文管理器，未启用时不做任何事"""
+        return _Span(self, name, category)
+
+    def timed(self, name=None, category="phase"):
+        """记录函数耗时的装饰器"""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.span(span_name, category):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _install_import_hook(self):
+        """包装 __import__，记录首次导入的模块耗时（嵌套导入在跟踪文件中显示为层级）"""
+        self._original_import = builtins.__import__
+        original_import = self._original_import
+        profiler = self
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules or threading.current_thread() is not threading.main_thread():
+                return original_import(name, globals, locals, fromlist, level)
+            start_us = profiler._now_us()
+            memory_before_kb = profiler._memory_kb()
+            profiler._import_depth += 1
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                profiler._import_depth -= 1
+                end_us = profiler._now_us()
+                if (end_us - start_us) / 1000 >= MIN_IMPORT_MS:
+                    profiler.record(f"import {name}", "import", start_us, end_us, memory_before_kb,
+                                    depth=profiler._import_depth)
+
+        builtins.__import__ = timed_import
+
+    def _remove_import_hook(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def summary_lines(self, limit=25):
+        """按耗时排序的汇总表：同名阶段合并，模块导入只统计最外层"""
+        totals = {}
+        for event in self.events:
+            if event["cat"] == "import" and event["args"].get("depth"):
+                continue
+            entry = totals.setdefault(event["name"], [event["cat"], 0, 0.0, 0.0])
+            entry[1] += 1
+            entry[2] += event["dur"] / 1000
+            entry[3] += event["args"]["memory_delta_kb"]
+        rows = sorted(totals.items(), key=lambda item: item[1][2], reverse=True)
+
+        lines = [f"{'耗时(ms)':>10} {'内存变化(KB)':>12} {'次数':>4}  {'类别':<8} 阶段"]
+        for name, (category, count, duration_ms, memory_kb) in rows[:limit]:
+            lines.append(f"{duration_ms:>10.1f} {memory_kb:>12.1f} {count:>4}  {category:<8} {name}")
+        return lines
+
+    def finish(self, trace_path=None):
+        """停止记录，写入跟踪文件并打印汇总表，返回跟踪文件路径"""
+        if not self.enabled or self._finished:
+            return None
+        self._finished = True
+        self.enabled = False
+        self._remove_import_hook()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        total_ms = self._now_us() / 1000
+
+        if trace_path is None:
+            from core.config import get_resource_path
+            trace_path = get_resource_path("resources/startup_trace.json")
+        with open(trace_path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+
+        print(f"[INFO] 启动总耗时: {total_ms:.1f} ms，Python内存峰值: {peak / 1024 / 1024:.2f} MB")
+        for line in self.summary_lines():
+            print(f"[INFO] {line}")
+        print(f"[SUCCESS] 启动跟踪文件已保存到: {trace_path}")
+        return trace_path
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'category', 'start_us', 'memory_before_kb')
+
+    def __init__(self, profiler, name, category):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.start_us = None
+
+    def __enter__(self):
+        if self.profiler.enabled:
+            self.start_us = self.profiler._now_us()
+            self.memory_before_kb = self.profiler._memory_kb()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.start_us is not None and self.profiler.enabled:
+            self.profiler.record(self.name, self.category, self.start_us, self.profiler._now_us(),
+                                 self.memory_before_kb)
+        return False
+
+
+profiler = StartupProfiler()
+
+
+def enable_from_environment(argv=None):
+    """根据环境变量或命令行参数启用分析，并从 argv 中移除命令行参数"""
+    argv = sys.argv if argv is None else argv
+    requested = os.environ.get(ENV_VAR, "").strip() not in ("", "0")
+    if CLI_FLAG in argv:
+        argv.remove(CLI_FLAG)
+        requested = True
+    if requested:
+        profiler.enable()
+    return requested
@@ -10,6 +10,10 @@ from PySide6.QtGui import QPainter, QColor, QFontMetrics
 from core.config import config
 from core.signal_bus import signal_bus
 from core.styles import get_button_style
+from core.startup_profiler import profiler
+from core.instrumentation import metrics
+from core.columnar_store import COLUMNAR_MIN_ROWS
+from core.game_version import parse_version, sort_versions
 
 
 class SimpleChartWidget(QWidget):
@@ -814,6 +818,241 @@ class TooltipWidget(QWidget):
         painter.drawRoundedRect(self.rect(), 6, 6)
 
 
+def calculate_statistics(achievements, version_filter='全部'):
+    """计算统计数据（逐条处理），成就组只计一次"""
+    stats = {
+        'total': 0,
+        'completed': 0,
+        'incomplete': 0,
+        'unavailable': 0,
+        'completion_rate': 0,
+        'categories': {},
+        'subcategories': {},
+        'versions': {}
+    }
+
+    # 预处理：收集成就组信息
+    groups = {}
+    for achievement in achievements:
+        group_id = achievement.get('成就组ID')
+        if group_id:
+            if group_id not in groups:
+                groups[group_id] = []
+            groups[group_id].append(achievement)
+
+    # 统计完成状态
+    processed_groups = set()
+    for achievement in achievements:
+        # 统计完成状态
+        status = achievement.get('获取状态', '')
+        group_id = achievement.get('成就组ID')
+        
+        if status == '已完成':
+            if group_id:
+                # 成就组：检查是否已统计过
+                if group_id not in processed_groups:
+                    stats['completed'] += 1
+                    processed_groups.add(group_id)
+            else:
+                # 普通成就
+                stats['completed'] += 1
+        elif status == '暂不可获取':
+            stats['unavailable'] += 1
+
+        # 统计分类
+        category = achievement.get('第一分类', '未知')
+        if category not in stats['categories']:
+            stats['categories'][category] = {'total': 0, 'completed': 0, 'processed_groups': set()}
+        
+        group_id = achievement.get('成就组ID')
+        if group_id:
+            # 成就组：每个组只统计一次
+            if group_id not in stats['categories'][category]['processed_groups']:
+                stats['categories'][category]['total'] += 1
+                if group_id in processed_groups:  # 该组已完成
+                    stats['categories'][category]['completed'] += 1
+                stats['categories'][category]['processed_groups'].add(group_id)
+        else:
+            # 普通成就
+            stats['categories'][category]['total'] += 1
+            if status == '已完成':
+                stats['categories'][category]['completed'] += 1
+
+        # 统计第二分类
+        subcategory = achievement.get('第二分类', '未知')
+        if subcategory not in stats['subcategories']:
+            stats['subcategories'][subcategory] = {'total': 0, 'completed': 0, 'processed_groups': set()}
+        
+        if group_id:
+            # 成就组：每个组只统计一次
+            if group_id not in stats['subcategories'][subcategory]['processed_groups']:
+                stats['subcategories'][subcategory]['total'] += 1
+                if group_id in processed_groups:  # 该组已完成
+                    stats['subcategories'][subcategory]['completed'] += 1
+                stats['subcategories'][subcategory]['processed_groups'].add(group_id)
+        else:
+            # 普通成就
+            stats['subcategories'][subcategory]['total'] += 1
+            if status == '已完成':
+                stats['subcategories'][subcategory]['completed'] += 1
+
+        # 统计版本（考虑成就组）
+        # 使用一个单独的集合来跟踪已处理的成就组
+        if 'processed_version_groups' not in stats:
+            stats['processed_version_groups'] = set()
+        
+        if group_id:
+            # 成就组：每个组只统计一次版本
+            if group_id not in stats['processed_version_groups']:
+                version = achievement.get('版本', '未知')
+                if version_filter == '全部':
+                    # 全部时，按大版本统计
+                    if version != '未知':
+                        # 提取大版本号（如2.7 -> 2.0）
+                        major_version = parse_version(version).major_label
+                        if major_version not in stats['versions']:
+                            stats['versions'][major_version] = 0
+                        stats['versions'][major_version] += 1
+                    else:
+                        if '未知' not in stats['versions']:
+                            stats['versions']['未知'] = 0
+                        stats['versions']['未知'] += 1
+                else:
+                    # 具体版本时，显示该大版本下所有小版本
+                    if version != '未知':
+                        # 获取筛选条件的大版本号
+                        filter_major = parse_version(version_filter).major_label
+                        achievement_major = parse_version(version).major_label
+
+                        # 只统计同一大版本的
+                        if achievement_major == filter_major:
+                            if version not in stats['versions']:
+                                stats['versions'][version] = 0
+                            stats['versions'][version] += 1
+                    else:
+                        if '未知' not in stats['versions']:
+                            stats['versions']['未知'] = 0
+                        stats['versions']['未知'] += 1
+                
+                stats['processed_version_groups'].add(group_id)
+        else:
+            # 普通成就：直接统计版本
+            version = achievement.get('版本', '未知')
+            if version_filter == '全部':
+                # 全部时，按大版本统计
+                if version != '未知':
+                    # 提取大版本号（如2.7 -> 2.0）
+                    major_version = parse_version(version).major_label
+                    if major_version not in stats['versions']:
+                        stats['versions'][major_version] = 0
+                    stats['versions'][major_version] += 1
+                else:
+                    if '未知' not in stats['versions']:
+                        stats['versions']['未知'] = 0
+                    stats['versions']['未知'] += 1
+            else:
+                # 具体版本时，显示该大版本下所有小版本
+                if version != '未知':
+                    # 获取筛选条件的大版本号
+                    filter_major = parse_version(version_filter).major_label
+                    achievement_major = parse_version(version).major_label
+
+                    # 只统计同一大版本的
+                    if achievement_major == filter_major:
+                        if version not in stats['versions']:
+                            stats['versions'][version] = 0
+                        stats['versions'][version] += 1
+                else:
+                    if '未知' not in stats['versions']:
+                        stats['versions']['未知'] = 0
+                    stats['versions']['未知'] += 1
+
+    # 计算未完成的成就组
+    for group_id in groups:
+        if group_id not in processed_groups:  # 该组没有完成
+            stats['incomplete'] += 1
+    
+    # 计算未完成的普通成就
+    for achievement in achievements:
+        status = achievement.get('获取状态', '')
+        group_id = achievement.get('成就组ID')
+        if status != '已完成' and status != '暂不可获取' and not group_id:
+            stats['incomplete'] += 1
+    
+    # 计算总计（考虑成就组）
+    total_groups = len(groups)
+    normal_achievements = sum(1 for a in achievements if not a.get('成就组ID'))
+    stats['total'] = total_groups + normal_achievements
+
+    # 清理临时数据
+    for category in stats['categories']:
+        if 'processed_groups' in stats['categories'][category]:
+            del stats['categories'][category]['processed_groups']
+    
+    for subcategory in stats['subcategories']:
+        if 'processed_groups' in stats['subcategories'][subcategory]:
+            del stats['subcategories'][subcategory]['processed_groups']
+    
+    # 清理版本统计的临时数据
+    if 'processed_version_groups' in stats:
+        del stats['processed_version_groups']
+
+    # 计算完成率
+    if stats['total'] > 0:
+        stats['completion_rate'] = int(stats['completed'] * 100 / stats['total'])
+        stats['unavailable_rate'] = int(stats['unavailable'] * 100 / stats['total'])
+
+    return stats
+
+def calculate_version_stats(achievements, version_filter):
+    """单独计算版本统计（考虑成就组，逐条处理）"""
+    version_stats = {}
+    processed_groups = set()  # 跟踪已处理的成就组
+
+    for achievement in achievements:
+        group_id = achievement.get('成就组ID')
+        version = achievement.get('版本', '未知')
+
+        # 如果是成就组，检查是否已处理过
+        if group_id and group_id in processed_groups:
+            continue
+
+        if group_id:
+            # 标记该组已处理
+            processed_groups.add(group_id)
+
+        if version_filter == '全部':
+            # 全部时，按大版本统计
+            if version != '未知':
+                # 提取大版本号（如2.7 -> 2.0）
+                major_version = parse_version(version).major_label
+                if major_version not in version_stats:
+                    version_stats[major_version] = 0
+                version_stats[major_version] += 1
+            else:
+                if '未知' not in version_stats:
+                    version_stats['未知'] = 0
+                version_stats['未知'] += 1
+        else:
+            # 具体版本时，显示该大版本下所有小版本
+            if version != '未知':
+                # 获取筛选条件的大版本号
+                filter_major = parse_version(version_filter).major_label
+                achievement_major = parse_version(version).major_label
+
+                # 只统计同一大版本的
+                if achievement_major == filter_major:
+                    if version not in version_stats:
+                        version_stats[version] = 0
+                    version_stats[version] += 1
+            else:
+                if '未知' not in version_stats:
+                    version_stats['未知'] = 0
+                version_stats['未知'] += 1
+
+    return version_stats
+
+
 class StatisticsTab(QWidget):
     """统计信息标签页"""
 
@@ -1016,23 +1255,26 @@ class StatisticsTab(QWidget):
         self.current_user = self.user_combo.currentText()
         self.load_data()
 
+    @profiler.timed("加载统计数据", "data")
     def load_data(self):
         """加载数据"""
         # 确保有当前用户
         if not self.current_user:
             self.current_user = config.get_current_user()
 
-        # 加载基础成就数据
+        from core.user_sessions import user_sessions
+
+        # 加载基础成就数据（所有用户共用，文件未变化时不重新读取）
         try:
-            self.base_achievements = config.load_base_achievements()
+            self.base_achievements = user_sessions.base_achievements()
         except Exception as e:
             print(f"[ERROR] 加载基础成就数据失败: {e}")
             self.base_achievements = []
 
-        # 加载用户进度
+        # 加载用户进度（使用用户会话缓存）
         if self.current_user:
             try:
-                self.user_progress = config.load_user_progress(self.current_user)
+                self.user_progress = user_sessions.get(self.current_user).progress
             except Exception as e:
                 print(f"[ERROR] 加载用户进度失败: {e}")
                 self.user_progress = {}
@@ -1083,7 +1325,23 @@ class StatisticsTab(QWidget):
         self.user_combo.blockSignals(False)
 
     def update_filters(self):
-        """更新筛选器选项"""
+        """更新筛选器选项
+
+        重建选项期间屏蔽下拉框信号（否则每次清空、添加、恢复选择都会重新统计一次），
+        第二分类按恢复后的第一分类重建并重置为全部，统计由调用方刷新一次
+        """
+        combos = (self.first_category_filter, self.second_category_filter, self.version_filter)
+        for combo in combos:
+            combo.blockSignals(True)
+        try:
+            self._rebuild_filter_options()
+            self._update_second_category_options()
+        finally:
+            for combo in combos:
+                combo.blockSignals(False)
+
+    def _rebuild_filter_options(self):
+        """重建第一分类和版本选项，并恢复之前的选择"""
         # 更新第一分类
         first_categories = set()
         second_categories = set()
@@ -1114,7 +1372,7 @@ class StatisticsTab(QWidget):
         # 更新版本
         self.version_filter.clear()
         self.version_filter.addItem("全部")
-        for version in sorted(versions, reverse=True):
+        for version in sort_versions(versions, reverse=True):
             if version:
                 self.version_filter.addItem(version)
 
@@ -1125,6 +1383,17 @@ class StatisticsTab(QWidget):
 
     def on_first_category_changed(self):
         """第一分类变化时更新第二分类选项并重置为全部"""
+        self.second_category_filter.blockSignals(True)
+        try:
+            self._update_second_category_options()
+        finally:
+            self.second_category_filter.blockSignals(False)
+
+        # 触发更新
+        self.update_statistics()
+
+    def _update_second_category_options(self):
+        """按当前第一分类重建第二分类选项并重置为全部"""
         first_category = self.first_category_filter.currentText()
 
         # 清空第二分类选项
@@ -1154,9 +1423,6 @@ class StatisticsTab(QWidget):
         # 强制重置第二分类为"全部"
         self.second_category_filter.setCurrentIndex(0)
 
-        # 触发更新
-        self.update_statistics()
-
     def filter_achievements(self):
         """筛选成就数据"""
         filtered = []
@@ -1199,239 +1465,24 @@ class StatisticsTab(QWidget):
         # 转换为列表
         self.merged_achievements = list(merged_achievements.values())
 
+    @metrics.timed("统计页统计")
     def calculate_statistics(self, achievements, version_filter='全部'):
-        """计算统计数据"""
-        stats = {
-            'total': 0,
-            'completed': 0,
-            'incomplete': 0,
-            'unavailable': 0,
-            'completion_rate': 0,
-            'categories': {},
-            'subcategories': {},
-            'versions': {}
-        }
-
-        # 预处理：收集成就组信息
-        groups = {}
-        for achievement in achievements:
-            group_id = achievement.get('成就组ID')
-            if group_id:
-                if group_id not in groups:
-                    groups[group_id] = []
-                groups[group_id].append(achievement)
-
-        # 统计完成状态
-        processed_groups = set()
-        for achievement in achievements:
-            # 统计完成状态
-            status = achievement.get('获取状态', '')
-            group_id = achievement.get('成就组ID')
-            
-            if status == '已完成':
-                if group_id:
-                    # 成就组：检查是否已统计过
-                    if group_id not in processed_groups:
-                        stats['completed'] += 1
-                        processed_groups.add(group_id)
-                else:
-                    # 普通成就
-                    stats['completed'] += 1
-            elif status == '暂不可获取':
-                stats['unavailable'] += 1
-
-            # 统计分类
-            category = achievement.get('第一分类', '未知')
-            if category not in stats['categories']:
-                stats['categories'][category] = {'total': 0, 'completed': 0, 'processed_groups': set()}
-            
-            group_id = achievement.get('成就组ID')
-            if group_id:
-                # 成就组：每个组只统计一次
-                if group_id not in stats['categories'][category]['processed_groups']:
-                    stats['categories'][category]['total'] += 1
-                    if group_id in processed_groups:  # 该组已完成
-                        stats['categories'][category]['completed'] += 1
-                    stats['categories'][category]['processed_groups'].add(group_id)
-            else:
-                # 普通成就
-                stats['categories'][category]['total'] += 1
-                if status == '已完成':
-                    stats['categories'][category]['completed'] += 1
-
-            # 统计第二分类
-            subcategory = achievement.get('第二分类', '未知')
-            if subcategory not in stats['subcategories']:
-                stats['subcategories'][subcategory] = {'total': 0, 'completed': 0, 'processed_groups': set()}
-            
-            if group_id:
-                # 成就组：每个组只统计一次
-                if group_id not in stats['subcategories'][subcategory]['processed_groups']:
-                    stats['subcategories'][subcategory]['total'] += 1
-                    if group_id in processed_groups:  # 该组已完成
-                        stats['subcategories'][subcategory]['completed'] += 1
-                    stats['subcategories'][subcategory]['processed_groups'].add(group_id)
-            else:
-                # 普通成就
-                stats['subcategories'][subcategory]['total'] += 1
-                if status == '已完成':
-                    stats['subcategories'][subcategory]['completed'] += 1
-
-            # 统计版本（考虑成就组）
-            # 使用一个单独的集合来跟踪已处理的成就组
-            if 'processed_version_groups' not in stats:
-                stats['processed_version_groups'] = set()
-            
-            if group_id:
-                # 成就组：每个组只统计一次版本
-                if group_id not in stats['processed_version_groups']:
-                    version = achievement.get('版本', '未知')
-                    if version_filter == '全部':
-                        # 全部时，按大版本统计
-                        if version != '未知':
-                            # 提取大版本号（如2.7 -> 2.0）
-                            major_version = version.split('.')[0] + '.0'
-                            if major_version not in stats['versions']:
-                                stats['versions'][major_version] = 0
-                            stats['versions'][major_version] += 1
-                        else:
-                            if '未知' not in stats['versions']:
-                                stats['versions']['未知'] = 0
-                            stats['versions']['未知'] += 1
-                    else:
-                        # 具体版本时，显示该大版本下所有小版本
-                        if version != '未知':
-                            # 获取筛选条件的大版本号
-                            filter_major = version_filter.split('.')[0] + '.0'
-                            achievement_major = version.split('.')[0] + '.0'
-
-                            # 只统计同一大版本的
-                            if achievement_major == filter_major:
-                                if version not in stats['versions']:
-                                    stats['versions'][version] = 0
-                                stats['versions'][version] += 1
-                        else:
-                            if '未知' not in stats['versions']:
-                                stats['versions']['未知'] = 0
-                            stats['versions']['未知'] += 1
-                    
-                    stats['processed_version_groups'].add(group_id)
-            else:
-                # 普通成就：直接统计版本
-                version = achievement.get('版本', '未知')
-                if version_filter == '全部':
-                    # 全部时，按大版本统计
-                    if version != '未知':
-                        # 提取大版本号（如2.7 -> 2.0）
-                        major_version = version.split('.')[0] + '.0'
-                        if major_version not in stats['versions']:
-                            stats['versions'][major_version] = 0
-                        stats['versions'][major_version] += 1
-                    else:
-                        if '未知' not in stats['versions']:
-                            stats['versions']['未知'] = 0
-                        stats['versions']['未知'] += 1
-                else:
-                    # 具体版本时，显示该大版本下所有小版本
-                    if version != '未知':
-                        # 获取筛选条件的大版本号
-                        filter_major = version_filter.split('.')[0] + '.0'
-                        achievement_major = version.split('.')[0] + '.0'
-
-                        # 只统计同一大版本的
-                        if achievement_major == filter_major:
-                            if version not in stats['versions']:
-                                stats['versions'][version] = 0
-                            stats['versions'][version] += 1
-                    else:
-                        if '未知' not in stats['versions']:
-                            stats['versions']['未知'] = 0
-                        stats['versions']['未知'] += 1
-
-        # 计算未完成的成就组
-        for group_id in groups:
-            if group_id not in processed_groups:  # 该组没有完成
-                stats['incomplete'] += 1
-        
-        # 计算未完成的普通成就
-        for achievement in achievements:
-            status = achievement.get('获取状态', '')
-            group_id = achievement.get('成就组ID')
-            if status != '已完成' and status != '暂不可获取' and not group_id:
-                stats['incomplete'] += 1
-        
-        # 计算总计（考虑成就组）
-        total_groups = len(groups)
-        normal_achievements = sum(1 for a in achievements if not a.get('成就组ID'))
-        stats['total'] = total_groups + normal_achievements
-
-        # 清理临时数据
-        for category in stats['categories']:
-            if 'processed_groups' in stats['categories'][category]:
-                del stats['categories'][category]['processed_groups']
-        
-        for subcategory in stats['subcategories']:
-            if 'processed_groups' in stats['subcategories'][subcategory]:
-                del stats['subcategories'][subcategory]['processed_groups']
-        
-        # 清理版本统计的临时数据
-        if 'processed_version_groups' in stats:
-            del stats['processed_version_groups']
-
-        # 计算完成率
-        if stats['total'] > 0:
-            stats['completion_rate'] = int(stats['completed'] * 100 / stats['total'])
-            stats['unavailable_rate'] = int(stats['unavailable'] * 100 / stats['total'])
-
-        return stats
+        """计算统计数据，成就较多时使用列存储实现"""
+        if len(achievements) >= COLUMNAR_MIN_ROWS:
+            from core import columnar_store
+            stats = columnar_store.calculate_statistics(achievements, version_filter)
+            if stats is not None:
+                return stats
+        return calculate_statistics(achievements, version_filter)
 
     def calculate_version_stats(self, achievements, version_filter):
         """单独计算版本统计（考虑成就组）"""
-        version_stats = {}
-        processed_groups = set()  # 跟踪已处理的成就组
-
-        for achievement in achievements:
-            group_id = achievement.get('成就组ID')
-            version = achievement.get('版本', '未知')
-
-            # 如果是成就组，检查是否已处理过
-            if group_id and group_id in processed_groups:
-                continue
-
-            if group_id:
-                # 标记该组已处理
-                processed_groups.add(group_id)
-
-            if version_filter == '全部':
-                # 全部时，按大版本统计
-                if version != '未知':
-                    # 提取大版本号（如2.7 -> 2.0）
-                    major_version = version.split('.')[0] + '.0'
-                    if major_version not in version_stats:
-                        version_stats[major_version] = 0
-                    version_stats[major_version] += 1
-                else:
-                    if '未知' not in version_stats:
-                        version_stats['未知'] = 0
-                    version_stats['未知'] += 1
-            else:
-                # 具体版本时，显示该大版本下所有小版本
-                if version != '未知':
-                    # 获取筛选条件的大版本号
-                    filter_major = version_filter.split('.')[0] + '.0'
-                    achievement_major = version.split('.')[0] + '.0'
-
-                    # 只统计同一大版本的
-                    if achievement_major == filter_major:
-                        if version not in version_stats:
-                            version_stats[version] = 0
-                        version_stats[version] += 1
-                else:
-                    if '未知' not in version_stats:
-                        version_stats['未知'] = 0
-                    version_stats['未知'] += 1
-
-        return version_stats
+        if len(achievements) >= COLUMNAR_MIN_ROWS:
+            from core import columnar_store
+            version_stats = columnar_store.calculate_version_stats(achievements, version_filter)
+            if version_stats is not None:
+                return version_stats
+        return calculate_version_stats(achievements, version_filter)
 
     def update_statistics(self):
         """更新统计信息"""
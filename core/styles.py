@@ -1,7 +1,11 @@
 ﻿# ui/styles.py
 """
 统一的样式定义文件
+
+样式表只依赖主题，每个主题生成一次后缓存，切换主题时直接复用
 """
+from functools import lru_cache
+
 from PySide6.QtGui import QIcon
 from core.config import get_resource_path
 
@@ -126,6 +130,7 @@ class _BaseStylesClass:
     """基础样式类 - 统一的样式定义"""
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_button_style(theme="light"):
         """生成按钮样式 - 统一使用太阳色/月亮色"""
         colors = ColorPalette.Dark if theme == "dark" else ColorPalette.Light
@@ -157,6 +162,7 @@ class _BaseStylesClass:
         """
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_groupbox_style(theme="light"):
         """生成分组框样式"""
         colors = ColorPalette.Dark if theme == "dark" else ColorPalette.Light
@@ -185,6 +191,7 @@ class _BaseStylesClass:
         """
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_tab_widget_style(theme="light"):
         """生成标签页样式"""
         colors = ColorPalette.Dark if theme == "dark" else ColorPalette.Light
@@ -237,6 +244,7 @@ class _BaseStylesClass:
         """
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_text_input_style(theme="light"):
         """生成文本输入样式"""
         colors = ColorPalette.Dark if theme == "dark" else ColorPalette.Light
@@ -327,6 +335,7 @@ class _BaseStylesClass:
         """
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_label_style(theme="light", label_type="normal"):
         """生成标签样式"""
         colors = ColorPalette.Dark if theme == "dark" else ColorPalette.Light
@@ -340,6 +349,7 @@ class _BaseStylesClass:
         """
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_combobox_style(theme="light"):
         """生成下拉框样式"""
         colors = ColorPalette.Dark if theme == "dark" else ColorPalette.Light
@@ -386,6 +396,7 @@ def get_icon(icon_name):
         return QIcon(str(icon_path))
     return QIcon()  # 返回空图标
 
+@lru_cache(maxsize=None)
 def get_main_window_style(theme="light"):
     """主窗口样式"""
     colors = ColorPalette.Dark if theme == "dark" else ColorPalette.Light
@@ -455,6 +466,7 @@ def get_main_window_style(theme="light"):
     """ + base_styles
 
 
+@lru_cache(maxsize=None)
 def get_dialog_style(theme="light"):
     """对话框样式"""
     colors = ColorPalette.Dark if theme == "dark" else ColorPalette.Light
@@ -482,6 +494,7 @@ def get_dialog_style(theme="light"):
         border-radius: 8px;
     }}
     """ + base_styles
+@lru_cache(maxsize=None)
 def get_settings_desc_style(theme="light"):
     """设置说明文本样式"""
     colors = ColorPalette.Dark if theme == "dark" else ColorPalette.Light
@@ -503,6 +516,7 @@ def get_font_gray_style(theme="light"):
 
 
 
+@lru_cache(maxsize=None)
 def get_scrollbar_style(theme="light"):
     """滚动条样式 - 用于表格等控件"""
     opacity = ColorPalette.Opacity.SCROLLBAR
@@ -557,6 +571,7 @@ def get_scrollbar_style(theme="light"):
     """
 
 
+@lru_cache(maxsize=None)
 def get_scroll_area_style(theme="light"):
     """滚动区域样式 - 包含滚动区域、内容Widget和滚动条"""
     return f"""
@@ -572,6 +587,29 @@ def get_scroll_area_style(theme="light"):
 def get_label_style(theme="light"):
     return _BaseStylesClass.get_label_style(theme)
 
+@lru_cache(maxsize=None)
+def get_avatar_grid_style(theme="light"):
+    """头像选择网格样式 - 透明背景、悬停圆角高亮和滚动条"""
+    colors = ColorPalette.Dark if theme == "dark" else ColorPalette.Light
+    opacity_hover = ColorPalette.Opacity.TAB_HOVER
+    hover_bg = _get_rgba_color(69, 90, 100, opacity_hover) if theme == "dark" else _get_rgba_color(231, 245, 255, opacity_hover)
+    return f"""
+        QListView {{
+            background-color: transparent;
+            border: none;
+            color: {colors.TEXT_PRIMARY};
+            font-size: 12px;
+        }}
+        QListView::item {{
+            border-radius: 8px;
+            padding: 4px;
+        }}
+        QListView::item:hover {{
+            background-color: {hover_bg};
+        }}
+    """ + get_scrollbar_style(theme)
+
+@lru_cache(maxsize=None)
 def get_notification_style(theme="light"):
     """通知样式 - 使用主题色"""
     colors = ColorPalette.Dark if theme == "dark" else ColorPalette.Light
@@ -594,6 +632,7 @@ def get_text_input_style(theme="light"):
     return BaseStyles.get_text_input_style(theme)
 
 
+@lru_cache(maxsize=None)
 def get_help_text_style(theme="light"):
     """帮助文本样式"""
     opacity = ColorPalette.Opacity.HELP_TEXT
@@ -609,4 +648,4 @@ def get_help_text_style(theme="light"):
             color: #3498db;
             text-decoration: underline;
         }}
-    """
\ No newline at end of file
+    """
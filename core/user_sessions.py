@@ -0,0 +1,177 @@
+"""
+用户会话缓存模块
+按用户缓存合并后的成就记录、筛选器选项、统计信息和用户进度，切换用户时成就管理页和统计页直接使用会话，
+不再重新读取和合并；最近使用过的其他用户在后台线程中预取，会话数超过 MAX_SESSIONS 时淘汰最久未使用的
+
+会话记录源文件（基础成就分片、用户进度、分类配置）的修改时间和大小（与热启动快照相同），
+任一源文件变化后会话失效，下次使用时重新加载。会话只在界面线程中读写，预取线程只读取文件构建会话，
+不写入热启动快照、进度矩阵或任何数据文件（旧格式数据的迁移在启动时由界面线程完成）；
+头像和立绘由主窗口提前交给 image_service 解码，切换时从图片的内存缓存中取得
+"""
+from collections import OrderedDict
+
+from PySide6.QtCore import QObject, QTimer
+
+from core.config import config
+
+# 最多缓存的用户会话数（含当前用户）
+MAX_SESSIONS = 3
+
+# 启动、切换用户或保存数据后延迟预取（毫秒），避免与界面刷新争抢
+PREFETCH_DELAY_MS = 1500
+
+
+class UserSession:
+    """单个用户的会话数据，achievements 为成就管理页正在使用的记录列表"""
+    __slots__ = ('username', 'sources', 'achievements', 'facets', 'statistics', 'progress')
+
+    def __init__(self, username, sources, achievements, facets, statistics, progress):
+        self.username = username
+        self.sources = sources
+        self.achievements = achievements
+        self.facets = facets
+        self.statistics = statistics
+        self.progress = progress
+
+
+def build_session(username, read_only=False):
+    """读取用户进度并加载合并后的成就记录，read_only 为 True 时不写入任何文件（后台线程中调用）"""
+    from core.manage_tab import load_user_achievements
+    from core.warm_snapshot import source_signature
+
+    # 先记录源文件签名，加载期间文件被修改时会话随即失效
+    sources = source_signature(username)
+    progress = config.load_user_progress(username, update_matrix=not read_only)
+    loaded = load_user_achievements(username, progress, write_snapshot=not read_only)
+    achievements, facets, statistics = loaded if loaded is not None else ([], None, None)
+    return UserSession(username, sources, achievements, facets, statistics, progress)
+
+
+def _prefetch_job(job, usernames):
+    sessions = []
+    for username in usernames:
+        job.check_cancelled()
+        sessions.append(build_session(username, read_only=True))
+    return sessions
+
+
+class UserSessionCache(QObject):
+    """用户会话的LRU缓存"""
+
+    def __init__(self):
+        super().__init__()
+        self._sessions = OrderedDict()
+        self._base = None  # (文件签名, 基础成就数据)
+        self._prefetch_job = None
+        self._prefetch_again = False
+        self._prefetch_timer = None
+
+    def _is_valid(self, session):
+        from core.warm_snapshot import source_signature
+        return session is not None and session.sources == source_signature(session.username)
+
+    def _remember(self, session):
+        self._sessions[session.username] = session
+        self._sessions.move_to_end(session.username)
+        # 淘汰最久未使用的会话，当前用户的会话始终保留
+        current_user = config.get_current_user()
+        while len(self._sessions) > MAX_SESSIONS:
+            username = next(name for name in self._sessions if name != current_user)
+            del self._sessions[username]
+            print(f"[DEBUG] 淘汰用户会话: {username}")
+
+    def get(self, username):
+        """返回用户的会话，没有有效会话时同步加载"""
+        session = self._sessions.get(username)
+        if self._is_valid(session):
+            self._sessions.move_to_end(username)
+            return session
+        session = build_session(username)
+        self._remember(session)
+        return session
+
+    def refresh(self, username, achievements, progress):
+        """用户数据保存后更新会话：内存中的记录与刚写入的文件一致，无需重新加载
+
+        保存时基础数据有变化（分片被改写）则其他用户的会话随之失效，稍后在后台重新预取
+        """
+        from core.warm_snapshot import source_signature
+        self._remember(UserSession(username, source_signature(username), achievements, None, None, progress))
+        self.schedule_prefetch()
+
+    def invalidate(self, username=None):
+        """丢弃指定用户（为 None 时所有用户）的会话"""
+        if username is None:
+            self._sessions.clear()
+        else:
+            self._sessions.pop(username, None)
+
+    def base_achievements(self):
+        """基础成就数据（所有用户共用，分片文件变化后重新读取）"""
+        from core.base_store import base_store
+        signature = base_store.signature()
+        if self._base is None or self._base[0] != signature or signature is None:
+            self._base = (signature, config.load_base_achievements())
+        return self._base[1]
+
+    def prefetch_candidates(self):
+        """最近使用过的其他用户，最多 MAX_SESSIONS - 1 个"""
+        current_user = config.get_current_user()
+        users = config.get_users()
+        return [username for username in config.recent_users
+                if username != current_user and username in users][:MAX_SESSIONS - 1]
+
+    def prefetch(self, usernames):
+        """在后台线程中构建这些用户的会话，已有有效会话的用户跳过"""
+        pending = [username for username in usernames if not self._is_valid(self._sessions.get(username))]
+        if not pending:
+            return
+        if self._prefetch_job is not None:
+            # 上一次预取结束后再检查一遍
+            self._prefetch_again = True
+            return
+
+        from core.background_jobs import BackgroundJob
+        job = BackgroundJob("预取用户会话", _prefetch_job, pending, parent=self)
+        job.succeeded.connect(self._on_prefetched)
+        job.finished.connect(self._on_prefetch_finished)
+        self._prefetch_job = job
+        job.start()
+
+    def schedule_prefetch(self, delay=PREFETCH_DELAY_MS):
+        """延迟预取最近使用过的其他用户，重复调用时重新计时"""
+        if self._prefetch_timer is None:
+            self._prefetch_timer = QTimer(self)
+            self._prefetch_timer.setSingleShot(True)
+            self._prefetch_timer.timeout.connect(lambda: self.prefetch(self.prefetch_candidates()))
+        self._prefetch_timer.start(delay)
+
+    def _on_prefetched(self, sessions):
+        for session in sessions:
+            if session.username not in config.get_users() or not self._is_valid(session):
+                continue
+            if self._is_valid(self._sessions.get(session.username)):
+                continue
+            self._remember(session)
+            print(f"[INFO] 已预取用户 {session.username} 的会话")
+
+    def _on_prefetch_finished(self):
+        job, self._prefetch_job = self._prefetch_job, None
+        if job is not None:
+            job.deleteLater()
+        if self._prefetch_again:
+            self._prefetch_again = False
+            self.prefetch(self.prefetch_candidates())
+
+    def cancel_prefetch(self):
+        """取消正在进行的预取并等待线程结束（退出前调用）"""
+        if self._prefetch_timer is not None:
+            self._prefetch_timer.stop()
+        job = self._prefetch_job
+        if job is not None:
+            self._prefetch_again = False
+            job.cancel()
+            job.wait()
+
+
+user_sessions = UserSessionCache()
@@ -0,0 +1,120 @@
+"""
+热启动快照模块
+把合并后的成就记录（基础数据 + 用户进度）、筛选器选项和统计信息按列存储为二进制快照，
+源文件（基础成就分片、用户进度、分类配置）的修改时间和大小都未变化时，启动直接读取快照，
+跳过JSON解析与合并；任一源文件变化后快照自动失效并在下次加载时重建
+"""
+import os
+import pickle
+
+from core.config import config, get_resource_path
+
+# 2: 用户进度文件改为只保存非默认状态（启动时由 Config.migrate_data_files 一次性精简），旧快照全部失效
+SNAPSHOT_VERSION = 2
+
+
+class _Missing:
+    """列存储中表示记录缺少该字段（区别于值为 None）"""
+
+    def __reduce__(self):
+        return "_MISSING"
+
+
+_MISSING = _Missing()
+
+
+def get_snapshot_path(username):
+    return get_resource_path(f"resources/cache/warm_start_{config.get_user_uid(username)}.pickle")
+
+
+def _source_files(username):
+    return [
+        config.get_user_progress_path(username),
+        get_resource_path("resources/category_config.json"),
+    ]
+
+
+def source_signature(username):
+    """源文件的 (文件名, 修改时间, 大小)，不存在的文件记为 None；基础成就为各分片文件的签名"""
+    from core.base_store import base_store
+    signature = [base_store.signature()]
+    for path in _source_files(username):
+        try:
+            stat = os.stat(path)
+            signature.append((os.path.basename(path), stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((os.path.basename(path), None, None))
+    return tuple(signature)
+
+
+def _to_columns(records):
+    """记录列表转为列存储；重复的字符串值共享同一对象，pickle 只写一次"""
+    fields = []
+    field_set = set()
+    for record in records:
+        for field in record:
+            if field not in field_set:
+                field_set.add(field)
+                fields.append(field)
+
+    columns = []
+    for field in fields:
+        shared = {}
+        column = []
+        for record in records:
+            value = record.get(field, _MISSING)
+            if isinstance(value, str):
+                value = shared.setdefault(value, value)
+            column.append(value)
+        columns.append(column)
+    return fields, columns
+
+
+def _from_columns(fields, columns, count):
+    """列存储还原为成就记录（Achievement）列表"""
+    from core.achievement_record import records_from_columns
+    return records_from_columns(fields, columns, count, _MISSING)
+
+
+def save_snapshot(username, records, facets, statistics):
+    """保存快照（先写临时文件再替换），失败只打印警告"""
+    snapshot_path = get_snapshot_path(username)
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        fields, columns = _to_columns(records)
+        payload = {
+            "version": SNAPSHOT_VERSION,
+            "sources": source_signature(username),
+            "count": len(records),
+            "fields": fields,
+            "columns": columns,
+            "facets": facets,
+            "statistics": statistics,
+        }
+        temp_path = snapshot_path.with_name(snapshot_path.name + ".tmp")
+        with open(temp_path, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, snapshot_path)
+        print(f"[INFO] 热启动快照已保存: {snapshot_path}")
+    except Exception as e:
+        print(f"[WARNING] 保存热启动快照失败: {str(e)}")
+
+
+def load_snapshot(username):
+    """读取并校验快照，返回 (记录列表, 筛选器选项, 统计信息)，无效时返回 None"""
+    snapshot_path = get_snapshot_path(username)
+    if not snapshot_path.exists():
+        return None
+    try:
+        with open(snapshot_path, 'rb') as f:
+            payload = pickle.load(f)
+        if payload.get("version") != SNAPSHOT_VERSION:
+            return None
+        if payload.get("sources") != source_signature(username):
+            print("[INFO] 源数据已变化，热启动快照失效")
+            return None
+        records = _from_columns(payload["fields"], payload["columns"], payload["count"])
+        return records, payload["facets"], payload["statistics"]
+    except Exception as e:
+        print(f"[WARNING] 读取热启动快照失败: {str(e)}")
+        return None
@@ -1,22 +1,37 @@
 ﻿import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 
-from PySide6.QtWidgets import QWidget
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PySide6.QtCore import Qt, QTimer, QRect, QPoint, QPointF
 from PySide6.QtGui import QPainter, QPixmap, QBrush, QPainterPath, QColor
 
 from core.config import config
+from core.image_service import image_service
 from core.signal_bus import signal_bus
+from core.startup_profiler import profiler
 
 
-def load_background_image(theme="light"):
-    """加载背景图片的辅助函数"""
+# 背景渲染缓存中保留的条目数（主窗口和各对话框的常用尺寸/主题组合）
+RENDERED_CACHE_SIZE = 6
+
+# 调整窗口大小结束后多久重新平滑渲染背景（毫秒）
+RESIZE_DEBOUNCE_MS = 150
+
+# 已缩放并叠加遮罩的背景，键为 (原图cacheKey, 宽, 高, 设备像素比, 主题)
+_rendered_cache = OrderedDict()
+
+
+def get_background_image_path(theme="light"):
+    """当前设置下的背景图片路径，不使用背景或图片不存在时返回 None"""
     try:
         if not config.use_background:
             return None
         
         custom_path = config.custom_background_light if theme == "light" else config.custom_background_dark
         if custom_path and os.path.exists(custom_path):
-            return QPixmap(custom_path)
+            return custom_path
         
         if theme == "dark":
             image_name = "background-dark.png"
@@ -27,7 +42,7 @@ def load_background_image(theme="light"):
         image_path = get_resource_path(f"resources/img/{image_name}")
         
         if image_path.exists():
-            return QPixmap(str(image_path))
+            return str(image_path)
         else:
             signal_bus.log_message.emit("WARNING", f"背景图片不存在: {image_path}", {})
             return None
@@ -36,55 +51,185 @@ def load_background_image(theme="light"):
         return None
 
 
+def load_background_image(theme="light"):
+    """加载背景图片的辅助函数
+
+    返回已解码的背景图片；尚未解码时在后台开始解码并返回 None，
+    BackgroundWidget 收到 None 时先绘制纯色背景，解码完成后自动更新
+    """
+    image_path = get_background_image_path(theme)
+    if image_path is None:
+        return None
+    _, pixmap = image_service.request(image_path)
+    return pixmap
+
+
+def render_background(pixmap, theme, size, device_pixel_ratio=1.0):
+    """把背景图片缩放到指定尺寸、叠加遮罩并裁剪圆角，结果按尺寸和主题缓存"""
+    cache_key = (pixmap.cacheKey() if pixmap else None, size.width(), size.height(), device_pixel_ratio, theme)
+    rendered = _rendered_cache.get(cache_key)
+    if rendered is not None:
+        _rendered_cache.move_to_end(cache_key)
+        return rendered
+
+    rendered = QPixmap(size * device_pixel_ratio)
+    rendered.setDevicePixelRatio(device_pixel_ratio)
+    rendered.fill(Qt.GlobalColor.transparent)
+    widget_rect = QRect(QPoint(0, 0), size)
+
+    painter = QPainter(rendered)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+    # 创建圆角裁剪路径
+    path = QPainterPath()
+    path.addRoundedRect(widget_rect.x(), widget_rect.y(), widget_rect.width(), widget_rect.height(), 8, 8)
+    painter.setClipPath(path)
+
+    if pixmap:
+        # 按物理像素缩放背景图片以适应widget大小
+        scaled_pixmap = pixmap.scaled(
+            size * device_pixel_ratio,
+            Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+            Qt.TransformationMode.SmoothTransformation
+        )
+        scaled_pixmap.setDevicePixelRatio(device_pixel_ratio)
+
+        # 计算居中位置
+        x = (widget_rect.width() - scaled_pixmap.width() / device_pixel_ratio) / 2
+        y = (widget_rect.height() - scaled_pixmap.height() / device_pixel_ratio) / 2
+
+        # 绘制背景图片
+        painter.drawPixmap(QPointF(x, y), scaled_pixmap)
+
+        # 绘制半透明遮罩以保证文字可读性
+        overlay_color = QColor(0, 0, 0, 120) if theme == "dark" else QColor(255, 255, 255, 120)
+        painter.fillRect(widget_rect, QBrush(overlay_color))
+    else:
+        # 没有背景图片时使用纯色背景
+        bg_color = QColor(30, 30, 30) if theme == "dark" else QColor(248, 249, 250)
+        painter.fillRect(widget_rect, QBrush(bg_color))
+    painter.end()
+
+    _rendered_cache[cache_key] = rendered
+    while len(_rendered_cache) > RENDERED_CACHE_SIZE:
+        _rendered_cache.popitem(last=False)
+    return rendered
+
+
 class BackgroundWidget(QWidget):
-    """带背景图片的Widget"""
+    """带背景图片的Widget
+    
+    缩放和遮罩后的背景按尺寸和主题缓存，重绘时直接绘制缓存；
+    拖动调整大小期间用快速缩放的上一帧预览，停止调整后再重新平滑渲染
+    """
     
     def __init__(self, pixmap=None, theme="light", parent=None):
         super().__init__(parent)
-        self.background_pixmap = pixmap
+        self.background_pixmap = None
         self.theme = theme
+        self._rendered = None
+        self._background_key = None
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(RESIZE_DEBOUNCE_MS)
+        self._resize_timer.timeout.connect(self.update)
+
+        image_service.image_ready.connect(self._on_image_ready)
+        self.set_background(pixmap, theme)
     
     def set_background(self, pixmap, theme):
-        """设置背景图片和主题"""
+        """设置背景图片和主题，pixmap 为 None 且启用了背景时等待后台解码完成"""
         self.background_pixmap = pixmap
         self.theme = theme
+        self._rendered = None
+        self._background_key = None
+        if pixmap is None:
+            image_path = get_background_image_path(theme)
+            if image_path is not None:
+                self._background_key, self.background_pixmap = image_service.request(image_path)
         self.update()
+
+    def _on_image_ready(self, key, pixmap):
+        if key == self._background_key and self.background_pixmap is None and not pixmap.isNull():
+            self.background_pixmap = pixmap
+            self._rendered = None
+            self.update()
+
+    def resizeEvent(self, event):
+        # 已有渲染结果时推迟平滑渲染，首次显示直接渲染
+        if self._rendered is not None:
+            self._resize_timer.start()
+        super().resizeEvent(event)
     
     def paintEvent(self, event):
         """绘制背景图片"""
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # 获取widget尺寸
-        widget_rect = self.rect()
-        
-        # 创建圆角裁剪路径
-        path = QPainterPath()
-        path.addRoundedRect(widget_rect.x(), widget_rect.y(), widget_rect.width(), widget_rect.height(), 8, 8)
-        painter.setClipPath(path)
-        
-        if self.background_pixmap:
-            # 缩放背景图片以适应widget大小
-            scaled_pixmap = self.background_pixmap.scaled(
-                widget_rect.size(),
-                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            
-            # 计算居中位置
-            x = (widget_rect.width() - scaled_pixmap.width()) // 2
-            y = (widget_rect.height() - scaled_pixmap.height()) // 2
-            
-            # 绘制背景图片
-            painter.drawPixmap(x, y, scaled_pixmap)
-            
-            # 绘制半透明遮罩以保证文字可读性
-            overlay_color = QColor(0, 0, 0, 120) if self.theme == "dark" else QColor(255, 255, 255, 120)
-            painter.fillRect(widget_rect, QBrush(overlay_color))
-        else:
-            # 没有背景图片时使用纯色背景
-            bg_color = QColor(30, 30, 30) if self.theme == "dark" else QColor(248, 249, 250)
-            painter.fillRect(widget_rect, QBrush(bg_color))
+        size = self.size()
+
+        if self._resize_timer.isActive() and self._rendered is not None:
+            # 调整大小过程中：快速拉伸上一帧作为预览
+            painter.drawPixmap(self.rect(), self._rendered)
+            return
+
+        self._rendered = render_background(self.background_pixmap, self.theme, size, self.devicePixelRatioF())
+        painter.drawPixmap(0, 0, self._rendered)
+
+
+@contextmanager
+def updates_suspended(widget):
+    """暂停控件及其子控件的重绘，退出时恢复并统一重绘一次"""
+    was_enabled = widget.updatesEnabled()
+    widget.setUpdatesEnabled(False)
+    try:
+        yield
+    finally:
+        widget.setUpdatesEnabled(was_enabled)
+
+
+class LazyTab(QWidget):
+    """延迟构建的标签页容器
+
+    首次激活前只显示轻量的占位文字，调用 widget() 时才导入模块并构建真正的标签页
+    """
+
+    def __init__(self, factory, title="", parent=None):
+        super().__init__(parent)
+        self._factory = factory
+        self._title = title
+        self._widget = None
+
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+
+        from core.styles import get_font_gray_style
+        self._placeholder = QLabel("正在加载…")
+        self._placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._placeholder.setStyleSheet(get_font_gray_style(config.theme))
+        self._layout.addWidget(self._placeholder)
+
+    def is_loaded(self):
+        return self._widget is not None
+
+    def apply_theme(self, theme):
+        if self._placeholder is not None:
+            from core.styles import get_font_gray_style
+            self._placeholder.setStyleSheet(get_font_gray_style(theme))
 
+    def loaded_widget(self):
+        """已构建时返回标签页，否则返回 None（不会触发构建）"""
+        return self._widget
 
+    def widget(self):
+        """返回标签页，首次调用时构建"""
+        if self._widget is None:
+            start_time = time.perf_counter()
+            with profiler.span(f"构建标签页: {self._title}", "tab"):
+                self._widget = self._factory()
+            self._layout.removeWidget(self._placeholder)
+            self._placeholder.deleteLater()
+            self._placeholder = None
+            self._layout.addWidget(self._widget)
+            print(f"[INFO] 标签页已加载: {self._title}，用时 {time.perf_counter() - start_time:.3f} 秒")
+        return self._widget
@@ -1,12 +1,15 @@
-﻿from PySide6.QtWidgets import QApplication
+﻿import sys
+
+# 启动性能分析需在其他模块导入之前启用（WW_PROFILE_STARTUP=1 或 --profile-startup）
+from core.startup_profiler import profiler, enable_from_environment
+enable_from_environment()
+
+from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QFont
 
 from core.styles import get_icon
 from version import VERSION
 
-
-import sys
-
 def setup_application():
     """设置应用程序基本属性"""
     app = QApplication(sys.argv)
@@ -32,22 +35,36 @@ def main():
         
         print("正在创建应用实例...")
         # 创建应用实例
-        app = setup_application()
+        with profiler.span("创建应用实例", "app"):
+            app = setup_application()
         print("应用实例创建完成")
         
+        # 一次性迁移旧格式的数据文件，之后加载数据时不再改写文件
+        with profiler.span("迁移旧格式数据", "data"):
+            from core.config import config
+            config.migrate_data_files()
+        
         print("正在导入TemplateMainWindow...")
-        from core.main_window import TemplateMainWindow
+        with profiler.span("导入主窗口模块", "import"):
+            from core.main_window import TemplateMainWindow
         print("TemplateMainWindow导入完成")
         
         print("正在创建主窗口...")
         # 创建主窗口
-        main_window = TemplateMainWindow()
+        with profiler.span("创建主窗口", "window"):
+            main_window = TemplateMainWindow()
         print("主窗口创建完成")
         
         print("正在显示主窗口...")
         # 直接显示窗口（不使用延迟）
-        main_window.show()
+        with profiler.span("显示主窗口", "window"):
+            main_window.show()
         print("主窗口显示完成")
+
+        if profiler.enabled:
+            # 当前标签页在首轮事件循环中构建，之后再输出分析结果
+            from PySide6.QtCore import QTimer
+            QTimer.singleShot(0, profiler.finish)
         
         print("应用启动成功！")
         # 运行应用